@@ -0,0 +1,156 @@
+# entry point for the benchmarks
+
+import os
+import sys
+
+from src.benchmark.benchmark_runner import (
+    FAMILIES,
+    REPEATS,
+    TIMEOUT_SECONDS,
+    TOLERANCE,
+    BenchmarkRunner,
+)
+from src.benchmark.startup_benchmark import (
+    STARTUP_BUDGET_SECONDS,
+    STARTUP_REPEATS,
+    StartupBenchmark,
+)
+
+# the baseline is compared with automatically when it exists
+BASELINE_PATH = "benchmark_baseline.json"
+
+
+def get_option(name: str) -> str:
+    # gets the value of an option given as --name=value
+    for argument in sys.argv[1:]:
+        if argument.startswith(f"{name}="):
+            return argument[len(name) + 1 :]
+
+    return None
+
+
+def get_list_option(name: str) -> list[str]:
+    # values separated by commas
+    value = get_option(name)
+
+    return value.split(",") if value is not None else None
+
+
+def run_startup_benchmark():
+    # times the cold start of iengine.py with each algorithm instead
+    algorithms = get_list_option("--algorithms")
+    repeats = get_option("--repeats")
+    budget = get_option("--budget")
+
+    benchmark = StartupBenchmark(
+        [name.upper() for name in algorithms] if algorithms is not None else None,
+        int(repeats) if repeats is not None else STARTUP_REPEATS,
+        float(budget) if budget is not None else STARTUP_BUDGET_SECONDS,
+    )
+
+    over_budget = []
+
+    for name, seconds, overhead, modules in benchmark.run(
+        get_option("--directory") or "benchmark_files"
+    ):
+        line = f"{name}: {seconds:.3f}s ({overhead:.3f}s more than python)"
+
+        if len(modules) > 0:
+            line += f", imported {', '.join(modules)}"
+
+        if overhead > benchmark.budget or len(modules) > 0:
+            over_budget.append(name)
+            print(f"\033[91m{line}\033[0m")
+        else:
+            print(f"\033[92m{line}\033[0m")
+
+    if len(over_budget) == 0:
+        print(
+            f"\033[92mAll algorithms started within {benchmark.budget}s and only imported what they use\033[0m"
+        )
+        return
+
+    print(
+        f"\033[91m{', '.join(over_budget)} took more than {benchmark.budget}s to start or imported modules they don't use\033[0m"
+    )
+
+    # so a script running the benchmark can tell
+    sys.exit(1)
+
+
+def main():
+    if "--help" in sys.argv:
+        print(
+            "Usage: python benchmark.py [--families=<names>] [--algorithms=<names>] [--max-size=<n>] [--seed=<n>] [--timeout=<seconds>] [--repeats=<n>] [--directory=<path>] [--output=<path>] [--csv=<path>] [--baseline=<path>] [--save-baseline] [--tolerance=<fraction>]"
+        )
+        print(
+            "       python benchmark.py --startup [--algorithms=<names>] [--repeats=<n>] [--budget=<seconds>]"
+        )
+        print(f"Families: {', '.join(FAMILIES)}")
+        return
+
+    if "--startup" in sys.argv:
+        run_startup_benchmark()
+        return
+
+    algorithms = get_list_option("--algorithms")
+    max_size = get_option("--max-size")
+    seed = get_option("--seed")
+    timeout = get_option("--timeout")
+    repeats = get_option("--repeats")
+    tolerance = get_option("--tolerance")
+    baseline_path = get_option("--baseline") or BASELINE_PATH
+
+    runner = BenchmarkRunner(
+        get_option("--directory") or "benchmark_files",
+        get_list_option("--families"),
+        [name.upper() for name in algorithms] if algorithms is not None else None,
+        int(seed) if seed is not None else 0,
+        float(timeout) if timeout is not None else TIMEOUT_SECONDS,
+        int(repeats) if repeats is not None else REPEATS,
+        int(max_size) if max_size is not None else None,
+    )
+
+    # print each result as soon as it is measured
+    results = list(runner.run(print))
+
+    output_path = get_option("--output") or "benchmark_results.json"
+    runner.write_json(results, output_path)
+    print(f"Results written to {output_path}")
+
+    csv_path = get_option("--csv")
+
+    if csv_path is not None:
+        runner.write_csv(results, csv_path)
+        print(f"Results written to {csv_path}")
+
+    if "--save-baseline" in sys.argv:
+        runner.write_json(results, baseline_path)
+        print(f"Baseline written to {baseline_path}")
+        return
+
+    if not os.path.exists(baseline_path):
+        return
+
+    regressions = runner.compare(
+        results,
+        runner.read_json(baseline_path),
+        float(tolerance) if tolerance is not None else TOLERANCE,
+    )
+
+    if len(regressions) == 0:
+        print(f"\033[92mNo regressions compared to {baseline_path}\033[0m")
+        return
+
+    print(f"\033[91m{len(regressions)} regressions compared to {baseline_path}:\033[0m")
+
+    for regression in regressions:
+        print(regression)
+
+    # so a script running the benchmarks can tell there was a regression
+    sys.exit(1)
+
+
+# runs the program if the file is run directly
+if __name__ == "__main__":
+    main()
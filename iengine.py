@@ -2,15 +2,52 @@
 
 import sys
 
+from src.branching_heuristic import BranchingHeuristic
+from src.enumeration_mode import EnumerationMode
+from src.file_parser import FileParser, FileType
 from src.inference_algorithm_factory import InferenceAlgorithmFactory
+from src.instrumentation import Instrumentation
 from src.runner import Runner
 
 
+def get_option(name: str) -> str:
+    # gets the value of an option given as --name=value
+    for argument in sys.argv[3:]:
+        if argument.startswith(f"{name}="):
+            return argument[len(name) + 1 :]
+
+    return None
+
+
+def write_metrics(
+    metrics_path: str,
+    file_path: str,
+    algorithm_name: str,
+    line: str,
+    instrumentation: Instrumentation,
+):
+    # one json object per query, appended so a log can be built up over many runs
+    import json
+
+    metrics = {"file": file_path, "algorithm": algorithm_name, "result": line}
+    metrics.update(instrumentation.to_dict())
+
+    if metrics_path == "-":
+        print(json.dumps(metrics))
+        return
+
+    with open(metrics_path, "a") as file:
+        file.write(json.dumps(metrics) + "\n")
+
+
 def main():
     # not enough arguments
     if len(sys.argv) < 3:
         print(
-            "Usage: python iengine.py <file_path> <inference_algorithm> [--test / --debug]"
+            "Usage: python iengine.py <file_path> <inference_algorithm> [--test / --debug] [--count / --first / --stream] [--workers=<n>] [--chunk-size=<n>] [--preprocess=<passes> / --preprocess=none] [--heuristic=<name>] [--seed=<n>] [--metrics=<path>] [--memory] [--cache=<directory>] [--cache-size=<MB>] [--write-dimacs=<path>]"
+        )
+        print(
+            "DIMACS files: DPLL and CDCL are practical up to a few hundred thousand clauses, the default preprocessing is skipped above 50,000"
         )
         return
 
@@ -24,11 +61,124 @@ def main():
     # debug mode
     debug = ("--debug" in sys.argv) if len(sys.argv) > 3 else False
 
+    # how models are reported by truth table checking
+    mode = None
+    consumer = None
+
+    if "--count" in sys.argv:
+        # only count the models
+        mode = EnumerationMode.COUNT
+    elif "--first" in sys.argv:
+        # stop at the first model
+        mode = EnumerationMode.FIRST
+    elif "--stream" in sys.argv:
+        # print each model as soon as it is found
+        mode = EnumerationMode.STREAM
+        consumer = print
+
     # get the inference algorithm
     inference_algorithm = InferenceAlgorithmFactory.get_inference_algorithm_from_name(
         inference_algorithm_name
     )
 
+    # number of worker processes and rows per task for parallel algorithms
+    workers = get_option("--workers")
+    chunk_size = get_option("--chunk-size")
+
+    # preprocessing passes for the cnf clauses separated by commas, see CNFPreprocessor
+    preprocess = get_option("--preprocess")
+
+    if preprocess is not None:
+        inference_algorithm.set_preprocessing(
+            [] if preprocess == "none" else preprocess.split(",")
+        )
+
+    # how DPLL chooses the literal to branch on, the seed is for the random heuristic
+    heuristic = get_option("--heuristic")
+    seed = get_option("--seed")
+
+    if heuristic is not None:
+        inference_algorithm.set_heuristic(
+            BranchingHeuristic.from_name(
+                heuristic, int(seed) if seed is not None else None
+            )
+        )
+
+    # times of each phase and counters of the algorithm, shown with --debug and written as json lines to
+    # the metrics file ("-" for the output), --memory measures peak memory as well but makes everything slower
+    metrics_path = get_option("--metrics")
+    trace_memory = "--memory" in sys.argv
+    instrumented = debug or metrics_path is not None
+
+    def report(line: str, instrumentation: Instrumentation):
+        if debug:
+            print(instrumentation)
+
+        if metrics_path is not None:
+            write_metrics(
+                metrics_path, file_path, inference_algorithm.name, line, instrumentation
+            )
+
+    # compiled knowledge bases are kept in the cache directory so the next run with the same knowledge base
+    # doesn't parse or convert it (FC, BC, DPLL, CDCL and SHARPSAT), see KnowledgeBaseCache
+    cache_directory = get_option("--cache")
+    cache_size = get_option("--cache-size")
+    cache = None
+
+    # the options that aren't used by every run import what they need when they are given
+    # so a plain run doesn't wait for them, see StartupBenchmark
+    if cache_directory is not None:
+        from src.knowledge_base_cache import MAX_BYTES, KnowledgeBaseCache
+
+        cache = KnowledgeBaseCache(
+            cache_directory,
+            (
+                int(float(cache_size) * 1024 * 1024)
+                if cache_size is not None
+                else MAX_BYTES
+            ),
+        )
+
+    # writes the cnf of the knowledge base to a DIMACS file (gzipped if the path ends with .gz) instead of asking
+    dimacs_path = get_option("--write-dimacs")
+
+    if dimacs_path is not None:
+        from src.cnf_knowledge_base import CNFKnowledgeBase
+        from src.dimacs_file import DIMACSFile
+
+        knowledge_base, _ = FileParser.parse_kb_and_query(file_path)
+
+        DIMACSFile.write(
+            CNFKnowledgeBase.from_generic_knowledge_base(knowledge_base), dimacs_path
+        )
+        print(f"Knowledge base written to {dimacs_path}")
+        return
+
+    if not is_test_file and FileParser.get_file_type(file_path) == FileType.BATCH:
+        # with a batch file the workers answer the queries instead
+        if chunk_size is not None:
+            inference_algorithm.set_parallelism(None, int(chunk_size))
+
+        # print each result as soon as it is ready
+        for line in Runner.run_batch(
+            inference_algorithm,
+            file_path,
+            mode,
+            consumer,
+            int(workers) if workers is not None else None,
+            report if instrumented else None,
+            trace_memory,
+        ):
+            print(line)
+
+        return
+
+    if workers is not None or chunk_size is not None:
+        inference_algorithm.set_parallelism(
+            int(workers) if workers is not None else None,
+            int(chunk_size) if chunk_size is not None else None,
+        )
+
     if is_test_file:
         # run the test
         result = Runner.run_test_from_file_path(inference_algorithm, file_path)
@@ -43,15 +193,24 @@ def main():
         return
 
     # run the algorithm
-    result = Runner.run_from_file_path(inference_algorithm, file_path)
+    result = Runner.run_from_file_path(
+        inference_algorithm,
+        file_path,
+        mode,
+        consumer,
+        Instrumentation(trace_memory) if instrumented else None,
+        cache,
+    )
 
     if debug:
         # print the result in debug mode
         print(result.debug())
-        return
+    else:
+        # print the result
+        print(result)
 
-    # print the result
-    print(result)
+    if instrumented:
+        report(str(result), result.instrumentation)
 
 
 # runs the program if the file is run directly
@@ -0,0 +1,62 @@
+# entry point for the inference server
+
+import asyncio
+import socket
+import sys
+
+from src.server.inference_server import TIMEOUT_SECONDS, InferenceServer
+
+# localhost port the server listens on when it isn't given a socket
+PORT = 8765
+
+
+def get_option(name: str) -> str:
+    # gets the value of an option given as --name=value
+    for argument in sys.argv[1:]:
+        if argument.startswith(f"{name}="):
+            return argument[len(name) + 1 :]
+
+    return None
+
+
+def main():
+    if "--help" in sys.argv:
+        print(
+            "Usage: python server.py [--socket=<path>] [--port=<n>] [--workers=<n>] [--timeout=<seconds>]"
+        )
+        return
+
+    socket_path = get_option("--socket")
+    port = get_option("--port")
+    workers = get_option("--workers")
+    timeout = get_option("--timeout")
+
+    server = InferenceServer(
+        int(workers) if workers is not None else None,
+        float(timeout) if timeout is not None else TIMEOUT_SECONDS,
+    )
+
+    try:
+        if socket_path is not None:
+            # eg. windows
+            if not hasattr(socket, "AF_UNIX"):
+                print("Unix sockets aren't supported here, use --port instead")
+                return
+
+            print(f"Listening on {socket_path} with {server.pool.size} workers")
+            asyncio.run(server.serve_unix(socket_path))
+        else:
+            port = int(port) if port is not None else PORT
+
+            print(
+                f"Listening on http://127.0.0.1:{port} with {server.pool.size} workers"
+            )
+            asyncio.run(server.serve_tcp("127.0.0.1", port))
+    except KeyboardInterrupt:
+        # the workers are stopped when serving is cancelled
+        pass
+
+
+# runs the program if the file is run directly
+if __name__ == "__main__":
+    main()
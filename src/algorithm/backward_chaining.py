@@ -1,63 +1,250 @@
 from src.horn_knowledge_base import HornKnowledgeBase
+from src.horn_rule_index import HornRuleIndex
 from src.inference_algorithm import InferenceAlgorithm
 from src.query import HornKnowledgeBaseQuery
 from src.result.chaining_result import ChainingResult
-from src.syntax.literal import PositiveLiteral
 
+# status of each goal during a run
+UNVISITED = 0
+IN_PROGRESS = 1
+ENTAILED = 2
+FAILED = 3
 
+# parts of a frame on the stack, a frame is a list so the parts can be changed
+GOAL = 0
+RULES = 1
+RULE = 2
+BODY = 3
+BODY_POSITION = 4
+BODY_ENTAILED = 5
+LOW = 6
+CHILDREN = 7
+
+
+# Depth first backward chaining with an explicit stack
+# each goal is only expanded once per run, a goal that is being expanded or has failed is false
+# and a goal that has been entailed is true, the rules of a goal are tried in the order of the kb
+# every symbol in the body of a rule is checked even after one is false because the entailed symbols
+# that are found along the way are part of the result
 class BackwardChaining(InferenceAlgorithm):
     def __init__(self):
         super().__init__("BC")
 
+        # goals expanded in the last run, goals replayed from the memo aren't counted
+        self.goals_expanded = 0
+
     def run(
         self, knowledge_base: HornKnowledgeBase, query: HornKnowledgeBaseQuery
     ) -> ChainingResult:
+        # symbols and rules as integers
+        index = knowledge_base.get_rule_index()
+
         # ultimate goal
-        goal = query.positive_literal
+        goal = index.symbol_ids.get(query.positive_literal.name)
 
-        # entailed symbols
-        entailed = set()
+        self.goals_expanded = 0
+
+        # a symbol that isn't in the kb can't be entailed and nothing else is checked
+        if goal is None:
+            return ChainingResult(self.name, False, set())
+
+        status = bytearray(index.get_number_of_symbols())
 
-        # visited goals
-        visited = set()
+        found = self.backwards_chaining(
+            index, knowledge_base.backward_chaining_memo, goal, status
+        )
 
-        # do the backward chaining recursively
-        found = self.backwards_chaining(knowledge_base, goal, entailed, visited)
+        # entailed symbols
+        entailed = {
+            index.symbols[symbol_id]
+            for symbol_id in range(len(status))
+            if status[symbol_id] == ENTAILED
+        }
 
         return ChainingResult(self.name, found, entailed)
 
     def backwards_chaining(
         self,
-        knowledge_base: HornKnowledgeBase,
-        goal: PositiveLiteral,
-        entailed: set[PositiveLiteral],
-        visited: set[PositiveLiteral],
+        index: HornRuleIndex,
+        memo: dict[int, tuple],
+        goal: int,
+        status: bytearray,
     ) -> bool:
-        # ensure that we don't loop but also that we can access already entailed literals
-        if goal in visited and goal not in entailed:
-            return False
-
-        visited.add(goal)
-
-        # if the goal is already a fact
-        if goal in knowledge_base.facts:
-            # we have entailed this known fact
-            entailed.add(goal)
-            return True
-
-        # check if any rule has the goal as the head
-        for rule in knowledge_base.rules:
-            if rule.head == goal:
-                # check if all the symbols in the body are entailed
-                if all(
+        # the memo is a table of goals that were expanded without looking at any goal from outside
+        # of their own expansion (a goal being expanded above them or one checked before them)
+        # so expanding them again would give exactly the same result
+        # each entry is (goal, whether it was entailed, entries of the goals it expanded in order)
+        # a memoised goal is replayed instead of expanded as long as none of its goals are visited yet
+
+        # order that each goal was visited in, any goal visited after a goal that is still being
+        # expanded is part of that expansion (like tarjan's algorithm)
+        order = [0] * len(status)
+        visit_count = 0
+
+        rule_body_offsets = index.rule_body_offsets
+        rule_bodies = index.rule_bodies
+        is_fact = index.is_fact
+
+        # the same query was already answered
+        if self.replay(memo, goal, status, order, visit_count) is not None:
+            return memo[goal][1]
+
+        stack = []
+
+        # result of the last goal that finished
+        entailed = False
+
+        # the first goal to expand
+        expand = goal
+
+        while True:
+            if expand is not None:
+                # start expanding the goal
+                self.goals_expanded += 1
+                status[expand] = IN_PROGRESS
+                order[expand] = visit_count
+                visit_count += 1
+
+                stack.append(
                     [
-                        self.backwards_chaining(
-                            knowledge_base, symbol, entailed, visited
-                        )
-                        for symbol in rule.body
+                        expand,
+                        index.get_head_rules(expand),
+                        -1,
+                        None,
+                        0,
+                        True,
+                        order[expand],
+                        [],
+                    ]
+                )
+
+                expand = None
+
+            frame = stack[-1]
+            current = frame[GOAL]
+
+            # a fact is entailed straight away
+            finished = is_fact[current] == 1
+            entailed = finished
+
+            while not finished:
+                body = frame[BODY]
+
+                # all the symbols of this rule have been checked
+                if body is not None and frame[BODY_POSITION] == len(body):
+                    # every symbol was entailed so the goal is entailed
+                    if frame[BODY_ENTAILED]:
+                        finished = True
+                        entailed = True
+                        break
+
+                    body = None
+
+                # move on to the next rule
+                if body is None:
+                    frame[RULE] += 1
+
+                    # no rules left so the goal fails
+                    if frame[RULE] == len(frame[RULES]):
+                        finished = True
+                        entailed = False
+                        break
+
+                    rule = frame[RULES][frame[RULE]]
+
+                    body = rule_bodies[
+                        rule_body_offsets[rule] : rule_body_offsets[rule + 1]
                     ]
-                ):
-                    entailed.add(goal)
-                    return True
 
-        return False
+                    frame[BODY] = body
+                    frame[BODY_POSITION] = 0
+                    frame[BODY_ENTAILED] = True
+
+                symbol = body[frame[BODY_POSITION]]
+                frame[BODY_POSITION] += 1
+
+                symbol_status = status[symbol]
+
+                if symbol_status == UNVISITED:
+                    replayed = self.replay(memo, symbol, status, order, visit_count)
+
+                    # not in the memo so it has to be expanded
+                    if replayed is None:
+                        expand = symbol
+                        break
+
+                    visit_count = replayed
+
+                    frame[CHILDREN].append(memo[symbol])
+
+                    symbol_entailed = memo[symbol][1]
+                else:
+                    # the goal was visited before this goal was expanded so this expansion can't be memoised
+                    frame[LOW] = min(frame[LOW], order[symbol])
+
+                    symbol_entailed = symbol_status == ENTAILED
+
+                frame[BODY_ENTAILED] = frame[BODY_ENTAILED] and symbol_entailed
+
+            if not finished:
+                continue
+
+            # the goal is done
+            stack.pop()
+
+            status[current] = ENTAILED if entailed else FAILED
+
+            entry = (current, entailed, tuple(frame[CHILDREN]))
+
+            if frame[LOW] >= order[current]:
+                memo[current] = entry
+
+            if len(stack) == 0:
+                return entailed
+
+            # pass the result up to the rule that needed it
+            parent = stack[-1]
+            parent[CHILDREN].append(entry)
+            parent[LOW] = min(parent[LOW], frame[LOW])
+            parent[BODY_ENTAILED] = parent[BODY_ENTAILED] and entailed
+
+    def get_counters(self) -> dict[str, int]:
+        return {"goals_expanded": self.goals_expanded}
+
+    @staticmethod
+    def replay(
+        memo: dict[int, tuple],
+        goal: int,
+        status: bytearray,
+        order: list[int],
+        visit_count: int,
+    ) -> int:
+        # sets the status of every goal that expanding the goal would visit, in the same order
+        # returns the new visit count, or None if the goal can't be replayed
+        entry = memo.get(goal)
+
+        if entry is None:
+            return None
+
+        # all the goals of the expansion must be unvisited for it to be the same
+        entries = []
+        stack = [entry]
+
+        while len(stack) > 0:
+            entry = stack.pop()
+
+            if status[entry[0]] != UNVISITED:
+                return None
+
+            entries.append(entry)
+
+            # reversed so the children come off the stack in order
+            stack.extend(reversed(entry[2]))
+
+        # entries are in the order the goals were visited
+        for current, entailed, _ in entries:
+            status[current] = ENTAILED if entailed else FAILED
+            order[current] = visit_count
+            visit_count += 1
+
+        return visit_count
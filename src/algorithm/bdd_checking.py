@@ -0,0 +1,123 @@
+from src.algorithm.sharp_sat import SharpSAT
+from src.algorithm.truth_table_checking import TruthTableChecking
+from src.bdd_knowledge_base import BDDKnowledgeBase
+from src.binary_decision_diagram import BudgetExceededError
+from src.cnf_knowledge_base import CNFKnowledgeBase
+from src.enumeration_mode import EnumerationMode
+from src.knowledge_base import KnowledgeBase
+from src.query import Query
+from src.result.truth_table_checking_result import TruthTableCheckingResult
+
+
+# Gives the same result as truth table checking by compiling the knowledge base into a binary decision diagram
+# the knowledge base is only compiled once (see BDDKnowledgeBase) and each query is combined with it
+# counting the models takes time proportional to the size of the diagram instead of the number of rows
+# if the diagram goes over its budget then the models are counted by SHARPSAT or checked by truth table checking
+class BDDChecking(TruthTableChecking):
+    def __init__(self):
+        super().__init__()
+        self.name = "BDD"
+
+        # nodes in the diagram after the last query was combined with it, 0 if it wasn't compiled
+        self.nodes = 0
+
+    def run(
+        self, knowledge_base: KnowledgeBase, query: Query
+    ) -> TruthTableCheckingResult:
+        self.nodes = 0
+        self.models_enumerated = 0
+
+        if not isinstance(knowledge_base, BDDKnowledgeBase):
+            knowledge_base = BDDKnowledgeBase.from_generic_knowledge_base(
+                knowledge_base
+            )
+
+        # query can only be valid if the kb could possibly entail it
+        names = {
+            symbol.name
+            for symbol in knowledge_base.propositional_symbols_excluding_query
+        }
+
+        if any(symbol.name not in names for symbol in query.sentence.get_symbols()):
+            return self.get_result([], False)
+
+        if not knowledge_base.is_compiled():
+            return self.run_fallback(knowledge_base, query)
+
+        try:
+            # the nodes of the query are removed from the diagram once it is answered
+            with knowledge_base.answering_query():
+                root = knowledge_base.conjoin_query(query.sentence)
+
+                self.nodes = knowledge_base.diagram.get_number_of_nodes()
+
+                return self.get_query_result(knowledge_base, root)
+        except BudgetExceededError:
+            return self.run_fallback(knowledge_base, query)
+
+    def get_query_result(
+        self, knowledge_base: BDDKnowledgeBase, root: int
+    ) -> TruthTableCheckingResult:
+        # count without creating any models
+        if self.mode == EnumerationMode.COUNT:
+            number_of_models = knowledge_base.count_models(root)
+
+            return self.get_result([], number_of_models > 0, number_of_models)
+
+        valid_models = knowledge_base.get_models(root)
+
+        # stop at the first valid model, we don't know how many others there are
+        if self.mode == EnumerationMode.FIRST:
+            witness = next(valid_models, None)
+
+            if witness is None:
+                return self.get_result([], False)
+
+            return self.get_result([witness], True, is_complete=False)
+
+        # pass each model on without keeping it
+        if self.mode == EnumerationMode.STREAM:
+            number_of_models = 0
+
+            for model in valid_models:
+                self.consumer(model)
+                number_of_models += 1
+
+            return self.get_result([], number_of_models > 0, number_of_models)
+
+        valid_models = list(valid_models)
+
+        return self.get_result(valid_models, len(valid_models) > 0)
+
+    def get_result(
+        self,
+        models: list,
+        found: bool,
+        number_of_models: int = None,
+        is_complete: bool = True,
+    ) -> TruthTableCheckingResult:
+        self.models_enumerated = (
+            number_of_models if number_of_models is not None else len(models)
+        )
+
+        return TruthTableCheckingResult(
+            models, found, number_of_models, is_complete, self.name
+        )
+
+    def get_counters(self) -> dict[str, int]:
+        return {"nodes": self.nodes, "models": self.models_enumerated}
+
+    def run_fallback(
+        self, knowledge_base: KnowledgeBase, query: Query
+    ) -> TruthTableCheckingResult:
+        # the diagram is too big, counting models doesn't need a diagram and anything else needs the models
+        if self.mode == EnumerationMode.COUNT:
+            result = SharpSAT().run(
+                CNFKnowledgeBase.from_generic_knowledge_base(knowledge_base), query
+            )
+
+            self.models_enumerated = result.number_of_models
+
+            return result
+
+        return super().run(knowledge_base, query)
@@ -0,0 +1,127 @@
+import time
+
+from src.cdcl_solver import CDCLSolver
+from src.cnf_knowledge_base import CNFKnowledgeBase
+from src.cnf_preprocessor import CNFPreprocessor
+from src.incremental_solver import IncrementalSolver
+from src.inference_algorithm import InferenceAlgorithm
+from src.query import Query
+from src.result.dpll_result import DPLLResult
+
+
+# Conflict driven clause learning, gives the same result as DPLL but uses
+# two watched literal propagation, 1-UIP clause learning, VSIDS branching and restarts
+# queries are answered by a solver that is kept with the knowledge base, so only the query is new for each
+# one and the clauses learnt for earlier queries are kept, see IncrementalSolver
+class CDCL(InferenceAlgorithm):
+
+    def __init__(self):
+        super().__init__("CDCL")
+
+        # simplifies the clauses before the search, see CNFPreprocessor
+        self.preprocessor = CNFPreprocessor()
+
+        # counters of the last search, see CDCLSolver
+        self.counters: dict[str, int] = {}
+
+        # seconds the clauses of the last run took to simplify
+        self.preprocessing_seconds = 0.0
+
+    def set_preprocessing(self, passes: list[str]):
+        # an empty list turns preprocessing off and the clauses are searched as they are
+        self.preprocessor = CNFPreprocessor(passes)
+
+    def run(self, knowledge_base: CNFKnowledgeBase, query: Query = None) -> DPLLResult:
+        # without a query the knowledge base is checked on its own eg. a DIMACS file
+        # symbols
+        symbols = knowledge_base.symbols
+
+        self.counters = {}
+        self.preprocessing_seconds = 0.0
+
+        if query is not None:
+            # if query symbol not in knowledge base then it must be unsatisfiable
+            for literal in query.sentence.get_symbols():
+                if literal.name not in symbols:
+                    return DPLLResult(False, knowledge_base, self.name)
+
+            return self.run_incremental(knowledge_base, query)
+
+        # the simplified clauses only keep whether there is a model, which is all that is needed here
+        start = time.perf_counter()
+        database = self.preprocessor.preprocess(knowledge_base.database)
+        self.preprocessing_seconds = time.perf_counter() - start
+        knowledge_base = CNFKnowledgeBase(
+            database, knowledge_base.symbols, knowledge_base.tseitin_threshold
+        )
+
+        solver = CDCLSolver()
+
+        # each symbol id is a variable of the solver (ids start from 1, variables from 0)
+        variables = [-1] + [
+            solver.new_variable() for _ in range(database.get_number_of_symbols())
+        ]
+
+        solver.add_clauses(database.literals, database.offsets, variables)
+
+        satisfiable = solver.solve()
+
+        self.counters = {
+            "decisions": solver.decisions,
+            "propagations": solver.propagations,
+            "conflicts": solver.conflicts,
+            "restarts": solver.restarts,
+        }
+
+        return DPLLResult(
+            satisfiable,
+            knowledge_base,
+            self.name,
+            self.preprocessor.get_statistics(),
+        )
+
+    def run_incremental(
+        self, knowledge_base: CNFKnowledgeBase, query: Query
+    ) -> DPLLResult:
+        solver = self.get_incremental_solver(knowledge_base)
+
+        # the solver counts over all the queries
+        before = solver.get_counters()
+        satisfiable = solver.is_satisfiable(query.sentence)
+
+        self.counters = {
+            name: value - before[name] for name, value in solver.get_counters().items()
+        }
+
+        return DPLLResult(
+            satisfiable,
+            solver.knowledge_base,
+            self.name,
+            solver.preprocessor.get_statistics(),
+        )
+
+    def entails(self, knowledge_base: CNFKnowledgeBase, query: Query) -> bool:
+        # whether the query is true in every model of the knowledge base
+        # unlike run the query can have symbols that aren't in the knowledge base
+        return self.get_incremental_solver(knowledge_base).entails(query.sentence)
+
+    def get_incremental_solver(
+        self, knowledge_base: CNFKnowledgeBase
+    ) -> IncrementalSolver:
+        # the solver is made again if the preprocessing passes are different
+        solver = knowledge_base.incremental_solver
+
+        if solver is None or solver.passes != self.preprocessor.passes:
+            solver = IncrementalSolver(knowledge_base, self.preprocessor.passes)
+            knowledge_base.incremental_solver = solver
+
+            # only the query that loads the knowledge base simplifies it
+            self.preprocessing_seconds = solver.preprocessing_seconds
+
+        return solver
+
+    def get_counters(self) -> dict[str, int]:
+        return self.counters
+
+    def get_phases(self) -> dict[str, float]:
+        return {"normalize": self.preprocessing_seconds}
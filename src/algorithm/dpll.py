@@ -1,74 +1,407 @@
+import time
+
+from src.branching_heuristic import BranchingHeuristic, JeroslowWangHeuristic
 from src.cnf_knowledge_base import CNFKnowledgeBase
+from src.cnf_preprocessor import CNFPreprocessor
 from src.inference_algorithm import InferenceAlgorithm
-from src.model import Model
 from src.query import Query
 from src.result.dpll_result import DPLLResult
-from src.syntax.literal import Literal
 
 
+# Davis-Putnam-Logemann-Loveland search for a model of the knowledge base and query
+# at each node of the search
+# - unit clauses set their literal, which can make more unit clauses (unit propagation)
+# - a literal whose negation isn't in any clause is set because it can only satisfy clauses (pure literal rule)
+# - then the heuristic chooses a literal to branch on, it is set to true first then false
+# the clauses are never copied, the literals that are set are kept on a trail and undone when a branch fails
+# and each clause watches 2 of its literals so unit propagation only looks at the clauses of a literal that became false
+# the heuristic is told about the clauses that are left as literals are set and undone, so it keeps its
+# scores up to date and a choice doesn't look at every clause that is left
+# the search uses an explicit stack instead of recursion so it isn't limited by the recursion limit
 class DPLL(InferenceAlgorithm):
 
     def __init__(self):
         super().__init__("DPLL")
 
-    def run(self, knowledge_base: CNFKnowledgeBase, query: Query) -> DPLLResult:
-        # convert query cnf
-        query_cnfs = query.sentence.get_cnfs()
+        # simplifies the clauses before the search, see CNFPreprocessor
+        self.preprocessor = CNFPreprocessor()
+
+        self.heuristic: BranchingHeuristic = JeroslowWangHeuristic()
+
+        # size of the last search
+        self.reset_counters()
 
-        # add cnfs
-        knowledge_base.clauses.extend(query_cnfs)
+    def set_preprocessing(self, passes: list[str]):
+        # an empty list turns preprocessing off and the clauses are searched as they are
+        self.preprocessor = CNFPreprocessor(passes)
 
+    def set_heuristic(self, heuristic: BranchingHeuristic):
+        self.heuristic = heuristic
+
+    def run(self, knowledge_base: CNFKnowledgeBase, query: Query = None) -> DPLLResult:
+        # without a query the knowledge base is checked on its own eg. a DIMACS file
         # symbols
         symbols = knowledge_base.symbols
 
-        # if query symbol not in knowledge base then it must be unsatisfiable
-        for clause in query_cnfs:
-            for literal in clause.literals:
+        # counters of an earlier run aren't kept if there is no search
+        self.reset_counters()
+
+        if query is not None:
+            # if query symbol not in knowledge base then it must be unsatisfiable
+            for literal in query.sentence.get_symbols():
                 if literal.name not in symbols:
-                    return DPLLResult(False, knowledge_base.copy())
+                    return DPLLResult(False, knowledge_base)
+
+            # add the query cnf to a copy so the knowledge base can be reused
+            knowledge_base = knowledge_base.copy()
+            knowledge_base.add_sentence(query.sentence)
+
+        # the simplified clauses only keep whether there is a model, which is all that is needed here
+        start = time.perf_counter()
+        database = self.preprocessor.preprocess(knowledge_base.database)
+        self.preprocessing_seconds = time.perf_counter() - start
+        knowledge_base = CNFKnowledgeBase(
+            database, knowledge_base.symbols, knowledge_base.tseitin_threshold
+        )
+
+        # clauses as lists of integer literals
+        clauses = [clause.tolist() for clause in database]
+
+        # position of each symbol in alphabetical order with any auxiliary symbols from the cnf conversion last
+        # heuristics use it to break ties
+        order = sorted(
+            range(1, database.get_number_of_symbols() + 1),
+            key=lambda symbol: (
+                database.is_auxiliary(symbol),
+                database.symbol_names[symbol],
+            ),
+        )
 
-        # all symbols start unassigned
-        model = Model({symbol: None for symbol in symbols})
+        ranks = {symbol: rank for rank, symbol in enumerate(order)}
 
         # run dpll
-        satisfiable = self.dpll(knowledge_base, model)
+        satisfiable = self.dpll(clauses, ranks)
 
-        return DPLLResult(satisfiable, knowledge_base.copy())
+        return DPLLResult(
+            satisfiable,
+            knowledge_base,
+            preprocessing_statistics=self.preprocessor.get_statistics(),
+            search_statistics=self.get_search_statistics(),
+        )
 
-    def dpll(self, cnf: CNFKnowledgeBase, model: Model) -> bool:
-        # cnf satisfied
-        if cnf.satisfies(model):
-            return True
+    def get_counters(self) -> dict[str, int]:
+        return {
+            "nodes": self.nodes,
+            "decisions": self.decisions,
+            "propagations": self.propagations,
+            "pure_literals": self.pure_literals,
+            "conflicts": self.conflicts,
+        }
 
-        # cnf contains empty clause and therefore is unsatisfiable
-        if cnf.contains_empty_clause():
-            return False
+    def get_phases(self) -> dict[str, float]:
+        return {"normalize": self.preprocessing_seconds}
 
-        # choose a symbol that is not yet assigned
-        symbol = self.choose_symbol(model)
+    def get_search_statistics(self) -> str:
+        return (
+            f"search: {self.nodes} nodes, {self.decisions} decisions, {self.propagations} unit propagations, "
+            f"{self.pure_literals} pure literals and {self.conflicts} conflicts ({self.heuristic.name} heuristic)"
+        )
 
-        # no more symbols to assign and cnf is not satisfied
-        if symbol is None:
-            return False
+    def reset_counters(self):
+        self.nodes = 0
+        self.decisions = 0
+        self.propagations = 0
+        self.pure_literals = 0
+        self.conflicts = 0
 
-        # create positive and negative models
-        positive_model = model.copy()
-        positive_model.set(symbol.name, True)
+        # seconds the clauses took to simplify
+        self.preprocessing_seconds = 0.0
 
-        negative_model = model.copy()
-        negative_model.set(symbol.name, False)
+    def dpll(self, clauses: list[list[int]], ranks: dict[int, int]) -> bool:
+        self.heuristic.reset(ranks)
 
-        # simplify the cnf
-        simplified_cnf_positive = cnf.simplify(positive_model)
-        simplified_cnf_negative = cnf.simplify(negative_model)
+        # value of each literal, 1 if it is true, -1 if it is false and 0 if it isn't set
+        # negated literals are at the end of the list so both signs of a symbol can be indexed by the literal
+        self.values = [0] * (2 * len(ranks) + 1)
 
-        # recursively call dpll
-        return self.dpll(simplified_cnf_positive, positive_model) or self.dpll(
-            simplified_cnf_negative, negative_model
-        )
+        # literals that are set in the order they were set, undone from the end when a branch fails
+        self.trail = []
+        self.propagated = 0
+
+        # indexes of the clauses that watch each literal, a clause watches its first 2 literals
+        # and only needs looking at when one of them becomes false
+        self.clauses = clauses
+        self.watches = [[] for _ in self.values]
+
+        # indexes of the clauses each literal is in
+        self.occurrences = [[] for _ in self.values]
+
+        # the clauses the heuristic chooses with (see BranchingHeuristic) and the pure literals are found with
+        # are the clauses that are left after the first counted literals of the trail, they are only brought up
+        # to date before each choice so unit propagation doesn't pay for them
+        # and counted_values are the values of those literals
+        self.counted = 0
+        self.counted_values = [0] * len(self.values)
+
+        # for each clause, the number of its literals that aren't counted and the number that are counted true
+        self.sizes = [len(clause) for clause in clauses]
+        self.true_counts = [0] * len(clauses)
+
+        # how many clauses without a true literal each literal is in
+        self.totals = [0] * len(self.values)
+        self.clauses_left = len(clauses)
+
+        # literals whose negation stopped being in any clause that is left since the last pure literals were set
+        # every literal can be pure at the start
+        self.pure_candidates = list(range(-len(ranks), len(ranks) + 1))
+
+        self.nodes += 1
+
+        for index, clause in enumerate(clauses):
+            for literal in clause:
+                self.occurrences[literal].append(index)
+
+            self.add_counts(clause, len(clause))
+
+            if len(clause) > 1:
+                self.watches[clause[0]].append(index)
+                self.watches[clause[1]].append(index)
+                continue
+
+            # cnf contains empty clause and therefore is unsatisfiable
+            if len(clause) == 0 or not self.set_literal(clause[0]):
+                self.conflicts += 1
+                return False
+
+            self.propagations += 1
+
+        # each entry is the length of the trail before a decision, the literal and whether it is
+        # already the other branch, the search is a stack of these instead of recursion
+        decisions: list[tuple[int, int, bool]] = []
+
+        while True:
+            if self.propagate():
+                self.set_pure_literals()
+
+                # cnf satisfied, every clause has a true literal
+                if self.clauses_left == 0:
+                    return True
+
+                literal = self.heuristic.choose_literal()
+                self.decisions += 1
+
+                decisions.append((len(self.trail), literal, False))
+            else:
+                self.conflicts += 1
+
+                # go back to the last decision that hasn't tried its negation
+                while len(decisions) > 0 and decisions[-1][2]:
+                    decisions.pop()
+
+                if len(decisions) == 0:
+                    return False
+
+                position, literal, _ = decisions.pop()
+                self.backtrack(position)
+
+                literal = -literal
+                decisions.append((position, literal, True))
+
+            self.nodes += 1
+            self.set_literal(literal)
+
+    def set_literal(self, literal: int) -> bool:
+        # returns false if the literal is already false
+        value = self.values[literal]
+
+        if value != 0:
+            return value == 1
+
+        self.values[literal] = 1
+        self.values[-literal] = -1
+        self.trail.append(literal)
+
+        return True
+
+    def backtrack(self, position: int):
+        # the counts are undone in the opposite order to the one they were made in
+        while self.counted > position:
+            self.counted -= 1
+            self.uncount_literal(self.trail[self.counted])
+
+        for literal in self.trail[position:]:
+            self.values[literal] = 0
+            self.values[-literal] = 0
+
+        del self.trail[position:]
+        self.propagated = position
+
+    def propagate(self) -> bool:
+        # sets the literals of unit clauses until there aren't any, returns false if a clause became false
+        values = self.values
+        trail = self.trail
+        watches = self.watches
+        clauses = self.clauses
+
+        while self.propagated < len(trail):
+            false_literal = -trail[self.propagated]
+            self.propagated += 1
+
+            watching = watches[false_literal]
+            kept = []
+
+            for position, index in enumerate(watching):
+                clause = clauses[index]
+
+                # the false literal is moved to the second watch
+                if clause[0] == false_literal:
+                    clause[0] = clause[1]
+                    clause[1] = false_literal
+
+                first = clause[0]
+
+                if values[first] == 1:
+                    kept.append(index)
+                    continue
+
+                # watch another literal that isn't false if there is one
+                for other in range(2, len(clause)):
+                    literal = clause[other]
+
+                    if values[literal] != -1:
+                        clause[1] = literal
+                        clause[other] = false_literal
+                        watches[literal].append(index)
+                        break
+                else:
+                    kept.append(index)
+
+                    if values[first] == -1:
+                        kept.extend(watching[position + 1 :])
+                        watches[false_literal] = kept
+                        return False
+
+                    # the clause is a unit clause
+                    values[first] = 1
+                    values[-first] = -1
+                    trail.append(first)
+                    self.propagations += 1
+
+            watches[false_literal] = kept
+
+        return True
+
+    def set_pure_literals(self):
+        # a literal whose negation isn't in any clause that is left is set, which can make more pure literals
+        # the counts are brought up to date with the trail
+        while True:
+            self.update_counts()
+
+            totals = self.totals
+            pure = {
+                literal
+                for literal in self.pure_candidates
+                if totals[literal] > 0 and totals[-literal] == 0
+            }
+
+            self.pure_candidates = []
+
+            if len(pure) == 0:
+                return
+
+            self.pure_literals += len(pure)
+
+            # pure literals can't make a clause false or unit so they don't need propagating
+            for literal in pure:
+                self.set_literal(literal)
+
+            self.propagated = len(self.trail)
+
+    def update_counts(self):
+        # counts the literals that were set since the counts were last brought up to date
+        while self.counted < len(self.trail):
+            self.count_literal(self.trail[self.counted])
+            self.counted += 1
+
+    def count_literal(self, literal: int):
+        # the clauses with the literal are satisfied and the clauses with its negation are a literal shorter
+        clauses = self.clauses
+        sizes = self.sizes
+        true_counts = self.true_counts
+
+        for index in self.occurrences[literal]:
+            if true_counts[index] == 0:
+                self.remove_counts(self.get_uncounted(index), sizes[index])
+                self.clauses_left -= 1
+
+            sizes[index] -= 1
+            true_counts[index] += 1
+
+        for index in self.occurrences[-literal]:
+            if true_counts[index] == 0:
+                uncounted = self.get_uncounted(index)
+                self.remove_counts(uncounted, sizes[index])
+
+                uncounted.remove(-literal)
+                self.add_counts(uncounted, sizes[index] - 1)
+
+            sizes[index] -= 1
+
+        self.counted_values[literal] = 1
+        self.counted_values[-literal] = -1
+
+    def uncount_literal(self, literal: int):
+        # undoes count_literal
+        self.counted_values[literal] = 0
+        self.counted_values[-literal] = 0
+
+        sizes = self.sizes
+        true_counts = self.true_counts
+
+        for index in self.occurrences[-literal]:
+            if true_counts[index] == 0:
+                uncounted = self.get_uncounted(index)
+                uncounted.remove(-literal)
+                self.remove_counts(uncounted, sizes[index])
+
+                uncounted.append(-literal)
+                self.add_counts(uncounted, sizes[index] + 1)
+
+            sizes[index] += 1
+
+        for index in self.occurrences[literal]:
+            sizes[index] += 1
+            true_counts[index] -= 1
+
+            if true_counts[index] == 0:
+                self.add_counts(self.get_uncounted(index), sizes[index])
+                self.clauses_left += 1
+
+    def get_uncounted(self, index: int) -> list[int]:
+        # literals of the clause that aren't counted as set
+        counted_values = self.counted_values
+
+        return [
+            literal for literal in self.clauses[index] if counted_values[literal] == 0
+        ]
+
+    def add_counts(self, literals: list[int], length: int):
+        # the literals of a clause of the length that is left
+        totals = self.totals
+
+        for literal in literals:
+            totals[literal] += 1
+
+        self.heuristic.add_literals(literals, length)
+
+    def remove_counts(self, literals: list[int], length: int):
+        # the literals of a clause of the length that isn't left anymore
+        totals = self.totals
+
+        for literal in literals:
+            totals[literal] -= 1
+
+            if totals[literal] == 0:
+                self.pure_candidates.append(-literal)
 
-    def choose_symbol(self, model: Model) -> Literal:
-        for symbol, value in model.values.items():
-            if value is None:
-                return Literal(symbol)
-        return None
+        self.heuristic.remove_literals(literals, length)
@@ -1,9 +1,12 @@
+from array import array
+from collections import deque
+
 from src.horn_knowledge_base import HornKnowledgeBase
+from src.horn_rule_index import HornRuleIndex
 from src.inference_algorithm import InferenceAlgorithm
 from src.query import HornKnowledgeBaseQuery
 from src.result.chaining_result import ChainingResult
 from src.syntax.literal import PositiveLiteral
-from src.syntax.sentence import Sentence
 
 
 class ForwardChaining(InferenceAlgorithm):
@@ -11,68 +14,88 @@ class ForwardChaining(InferenceAlgorithm):
     def __init__(self):
         super().__init__("FC")
 
+        # symbols taken off the agenda in the last run
+        self.agenda_pops = 0
+
     # NOTE: Because we use a queue and the symbols are ordered by the order that appear left to right in the string
     # the results may be different from the provided implementation
 
     # ? I'm not sure what ordering they use but maybe it's alphabetical?
 
     # uses horn kb
+    # linear time forward chaining (Dowling-Gallier), each rule is only visited once for each symbol in its body
     def run(
         self, knowledge_base: HornKnowledgeBase, query: HornKnowledgeBaseQuery
     ) -> ChainingResult:
-        # gets the counts of symbols in the body of each sentence
-        count = self.init_count(knowledge_base)
+        # symbols and rules as integers
+        index = knowledge_base.get_rule_index()
+
+        # gets the counts of symbols in the body of each rule
+        # a rule with the same symbol twice in its body is only counted down once so it never fires
+        count = array("i", index.body_sizes)
 
-        # the agenda is a list of symbols that we need to check
-        agenda: list[PositiveLiteral] = list(knowledge_base.facts)
+        heads = index.heads
 
-        # wanted result
-        wanted = query.positive_literal
+        # the agenda is a queue of symbols that we need to check
+        agenda = deque(index.fact_ids)
+
+        # wanted result, it can't be entailed if it isn't in the kb
+        wanted = index.symbol_ids.get(query.positive_literal.name, -1)
 
         # entailed symbols
-        entailed = set()
+        entailed = bytearray(index.get_number_of_symbols())
+
+        # a local is faster than an attribute in the loop
+        agenda_pops = 0
 
         # while there are symbols in the agenda
         while len(agenda) > 0:
             # get the first symbol in the agenda
-            p = agenda.pop(0)
+            p = agenda.popleft()
+            agenda_pops += 1
 
             # skip if in entailed
-            if p in entailed:
+            if entailed[p]:
                 continue
 
             # we have entailed the consequent
-            entailed.add(p)
+            entailed[p] = 1
 
             # we found the wanted symbol
             if wanted == p:
-                return ChainingResult(self.name, True, entailed | set(agenda))
+                self.agenda_pops = agenda_pops
 
-            # for every sentence in the kb
-            for clause in knowledge_base.rules:
+                return ChainingResult(
+                    self.name, True, self.get_symbols(index, entailed, agenda)
+                )
 
-                # if the symbol is in the body of the sentence
-                if p in clause.body:
-                    # decrement the count of the symbol in the body
-                    count[clause] -= 1
+            # for every rule with the symbol in its body, in the order of the kb
+            for rule in index.get_body_rules(p):
+                # decrement the count of the symbol in the body
+                count[rule] -= 1
 
-                    # if all the symbols in the body are in the entailed symbols
-                    if count[clause] == 0:
+                # if all the symbols in the body are in the entailed symbols
+                if count[rule] == 0:
 
-                        # add the head of the sentence to the agenda
-                        agenda.append(clause.head)
+                    # add the head of the rule to the agenda
+                    agenda.append(heads[rule])
 
         # we couldn't find it
-        return ChainingResult(self.name, False, entailed | set(agenda))
+        self.agenda_pops = agenda_pops
+
+        return ChainingResult(
+            self.name, False, self.get_symbols(index, entailed, agenda)
+        )
 
-    # init count
-    def init_count(self, knowledge_base: HornKnowledgeBase) -> dict[Sentence, int]:
-        # dict for sentence to count of symbols in body lookup eg. A & B => C; count = 2
-        count = {}
+    def get_counters(self) -> dict[str, int]:
+        return {"agenda_pops": self.agenda_pops}
 
-        # for every clause count the number of symbols in the body
-        for clause in knowledge_base.rules:
-            # add the count to the dict
-            count[clause] = len(clause.body)
+    @staticmethod
+    def get_symbols(
+        index: HornRuleIndex, entailed: bytearray, agenda: deque
+    ) -> set[PositiveLiteral]:
+        # entailed symbols and the symbols still in the agenda
+        symbols = {index.symbols[p] for p in range(len(entailed)) if entailed[p]}
+        symbols.update(index.symbols[p] for p in agenda)
 
-        return count
+        return symbols
@@ -0,0 +1,188 @@
+import itertools
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from src.algorithm.truth_table_checking import TruthTableChecking
+from src.enumeration_mode import EnumerationMode
+from src.model import Model
+from src.syntax.compiler import SentenceCompiler
+from src.syntax.literal import Literal
+from src.syntax.sentence import Sentence
+
+# state of each worker process, set once by the pool initializer
+worker_state = {}
+
+
+def init_worker(
+    sentences: list[Sentence],
+    unknown_symbol_names: list[str],
+    constants: dict[str, bool],
+    partition_bits: int,
+):
+    worker_state["sentences"] = sentences
+    worker_state["unknown_symbol_names"] = unknown_symbol_names
+    worker_state["constants"] = constants
+    worker_state["partition_bits"] = partition_bits
+
+
+def check_partition(partition: int, mode: EnumerationMode):
+    # checks every row where the highest unknown symbols are fixed to the bits of the partition number
+    unknown_symbol_names = worker_state["unknown_symbol_names"]
+    partition_bits = worker_state["partition_bits"]
+
+    fixed_names = unknown_symbol_names[:partition_bits]
+    free_names = unknown_symbol_names[partition_bits:]
+
+    # the first unknown symbol is the most significant bit
+    fixed_values = tuple(
+        (partition >> (partition_bits - 1 - i)) & 1 == 1 for i in range(partition_bits)
+    )
+
+    # the fixed symbols are inlined so each row only needs the free symbols
+    constants = dict(worker_state["constants"])
+    constants.update(zip(fixed_names, fixed_values))
+
+    evaluate = SentenceCompiler.compile_sentences(
+        worker_state["sentences"],
+        {name: i for i, name in enumerate(free_names)},
+        constants,
+    )
+
+    valid_values = filter(
+        evaluate, itertools.product((False, True), repeat=len(free_names))
+    )
+
+    if mode == EnumerationMode.COUNT:
+        return sum(1 for _ in valid_values)
+
+    if mode == EnumerationMode.FIRST:
+        values = next(valid_values, None)
+
+        return [] if values is None else [fixed_values + values]
+
+    # the models are built by the main process from the values
+    return [fixed_values + values for values in valid_values]
+
+
+# Truth table checking that splits the truth table into partitions by fixing the highest unknown symbols
+# then checks the partitions at the same time in a process pool
+class ParallelTruthTableChecking(TruthTableChecking):
+    def __init__(self, workers: int = None, chunk_size: int = 2**16):
+        super().__init__()
+        self.name = "TT-PAR"
+
+        self.set_parallelism(workers, chunk_size)
+
+    def set_parallelism(self, workers: int = None, chunk_size: int = None):
+        # number of worker processes, defaults to the number of cpus
+        if workers is not None and workers < 1:
+            raise ValueError("There must be at least 1 worker")
+
+        self.workers = workers if workers is not None else os.cpu_count() or 1
+
+        # number of rows checked by each task, this must be a power of 2
+        if chunk_size is not None:
+            if chunk_size < 1 or chunk_size & (chunk_size - 1) != 0:
+                raise ValueError("Chunk size must be a power of 2")
+
+            self.chunk_size = chunk_size
+
+    def get_chunk_bits(self) -> int:
+        return self.chunk_size.bit_length() - 1
+
+    def find_valid_values(
+        self,
+        unknown: list[Literal],
+        known: list[Literal],
+        sentences: list[Sentence],
+        mode: EnumerationMode = EnumerationMode.ALL,
+    ):
+        # yields the result of each partition, a count in count mode otherwise a list of values
+        n = len(unknown)
+
+        unknown_symbol_names = [symbol.name for symbol in unknown]
+
+        known_dict = {symbol.name: not symbol.negated for symbol in known}
+
+        # known symbols are inlined as constants, unknown symbols override them (the same as merging the dicts)
+        constants = {
+            name: value
+            for name, value in known_dict.items()
+            if name not in unknown_symbol_names
+        }
+
+        # each partition fixes the highest symbols so the rest fill a chunk
+        partition_bits = max(0, n - self.get_chunk_bits())
+
+        # small tables aren't worth starting the pool for
+        if partition_bits == 0:
+            valid_values = super().find_valid_values(unknown, known, sentences)
+
+            if mode == EnumerationMode.COUNT:
+                yield sum(1 for _ in valid_values)
+            elif mode == EnumerationMode.FIRST:
+                values = next(valid_values, None)
+                yield [] if values is None else [values]
+            else:
+                yield list(valid_values)
+
+            return
+
+        with ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=init_worker,
+            initargs=(sentences, unknown_symbol_names, constants, partition_bits),
+        ) as executor:
+            # only keep a few partitions queued so we don't create millions of futures
+            max_pending = self.workers * 4
+
+            partitions = iter(range(2**partition_bits))
+            pending = set()
+
+            try:
+                while True:
+                    for partition in partitions:
+                        pending.add(executor.submit(check_partition, partition, mode))
+
+                        if len(pending) >= max_pending:
+                            break
+
+                    if len(pending) == 0:
+                        return
+
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+
+                    for future in done:
+                        yield future.result()
+            finally:
+                # stopping early (eg. at the first model) cancels the partitions that haven't started
+                for future in pending:
+                    future.cancel()
+
+    def find_valid_models(
+        self, unknown: list[Literal], known: list[Literal], sentences: list[Sentence]
+    ):
+        unknown_symbol_names = [symbol.name for symbol in unknown]
+
+        known_dict = {symbol.name: not symbol.negated for symbol in known}
+
+        # only look for one model in each partition if we stop at the first
+        mode = (
+            EnumerationMode.FIRST
+            if self.mode == EnumerationMode.FIRST
+            else EnumerationMode.ALL
+        )
+
+        for partition_values in self.find_valid_values(unknown, known, sentences, mode):
+            for values in partition_values:
+                model_values = known_dict.copy()
+                model_values.update(zip(unknown_symbol_names, values))
+
+                yield Model(model_values)
+
+    def count_valid_models(
+        self, unknown: list[Literal], known: list[Literal], sentences: list[Sentence]
+    ) -> int:
+        return sum(
+            self.find_valid_values(unknown, known, sentences, EnumerationMode.COUNT)
+        )
@@ -0,0 +1,301 @@
+import heapq
+
+from src.cnf_knowledge_base import CNFKnowledgeBase
+from src.enumeration_mode import EnumerationMode
+from src.inference_algorithm import InferenceAlgorithm
+from src.query import Query
+from src.result.truth_table_checking_result import TruthTableCheckingResult
+
+
+# Exact model counting (#SAT), gives the same count as truth table checking without listing the models
+# it is DPLL that counts both branches instead of stopping at the first model, with
+# - unit propagation, the symbols it assigns only have one value so they don't change the count
+# - symbols that are no longer in any clause can be either value so they double the count
+# - clauses that don't share any symbols are split into components that are counted separately
+#   and multiplied, which is what stops the count being exponential in the number of symbols
+# - the count of each component is cached by its clauses because the same components come up in many branches
+# - symbols are chosen in the reverse of a min degree elimination order, so the symbols that separate the
+#   clauses into parts are chosen first and the parts become components sooner
+# the search uses an explicit stack of generators instead of recursion so it isn't limited by the recursion limit
+class SharpSAT(InferenceAlgorithm):
+
+    def __init__(self):
+        super().__init__("SHARPSAT")
+
+        # count of each component by its clauses, only kept for one run
+        self.cache: dict[frozenset, int] = {}
+
+        # position of each symbol in the elimination order, the symbol with the highest rank is chosen first
+        self.ranks: dict[int, int] = {}
+
+        # components counted and counts found in the cache in the last run
+        self.components = 0
+        self.cache_hits = 0
+
+    def set_enumeration_mode(self, mode: EnumerationMode, consumer=None):
+        # the models are always only counted
+        if mode != EnumerationMode.COUNT:
+            super().set_enumeration_mode(mode, consumer)
+
+    def run(
+        self, knowledge_base: CNFKnowledgeBase, query: Query = None
+    ) -> TruthTableCheckingResult:
+        # without a query the models of the knowledge base are counted eg. a DIMACS file
+        self.components = 0
+        self.cache_hits = 0
+
+        if query is not None:
+            # if query symbol not in knowledge base then it can't have any models
+            for literal in query.sentence.get_symbols():
+                if literal.name not in knowledge_base.symbols:
+                    return self.get_result(0)
+
+            # add the query cnf to a copy so the knowledge base can be reused
+            knowledge_base = knowledge_base.copy()
+            knowledge_base.add_sentence(query.sentence)
+
+        database = knowledge_base.database
+
+        # every symbol is counted, auxiliary symbols from the tseitin conversion only have one value
+        # in each model of the other symbols so they don't change the count
+        clauses = [tuple(clause) for clause in database]
+
+        self.cache = {}
+        self.ranks = self.get_elimination_ranks(clauses)
+
+        number_of_models = self.count(clauses, database.get_number_of_symbols())
+
+        self.components = len(self.cache)
+
+        # the cache can be very big
+        self.cache = {}
+        self.ranks = {}
+
+        return self.get_result(number_of_models)
+
+    def get_counters(self) -> dict[str, int]:
+        return {"components": self.components, "cache_hits": self.cache_hits}
+
+    def get_result(self, number_of_models: int) -> TruthTableCheckingResult:
+        return TruthTableCheckingResult(
+            [], number_of_models > 0, number_of_models, algorithm_name=self.name
+        )
+
+    def count(self, clauses: list[tuple], number_of_symbols: int) -> int:
+        # runs the generators, each one yields the generators of the counts it needs
+        # and is sent back their results, a finished generator returns its own count
+        stack = [self.count_clauses(clauses, number_of_symbols)]
+        result = None
+
+        while len(stack) > 0:
+            try:
+                child = stack[-1].send(result)
+            except StopIteration as stop:
+                stack.pop()
+                result = stop.value
+                continue
+
+            stack.append(child)
+            result = None
+
+        return result
+
+    def count_clauses(self, clauses: list[tuple], number_of_symbols: int):
+        # counts the models of the clauses over number_of_symbols symbols, which include all the symbols in them
+        clauses, number_of_assigned = self.propagate_units(clauses)
+
+        # there was a conflict
+        if clauses is None:
+            return 0
+
+        components = self.get_components(clauses)
+
+        # symbols that aren't in any clause anymore can be true or false
+        number_of_free = number_of_symbols - number_of_assigned
+
+        for component, symbols in components:
+            number_of_free -= len(symbols)
+
+        number_of_models = 2**number_of_free
+
+        for component, symbols in components:
+            component_models = self.cache.get(component)
+
+            if component_models is None:
+                component_models = yield self.count_component(component, symbols)
+
+                self.cache[component] = component_models
+            else:
+                self.cache_hits += 1
+
+            number_of_models *= component_models
+
+            # no need to count the other components
+            if number_of_models == 0:
+                break
+
+        return number_of_models
+
+    def count_component(self, component: frozenset, symbols: set[int]):
+        symbol = max(symbols, key=self.ranks.__getitem__)
+
+        # count the models with the symbol set to true then false
+        number_of_symbols = len(symbols) - 1
+
+        true_models = yield self.count_clauses(
+            self.simplify(component, symbol), number_of_symbols
+        )
+
+        false_models = yield self.count_clauses(
+            self.simplify(component, -symbol), number_of_symbols
+        )
+
+        return true_models + false_models
+
+    @staticmethod
+    def get_elimination_ranks(clauses: list[tuple]) -> dict[int, int]:
+        # eliminates the symbols one at a time, always the one with the fewest neighbours
+        # (symbols that share a clause with it), and connects its neighbours to each other
+        # the last symbols to be eliminated are the ones that connect the rest of the clauses
+        neighbours: dict[int, set[int]] = {}
+
+        for clause in clauses:
+            symbols = [abs(literal) for literal in clause]
+
+            for symbol in symbols:
+                neighbours.setdefault(symbol, set()).update(symbols)
+
+        for symbol, others in neighbours.items():
+            others.discard(symbol)
+
+        # the smallest symbol is eliminated first if there is a tie so the order is always the same
+        # symbols are pushed again when their number of neighbours changes and old entries are skipped
+        heap = [(len(others), symbol) for symbol, others in neighbours.items()]
+        heapq.heapify(heap)
+
+        ranks = {}
+
+        while len(heap) > 0:
+            degree, symbol = heapq.heappop(heap)
+
+            if symbol in ranks or degree != len(neighbours[symbol]):
+                continue
+
+            ranks[symbol] = len(ranks)
+
+            others = neighbours.pop(symbol)
+
+            for other in others:
+                other_neighbours = neighbours[other]
+                other_neighbours.discard(symbol)
+                other_neighbours.update(others)
+                other_neighbours.discard(other)
+
+                heapq.heappush(heap, (len(other_neighbours), other))
+
+        return ranks
+
+    @staticmethod
+    def propagate_units(clauses) -> tuple[list[tuple], int]:
+        # returns the clauses left after assigning every unit clause and the number of symbols that were assigned
+        # the clauses are None if there was a conflict
+        number_of_assigned = 0
+
+        # an empty clause can never be satisfied
+        if any(len(clause) == 0 for clause in clauses):
+            return None, number_of_assigned
+
+        while True:
+            units = {clause[0] for clause in clauses if len(clause) == 1}
+
+            if len(units) == 0:
+                return clauses, number_of_assigned
+
+            # a symbol can't be true and false
+            if any(-literal in units for literal in units):
+                return None, number_of_assigned
+
+            number_of_assigned += len(units)
+
+            simplified = []
+
+            for clause in clauses:
+                # satisfied by one of the units
+                if any(literal in units for literal in clause):
+                    continue
+
+                clause = tuple(literal for literal in clause if -literal not in units)
+
+                # every literal is false
+                if len(clause) == 0:
+                    return None, number_of_assigned
+
+                simplified.append(clause)
+
+            clauses = simplified
+
+    @staticmethod
+    def get_components(clauses: list[tuple]) -> list[tuple[frozenset, set[int]]]:
+        # splits the clauses into groups that don't share any symbols, with the symbols of each group
+        # union find over the symbols, each symbol points towards the root of its group
+        parents = {}
+
+        def find(symbol: int) -> int:
+            root = symbol
+
+            while parents[root] != root:
+                root = parents[root]
+
+            # point everything on the path straight at the root
+            while parents[symbol] != root:
+                parents[symbol], symbol = root, parents[symbol]
+
+            return root
+
+        for clause in clauses:
+            first = abs(clause[0])
+
+            if first not in parents:
+                parents[first] = first
+
+            root = find(first)
+
+            for literal in clause[1:]:
+                symbol = abs(literal)
+
+                if symbol not in parents:
+                    parents[symbol] = root
+                    continue
+
+                other = find(symbol)
+
+                if other != root:
+                    parents[other] = root
+
+        # group the clauses and symbols by their root
+        groups: dict[int, tuple[list[tuple], set[int]]] = {}
+
+        for symbol in parents:
+            root = find(symbol)
+
+            if root not in groups:
+                groups[root] = ([], set())
+
+            groups[root][1].add(symbol)
+
+        for clause in clauses:
+            groups[find(abs(clause[0]))][0].append(clause)
+
+        # duplicate clauses don't change the count so the clauses can be a set, which is also the cache key
+        return [(frozenset(group), symbols) for group, symbols in groups.values()]
+
+    @staticmethod
+    def simplify(clauses, literal: int) -> list[tuple]:
+        # the literal is true so remove the clauses it satisfies and its negation from the others
+        negation = -literal
+
+        return [
+            tuple(other for other in clause if other != negation)
+            for clause in clauses
+            if literal not in clause
+        ]
@@ -1,20 +1,116 @@
+import itertools
+
+from src.enumeration_mode import EnumerationMode
 from src.inference_algorithm import InferenceAlgorithm
 from src.knowledge_base import KnowledgeBase
 from src.model import Model
 from src.query import Query
 from src.result.chaining_result import ChainingResult
 from src.result.truth_table_checking_result import TruthTableCheckingResult
+from src.syntax.compiler import SentenceCompiler
 from src.syntax.literal import Literal
+from src.syntax.sentence import Sentence
 
 
 class TruthTableChecking(InferenceAlgorithm):
     def __init__(self):
         super().__init__("TT")
 
+        # by default every valid model is kept
+        self.mode = EnumerationMode.ALL
+
+        # called with each valid model when streaming
+        self.consumer = None
+
+        # rows in the truth table and valid models found in the last run
+        self.rows = 0
+        self.models_enumerated = 0
+
+    def set_enumeration_mode(self, mode: EnumerationMode, consumer=None):
+        if mode == EnumerationMode.STREAM and consumer is None:
+            raise ValueError("Streaming models requires a consumer")
+
+        self.mode = mode
+        self.consumer = consumer
+
     def run(self, knowledge_base: KnowledgeBase, query: Query) -> ChainingResult:
         # sentence of the query to check
         query_sentence = query.sentence
 
+        # split the symbols into the ones we need to enumerate and the known facts
+        symbols = self.get_unknown_and_known_symbols(knowledge_base, query)
+
+        self.rows = 0
+        self.models_enumerated = 0
+
+        # query can only be valid if the kb could possibly entail it
+        if symbols is None:
+            return TruthTableCheckingResult([], False)
+
+        unknown_symbols, facts = symbols
+
+        self.rows = 2 ** len(unknown_symbols)
+
+        # add the query sentence to the knowledge base to verify the models
+        all_sentences = knowledge_base.sentences + [query_sentence]
+
+        # count without creating any models
+        if self.mode == EnumerationMode.COUNT:
+            number_of_models = self.count_valid_models(
+                unknown_symbols, facts, all_sentences
+            )
+
+            self.models_enumerated = number_of_models
+
+            return TruthTableCheckingResult([], number_of_models > 0, number_of_models)
+
+        # the valid models are generated lazily so we can stop or stream at any point
+        valid_models = self.find_valid_models(unknown_symbols, facts, all_sentences)
+
+        # stop at the first valid model, we don't know how many others there are
+        if self.mode == EnumerationMode.FIRST:
+            witness = next(valid_models, None)
+
+            # no witness means we checked every row and there are no models
+            if witness is None:
+                return TruthTableCheckingResult([], False)
+
+            self.models_enumerated = 1
+
+            return TruthTableCheckingResult([witness], True, is_complete=False)
+
+        # pass each model on without keeping it
+        if self.mode == EnumerationMode.STREAM:
+            number_of_models = 0
+
+            for model in valid_models:
+                self.consumer(model)
+                number_of_models += 1
+
+            self.models_enumerated = number_of_models
+
+            return TruthTableCheckingResult([], number_of_models > 0, number_of_models)
+
+        # get the valid models, where all sentences are true
+        valid_models = list(valid_models)
+
+        self.models_enumerated = len(valid_models)
+
+        # if there are any valid models then the query is true
+        found = len(valid_models) > 0
+
+        return TruthTableCheckingResult(valid_models, found)
+
+    def get_counters(self) -> dict[str, int]:
+        # with --first the search stops before the last row
+        return {"rows": self.rows, "models": self.models_enumerated}
+
+    def get_unknown_and_known_symbols(
+        self, knowledge_base: KnowledgeBase, query: Query
+    ) -> tuple[list[Literal], list[Literal]]:
+        # returns None if the query can't be entailed, otherwise the unknown symbols and the known facts
+        query_sentence = query.sentence
+
         # get all the symbols in the kb
         symbols = list(knowledge_base.propositional_symbols_excluding_query)
 
@@ -32,7 +128,7 @@ class TruthTableChecking(InferenceAlgorithm):
 
         # query can only be valid if the kb could possibly entail it
         if any([symbol_name not in symbol_names for symbol_name in query_symbol_names]):
-            return TruthTableCheckingResult([], False)
+            return None
 
         # get all the symbols that we need to check which aren't in the facts
         unknown_symbols = [symbol for symbol in symbols if symbol not in facts]
@@ -43,77 +139,50 @@ class TruthTableChecking(InferenceAlgorithm):
         # get unique so there are no needless duplicates
         unknown_symbols = list(set(unknown_symbols))
 
-        # find all possible models regardless of whether they are valid or not
-        unvalidated_models = self.find_all_models(unknown_symbols, facts)
-
-        # add the query sentence to the knowledge base to verify the models
-        all_sentences = knowledge_base.sentences + [query_sentence]
-
-        # get the valid models, where all sentences are true
-        valid_models = [
-            model
-            for model in unvalidated_models
-            if all([sentence.evaluate(model) for sentence in all_sentences])
-        ]
-
-        # if there are any valid models then the query is true
-        found = len(valid_models) > 0
-
-        return TruthTableCheckingResult(valid_models, found)
+        return unknown_symbols, facts
 
-    def find_all_models(
-        self, unknown: list[Literal], known: list[Literal]
-    ) -> list[Model]:
-        # get all permutations of the unknown symbols
-        permutations = self.get_permutations(unknown)
+    def find_valid_values(
+        self, unknown: list[Literal], known: list[Literal], sentences: list[Sentence]
+    ):
+        # unknown symbol names in the order of the values passed to the compiled sentences
+        unknown_symbol_names = [symbol.name for symbol in unknown]
 
         # convert known list to dict
         known_dict = {symbol.name: not symbol.negated for symbol in known}
 
-        def merge_dicts(dict1: dict, dict2: dict) -> dict:
-            merged = dict1.copy()
-            merged.update(dict2)
-            return merged
-
-        # create a model for each permutation
-        # eg. known: { "A": TRUE, "B": TRUE }, unknown: { "C": TRUE/FALSE, "D": TRUE/FALSE }
-        # permutations: [{ "C": TRUE, "D": TRUE }, { "C": TRUE, "D": FALSE }, { "C": FALSE, "D": TRUE }, { "C": FALSE, "D": FALSE }]
-
-        # merge them eg. { "A": TRUE, "B": TRUE, "C": TRUE, "D": TRUE }
-        models = [
-            Model(merge_dicts(known_dict, permutation)) for permutation in permutations
-        ]
-
-        return models
-
-    def get_permutations(self, unknown: list[Literal]) -> list[dict[str, bool]]:
-        # get the number of unknown symbols
-        n = len(unknown)
-
-        # get the number of permutations as 2^n because each symbol can be true or false
-        num_permutations = 2**n
-
-        # get all permutations
-        permutations = [
-            self.get_permutation(i, unknown) for i in range(num_permutations)
-        ]
+        # known symbols are inlined as constants, unknown symbols override them (the same as merging the dicts)
+        constants = {
+            name: value
+            for name, value in known_dict.items()
+            if name not in unknown_symbol_names
+        }
 
-        return permutations
+        # compile the sentences once so each row doesn't need to walk the sentences
+        evaluate = SentenceCompiler.compile_sentences(
+            sentences,
+            {name: i for i, name in enumerate(unknown_symbol_names)},
+            constants,
+        )
 
-    def get_permutation(self, i: int, unknown: list[Literal]) -> dict[str, bool]:
-        # get the binary representation of the number, skip first two characters "0b" eg. "0b1001" -> "1001"
-        binary = bin(i)[2:]
+        # the first unknown symbol changes slowest eg. a, b -> (F, F), (F, T), (T, F), (T, T)
+        # only the values of the valid rows are yielded
+        return filter(evaluate, itertools.product((False, True), repeat=len(unknown)))
 
-        # unknown symbol names
+    def find_valid_models(
+        self, unknown: list[Literal], known: list[Literal], sentences: list[Sentence]
+    ):
         unknown_symbol_names = [symbol.name for symbol in unknown]
 
-        # pad the binary number with 0s
-        binary = binary.zfill(len(unknown_symbol_names))
+        known_dict = {symbol.name: not symbol.negated for symbol in known}
 
-        # create the permutation converting the binary string to a dict
-        # eg. "1001" and ["A", "B", "C", "D"] -> {"A": True, "B": False, "C": False, "D": True}
-        permutation = {
-            symbol: value == "1" for symbol, value in zip(unknown_symbol_names, binary)
-        }
+        # only the valid rows are turned into models
+        for values in self.find_valid_values(unknown, known, sentences):
+            model_values = known_dict.copy()
+            model_values.update(zip(unknown_symbol_names, values))
+
+            yield Model(model_values)
 
-        return permutation
+    def count_valid_models(
+        self, unknown: list[Literal], known: list[Literal], sentences: list[Sentence]
+    ) -> int:
+        return sum(1 for _ in self.find_valid_values(unknown, known, sentences))
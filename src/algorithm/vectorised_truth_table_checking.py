@@ -0,0 +1,174 @@
+from src.algorithm.truth_table_checking import TruthTableChecking
+from src.knowledge_base import KnowledgeBase
+from src.model import Model
+from src.query import Query
+from src.result.truth_table_checking_result import TruthTableCheckingResult
+from src.syntax.compiler import SentenceCompiler
+from src.syntax.literal import Literal
+from src.syntax.sentence import Sentence
+
+# numpy is optional, only this algorithm needs it
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+# bit patterns for the lowest 6 symbols of a chunk, where bit b of a word is row b of the word
+# eg. the lowest symbol alternates false, true, false, true... so its pattern is 0b...1010
+LOW_BIT_PATTERNS = [
+    0xAAAAAAAAAAAAAAAA,
+    0xCCCCCCCCCCCCCCCC,
+    0xF0F0F0F0F0F0F0F0,
+    0xFF00FF00FF00FF00,
+    0xFFFF0000FFFF0000,
+    0xFFFFFFFF00000000,
+]
+
+# number of rows packed into each word
+WORD_BITS = 64
+
+
+# Truth table checking that evaluates a whole chunk of the truth table at once
+# each symbol is a column of packed bits (one bit per row) so a sentence is evaluated with bitwise operators
+class VectorisedTruthTableChecking(TruthTableChecking):
+    def __init__(self, chunk_bits: int = 16):
+        super().__init__()
+        self.name = "TT-VEC"
+
+        # each chunk covers 2^chunk_bits rows of the truth table
+        self.chunk_bits = chunk_bits
+
+    def run(
+        self, knowledge_base: KnowledgeBase, query: Query
+    ) -> TruthTableCheckingResult:
+        if np is None:
+            raise ImportError("The TT-VEC algorithm requires numpy to be installed")
+
+        return super().run(knowledge_base, query)
+
+    def find_valid_chunks(
+        self, unknown: list[Literal], known: list[Literal], sentences: list[Sentence]
+    ):
+        # yields the chunk number and the packed valid rows of every chunk that has a valid row
+        # number of unknown symbols
+        n = len(unknown)
+
+        # the lowest bits of the row number vary within a chunk, the highest bits are fixed per chunk
+        chunk_bits = min(n, self.chunk_bits)
+
+        # number of rows and packed words in a chunk
+        rows_per_chunk = 2**chunk_bits
+        words_per_chunk = max(1, rows_per_chunk // WORD_BITS)
+
+        all_ones = np.uint64(0xFFFFFFFFFFFFFFFF)
+        all_zeros = np.uint64(0)
+
+        # if there are fewer than 64 rows then the unused bits of the only word must be ignored
+        row_mask = (
+            all_ones
+            if rows_per_chunk >= WORD_BITS
+            else np.uint64((1 << rows_per_chunk) - 1)
+        )
+
+        # the first unknown symbol is the most significant bit (the same order as TruthTableChecking)
+        unknown_symbol_names = [symbol.name for symbol in unknown]
+        bit_positions = {name: n - 1 - i for i, name in enumerate(unknown_symbol_names)}
+
+        # known symbols have the same value for every row
+        known_dict = {symbol.name: not symbol.negated for symbol in known}
+
+        # known symbols are inlined as constants, unknown symbols override them (the same as merging the dicts)
+        constants = {
+            name: value
+            for name, value in known_dict.items()
+            if name not in bit_positions
+        }
+
+        # compile the sentences once into bitwise operations over the columns
+        evaluate = SentenceCompiler.compile_sentences(
+            sentences,
+            {name: i for i, name in enumerate(unknown_symbol_names)},
+            constants,
+            vectorised=True,
+            namespace={"ONES": all_ones, "ZEROS": all_zeros},
+        )
+
+        # columns for the symbols that vary inside a chunk can be built once
+        word_indexes = np.arange(words_per_chunk, dtype=np.uint64)
+
+        columns = [None] * n
+
+        for i, name in enumerate(unknown_symbol_names):
+            bit = bit_positions[name]
+
+            if bit >= chunk_bits:
+                continue
+
+            if bit < len(LOW_BIT_PATTERNS):
+                columns[i] = np.full(
+                    words_per_chunk, LOW_BIT_PATTERNS[bit], dtype=np.uint64
+                )
+            else:
+                # a whole word is either true or false depending on the word index
+                is_set = (
+                    word_indexes >> np.uint64(bit - len(LOW_BIT_PATTERNS))
+                ) & np.uint64(1)
+                columns[i] = np.where(is_set == 1, all_ones, all_zeros)
+
+        # each chunk fixes the highest bits of the row number
+        for chunk in range(2 ** (n - chunk_bits)):
+            for i, name in enumerate(unknown_symbol_names):
+                bit = bit_positions[name]
+
+                if bit >= chunk_bits:
+                    is_set = (chunk >> (bit - chunk_bits)) & 1
+                    columns[i] = all_ones if is_set else all_zeros
+
+            # start with every row valid and remove the rows that fail a sentence
+            valid = evaluate(
+                columns, np.full(words_per_chunk, row_mask, dtype=np.uint64)
+            )
+
+            if valid.any():
+                yield chunk, valid
+
+    def get_rows_per_chunk(self, unknown: list[Literal]) -> int:
+        return 2 ** min(len(unknown), self.chunk_bits)
+
+    def find_valid_models(
+        self, unknown: list[Literal], known: list[Literal], sentences: list[Sentence]
+    ):
+        n = len(unknown)
+
+        rows_per_chunk = self.get_rows_per_chunk(unknown)
+        chunk_bits = rows_per_chunk.bit_length() - 1
+
+        # the first unknown symbol is the most significant bit
+        bit_positions = {symbol.name: n - 1 - i for i, symbol in enumerate(unknown)}
+
+        known_dict = {symbol.name: not symbol.negated for symbol in known}
+
+        for chunk, valid in self.find_valid_chunks(unknown, known, sentences):
+            # only the surviving rows are turned into models
+            bits = np.unpackbits(valid.astype("<u8").view(np.uint8), bitorder="little")
+            rows = np.flatnonzero(bits[:rows_per_chunk])
+
+            for row in rows:
+                row_number = (chunk << chunk_bits) | int(row)
+
+                values = known_dict.copy()
+
+                for name, bit in bit_positions.items():
+                    values[name] = (row_number >> bit) & 1 == 1
+
+                yield Model(values)
+
+    def count_valid_models(
+        self, unknown: list[Literal], known: list[Literal], sentences: list[Sentence]
+    ) -> int:
+        # the unused bits of a small chunk are already masked out so every set bit is a valid row
+        return sum(
+            int(np.unpackbits(valid.view(np.uint8)).sum())
+            for _, valid in self.find_valid_chunks(unknown, known, sentences)
+        )
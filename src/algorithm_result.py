@@ -6,6 +6,9 @@ class AlgorithmResult:
     def __init__(self, algorithm_name: str):
         self.algorithm_name = algorithm_name
 
+        # where the time went, only set when the runner is asked to measure it (see Instrumentation)
+        self.instrumentation = None
+
     def __str__(self) -> str:
         raise NotImplementedError("__str__ method must be implemented by the subclass.")
 
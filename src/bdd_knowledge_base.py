@@ -0,0 +1,334 @@
+from contextlib import contextmanager
+
+from src.binary_decision_diagram import (
+    FALSE,
+    MAX_MEMORY,
+    MAX_NODES,
+    TRUE,
+    BinaryDecisionDiagram,
+    BudgetExceededError,
+)
+from src.knowledge_base import KnowledgeBase
+from src.model import Model
+from src.syntax.atom import BoolAtom
+from src.syntax.sentence import AtomicSentence, Sentence
+
+# most number of times the symbols are moved when ordering them
+FORCE_ITERATIONS = 20
+
+# the nodes of answered queries are removed once the diagram uses this many times the memory it did
+# after the last garbage collection, so collecting takes about as long as making the nodes did
+GARBAGE_COLLECTION_GROWTH = 2
+
+
+# Knowledge base compiled into a binary decision diagram once so each query only needs
+# to be compiled and combined with it, see BinaryDecisionDiagram
+# the sentences and symbols are shared with the knowledge base it was compiled from
+# if the diagram goes over its budget it is given up on and is_compiled is false
+class BDDKnowledgeBase(KnowledgeBase):
+    def __init__(
+        self,
+        knowledge_base: KnowledgeBase,
+        max_nodes: int = MAX_NODES,
+        max_memory: int = MAX_MEMORY,
+    ):
+        super().__init__(
+            knowledge_base.sentences,
+            knowledge_base.propositional_symbols,
+            knowledge_base.symbol_table,
+        )
+
+        # shared so sentences told to the knowledge base are part of this one too
+        self.propositional_symbols_excluding_query = (
+            knowledge_base.propositional_symbols_excluding_query
+        )
+
+        self.diagram = BinaryDecisionDiagram(max_nodes, max_memory)
+
+        # node of the conjunction of all the sentences
+        self.root = TRUE
+
+        # estimated memory of the diagram after the last garbage collection
+        self.collected_memory = 0
+
+        self.compile_sentences(knowledge_base.sentences)
+
+    @classmethod
+    def from_generic_knowledge_base(
+        cls,
+        knowledge_base: KnowledgeBase,
+        max_nodes: int = MAX_NODES,
+        max_memory: int = MAX_MEMORY,
+    ) -> "BDDKnowledgeBase":
+        return cls(knowledge_base, max_nodes, max_memory)
+
+    def is_compiled(self) -> bool:
+        return self.diagram is not None
+
+    def compile_sentences(self, sentences: list[Sentence]):
+        # adds the sentences to the diagram, they must already be in the sentences of the knowledge base
+        if not self.is_compiled():
+            return
+
+        # new symbols are tested after the existing ones
+        for name in self.get_variable_order(sentences):
+            self.diagram.add_variable(name)
+
+        try:
+            nodes = [self.diagram.compile(sentence) for sentence in sentences]
+
+            # neighbouring sentences are joined in pairs, then pairs of pairs and so on
+            # so each conjunction is between diagrams of about the same size, which is much faster
+            # than adding one sentence at a time to a diagram that keeps growing
+            while len(nodes) > 1:
+                nodes = [
+                    (
+                        self.diagram.conjoin(nodes[i], nodes[i + 1])
+                        if i + 1 < len(nodes)
+                        else nodes[i]
+                    )
+                    for i in range(0, len(nodes), 2)
+                ]
+
+            if len(nodes) > 0:
+                self.root = self.diagram.conjoin(self.root, nodes[0])
+
+            # the nodes of each sentence on its own aren't needed anymore
+            self.collect_garbage(True)
+        except BudgetExceededError:
+            # the nodes are dropped straight away because they can use a lot of memory
+            self.diagram = None
+            self.root = None
+
+    @staticmethod
+    def get_variable_order(sentences: list[Sentence]) -> list[str]:
+        # the size of the diagram depends a lot on the order, it is small when symbols that are used
+        # together are close eg. a chain a => b; b => c; c => d
+        # symbols are neighbours if they are in the same sentence, the first order is a breadth first search
+        # from a symbol at the edge of the graph (Cuthill-McKee) so neighbours are close, then each symbol
+        # is moved towards the centre of its sentences (FORCE) while that makes the sentences shorter
+        sentence_names = [
+            BDDKnowledgeBase.get_symbol_names(sentence) for sentence in sentences
+        ]
+
+        # ties are broken by the order the symbols first appear
+        appearance = {}
+
+        for names in sentence_names:
+            for name in names:
+                appearance.setdefault(name, len(appearance))
+
+        neighbours = {name: set() for name in appearance}
+
+        for names in sentence_names:
+            for name in names:
+                neighbours[name].update(names)
+
+        for name, others in neighbours.items():
+            others.discard(name)
+
+        order = []
+        visited = set()
+
+        # each group of connected symbols is searched separately
+        for name in appearance:
+            if name in visited:
+                continue
+
+            start = BDDKnowledgeBase.get_peripheral_symbol(name, neighbours, appearance)
+
+            order.extend(
+                BDDKnowledgeBase.breadth_first_search(start, neighbours, appearance)
+            )
+
+            visited.update(order[len(visited) :])
+
+        return BDDKnowledgeBase.improve_order(order, sentence_names)
+
+    @staticmethod
+    def breadth_first_search(
+        start: str, neighbours: dict[str, set[str]], appearance: dict[str, int]
+    ) -> list[str]:
+        # symbols connected to the start in the order they are found
+        # the neighbours of each symbol are visited from the one with the fewest neighbours
+        found = {start}
+        order = [start]
+        i = 0
+
+        while i < len(order):
+            name = order[i]
+            i += 1
+
+            new = [other for other in neighbours[name] if other not in found]
+            new.sort(key=lambda other: (len(neighbours[other]), appearance[other]))
+
+            found.update(new)
+            order.extend(new)
+
+        return order
+
+    @staticmethod
+    def get_peripheral_symbol(
+        start: str, neighbours: dict[str, set[str]], appearance: dict[str, int]
+    ) -> str:
+        # a symbol that is as far from the others as possible, found by moving to the furthest symbol
+        # from the current one while that symbol is further from everything
+        depths = BDDKnowledgeBase.get_depths(start, neighbours)
+        eccentricity = max(depths.values())
+
+        while True:
+            # the furthest symbol with the fewest neighbours
+            candidate = min(
+                (name for name, depth in depths.items() if depth == eccentricity),
+                key=lambda name: (len(neighbours[name]), appearance[name]),
+            )
+
+            candidate_depths = BDDKnowledgeBase.get_depths(candidate, neighbours)
+            candidate_eccentricity = max(candidate_depths.values())
+
+            if candidate_eccentricity <= eccentricity:
+                return start
+
+            start = candidate
+            depths = candidate_depths
+            eccentricity = candidate_eccentricity
+
+    @staticmethod
+    def get_depths(start: str, neighbours: dict[str, set[str]]) -> dict[str, int]:
+        # distance of each connected symbol from the start
+        depths = {start: 0}
+        queue = [start]
+        i = 0
+
+        while i < len(queue):
+            name = queue[i]
+            i += 1
+
+            for other in neighbours[name]:
+                if other not in depths:
+                    depths[other] = depths[name] + 1
+                    queue.append(other)
+
+        return depths
+
+    @staticmethod
+    def improve_order(order: list[str], sentence_names: list[list[str]]) -> list[str]:
+        # moves each symbol to the average centre of its sentences (FORCE)
+        # sentences with one symbol don't pull anything
+        sentence_names = [names for names in sentence_names if len(names) > 1]
+
+        best_order = order
+        best_span = None
+
+        for _ in range(FORCE_ITERATIONS):
+            positions = {name: i for i, name in enumerate(order)}
+
+            # total length of the sentences in the order
+            span = sum(
+                max(positions[name] for name in names)
+                - min(positions[name] for name in names)
+                for names in sentence_names
+            )
+
+            if best_span is not None and span >= best_span:
+                break
+
+            best_span = span
+            best_order = order
+
+            totals = dict.fromkeys(order, 0.0)
+            counts = dict.fromkeys(order, 0)
+
+            for names in sentence_names:
+                centre = sum(positions[name] for name in names) / len(names)
+
+                for name in names:
+                    totals[name] += centre
+                    counts[name] += 1
+
+            # symbols without any sentences stay where they are, the sort is stable so ties keep their order
+            order = sorted(
+                order,
+                key=lambda name: (
+                    totals[name] / counts[name] if counts[name] > 0 else positions[name]
+                ),
+            )
+
+        return best_order
+
+    @staticmethod
+    def get_symbol_names(sentence: Sentence) -> list[str]:
+        # names of the symbols in the order they first appear from left to right
+        names = {}
+        stack = [sentence]
+
+        while len(stack) > 0:
+            sentence = stack.pop()
+
+            if isinstance(sentence, AtomicSentence):
+                if not isinstance(sentence.atom, BoolAtom):
+                    names[sentence.atom.name] = None
+
+                continue
+
+            stack.append(sentence.rhs)
+
+            if sentence.lhs is not None:
+                stack.append(sentence.lhs)
+
+        return list(names)
+
+    def collect_garbage(self, force: bool = False):
+        # removes the nodes that aren't part of the knowledge base, eg. the nodes of queries that were answered
+        # without force only once the diagram has grown enough since the last time, see GARBAGE_COLLECTION_GROWTH
+        if not self.is_compiled():
+            return
+
+        memory = self.diagram.get_memory_usage()
+
+        if not force and memory < GARBAGE_COLLECTION_GROWTH * self.collected_memory:
+            return
+
+        (self.root,) = self.diagram.collect_garbage([self.root])
+        self.collected_memory = self.diagram.get_memory_usage()
+
+    @contextmanager
+    def answering_query(self):
+        # nodes made for a query are only needed until it is answered
+        # a query that went over budget leaves the diagram full so it is always collected
+        try:
+            yield
+        except BudgetExceededError:
+            self.collect_garbage(True)
+            raise
+        finally:
+            self.collect_garbage()
+
+    def conjoin_query(self, query: Sentence) -> int:
+        # node of the knowledge base and the query, raises BudgetExceededError if it is too big
+        # the query symbols must all be in the knowledge base
+        # the node is only valid until the garbage is collected, see answering_query
+        return self.diagram.conjoin(self.root, self.diagram.compile(query))
+
+    def is_satisfiable(self, query: Sentence = None) -> bool:
+        with self.answering_query():
+            root = self.root if query is None else self.conjoin_query(query)
+
+            return root != FALSE
+
+    def entails(self, query: Sentence) -> bool:
+        # the query is true in every model if the knowledge base and the negated query is unsatisfiable
+        with self.answering_query():
+            negated = self.diagram.negate(self.diagram.compile(query))
+
+            return self.diagram.conjoin(self.root, negated) == FALSE
+
+    def count_models(self, root: int) -> int:
+        return self.diagram.count_models(root)
+
+    def get_models(self, root: int):
+        # generator of the models of the node, over all the symbols of the knowledge base
+        names = self.diagram.variable_names
+
+        for values in self.diagram.get_models(root):
+            yield Model(dict(zip(names, values)))
@@ -0,0 +1,84 @@
+# status of a measurement
+OK = "ok"
+# the algorithm doesn't work on the knowledge base eg. FC on a knowledge base that isn't horn
+UNSUPPORTED = "unsupported"
+TIMEOUT = "timeout"
+ERROR = "error"
+# a smaller knowledge base of the same family didn't finish so this one wasn't run
+SKIPPED = "skipped"
+
+# columns of the csv file, in the same order as the fields
+FIELDS = [
+    "family",
+    "size",
+    "algorithm",
+    "status",
+    "parse_seconds",
+    "conversion_seconds",
+    "solve_seconds",
+    "total_seconds",
+    "result",
+]
+
+
+# Times of one algorithm on one generated knowledge base
+# parse is reading the file, conversion is building the horn, cnf or bdd knowledge base the algorithm
+# works on (0 for algorithms that work on the generic knowledge base) and solve is running the algorithm
+# result is the output line, or the error message when the status isn't ok
+class BenchmarkResult:
+    def __init__(
+        self,
+        family: str,
+        size: int,
+        algorithm: str,
+        status: str,
+        parse_seconds: float = None,
+        conversion_seconds: float = None,
+        solve_seconds: float = None,
+        result: str = "",
+    ):
+        self.family = family
+        self.size = size
+        self.algorithm = algorithm
+        self.status = status
+        self.parse_seconds = parse_seconds
+        self.conversion_seconds = conversion_seconds
+        self.solve_seconds = solve_seconds
+        self.result = result
+
+    @property
+    def total_seconds(self) -> float:
+        if self.status != OK:
+            return None
+
+        return self.parse_seconds + self.conversion_seconds + self.solve_seconds
+
+    def get_key(self) -> tuple[str, int, str]:
+        # results are matched with the baseline by this
+        return self.family, self.size, self.algorithm
+
+    def to_dict(self) -> dict:
+        return {field: getattr(self, field) for field in FIELDS}
+
+    @classmethod
+    def from_dict(cls, values: dict) -> "BenchmarkResult":
+        return cls(
+            values["family"],
+            int(values["size"]),
+            values["algorithm"],
+            values["status"],
+            values.get("parse_seconds"),
+            values.get("conversion_seconds"),
+            values.get("solve_seconds"),
+            values.get("result", ""),
+        )
+
+    def __str__(self):
+        if self.status != OK:
+            return f"{self.family} {self.size} {self.algorithm}: {self.status} {self.result}".rstrip()
+
+        return (
+            f"{self.family} {self.size} {self.algorithm}: {self.total_seconds:.3f}s "
+            f"(parse {self.parse_seconds:.3f}s, conversion {self.conversion_seconds:.3f}s, "
+            f"solve {self.solve_seconds:.3f}s) {self.result}"
+        )
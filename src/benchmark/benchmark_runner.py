@@ -0,0 +1,324 @@
+import csv
+import gc
+import json
+import multiprocessing
+import os
+import platform
+import signal
+import time
+import zlib
+
+from src.benchmark.benchmark_result import (
+    ERROR,
+    FIELDS,
+    OK,
+    SKIPPED,
+    TIMEOUT,
+    UNSUPPORTED,
+    BenchmarkResult,
+)
+from src.benchmark.knowledge_base_generator import KnowledgeBaseGenerator
+from src.file_parser import FileParser
+from src.inference_algorithm_factory import InferenceAlgorithmFactory
+from src.knowledge_base_session import KnowledgeBaseSession
+
+# each family generates a knowledge base of a given size, the sizes grow so the times give a scaling curve
+#   cnf-2.0 and cnf-4.26: random 3-cnf with that many clauses for each symbol, the size is the number of symbols
+#   horn: layers of 10 symbols, the size is the number of symbols
+#   nested: 4 sentences over 10 symbols, the size is how deep the brackets are nested
+#   biconditional: a chain of biconditionals, the size is the number of symbols
+FAMILIES = {
+    "cnf-2.0": (
+        lambda generator, size: generator.get_random_cnf(size, 2.0),
+        [8, 16, 32, 64, 128, 256],
+    ),
+    "cnf-4.26": (
+        lambda generator, size: generator.get_random_cnf(size, 4.26),
+        [8, 16, 32, 64, 128, 256],
+    ),
+    "horn": (
+        lambda generator, size: generator.get_layered_horn(size // 10),
+        [20, 40, 80, 160, 320, 570],
+    ),
+    "nested": (
+        lambda generator, size: generator.get_nested_sentences(size),
+        [4, 8, 16, 32, 64],
+    ),
+    "biconditional": (
+        lambda generator, size: generator.get_biconditional_chain(size),
+        [8, 16, 32, 64, 128, 256],
+    ),
+}
+
+# seconds that each algorithm gets for each knowledge base, including all of the repeats
+TIMEOUT_SECONDS = 10.0
+
+# each measurement is the fastest of this many runs
+REPEATS = 3
+
+# a result is a regression when it is this fraction slower than the baseline
+TOLERANCE = 0.25
+
+# and at least this many seconds slower, because tiny times are mostly noise
+MINIMUM_DIFFERENCE_SECONDS = 0.01
+
+
+def measure_algorithm(algorithm_name: str, file_path: str, repeats: int, connection):
+    # runs in its own process so it can be stopped when it takes too long
+    # with its own process group so the processes of parallel algorithms are stopped with it
+    if hasattr(os, "setsid"):
+        os.setsid()
+
+    try:
+        connection.send(measure(algorithm_name, file_path, repeats))
+    except Exception as error:
+        connection.send((ERROR, f"{type(error).__name__}: {error}"))
+    finally:
+        connection.close()
+
+
+def measure(algorithm_name: str, file_path: str, repeats: int) -> tuple:
+    algorithm = InferenceAlgorithmFactory.get_inference_algorithm_from_name(
+        algorithm_name
+    )
+
+    times = []
+
+    for _ in range(repeats):
+        # garbage from the last run isn't collected in the middle of this one
+        gc.collect()
+
+        start = time.perf_counter()
+        knowledge_base, query = FileParser.parse_kb_and_query(file_path)
+        parsed = time.perf_counter()
+
+        # a new session each time so the conversion is done again
+        session = KnowledgeBaseSession(knowledge_base)
+
+        try:
+            session.get_knowledge_base(algorithm)
+        except ValueError as error:
+            # the first argument is the message, the second is the sentence which can be huge
+            return UNSUPPORTED, str(error.args[0]) if error.args else ""
+
+        converted = time.perf_counter()
+        result = session.ask(query, algorithm)
+        solved = time.perf_counter()
+
+        times.append((parsed - start, converted - parsed, solved - converted))
+
+    # the fastest time of each step
+    parse_seconds, conversion_seconds, solve_seconds = (
+        min(step) for step in zip(*times)
+    )
+
+    return OK, parse_seconds, conversion_seconds, solve_seconds, str(result)
+
+
+# Runs every algorithm on knowledge bases of each family with growing sizes
+# the files are written to the directory so a slow case can be run again with iengine.py
+# once an algorithm doesn't finish a size (or doesn't work on the family) the bigger sizes of that family are skipped
+class BenchmarkRunner:
+    def __init__(
+        self,
+        directory: str,
+        families: list[str] = None,
+        algorithms: list[str] = None,
+        seed: int = 0,
+        timeout: float = TIMEOUT_SECONDS,
+        repeats: int = REPEATS,
+        max_size: int = None,
+    ):
+        self.directory = directory
+        self.families = families if families is not None else list(FAMILIES)
+        self.seed = seed
+        self.timeout = timeout
+        self.repeats = repeats
+        self.max_size = max_size
+
+        for family in self.families:
+            if family not in FAMILIES:
+                raise ValueError(
+                    f"Family with name {family} not found, valid families are: {list(FAMILIES)}"
+                )
+
+        if repeats < 1:
+            raise ValueError("Each measurement needs at least 1 repeat")
+
+        if algorithms is None:
+            # the test algorithm isn't a real algorithm
+            algorithms = [
+                name
+                for name in InferenceAlgorithmFactory.get_inference_algorithm_names()
+                if name != "TEST"
+            ]
+        else:
+            # checks the names
+            for name in algorithms:
+                InferenceAlgorithmFactory.get_inference_algorithm_from_name(name)
+
+        self.algorithms = algorithms
+
+    def get_sizes(self, family: str) -> list[int]:
+        sizes = FAMILIES[family][1]
+
+        if self.max_size is not None:
+            sizes = [size for size in sizes if size <= self.max_size]
+
+        return sizes
+
+    def write_file(self, family: str, size: int) -> str:
+        # each file gets its own generator so it doesn't depend on the other families and sizes
+        # crc32 instead of hash because strings hash differently in each process
+        generator = KnowledgeBaseGenerator(
+            zlib.crc32(f"{self.seed} {family} {size}".encode())
+        )
+        file_path = os.path.join(self.directory, f"{family}_{size}.txt")
+
+        with open(file_path, "w") as file:
+            file.write(FAMILIES[family][0](generator, size))
+
+        return file_path
+
+    def run(self, callback=None):
+        # yields the result of each algorithm on each file, callback is called with each result as well
+        os.makedirs(self.directory, exist_ok=True)
+
+        for family in self.families:
+            stopped = set()
+
+            for size in self.get_sizes(family):
+                file_path = self.write_file(family, size)
+
+                for algorithm in self.algorithms:
+                    if algorithm in stopped:
+                        result = BenchmarkResult(family, size, algorithm, SKIPPED)
+                    else:
+                        result = self.run_algorithm(family, size, algorithm, file_path)
+
+                        if result.status != OK:
+                            stopped.add(algorithm)
+
+                    if callback is not None:
+                        callback(result)
+
+                    yield result
+
+    def run_algorithm(
+        self, family: str, size: int, algorithm: str, file_path: str
+    ) -> BenchmarkResult:
+        receiver, sender = multiprocessing.Pipe(duplex=False)
+
+        process = multiprocessing.Process(
+            target=measure_algorithm,
+            args=(algorithm, file_path, self.repeats, sender),
+        )
+        process.start()
+        sender.close()
+
+        # the result is received before joining because a big result could fill the pipe
+        if receiver.poll(self.timeout):
+            try:
+                values = receiver.recv()
+            except EOFError:
+                values = (ERROR, f"process exited with code {process.exitcode}")
+        else:
+            values = (TIMEOUT, "")
+            self.stop_process(process)
+
+        receiver.close()
+        process.join()
+
+        # eg. a crash from running out of memory
+        if values[0] != TIMEOUT and process.exitcode not in (0, None):
+            if values[0] == OK:
+                values = (ERROR, f"process exited with code {process.exitcode}")
+
+        if values[0] == OK:
+            return BenchmarkResult(family, size, algorithm, *values)
+
+        return BenchmarkResult(family, size, algorithm, values[0], result=values[1])
+
+    @staticmethod
+    def stop_process(process: multiprocessing.Process):
+        # the whole process group so worker processes of TT-PAR are stopped as well
+        if hasattr(os, "killpg"):
+            try:
+                os.killpg(process.pid, signal.SIGKILL)
+                return
+            except OSError:
+                pass
+
+        process.kill()
+
+    def write_json(self, results: list[BenchmarkResult], file_path: str):
+        with open(file_path, "w") as file:
+            json.dump(
+                {
+                    "seed": self.seed,
+                    "repeats": self.repeats,
+                    "timeout": self.timeout,
+                    "python": platform.python_version(),
+                    "platform": platform.platform(),
+                    "results": [result.to_dict() for result in results],
+                },
+                file,
+                indent=2,
+            )
+
+    @staticmethod
+    def write_csv(results: list[BenchmarkResult], file_path: str):
+        with open(file_path, "w", newline="") as file:
+            writer = csv.DictWriter(file, FIELDS)
+            writer.writeheader()
+
+            for result in results:
+                writer.writerow(result.to_dict())
+
+    @staticmethod
+    def read_json(file_path: str) -> list[BenchmarkResult]:
+        with open(file_path, "r") as file:
+            values = json.load(file)
+
+        return [BenchmarkResult.from_dict(result) for result in values["results"]]
+
+    @staticmethod
+    def compare(
+        results: list[BenchmarkResult],
+        baseline: list[BenchmarkResult],
+        tolerance: float = TOLERANCE,
+    ) -> list[str]:
+        # a line for each regression, results that aren't in the baseline are ignored
+        baseline_results = {result.get_key(): result for result in baseline}
+        regressions = []
+
+        for result in results:
+            before = baseline_results.get(result.get_key())
+
+            if before is None or before.status != OK:
+                continue
+
+            name = f"{result.family} {result.size} {result.algorithm}"
+
+            if result.status != OK:
+                regressions.append(
+                    f"{name}: {result.status}, was {before.total_seconds:.3f}s"
+                )
+
+            elif result.result != before.result:
+                # a different answer is always a regression, however fast it is
+                regressions.append(
+                    f"{name}: result changed from {before.result!r} to {result.result!r}"
+                )
+
+            elif (
+                result.total_seconds > before.total_seconds * (1 + tolerance)
+                and result.total_seconds - before.total_seconds
+                > MINIMUM_DIFFERENCE_SECONDS
+            ):
+                regressions.append(
+                    f"{name}: {result.total_seconds:.3f}s, was {before.total_seconds:.3f}s "
+                    f"({result.total_seconds / before.total_seconds:.2f}x slower)"
+                )
+
+        return regressions
@@ -0,0 +1,134 @@
+import random
+import string
+
+from src.syntax.operator import Operator
+
+# symbols are a letter and an optional digit so there are 52 + 52 * 10 of them
+MAX_SYMBOLS = 52 * 11
+
+BINARY_OPERATORS = [
+    Operator.CONJUNCTION,
+    Operator.DISJUNCTION,
+    Operator.IMPLICATION,
+    Operator.BICONDITIONAL,
+]
+
+
+# Generates random knowledge bases and queries in the TELL/ASK file format for benchmarks
+# the same seed always gives the same files, eg.
+#   KnowledgeBaseGenerator(1).get_random_cnf(20, 4.26)
+# each method gives the whole file as a string
+class KnowledgeBaseGenerator:
+    def __init__(self, seed: int = 0):
+        self.seed = seed
+        self.random = random.Random(seed)
+
+    @staticmethod
+    def get_symbol_names(number_of_symbols: int) -> list[str]:
+        # a, b, ..., Z, a0, b0, ..., Z9
+        if number_of_symbols > MAX_SYMBOLS:
+            raise ValueError(
+                f"Knowledge bases can't have more than {MAX_SYMBOLS} symbols, {number_of_symbols} were asked for"
+            )
+
+        letters = string.ascii_lowercase + string.ascii_uppercase
+        names = list(letters)
+
+        for digit in range(10):
+            names.extend(f"{letter}{digit}" for letter in letters)
+
+        return names[:number_of_symbols]
+
+    @staticmethod
+    def to_file_string(sentences: list[str], query: str) -> str:
+        return f"TELL\n{'; '.join(sentences)};\nASK\n{query}\n"
+
+    def get_random_literal(self, names: list[str]) -> str:
+        name = self.random.choice(names)
+
+        return f"{Operator.NEGATION}{name}" if self.random.random() < 0.5 else name
+
+    def get_random_cnf(self, number_of_symbols: int, ratio: float, k: int = 3) -> str:
+        # round(ratio * number of symbols) clauses of k different symbols with random signs
+        # 3-cnf is hardest around a ratio of 4.26 where about half of the knowledge bases are satisfiable
+        names = self.get_symbol_names(number_of_symbols)
+
+        if k > number_of_symbols:
+            raise ValueError(f"Clauses of {k} literals need at least {k} symbols")
+
+        sentences = []
+
+        for _ in range(round(ratio * number_of_symbols)):
+            literals = [
+                f"{Operator.NEGATION}{name}" if self.random.random() < 0.5 else name
+                for name in self.random.sample(names, k)
+            ]
+
+            sentences.append(f" {Operator.DISJUNCTION} ".join(literals))
+
+        return self.to_file_string(sentences, self.get_random_literal(names))
+
+    def get_layered_horn(
+        self, number_of_layers: int, width: int = 10, body_size: int = 2
+    ) -> str:
+        # the first layer is facts (only half of them so not everything can be derived)
+        # and each symbol of the other layers is the head of a rule with a body from the layer before it
+        # the query is a symbol in the last layer so chaining has to go through every layer
+        names = self.get_symbol_names(number_of_layers * width)
+        layers = [names[i : i + width] for i in range(0, len(names), width)]
+
+        sentences = [name for name in layers[0] if self.random.random() < 0.5]
+
+        for previous, layer in zip(layers, layers[1:]):
+            for name in layer:
+                body = self.random.sample(previous, min(body_size, len(previous)))
+
+                sentences.append(
+                    f"{f' {Operator.CONJUNCTION} '.join(body)} {Operator.IMPLICATION} {name}"
+                )
+
+        # a knowledge base can't be empty
+        if len(sentences) == 0:
+            sentences.append(layers[0][0])
+
+        return self.to_file_string(sentences, self.random.choice(layers[-1]))
+
+    def get_nested_sentence(self, names: list[str], depth: int) -> str:
+        # the lhs always has the full depth and the rhs a random depth so the size doesn't double at each level
+        if depth == 0:
+            return self.get_random_literal(names)
+
+        lhs = self.get_nested_sentence(names, depth - 1)
+        rhs = self.get_nested_sentence(names, self.random.randrange(depth))
+        operator = self.random.choice(BINARY_OPERATORS)
+
+        sentence = f"({lhs} {operator} {rhs})"
+
+        if self.random.random() < 0.25:
+            return f"{Operator.NEGATION}{sentence}"
+
+        return sentence
+
+    def get_nested_sentences(
+        self, depth: int, number_of_sentences: int = 4, number_of_symbols: int = 10
+    ) -> str:
+        # sentences with brackets nested depth levels deep that use every operator
+        # there are only a few symbols so truth table checking still works, it is the size of the sentences that grows
+        names = self.get_symbol_names(number_of_symbols)
+
+        sentences = [
+            self.get_nested_sentence(names, depth) for _ in range(number_of_sentences)
+        ]
+
+        return self.to_file_string(sentences, self.get_random_literal(names))
+
+    def get_biconditional_chain(self, length: int) -> str:
+        # a <=> b <=> c ... with every symbol except the last one as a fact, the same as
+        # test_files/generic_biconditional_chain.txt, so the query depends on how many symbols there are
+        # the chain has 2 ** (length - 1) clauses in cnf without the tseitin transformation
+        names = self.get_symbol_names(length)
+
+        sentences = [f" {Operator.BICONDITIONAL} ".join(names)]
+        sentences.extend(names[:-1])
+
+        return self.to_file_string(sentences, names[-1])
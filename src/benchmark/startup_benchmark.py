@@ -0,0 +1,151 @@
+import os
+import subprocess
+import sys
+import time
+
+from src.inference_algorithm_factory import InferenceAlgorithmFactory
+
+# seconds that iengine.py can take to answer a tiny query with each algorithm, on top of starting python
+# eg. numpy for TT-VEC is most of it, the other algorithms take about a sixth of this
+STARTUP_BUDGET_SECONDS = 0.75
+
+# modules that only the algorithms that use them can import, a module that isn't here can be imported by any
+# the time can be within the budget on a fast machine even when everything is imported, but these can't
+# eg. the DIMACS reader, the cache and the test results are only for the options that use them
+STARTUP_MODULES = {
+    "numpy": ("TT-VEC",),
+    "concurrent.futures": ("TT-PAR",),
+    "multiprocessing": ("TT-PAR",),
+    "src.syntax.compiler": (
+        "TT",
+        "TT-VEC",
+        "TT-PAR",
+        "DPLL",
+        "CDCL",
+        "SHARPSAT",
+        "BDD",
+    ),
+    "src.horn_knowledge_base": ("FC", "BC"),
+    "src.clause_database": ("DPLL", "CDCL", "SHARPSAT", "BDD"),
+    "src.cnf_knowledge_base": ("DPLL", "CDCL", "SHARPSAT", "BDD"),
+    "src.tseitin_converter": ("DPLL", "CDCL", "SHARPSAT", "BDD"),
+    "src.cnf_preprocessor": ("DPLL", "CDCL"),
+    "src.binary_decision_diagram": ("BDD",),
+    "src.bdd_knowledge_base": ("BDD",),
+    "src.dimacs_file": (),
+    "src.knowledge_base_cache": (),
+    "src.test.unit_test_result": (),
+    "gzip": (),
+    "json": (),
+    "mmap": (),
+}
+
+# each time is the fastest of this many runs
+STARTUP_REPEATS = 5
+
+# a knowledge base every algorithm can answer straight away, so the time is almost all startup
+STARTUP_FILE = "TELL\na; a => b;\nASK\nb\n"
+
+
+# Times how long iengine.py takes to start, answer a tiny query and exit with each algorithm
+# each run is a new python process so nothing is imported already, and starting python with nothing
+# is timed as well so the budget is only for what iengine.py adds
+# each algorithm is also run once with -X importtime to find the modules it imports that it shouldn't
+# eg.
+#   benchmark = StartupBenchmark(["FC", "CDCL"])
+#   for name, seconds, overhead, modules in benchmark.run("benchmark_files"):
+#       print(name, seconds, overhead <= benchmark.budget, len(modules) == 0)
+class StartupBenchmark:
+    def __init__(
+        self,
+        algorithms: list[str] = None,
+        repeats: int = STARTUP_REPEATS,
+        budget: float = STARTUP_BUDGET_SECONDS,
+    ):
+        if repeats < 1:
+            raise ValueError("Each measurement needs at least 1 repeat")
+
+        if algorithms is None:
+            # the test algorithm isn't a real algorithm
+            algorithms = [
+                name
+                for name in InferenceAlgorithmFactory.get_inference_algorithm_names()
+                if name != "TEST"
+            ]
+
+        self.algorithms = algorithms
+        self.repeats = repeats
+        self.budget = budget
+
+    @staticmethod
+    def get_iengine_path() -> str:
+        # iengine.py is next to the src folder
+        return os.path.join(
+            os.path.dirname(
+                os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+            ),
+            "iengine.py",
+        )
+
+    def measure(self, arguments: list[str]) -> float:
+        # fastest wall time of running python with the arguments
+        times = []
+
+        for _ in range(self.repeats):
+            start = time.perf_counter()
+            process = subprocess.run(
+                [sys.executable] + arguments, capture_output=True, text=True
+            )
+            times.append(time.perf_counter() - start)
+
+            if process.returncode != 0:
+                raise ValueError(
+                    f"{' '.join(arguments)} exited with code {process.returncode}: {process.stderr.strip()}"
+                )
+
+        return min(times)
+
+    @staticmethod
+    def get_modules(arguments: list[str]) -> set[str]:
+        # names of every module imported by running python with the arguments
+        # -X importtime writes a line to stderr for each one eg. "import time:  306 |  306 |   src"
+        process = subprocess.run(
+            [sys.executable, "-X", "importtime"] + arguments,
+            capture_output=True,
+            text=True,
+        )
+
+        return {
+            line.split("|")[-1].strip()
+            for line in process.stderr.splitlines()
+            if line.startswith("import time:")
+        }
+
+    @staticmethod
+    def get_unexpected_modules(name: str, modules: set[str]) -> list[str]:
+        # modules of STARTUP_MODULES that the algorithm imported but doesn't use
+        return [
+            module
+            for module, algorithms in STARTUP_MODULES.items()
+            if module in modules and name not in algorithms
+        ]
+
+    def run(self, directory: str):
+        # yields the name, seconds, seconds more than python on its own and modules it shouldn't import
+        # of each algorithm
+        os.makedirs(directory, exist_ok=True)
+
+        file_path = os.path.join(directory, "startup.txt")
+
+        with open(file_path, "w") as file:
+            file.write(STARTUP_FILE)
+
+        python_seconds = self.measure(["-c", "pass"])
+
+        for name in self.algorithms:
+            arguments = [self.get_iengine_path(), file_path, name]
+            seconds = self.measure(arguments)
+
+            yield name, seconds, seconds - python_seconds, self.get_unexpected_modules(
+                name, self.get_modules(arguments)
+            )
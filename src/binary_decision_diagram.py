@@ -0,0 +1,351 @@
+from array import array
+
+from src.syntax.atom import BoolAtom
+from src.syntax.operator import Operator
+from src.syntax.sentence import AtomicSentence, Sentence
+
+# the two terminal nodes
+FALSE = 0
+TRUE = 1
+
+# level of the terminal nodes, below every variable
+TERMINAL_LEVEL = 2**31 - 1
+
+# default budget, a diagram that needs more than this is given up on
+MAX_NODES = 250_000
+MAX_MEMORY = 256 * 2**20
+
+# rough number of bytes used by each node (the arrays, the unique table entry and its key)
+# and by each entry of the computed table, used to estimate the memory of the diagram
+BYTES_PER_NODE = 120
+BYTES_PER_COMPUTED_ENTRY = 100
+
+
+class BudgetExceededError(Exception):
+    def __init__(self, number_of_nodes: int, memory: int):
+        self.number_of_nodes = number_of_nodes
+        self.memory = memory
+
+        super().__init__(
+            f"Binary decision diagram has {number_of_nodes} nodes using about {memory} bytes which is over budget"
+        )
+
+
+# Reduced ordered binary decision diagram (ROBDD)
+# each node tests a variable and has a low child (the variable is false) and a high child (the variable is true)
+# the variables are always tested in the same order (their level) and nodes are never repeated or redundant
+# so every boolean function has exactly one node, eg. checking if a function is false is comparing it to FALSE
+# nodes are integers and their level, low and high children are kept in flat arrays
+# - the unique table finds the node for a level and children so the same node is never made twice
+# - the computed table caches the result of each if-then-else so shared parts are only computed once
+# all the diagrams made by one instance share their nodes
+class BinaryDecisionDiagram:
+    def __init__(self, max_nodes: int = MAX_NODES, max_memory: int = MAX_MEMORY):
+        # name of each variable by level and the level of each name
+        self.variable_names: list[str] = []
+        self.variable_levels: dict[str, int] = {}
+
+        # the terminal nodes come first
+        self.levels = array("i", [TERMINAL_LEVEL, TERMINAL_LEVEL])
+        self.lows = array("i", [FALSE, TRUE])
+        self.highs = array("i", [FALSE, TRUE])
+
+        self.unique: dict[tuple[int, int, int], int] = {}
+        self.computed: dict[tuple[int, int, int], int] = {}
+
+        self.max_nodes = max_nodes
+        self.max_memory = max_memory
+
+    def get_number_of_nodes(self) -> int:
+        return len(self.levels)
+
+    def get_number_of_variables(self) -> int:
+        return len(self.variable_names)
+
+    def get_memory_usage(self) -> int:
+        # estimate in bytes
+        return (
+            self.get_number_of_nodes() * BYTES_PER_NODE
+            + len(self.computed) * BYTES_PER_COMPUTED_ENTRY
+        )
+
+    def add_variable(self, name: str) -> int:
+        # new variables are tested after all the others so the existing nodes stay ordered
+        level = self.variable_levels.get(name)
+
+        if level is None:
+            level = len(self.variable_names)
+            self.variable_levels[name] = level
+            self.variable_names.append(name)
+
+        return level
+
+    def make_node(self, level: int, low: int, high: int) -> int:
+        # a node with the same children doesn't need to test the variable
+        if low == high:
+            return low
+
+        key = (level, low, high)
+        node = self.unique.get(key)
+
+        if node is not None:
+            return node
+
+        self.check_budget()
+
+        node = len(self.levels)
+
+        self.levels.append(level)
+        self.lows.append(low)
+        self.highs.append(high)
+        self.unique[key] = node
+
+        return node
+
+    def check_budget(self):
+        if self.get_memory_usage() + BYTES_PER_NODE <= self.max_memory:
+            if self.get_number_of_nodes() < self.max_nodes:
+                return
+
+        # the computed table is only a cache so it is cleared before giving up
+        if self.get_number_of_nodes() < self.max_nodes:
+            self.computed = {}
+
+            if self.get_memory_usage() + BYTES_PER_NODE <= self.max_memory:
+                return
+
+        raise BudgetExceededError(self.get_number_of_nodes(), self.get_memory_usage())
+
+    def collect_garbage(self, roots: list[int]) -> list[int]:
+        # removes the nodes that can't be reached from the roots and returns the new node of each root
+        # the nodes that are left are renumbered in the same order, so children still come before their parents,
+        # and the computed table is cleared because its nodes could be gone
+        reachable = set()
+
+        for root in roots:
+            reachable.update(self.get_nodes(root))
+
+        levels = array("i", [TERMINAL_LEVEL, TERMINAL_LEVEL])
+        lows = array("i", [FALSE, TRUE])
+        highs = array("i", [FALSE, TRUE])
+        unique = {}
+
+        # new node of each old node
+        numbers = {FALSE: FALSE, TRUE: TRUE}
+
+        for node in sorted(reachable):
+            key = (
+                self.levels[node],
+                numbers[self.lows[node]],
+                numbers[self.highs[node]],
+            )
+
+            numbers[node] = len(levels)
+            unique[key] = len(levels)
+
+            levels.append(key[0])
+            lows.append(key[1])
+            highs.append(key[2])
+
+        self.levels = levels
+        self.lows = lows
+        self.highs = highs
+        self.unique = unique
+        self.computed = {}
+
+        return [numbers[root] for root in roots]
+
+    def get_variable_node(self, name: str, negated: bool = False) -> int:
+        level = self.add_variable(name)
+
+        if negated:
+            return self.make_node(level, TRUE, FALSE)
+
+        return self.make_node(level, FALSE, TRUE)
+
+    def ite(self, f: int, g: int, h: int) -> int:
+        # if f then g else h, every other operation is made from this
+        # the recursion is at most one level deep for each variable so it can't hit the recursion limit
+        # because there can only be 572 propositional symbols
+        if f == TRUE:
+            return g
+
+        if f == FALSE:
+            return h
+
+        if g == h:
+            return g
+
+        if g == TRUE and h == FALSE:
+            return f
+
+        key = (f, g, h)
+        node = self.computed.get(key)
+
+        if node is not None:
+            return node
+
+        # split on the first variable tested by any of them
+        levels = self.levels
+        level = min(levels[f], levels[g], levels[h])
+
+        f_low, f_high = self.get_children(f, level)
+        g_low, g_high = self.get_children(g, level)
+        h_low, h_high = self.get_children(h, level)
+
+        low = self.ite(f_low, g_low, h_low)
+        high = self.ite(f_high, g_high, h_high)
+
+        node = self.make_node(level, low, high)
+
+        self.computed[key] = node
+
+        return node
+
+    def get_children(self, node: int, level: int) -> tuple[int, int]:
+        # a node that doesn't test the variable is the same whatever its value
+        if self.levels[node] != level:
+            return node, node
+
+        return self.lows[node], self.highs[node]
+
+    def negate(self, node: int) -> int:
+        return self.ite(node, FALSE, TRUE)
+
+    def conjoin(self, lhs: int, rhs: int) -> int:
+        return self.ite(lhs, rhs, FALSE)
+
+    def apply(self, operator: Operator, lhs: int, rhs: int) -> int:
+        if operator == Operator.CONJUNCTION:
+            return self.ite(lhs, rhs, FALSE)
+
+        if operator == Operator.DISJUNCTION:
+            return self.ite(lhs, TRUE, rhs)
+
+        if operator == Operator.IMPLICATION:
+            return self.ite(lhs, rhs, TRUE)
+
+        if operator == Operator.BICONDITIONAL:
+            return self.ite(lhs, rhs, self.negate(rhs))
+
+        raise ValueError(f"Operator {operator} not supported.")
+
+    def compile(self, sentence: Sentence) -> int:
+        # node of the sentence, the tree is walked with an explicit stack because sentences can be very deep
+        # each entry is a sentence and whether its children are done
+        stack: list[tuple[Sentence, bool]] = [(sentence, False)]
+        nodes: list[int] = []
+
+        while len(stack) > 0:
+            current, children_done = stack.pop()
+
+            if isinstance(current, AtomicSentence):
+                atom = current.atom
+
+                if isinstance(atom, BoolAtom):
+                    nodes.append(TRUE if atom.name == "True" else FALSE)
+                else:
+                    nodes.append(self.get_variable_node(atom.name, atom.negated))
+
+                continue
+
+            if not children_done:
+                stack.append((current, True))
+
+                # the rhs is pushed first so the lhs is done first
+                stack.append((current.rhs, False))
+
+                if current.operator != Operator.NEGATION:
+                    stack.append((current.lhs, False))
+
+                continue
+
+            rhs = nodes.pop()
+
+            if current.operator == Operator.NEGATION:
+                nodes.append(self.negate(rhs))
+            else:
+                nodes.append(self.apply(current.operator, nodes.pop(), rhs))
+
+        return nodes[0]
+
+    def count_models(self, root: int) -> int:
+        # number of assignments of all the variables that make the function true
+        # the count of each node is over the variables from its level down, the levels that
+        # an edge skips can be either value so they multiply the count
+        n = self.get_number_of_variables()
+        levels = self.levels
+
+        def get_level(node: int) -> int:
+            return n if node <= TRUE else levels[node]
+
+        counts = {FALSE: 0, TRUE: 1}
+
+        # children always have a higher level so going through the nodes from the deepest level up works
+        for node in sorted(self.get_nodes(root), key=lambda node: -levels[node]):
+            level = levels[node]
+            low = self.lows[node]
+            high = self.highs[node]
+
+            counts[node] = counts[low] * 2 ** (get_level(low) - level - 1) + counts[
+                high
+            ] * 2 ** (get_level(high) - level - 1)
+
+        return counts[root] * 2 ** get_level(root)
+
+    def get_nodes(self, root: int) -> list[int]:
+        # non terminal nodes reachable from the root
+        seen = set()
+        stack = [root]
+
+        while len(stack) > 0:
+            node = stack.pop()
+
+            if node <= TRUE or node in seen:
+                continue
+
+            seen.add(node)
+
+            stack.append(self.lows[node])
+            stack.append(self.highs[node])
+
+        return list(seen)
+
+    def get_models(self, root: int):
+        # yields the value of every variable by level for each assignment that makes the function true
+        # levels that are skipped are yielded with both values, false first
+        n = self.get_number_of_variables()
+        levels = self.levels
+
+        values = [False] * n
+
+        # each entry is a node to continue from at a level, after setting the variable before that level
+        stack: list[tuple[int, int, bool]] = [(root, 0, None)]
+
+        while len(stack) > 0:
+            node, level, value = stack.pop()
+
+            if level > 0:
+                values[level - 1] = value
+
+            if node == FALSE:
+                continue
+
+            if level == n:
+                yield tuple(values)
+                continue
+
+            if levels[node] != level:
+                # the variable isn't tested so it can be either value
+                low = high = node
+            else:
+                low = self.lows[node]
+                high = self.highs[node]
+
+            # false is pushed last so it comes first
+            stack.append((high, level + 1, True))
+            stack.append((low, level + 1, False))
+
+    def get_size(self, root: int) -> int:
+        # number of nodes in the diagram of the function including the terminals
+        return len(self.get_nodes(root)) + 2
@@ -0,0 +1,318 @@
+import heapq
+import random
+from itertools import chain
+
+# clauses of the smallest size are weighted by 2 ** MOMS_WEIGHT so the number of them comes first
+# and the product of the positive and negated counts only breaks ties, the same as Freeman's POSIT solver
+MOMS_WEIGHT = 10
+
+
+# Chooses the literal that DPLL branches on, the literal is tried first and then its negation
+# the heuristics look at the clauses that aren't satisfied yet, with the false literals removed
+# DPLL tells the heuristic each time a clause starts or stops being one of these (a clause that gets shorter stops
+# being one of the longer length and starts being one of the shorter length) so the heuristic keeps its scores
+# up to date instead of looking at every clause for each choice
+# the clauses are integer literals (see ClauseDatabase) and are never empty or unit clauses when a literal is chosen
+# because those are handled before branching
+# ranks is the position of each symbol in alphabetical order, used to break ties so the search is always the same
+# eg.
+#   heuristic.reset({1: 0, 2: 1})
+#   heuristic.add_clauses([[1, 2], [-1, 2]])
+#   heuristic.choose_literal() -> 2
+class BranchingHeuristic:
+    def __init__(self, name: str):
+        self.name = name
+
+        # how many of the clauses of each length each literal is in, kept by the heuristics that don't keep scores
+        # a literal that isn't in any clause of a length isn't in its counts and there are no lengths without
+        # clauses eg. {2: {1: 1, 2: 2, -1: 1}}
+        self.counts: dict[int, dict[int, int]] = {}
+        self.ranks: dict[int, int] = {}
+
+    def choose_literal(self) -> int:
+        raise NotImplementedError("Choose literal should be implemented in subclasses.")
+
+    def reset(self, ranks: dict[int, int]):
+        # called at the start of each search, before any clause is added
+        self.counts = {}
+        self.ranks = ranks
+
+    def add_literals(self, literals: list[int], length: int):
+        # the literals of a clause of the length that is left
+        length_counts = self.counts.get(length)
+
+        if length_counts is None:
+            length_counts = self.counts[length] = {}
+
+        for literal in literals:
+            length_counts[literal] = length_counts.get(literal, 0) + 1
+
+    def remove_literals(self, literals: list[int], length: int):
+        # the literals of a clause of the length that isn't left anymore
+        length_counts = self.counts[length]
+
+        for literal in literals:
+            count = length_counts[literal] - 1
+
+            if count == 0:
+                del length_counts[literal]
+            else:
+                length_counts[literal] = count
+
+        if len(length_counts) == 0:
+            del self.counts[length]
+
+    def add_clauses(self, clauses: list[list[int]]):
+        # clauses given as lists of literals eg. to choose a literal without a search
+        for clause in clauses:
+            self.add_literals(clause, len(clause))
+
+    @staticmethod
+    def get_branching_heuristics(seed: int = None) -> "list[BranchingHeuristic]":
+        return [
+            FirstSymbolHeuristic(),
+            MOMSHeuristic(),
+            JeroslowWangHeuristic(),
+            DLISHeuristic(),
+            RandomHeuristic(seed),
+        ]
+
+    @classmethod
+    def from_name(cls, name: str, seed: int = None) -> "BranchingHeuristic":
+        heuristics = cls.get_branching_heuristics(seed)
+
+        for heuristic in heuristics:
+            if heuristic.name == name:
+                return heuristic
+
+        names = [heuristic.name for heuristic in heuristics]
+
+        raise ValueError(
+            f"Heuristic with name {name} not found, valid heuristics are: {names}"
+        )
+
+    @staticmethod
+    def get_best_literal(scores: dict[int, float], ranks: dict[int, int]) -> int:
+        # literal with the highest score, the first symbol in alphabetical order if there is a tie
+        # and the positive literal before the negated one
+        best = max(scores.values())
+
+        return max(
+            (literal for literal, score in scores.items() if score == best),
+            key=lambda literal: (-ranks[abs(literal)], literal),
+        )
+
+
+# Highest scores of items whose scores change between choices, used by the heuristics that keep a score
+# for every literal or symbol
+# the items that changed are only pushed again when the best one is needed, with their score and what breaks ties
+# eg. (-score, rank, item), and an entry whose score isn't the item's score anymore is dropped when it gets to the top
+class ScoreHeap:
+    def __init__(self, get_score, get_tie_break, number_of_items: int):
+        self.get_score = get_score
+        self.get_tie_break = get_tie_break
+        self.number_of_items = number_of_items
+
+        self.heap: list[tuple] = []
+        self.changed: set[int] = set()
+
+    def get_best(self) -> int:
+        # the item with the highest score above 0, there must be one
+        heap = self.heap
+        get_score = self.get_score
+
+        for item in self.changed:
+            score = get_score(item)
+
+            if score > 0:
+                heapq.heappush(heap, (-score, self.get_tie_break(item), item))
+
+        self.changed.clear()
+
+        while -heap[0][0] != get_score(heap[0][2]):
+            heapq.heappop(heap)
+
+        # the heap keeps stale entries so rebuild it if it gets too big
+        if len(heap) > 4 * self.number_of_items + 100:
+            self.changed.update(self.get_items())
+            self.heap = []
+
+            return self.get_best()
+
+        return heap[0][2]
+
+    def get_items(self) -> set[int]:
+        # every item with an entry, some of them might not have a score anymore
+        return {entry[2] for entry in self.heap}
+
+
+# The first symbol in alphabetical order set to true, with auxiliary symbols from the cnf conversion last
+class FirstSymbolHeuristic(BranchingHeuristic):
+    def __init__(self):
+        super().__init__("order")
+
+    def choose_literal(self) -> int:
+        return min(
+            map(abs, chain.from_iterable(self.counts.values())),
+            key=self.ranks.__getitem__,
+        )
+
+
+# Maximum occurrences in clauses of minimum size
+# the symbol in the most of the shortest clauses, setting it makes them shorter which leads to more unit clauses
+# only the shortest clauses are looked at for each choice
+class MOMSHeuristic(BranchingHeuristic):
+    def __init__(self):
+        super().__init__("moms")
+
+    def choose_literal(self) -> int:
+        counts = self.counts[min(self.counts)]
+
+        scores = {}
+
+        for literal in counts:
+            symbol = abs(literal)
+
+            if symbol in scores:
+                continue
+
+            positive = counts.get(symbol, 0)
+            negative = counts.get(-symbol, 0)
+
+            scores[symbol] = (
+                positive + negative
+            ) * 2**MOMS_WEIGHT + positive * negative
+
+        symbol = self.get_best_literal(scores, self.ranks)
+
+        # the sign that is in more of the clauses
+        if counts.get(-symbol, 0) > counts.get(symbol, 0):
+            return -symbol
+
+        return symbol
+
+
+# Two sided Jeroslow-Wang
+# each clause adds 2 ** -length to the score of its literals so short clauses count for much more
+# the symbol with the highest score for both signs is chosen with the sign that has the higher score
+# the scores are kept as integers, multiplied by 2 ** the longest length, so adding and removing clauses
+# is exact and the scores are the same as adding up the clauses that are left
+class JeroslowWangHeuristic(BranchingHeuristic):
+    def __init__(self):
+        super().__init__("jw")
+
+    def reset(self, ranks: dict[int, int]):
+        super().reset(ranks)
+
+        # score of each literal, negated literals are at the end of the list like the values of DPLL
+        self.scores = [0] * (2 * len(ranks) + 1)
+        self.longest = 0
+
+        self.symbols = ScoreHeap(
+            lambda symbol: self.scores[symbol] + self.scores[-symbol],
+            ranks.__getitem__,
+            len(ranks),
+        )
+
+    def get_weight(self, length: int) -> int:
+        # a longer clause than before makes every weight and score bigger so its weight is still an integer
+        if length > self.longest:
+            shift = length - self.longest
+            self.scores = [score << shift for score in self.scores]
+            self.longest = length
+
+            # every entry has an old score
+            self.symbols.changed.update(self.symbols.get_items())
+            self.symbols.heap = []
+
+        return 1 << (self.longest - length)
+
+    def add_literals(self, literals: list[int], length: int):
+        weight = self.get_weight(length)
+        scores = self.scores
+        changed = self.symbols.changed
+
+        for literal in literals:
+            scores[literal] += weight
+            changed.add(abs(literal))
+
+    def remove_literals(self, literals: list[int], length: int):
+        weight = 1 << (self.longest - length)
+        scores = self.scores
+        changed = self.symbols.changed
+
+        for literal in literals:
+            scores[literal] -= weight
+            changed.add(abs(literal))
+
+    def choose_literal(self) -> int:
+        symbol = self.symbols.get_best()
+
+        if self.scores[-symbol] > self.scores[symbol]:
+            return -symbol
+
+        return symbol
+
+
+# Dynamic largest individual sum
+# the literal in the most clauses, setting it satisfies the most clauses
+class DLISHeuristic(BranchingHeuristic):
+    def __init__(self):
+        super().__init__("dlis")
+
+    def reset(self, ranks: dict[int, int]):
+        super().reset(ranks)
+
+        # number of clauses each literal is in, the positive literal comes first in a tie
+        self.totals = [0] * (2 * len(ranks) + 1)
+
+        self.literals = ScoreHeap(
+            self.totals.__getitem__,
+            lambda literal: (ranks[abs(literal)], -literal),
+            2 * len(ranks),
+        )
+
+    def add_literals(self, literals: list[int], length: int):
+        totals = self.totals
+
+        for literal in literals:
+            totals[literal] += 1
+
+        self.literals.changed.update(literals)
+
+    def remove_literals(self, literals: list[int], length: int):
+        totals = self.totals
+
+        for literal in literals:
+            totals[literal] -= 1
+
+        self.literals.changed.update(literals)
+
+    def choose_literal(self) -> int:
+        return self.literals.get_best()
+
+
+# A random symbol with a random sign, the same seed always gives the same search
+class RandomHeuristic(BranchingHeuristic):
+    def __init__(self, seed: int = None):
+        super().__init__("random")
+
+        self.seed = seed if seed is not None else 0
+        self.random = random.Random(self.seed)
+
+    def reset(self, ranks: dict[int, int]):
+        super().reset(ranks)
+
+        # each search makes the same choices
+        self.random = random.Random(self.seed)
+
+    def choose_literal(self) -> int:
+        # sorted so the choice only depends on the seed
+        symbols = sorted(
+            set(map(abs, chain.from_iterable(self.counts.values()))),
+            key=self.ranks.__getitem__,
+        )
+
+        symbol = self.random.choice(symbols)
+
+        return symbol if self.random.random() < 0.5 else -symbol
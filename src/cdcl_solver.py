@@ -0,0 +1,578 @@
+import heapq
+
+from src.garbage_collection import garbage_collection_paused
+
+# literal values, indexed by literal
+TRUE = 1
+FALSE = 0
+UNASSIGNED = -1
+
+# reason of a decision or a unit clause
+NO_REASON = -1
+
+
+# Conflict driven clause learning SAT solver
+# variables are numbered from 0 and literals are encoded as 2 * variable + negated
+# eg. variable 3 is literal 6 and its negation is literal 7, so negating a literal is literal ^ 1
+class CDCLSolver:
+    def __init__(self):
+        self.number_of_variables = 0
+
+        # clauses are lists of literals, the first two are watched
+        # a clause that is the reason for an assignment has the assigned literal first
+        # deleted learnt clauses are replaced by None
+        self.clauses: list[list[int]] = []
+
+        # extra information about learnt clauses by clause index
+        self.learnt_clauses: dict[int, int] = {}
+
+        # for each literal the clauses watching it, visited when the literal becomes false
+        self.watches: list[list[int]] = []
+
+        # value of each literal
+        self.values: list[int] = []
+
+        # decision level, reason clause and saved phase of each variable
+        self.levels: list[int] = []
+        self.reasons: list[int] = []
+        self.polarity: list[int] = []
+
+        # assigned literals in order and the trail index where each decision level starts
+        self.trail: list[int] = []
+        self.trail_limits: list[int] = []
+
+        # index of the next trail literal to propagate
+        self.propagation_head = 0
+
+        # VSIDS activity of each variable with a heap of (-activity, variable) to branch on
+        self.activity: list[float] = []
+        self.activity_increment = 1.0
+        self.activity_decay = 0.95
+        self.heap: list[tuple[float, int]] = []
+
+        # used during conflict analysis
+        self.seen: list[bool] = []
+
+        # learnt clauses are reduced when there are more than this
+        self.max_learnt_clauses = 1000
+
+        # false once the clauses are known to be unsatisfiable
+        self.ok = True
+
+        # value of each variable in the last satisfying assignment
+        self.model: list[bool] = []
+
+        # counters
+        self.decisions = 0
+        self.propagations = 0
+        self.conflicts = 0
+        self.restarts = 0
+
+    def new_variable(self) -> int:
+        variable = self.number_of_variables
+        self.number_of_variables += 1
+
+        # two literals per variable
+        self.watches.append([])
+        self.watches.append([])
+        self.values.append(UNASSIGNED)
+        self.values.append(UNASSIGNED)
+
+        self.levels.append(0)
+        self.reasons.append(NO_REASON)
+        self.polarity.append(1)
+        self.activity.append(0.0)
+        self.seen.append(False)
+
+        heapq.heappush(self.heap, (0.0, variable))
+
+        return variable
+
+    @staticmethod
+    def to_literal(variable: int, negated: bool) -> int:
+        return 2 * variable + (1 if negated else 0)
+
+    def get_decision_level(self) -> int:
+        return len(self.trail_limits)
+
+    def add_clause(self, literals: list[int]) -> bool:
+        # returns false if the clauses are now known to be unsatisfiable
+        if not self.ok:
+            return False
+
+        # clauses are always added at the top level
+        self.cancel_until(0)
+
+        clause = []
+
+        for literal in literals:
+            # already true or a tautology so the clause is always satisfied
+            if self.values[literal] == TRUE or literal ^ 1 in clause:
+                return True
+
+            # false literals and duplicates can be removed
+            if self.values[literal] == FALSE or literal in clause:
+                continue
+
+            clause.append(literal)
+
+        if len(clause) == 0:
+            self.ok = False
+            return False
+
+        if len(clause) == 1:
+            self.enqueue(clause[0], NO_REASON)
+
+            self.ok = self.propagate() == NO_REASON
+            return self.ok
+
+        self.attach_clause(clause)
+
+        return True
+
+    @garbage_collection_paused()
+    def add_clauses(
+        self, literals, offsets, variables: list[int], first_clause: int = 0
+    ) -> bool:
+        # adds the clauses of a ClauseDatabase from the first clause on at once, from its flat literals and offsets
+        # variables is the solver variable of each symbol id, the clauses never have duplicate literals or
+        # tautologies so a clause with no assigned literals is watched straight away, the others go through
+        # add_clause, and the unit clauses are propagated together at the end
+        # returns false if the clauses are now known to be unsatisfiable
+        if not self.ok:
+            return False
+
+        self.cancel_until(0)
+
+        values = self.values
+        clauses = self.clauses
+        watches = self.watches
+
+        # nothing is assigned yet in a new solver so none of the clauses need checking
+        check = len(self.trail) > 0
+
+        # solver literals from the first clause on, a symbol id and its negation index the same table
+        # from each end of it eg. -1 is the last item
+        table = [2 * variable for variable in variables] + [
+            2 * variable + 1 for variable in reversed(variables[1:])
+        ]
+
+        base = offsets[first_clause]
+        converted = list(map(table.__getitem__, literals[base:]))
+        starts = [offset - base for offset in offsets[first_clause:]]
+
+        units = []
+
+        for start, end in zip(starts, starts[1:]):
+            if end - start < 2:
+                if end == start:
+                    self.ok = False
+                    return False
+
+                units.append(converted[start])
+                continue
+
+            clause = converted[start:end]
+
+            if check and any(values[literal] != UNASSIGNED for literal in clause):
+                if not self.add_clause(clause):
+                    return False
+
+                continue
+
+            watches[clause[0]].append(len(clauses))
+            watches[clause[1]].append(len(clauses))
+            clauses.append(clause)
+
+        for literal in units:
+            if values[literal] == FALSE:
+                self.ok = False
+                return False
+
+            if values[literal] == UNASSIGNED:
+                self.enqueue(literal, NO_REASON)
+
+        self.ok = self.propagate() == NO_REASON
+
+        return self.ok
+
+    def attach_clause(self, clause: list[int]) -> int:
+        index = len(self.clauses)
+
+        self.clauses.append(clause)
+        self.watches[clause[0]].append(index)
+        self.watches[clause[1]].append(index)
+
+        return index
+
+    def enqueue(self, literal: int, reason: int):
+        values = self.values
+
+        values[literal] = TRUE
+        values[literal ^ 1] = FALSE
+
+        variable = literal >> 1
+        self.levels[variable] = len(self.trail_limits)
+        self.reasons[variable] = reason
+
+        self.trail.append(literal)
+
+    def propagate(self) -> int:
+        # returns the index of a conflicting clause or NO_REASON
+        values = self.values
+        watches = self.watches
+        clauses = self.clauses
+        trail = self.trail
+        enqueue = self.enqueue
+
+        while self.propagation_head < len(trail):
+            literal = trail[self.propagation_head]
+            self.propagation_head += 1
+            self.propagations += 1
+
+            # clauses watching the negation of the literal have lost a watch
+            false_literal = literal ^ 1
+            watch_list = watches[false_literal]
+
+            # the watch list is compacted in place as clauses move to other watches
+            i = 0
+            j = 0
+            n = len(watch_list)
+
+            while i < n:
+                clause_index = watch_list[i]
+                i += 1
+
+                clause = clauses[clause_index]
+
+                # deleted learnt clause
+                if clause is None:
+                    continue
+
+                # make sure the false literal is the second watch
+                if clause[0] == false_literal:
+                    clause[0] = clause[1]
+                    clause[1] = false_literal
+
+                first = clause[0]
+
+                # the clause is already satisfied by the other watch
+                if values[first] == TRUE:
+                    watch_list[j] = clause_index
+                    j += 1
+                    continue
+
+                # look for another literal that isn't false to watch
+                for k in range(2, len(clause)):
+                    other = clause[k]
+
+                    if values[other] != FALSE:
+                        clause[1] = other
+                        clause[k] = false_literal
+                        watches[other].append(clause_index)
+                        break
+                else:
+                    # no other literal so the clause is unit or conflicting
+                    watch_list[j] = clause_index
+                    j += 1
+
+                    if values[first] == FALSE:
+                        # keep the rest of the watches
+                        while i < n:
+                            watch_list[j] = watch_list[i]
+                            i += 1
+                            j += 1
+
+                        del watch_list[j:]
+
+                        self.propagation_head = len(trail)
+                        return clause_index
+
+                    enqueue(first, clause_index)
+
+            del watch_list[j:]
+
+        return NO_REASON
+
+    def analyze(self, conflict: int) -> tuple[list[int], int]:
+        # finds the first unique implication point and returns the learnt clause and the level to backtrack to
+        clauses = self.clauses
+        levels = self.levels
+        reasons = self.reasons
+        trail = self.trail
+        seen = self.seen
+
+        decision_level = len(self.trail_limits)
+
+        # the asserting literal goes first once it is known
+        learnt = [-1]
+
+        # number of literals at the current level that still need to be resolved
+        counter = 0
+
+        literal = -1
+        index = len(trail) - 1
+        clause_index = conflict
+
+        while True:
+            clause = clauses[clause_index]
+
+            if clause_index in self.learnt_clauses:
+                self.learnt_clauses[clause_index] += 1
+
+            # the first literal of a reason clause is the literal it implied
+            for other in clause if literal == -1 else clause[1:]:
+                variable = other >> 1
+
+                if not seen[variable] and levels[variable] > 0:
+                    self.bump_variable(variable)
+                    seen[variable] = True
+
+                    if levels[variable] >= decision_level:
+                        counter += 1
+                    else:
+                        learnt.append(other)
+
+            # go back along the trail to the next literal involved in the conflict
+            while not seen[trail[index] >> 1]:
+                index -= 1
+
+            literal = trail[index]
+            index -= 1
+
+            clause_index = reasons[literal >> 1]
+            seen[literal >> 1] = False
+            counter -= 1
+
+            if counter == 0:
+                break
+
+        learnt[0] = literal ^ 1
+
+        # remove literals that are implied by the other literals of the learnt clause
+        minimised = [learnt[0]]
+
+        for other in learnt[1:]:
+            reason = reasons[other >> 1]
+
+            if reason == NO_REASON or any(
+                not seen[implied >> 1] and levels[implied >> 1] > 0
+                for implied in clauses[reason][1:]
+            ):
+                minimised.append(other)
+
+        for other in learnt:
+            seen[other >> 1] = False
+
+        # backtrack to the second highest level in the clause and watch a literal from it
+        backtrack_level = 0
+
+        if len(minimised) > 1:
+            highest = 1
+
+            for k in range(2, len(minimised)):
+                if levels[minimised[k] >> 1] > levels[minimised[highest] >> 1]:
+                    highest = k
+
+            minimised[1], minimised[highest] = minimised[highest], minimised[1]
+            backtrack_level = levels[minimised[1] >> 1]
+
+        return minimised, backtrack_level
+
+    def bump_variable(self, variable: int):
+        activity = self.activity
+
+        activity[variable] += self.activity_increment
+
+        # rescale to avoid overflowing
+        if activity[variable] > 1e100:
+            for i in range(self.number_of_variables):
+                activity[i] *= 1e-100
+
+            self.activity_increment *= 1e-100
+
+            self.rebuild_heap()
+
+    def rebuild_heap(self):
+        self.heap = [
+            (-self.activity[variable], variable)
+            for variable in range(self.number_of_variables)
+            if self.values[2 * variable] == UNASSIGNED
+        ]
+
+        heapq.heapify(self.heap)
+
+    def cancel_until(self, level: int):
+        if len(self.trail_limits) <= level:
+            return
+
+        values = self.values
+        trail = self.trail
+        limit = self.trail_limits[level]
+
+        for i in range(len(trail) - 1, limit - 1, -1):
+            literal = trail[i]
+            variable = literal >> 1
+
+            values[literal] = UNASSIGNED
+            values[literal ^ 1] = UNASSIGNED
+            self.reasons[variable] = NO_REASON
+
+            # phase saving, next time this variable is chosen it gets the same value
+            self.polarity[variable] = literal & 1
+
+            heapq.heappush(self.heap, (-self.activity[variable], variable))
+
+        del trail[limit:]
+        del self.trail_limits[level:]
+
+        self.propagation_head = limit
+
+        # the heap keeps stale entries so rebuild it if it gets too big
+        if len(self.heap) > 4 * self.number_of_variables + 100:
+            self.rebuild_heap()
+
+    def pick_branch_variable(self) -> int:
+        heap = self.heap
+        values = self.values
+
+        while len(heap) > 0:
+            _, variable = heapq.heappop(heap)
+
+            if values[2 * variable] == UNASSIGNED:
+                return variable
+
+        return -1
+
+    def reduce_learnt_clauses(self):
+        # deletes the less useful half of the learnt clauses that aren't the reason for an assignment
+        candidates = []
+
+        for clause_index, activity in self.learnt_clauses.items():
+            clause = self.clauses[clause_index]
+
+            locked = (
+                self.values[clause[0]] == TRUE
+                and self.reasons[clause[0] >> 1] == clause_index
+            )
+
+            # binary clauses are cheap and always kept
+            if not locked and len(clause) > 2:
+                candidates.append((activity, clause_index))
+
+        candidates.sort()
+
+        for _, clause_index in candidates[: len(candidates) // 2]:
+            # the watches are removed lazily during propagation
+            self.clauses[clause_index] = None
+            del self.learnt_clauses[clause_index]
+
+        self.max_learnt_clauses = int(self.max_learnt_clauses * 1.1)
+
+    @staticmethod
+    def luby(i: int) -> int:
+        # the luby sequence 1, 1, 2, 1, 1, 2, 4, 1, 1, 2, ... used for restart intervals
+        size = 1
+        sequence = 0
+
+        while size < i + 1:
+            sequence += 1
+            size = 2 * size + 1
+
+        while size - 1 != i:
+            size = (size - 1) >> 1
+            sequence -= 1
+            i = i % size
+
+        return 2**sequence
+
+    def solve(self, assumptions: list[int] = None) -> bool:
+        # the assumptions are literals that are decided first, in order, at their own decision levels
+        # so the clauses learnt under them still follow from the clauses alone and are kept for the next solve
+        # returns false if there is no model with all of them true, self.ok stays true unless there is no model at all
+        if not self.ok:
+            return False
+
+        if assumptions is None:
+            assumptions = []
+
+        self.cancel_until(0)
+
+        conflicts_since_restart = 0
+        restart_limit = 100 * self.luby(self.restarts)
+
+        while True:
+            conflict = self.propagate()
+
+            if conflict != NO_REASON:
+                self.conflicts += 1
+                conflicts_since_restart += 1
+
+                # a conflict without any decisions means the clauses are unsatisfiable
+                if len(self.trail_limits) == 0:
+                    self.ok = False
+                    return False
+
+                learnt, backtrack_level = self.analyze(conflict)
+
+                self.cancel_until(backtrack_level)
+
+                # the learnt clause is unit after backtracking so it implies its first literal
+                if len(learnt) == 1:
+                    self.enqueue(learnt[0], NO_REASON)
+                else:
+                    clause_index = self.attach_clause(learnt)
+                    self.learnt_clauses[clause_index] = 0
+                    self.enqueue(learnt[0], clause_index)
+
+                self.activity_increment /= self.activity_decay
+
+                continue
+
+            # restart, the learnt clauses and saved phases are kept
+            if conflicts_since_restart >= restart_limit:
+                self.restarts += 1
+                conflicts_since_restart = 0
+                restart_limit = 100 * self.luby(self.restarts)
+
+                self.cancel_until(0)
+                continue
+
+            if len(self.learnt_clauses) >= self.max_learnt_clauses + len(self.trail):
+                self.reduce_learnt_clauses()
+
+            # the next assumption, one that is already true gets an empty decision level
+            literal = -1
+
+            while len(self.trail_limits) < len(assumptions):
+                assumption = assumptions[len(self.trail_limits)]
+
+                if self.values[assumption] == TRUE:
+                    self.trail_limits.append(len(self.trail))
+                elif self.values[assumption] == FALSE:
+                    # the clauses imply the negation of the assumption, given the assumptions before it
+                    self.cancel_until(0)
+                    return False
+                else:
+                    literal = assumption
+                    break
+
+            if literal == -1:
+                variable = self.pick_branch_variable()
+
+                # every variable is assigned without a conflict
+                if variable == -1:
+                    self.model = [
+                        self.values[2 * i] == TRUE
+                        for i in range(self.number_of_variables)
+                    ]
+
+                    self.cancel_until(0)
+                    return True
+
+                literal = 2 * variable + self.polarity[variable]
+
+            self.decisions += 1
+
+            self.trail_limits.append(len(self.trail))
+            self.enqueue(literal, NO_REASON)
@@ -0,0 +1,136 @@
+from array import array
+from operator import neg
+
+
+# Compact store for CNF clauses
+# each symbol gets an integer id (starting from 1) and a literal is the id, negated if the literal is negated
+# eg. with a = 1 and b = 2 the clause ~a || b is [-1, 2]
+# all the literals are kept in one flat array and clause i is literals[offsets[i] : offsets[i + 1]]
+class ClauseDatabase:
+    def __init__(self, deduplicate: bool = True):
+        # symbol name of each id, id 0 isn't used because it can't be negated
+        self.symbol_names: list[str] = [None]
+        self.symbol_ids: dict[str, int] = {}
+
+        # flat literals and where each clause starts
+        self.literals = array("i")
+        self.offsets = array("q", [0])
+
+        # ids of symbols that were added by the cnf conversion and aren't part of the knowledge base
+        self.auxiliary_ids: set[int] = set()
+
+        # hash of each clause to the index of the first clause with that hash, used to skip duplicates
+        # it is bigger than the clauses so it is dropped once the database is built (see drop_clause_hashes)
+        # and only worked out again if another clause is added eg. by a tell
+        self.deduplicate = deduplicate
+        self.clause_hashes: dict[int, int] = None
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self.get_clause(i)
+
+    def get_number_of_symbols(self) -> int:
+        return len(self.symbol_names) - 1
+
+    def get_symbol_id(self, name: str) -> int:
+        # adds the symbol if it isn't known yet
+        symbol_id = self.symbol_ids.get(name)
+
+        if symbol_id is None:
+            symbol_id = len(self.symbol_names)
+            self.symbol_ids[name] = symbol_id
+            self.symbol_names.append(name)
+
+        return symbol_id
+
+    def new_auxiliary_symbol(self) -> int:
+        # auxiliary names start with $ so they can never be the same as a propositional symbol
+        symbol_id = self.get_symbol_id(f"${len(self.auxiliary_ids) + 1}")
+
+        self.auxiliary_ids.add(symbol_id)
+
+        return symbol_id
+
+    def is_auxiliary(self, literal: int) -> bool:
+        return abs(literal) in self.auxiliary_ids
+
+    def get_visible_symbol_names(self, first_symbol_id: int = 1) -> list[str]:
+        # names of all the symbols that aren't auxiliary, from the first id on
+        return [
+            self.symbol_names[symbol_id]
+            for symbol_id in range(first_symbol_id, len(self.symbol_names))
+            if symbol_id not in self.auxiliary_ids
+        ]
+
+    def encode_literal(self, name: str, negated: bool) -> int:
+        symbol_id = self.get_symbol_id(name)
+
+        return -symbol_id if negated else symbol_id
+
+    def get_symbol_name(self, literal: int) -> str:
+        return self.symbol_names[abs(literal)]
+
+    def get_clause(self, i: int) -> array:
+        return self.literals[self.offsets[i] : self.offsets[i + 1]]
+
+    def add_clause(self, literals) -> bool:
+        # returns false if the clause was not added because it is a tautology or a duplicate
+        unique = set(literals)
+
+        # a clause with a literal and its negation is always true eg. a || ~a
+        if not unique.isdisjoint(map(neg, unique)):
+            return False
+
+        clause = sorted(unique)
+
+        if self.deduplicate:
+            if self.clause_hashes is None:
+                self.clause_hashes = self.get_clause_hashes()
+
+            clause_hash = hash(tuple(clause))
+
+            existing = self.clause_hashes.get(clause_hash)
+
+            if existing is not None:
+                # a hash collision with a different clause is still added, it just won't be deduplicated
+                if self.get_clause(existing).tolist() == clause:
+                    return False
+            else:
+                self.clause_hashes[clause_hash] = len(self.offsets) - 1
+
+        self.literals.extend(clause)
+        self.offsets.append(len(self.literals))
+
+        return True
+
+    def get_clause_hashes(self) -> dict[int, int]:
+        # the same as adding the clauses one by one, the first clause with each hash is kept
+        clause_hashes = {}
+
+        for i, clause in enumerate(self):
+            clause_hashes.setdefault(hash(tuple(clause)), i)
+
+        return clause_hashes
+
+    def drop_clause_hashes(self):
+        # called when no more clauses are expected
+        self.clause_hashes = None
+
+    def copy(self, clauses: bool = True) -> "ClauseDatabase":
+        # without the clauses it only has the same symbols
+        database = ClauseDatabase(self.deduplicate)
+
+        database.symbol_names = list(self.symbol_names)
+        database.symbol_ids = dict(self.symbol_ids)
+        database.auxiliary_ids = set(self.auxiliary_ids)
+
+        if not clauses:
+            return database
+
+        database.literals = array("i", self.literals)
+        database.offsets = array("q", self.offsets)
+
+        return database
@@ -22,7 +22,7 @@ class CNFClause:
 
     def is_tautology(self) -> bool:
         for symbol in self.literals:
-            if Literal(symbol.name, not symbol.negated) in self.literals:
+            if symbol.get_negation() in self.literals:
                 return True
         return False
 
@@ -33,9 +33,8 @@ class CNFClause:
         return self.literals == other.literals
 
     def copy(self) -> "CNFClause":
-        return CNFClause(
-            [Literal.from_string(str(literal)) for literal in self.literals]
-        )
+        # literals are never changed so they can be shared
+        return CNFClause(list(self.literals))
 
     def from_string(string: str) -> "CNFClause":
         literals = string.split(" || ")
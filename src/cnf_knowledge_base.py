@@ -1,61 +1,125 @@
+from src.clause_database import ClauseDatabase
 from src.cnf_clause import CNFClause
 from src.knowledge_base import KnowledgeBase
-from src.model import Model
 from src.syntax.literal import Literal
+from src.syntax.sentence import Sentence
+from src.tseitin_converter import TseitinConverter
+
+# sentences that would create more clauses than this with the distributive law are converted with Tseitin instead
+TSEITIN_THRESHOLD = 256
 
 
 class CNFKnowledgeBase:
 
-    def __init__(self, cnf_clauses: list[CNFClause], symbols: set[str] = set()):
-        self.clauses = cnf_clauses
-        self.symbols = symbols
+    def __init__(
+        self,
+        database: ClauseDatabase,
+        symbols: set[str] = None,
+        tseitin_threshold: int = TSEITIN_THRESHOLD,
+    ):
+        # the clauses are stored as integers, see ClauseDatabase
+        self.database = database
+
+        # names of all the symbols, not including auxiliary symbols
+        self.symbols = (
+            symbols if symbols is not None else set(database.get_visible_symbol_names())
+        )
+
+        self.tseitin_threshold = tseitin_threshold
+
+        # kept with the knowledge base so CDCL answers each query with the clauses it learnt for the others
+        # made the first time CDCL is asked a query, see IncrementalSolver
+        self.incremental_solver = None
 
     @classmethod
-    def from_generic_knowledge_base(cls, knowledge_base: KnowledgeBase):
-        # get the cnf version of all the sentences
-        cnf_clauses: list[CNFClause] = []
+    def from_generic_knowledge_base(
+        cls, knowledge_base: KnowledgeBase, tseitin_threshold: int = TSEITIN_THRESHOLD
+    ):
+        cnf_knowledge_base = cls(ClauseDatabase(), tseitin_threshold=tseitin_threshold)
+
+        cnf_knowledge_base.add_sentences(
+            knowledge_base.sentences,
+            knowledge_base.propositional_symbols_excluding_query,
+        )
 
-        for sentence in knowledge_base.sentences:
-            cnf_clauses.extend(sentence.get_cnfs())
+        cnf_knowledge_base.database.drop_clause_hashes()
 
-        # filter out invalid sentences
-        valid_clauses = [clause for clause in cnf_clauses if not clause.is_tautology()]
+        return cnf_knowledge_base
 
-        # filter out duplicate sentences
-        string_valid_clauses = list(set([str(clause) for clause in valid_clauses]))
-        valid_clauses: list[CNFClause] = [
-            CNFClause.from_string(clause) for clause in string_valid_clauses
-        ]
+    @classmethod
+    def from_clauses(cls, clauses: list[CNFClause]) -> "CNFKnowledgeBase":
+        database = ClauseDatabase()
 
-        # all symbols
-        symbols = set()
+        for clause in clauses:
+            database.add_clause(cls.encode_clause(database, clause))
 
-        for clause in valid_clauses:
-            for literal in clause.literals:
-                symbols.add(literal.name)
+        database.drop_clause_hashes()
 
-        return cls(valid_clauses, symbols)
+        return cls(database)
 
-    def copy(self) -> "CNFKnowledgeBase":
-        return CNFKnowledgeBase(
-            [clause.copy() for clause in self.clauses], self.symbols.copy()
-        )
+    @staticmethod
+    def encode_clause(database: ClauseDatabase, clause: CNFClause) -> list[int]:
+        return [
+            database.encode_literal(literal.name, literal.negated)
+            for literal in clause.literals
+        ]
 
-    def satisfies(self, model: Model) -> bool:
-        return all(clause.satisfies(model) for clause in self.clauses)
+    def add_sentences(self, sentences: list[Sentence], symbols: set[Literal]):
+        # all symbols, including the ones that are only in tautologies
+        # sorted so the ids are the same every time
+        for name in sorted(set(symbol.name for symbol in symbols)):
+            self.database.get_symbol_id(name)
 
-    def contains_empty_clause(self) -> bool:
-        return any(clause.is_empty() for clause in self.clauses)
+        # add the cnf version of all the sentences
+        for sentence in sentences:
+            self.add_sentence(sentence)
 
-    def simplify(self, model: Model) -> "CNFKnowledgeBase":
-        new_clauses: list[CNFClause] = []
+        self.symbols.update(self.database.get_visible_symbol_names())
 
-        # only keep the clauses that are not satisfied
-        unsatisied_clauses: list[CNFClause] = [
-            clause for clause in self.clauses if not clause.satisfies(model)
-        ]
+    def add_sentence(self, sentence: Sentence):
+        # tautologies and duplicates are filtered out by the database
+        # sentences that would blow up with the distributive law use auxiliary symbols instead
+        first_new_symbol_id = self.database.get_number_of_symbols() + 1
+
+        estimate = TseitinConverter.estimate_clause_count(
+            sentence, self.tseitin_threshold + 1
+        )
+
+        if estimate > self.tseitin_threshold:
+            TseitinConverter(self.database).add_sentence(sentence)
+        else:
+            for clause in sentence.get_cnfs():
+                self.database.add_clause(self.encode_clause(self.database, clause))
+
+        # only the symbols that the sentence added
+        self.symbols.update(self.database.get_visible_symbol_names(first_new_symbol_id))
+
+    def get_clause_strings(self):
+        # each clause as it is printed eg. a || ~b, formatted straight from the symbol names because
+        # they aren't always propositional symbols eg. DIMACS variables are numbers
+        # clauses with auxiliary symbols are hidden
+        names = self.database.symbol_names
+
+        for clause in self.database:
+            if not any(self.database.is_auxiliary(literal) for literal in clause):
+                yield " || ".join(
+                    f"~{names[-literal]}" if literal < 0 else names[literal]
+                    for literal in clause
+                )
+
+    def get_number_of_hidden_clauses(self) -> int:
+        return sum(
+            any(self.database.is_auxiliary(literal) for literal in clause)
+            for clause in self.database
+        )
+
+    def add_clauses(self, clauses: list[CNFClause]):
+        for clause in clauses:
+            self.database.add_clause(self.encode_clause(self.database, clause))
 
-        # simplify the unsatisfied clauses
-        new_clauses = [clause.simplify(model) for clause in unsatisied_clauses]
+        self.symbols.update(self.database.get_visible_symbol_names())
 
-        return CNFKnowledgeBase(new_clauses, self.symbols)
+    def copy(self) -> "CNFKnowledgeBase":
+        return CNFKnowledgeBase(
+            self.database.copy(), self.symbols.copy(), self.tseitin_threshold
+        )
@@ -0,0 +1,578 @@
+import time
+
+from src.clause_database import ClauseDatabase
+
+# names of the passes, they are run in this order
+SUBSUMPTION = "subsumption"
+PURE_LITERALS = "pure"
+FAILED_LITERALS = "probing"
+VARIABLE_ELIMINATION = "elimination"
+
+PASSES = (SUBSUMPTION, PURE_LITERALS, FAILED_LITERALS, VARIABLE_ELIMINATION)
+
+# passes run when none are chosen, the others take much longer on big knowledge bases so they have to be chosen
+# eg. variable elimination takes about 7 seconds on 150,000 random clauses
+DEFAULT_PASSES = (SUBSUMPTION,)
+
+# the default passes are skipped on knowledge bases with more clauses than this because copying the clauses into
+# the preprocessor takes longer than the search saves (about 5 seconds for 150,000 clauses)
+# passes that are chosen always run
+MAX_DEFAULT_CLAUSES = 50_000
+
+# unit propagation isn't a pass that can be turned off, it runs after every pass
+UNIT_PROPAGATION = "units"
+
+# the passes are run again while they change something, up to this many times
+MAX_ROUNDS = 5
+
+# a symbol is only eliminated if it is in at most this many clauses and none of the new clauses are longer
+# than the limit, the number of clauses can't go up either
+MAX_ELIMINATION_OCCURRENCES = 16
+MAX_RESOLVENT_LENGTH = 16
+
+# most literals that probing can look at in one pass, so it stays cheap on big knowledge bases
+PROBING_BUDGET = 1_000_000
+
+
+class PassStatistics:
+    def __init__(self, name: str):
+        self.name = name
+        self.runs = 0
+
+        # net number removed, over all the runs
+        self.clauses_removed = 0
+        self.literals_removed = 0
+        self.symbols_removed = 0
+
+        self.seconds = 0.0
+
+    def __str__(self) -> str:
+        runs = f"{self.runs} run" if self.runs == 1 else f"{self.runs} runs"
+
+        return (
+            f"{self.name}: removed {self.clauses_removed} clauses, {self.literals_removed} literals "
+            f"and {self.symbols_removed} symbols ({runs}, {self.seconds:.3f}s)"
+        )
+
+
+# Simplifies the clauses of a cnf knowledge base before a SAT solver searches them
+# - subsumption removes clauses that contain all the literals of another clause eg. a || b || c with a || b,
+#   and self subsuming resolution removes a literal from a clause when the other literals are in another clause
+#   with its negation eg. a || b || c with ~a || b becomes b || c
+# - pure literal elimination removes the clauses of a symbol that is only ever positive or only ever negated
+# - failed literal probing sets a literal and propagates units, if that gives a conflict the literal must be false
+# - bounded variable elimination replaces the clauses of a symbol with all of their resolvents on it,
+#   as long as that doesn't make more clauses
+# - unit propagation assigns the symbols of unit clauses and runs after each pass
+# without any passes (--preprocess=none) nothing is done, not even unit propagation, so the clauses aren't copied
+# and the same happens with the default passes on more than MAX_DEFAULT_CLAUSES clauses
+# subsumption, probing and unit propagation keep the same models, but pure literal elimination and variable
+# elimination only keep whether there is a model, so the result can't be used to count or list models
+# a clause is a list of integer literals like in ClauseDatabase, each clause also has a signature with a bit
+# for each of its symbols (modulo 64) so most clauses that can't be subsumed are skipped without looking at them
+class CNFPreprocessor:
+    def __init__(self, passes: list[str] = None, max_rounds: int = MAX_ROUNDS):
+        # most clauses the passes are run on, only the default passes have a limit
+        self.max_clauses = None
+
+        if passes is None:
+            passes = DEFAULT_PASSES
+            self.max_clauses = MAX_DEFAULT_CLAUSES
+
+        for name in passes:
+            if name not in PASSES:
+                raise ValueError(
+                    f"Preprocessing pass {name} not found, valid passes are: {list(PASSES)}"
+                )
+
+        # in the usual order whatever order they were given in
+        self.passes = [name for name in PASSES if name in passes]
+        self.max_rounds = max_rounds
+
+        # statistics of the last run by pass, unit propagation first
+        self.statistics: dict[str, PassStatistics] = {}
+
+        # number of clauses, literals and symbols before and after the last run
+        self.sizes_before = (0, 0, 0)
+        self.sizes_after = (0, 0, 0)
+
+        # clause of each index, removed clauses are None
+        self.clauses: list[list[int]] = []
+        self.signatures: list[int] = []
+
+        # indexes of the clauses that each literal is in
+        self.occurrences: dict[int, set[int]] = {}
+
+        # literals of the unit clauses in order, they are kept out of the clauses and added back at the end
+        self.units: list[int] = []
+        self.assigned: set[int] = set()
+
+        # units that haven't been propagated yet
+        self.pending: list[int] = []
+
+        # clauses that were added or changed since subsumption last ran
+        self.touched: set[int] = set()
+
+        self.unsatisfiable = False
+
+        # sizes of the clauses that are left
+        self.number_of_clauses = 0
+        self.number_of_literals = 0
+
+    def preprocess(self, database: ClauseDatabase) -> ClauseDatabase:
+        # returns a new database with the simplified clauses and the same symbols
+        # without any passes the database itself is returned, the solvers propagate the units themselves
+        if len(self.passes) == 0 or (
+            self.max_clauses is not None and len(database) > self.max_clauses
+        ):
+            self.statistics = {}
+            return database
+
+        self.statistics = {
+            name: PassStatistics(name) for name in (UNIT_PROPAGATION, *self.passes)
+        }
+
+        self.clauses = []
+        self.signatures = []
+        self.occurrences = {}
+        self.units = []
+        self.assigned = set()
+        self.pending = []
+        self.touched = set()
+        self.unsatisfiable = False
+        self.number_of_clauses = 0
+        self.number_of_literals = 0
+
+        self.sizes_before = (
+            len(database),
+            len(database.literals),
+            len({abs(literal) for literal in database.literals}),
+        )
+
+        for clause in database:
+            self.add_clause(clause.tolist())
+
+        self.run_pass(UNIT_PROPAGATION)
+
+        for _ in range(self.max_rounds):
+            changed = False
+
+            for name in self.passes:
+                if self.unsatisfiable:
+                    break
+
+                changed = self.run_pass(name) or changed
+                self.run_pass(UNIT_PROPAGATION)
+
+            if not changed or self.unsatisfiable:
+                break
+
+        self.sizes_after = self.get_sizes()
+
+        return self.get_database(database)
+
+    def run_pass(self, name: str) -> bool:
+        # returns whether the pass changed the clauses
+        statistics = self.statistics[name]
+
+        clauses, literals, symbols = self.get_sizes()
+        start = time.perf_counter()
+
+        if name == UNIT_PROPAGATION:
+            self.propagate()
+        elif name == SUBSUMPTION:
+            self.subsume()
+        elif name == PURE_LITERALS:
+            self.eliminate_pure_literals()
+        elif name == FAILED_LITERALS:
+            self.probe()
+        elif name == VARIABLE_ELIMINATION:
+            self.eliminate_variables()
+
+        statistics.seconds += time.perf_counter() - start
+        statistics.runs += 1
+
+        new_clauses, new_literals, new_symbols = self.get_sizes()
+
+        statistics.clauses_removed += clauses - new_clauses
+        statistics.literals_removed += literals - new_literals
+        statistics.symbols_removed += symbols - new_symbols
+
+        return (clauses, literals, symbols) != (new_clauses, new_literals, new_symbols)
+
+    def get_sizes(self) -> tuple[int, int, int]:
+        # number of clauses, literals and symbols, including the unit clauses
+        if self.unsatisfiable:
+            return 1, 0, 0
+
+        symbols = {abs(literal) for literal, found in self.occurrences.items() if found}
+        symbols.update(abs(literal) for literal in self.units)
+
+        return (
+            self.number_of_clauses + len(self.units),
+            self.number_of_literals + len(self.units),
+            len(symbols),
+        )
+
+    def get_database(self, database: ClauseDatabase) -> ClauseDatabase:
+        simplified = ClauseDatabase(database.deduplicate)
+
+        simplified.symbol_names = list(database.symbol_names)
+        simplified.symbol_ids = dict(database.symbol_ids)
+        simplified.auxiliary_ids = set(database.auxiliary_ids)
+
+        if self.unsatisfiable:
+            simplified.add_clause([])
+            return simplified
+
+        for literal in self.units:
+            simplified.add_clause([literal])
+
+        for clause in self.clauses:
+            if clause is not None:
+                simplified.add_clause(clause)
+
+        simplified.drop_clause_hashes()
+
+        return simplified
+
+    def get_statistics(self) -> list[str]:
+        # a line for the whole run then one for each pass, None if it didn't run
+        if len(self.statistics) == 0:
+            return None
+
+        clauses, literals, symbols = self.sizes_before
+        new_clauses, new_literals, new_symbols = self.sizes_after
+
+        lines = [
+            f"preprocessing: {clauses} -> {new_clauses} clauses, {literals} -> {new_literals} literals, "
+            f"{symbols} -> {new_symbols} symbols"
+        ]
+
+        return lines + [str(statistics) for statistics in self.statistics.values()]
+
+    @staticmethod
+    def get_signature(clause: list[int]) -> int:
+        signature = 0
+
+        for literal in clause:
+            signature |= 1 << (abs(literal) & 63)
+
+        return signature
+
+    def add_clause(self, clause: list[int]):
+        # duplicate literals, tautologies and clauses satisfied by a unit are left out
+        clause = list(dict.fromkeys(clause))
+
+        if any(-literal in clause for literal in clause):
+            return
+
+        if any(literal in self.assigned for literal in clause):
+            return
+
+        clause = [literal for literal in clause if -literal not in self.assigned]
+
+        if len(clause) == 0:
+            self.unsatisfiable = True
+            return
+
+        if len(clause) == 1:
+            self.assign(clause[0])
+            return
+
+        index = len(self.clauses)
+
+        self.clauses.append(clause)
+        self.signatures.append(self.get_signature(clause))
+
+        for literal in clause:
+            self.occurrences.setdefault(literal, set()).add(index)
+
+        self.touched.add(index)
+
+        self.number_of_clauses += 1
+        self.number_of_literals += len(clause)
+
+    def remove_clause(self, index: int):
+        clause = self.clauses[index]
+
+        for literal in clause:
+            self.occurrences[literal].discard(index)
+
+        self.clauses[index] = None
+        self.touched.discard(index)
+
+        self.number_of_clauses -= 1
+        self.number_of_literals -= len(clause)
+
+    def strengthen(self, index: int, literal: int):
+        # removes the literal from the clause, a clause that becomes a unit is assigned
+        clause = self.clauses[index]
+
+        if len(clause) == 2:
+            self.remove_clause(index)
+
+            self.assign(clause[0] if clause[1] == literal else clause[1])
+            return
+
+        clause.remove(literal)
+        self.occurrences[literal].discard(index)
+
+        self.signatures[index] = self.get_signature(clause)
+        self.touched.add(index)
+
+        self.number_of_literals -= 1
+
+    def assign(self, literal: int):
+        # the literal is a unit so it must be true
+        if literal in self.assigned:
+            return
+
+        if -literal in self.assigned:
+            self.unsatisfiable = True
+            return
+
+        self.assigned.add(literal)
+        self.units.append(literal)
+        self.pending.append(literal)
+
+    def propagate(self):
+        # removes the clauses satisfied by the units and their negations from the other clauses
+        while len(self.pending) > 0 and not self.unsatisfiable:
+            literal = self.pending.pop()
+
+            for index in list(self.occurrences.get(literal, ())):
+                self.remove_clause(index)
+
+            for index in list(self.occurrences.get(-literal, ())):
+                if self.clauses[index] is not None:
+                    self.strengthen(index, -literal)
+
+    def subsume(self):
+        # checks each clause that changed against the clauses that could contain it, smallest first
+        # because a small clause subsumes more
+        queue = sorted(self.touched, key=lambda index: len(self.clauses[index]))
+        self.touched = set()
+
+        for index in queue:
+            clause = self.clauses[index]
+
+            if clause is None or self.unsatisfiable:
+                continue
+
+            # every clause that it subsumes or strengthens has its symbol with the fewest clauses
+            literal = min(
+                clause,
+                key=lambda literal: len(self.occurrences[literal])
+                + len(self.occurrences.get(-literal, ())),
+            )
+
+            signature = self.signatures[index]
+
+            candidates = list(self.occurrences[literal]) + list(
+                self.occurrences.get(-literal, ())
+            )
+
+            for other in candidates:
+                other_clause = self.clauses[other]
+
+                if other == index or other_clause is None:
+                    continue
+
+                if len(other_clause) < len(clause):
+                    continue
+
+                if signature & ~self.signatures[other] != 0:
+                    continue
+
+                removed = self.get_subsumed_literal(clause, other_clause)
+
+                # the clause isn't in the other one
+                if removed is None:
+                    continue
+
+                if removed == 0:
+                    self.remove_clause(other)
+                else:
+                    self.strengthen(other, removed)
+
+                # the clause itself can't change but a unit can make it satisfied
+                if self.clauses[index] is None:
+                    break
+
+    @staticmethod
+    def get_subsumed_literal(clause: list[int], other_clause: list[int]) -> int:
+        # 0 if every literal of the clause is in the other clause so it can be removed
+        # a literal of the other clause if every literal of the clause is in it except one that is negated,
+        # then the negated literal can be removed from the other clause, otherwise None
+        other_literals = set(other_clause)
+        removed = 0
+
+        for literal in clause:
+            if literal in other_literals:
+                continue
+
+            if removed == 0 and -literal in other_literals:
+                removed = -literal
+                continue
+
+            return None
+
+        return removed
+
+    def eliminate_pure_literals(self):
+        # removing clauses can make more literals pure so the symbols of the removed clauses are checked again
+        symbols = {abs(literal) for literal in self.occurrences}
+
+        while len(symbols) > 0:
+            symbol = symbols.pop()
+
+            positive = self.occurrences.get(symbol, ())
+            negative = self.occurrences.get(-symbol, ())
+
+            if (len(positive) == 0) == (len(negative) == 0):
+                continue
+
+            for index in list(positive if len(positive) > 0 else negative):
+                symbols.update(abs(literal) for literal in self.clauses[index])
+
+                self.remove_clause(index)
+
+    def probe(self):
+        # only literals that imply something through a binary clause are worth probing
+        # ie. a literal whose negation is in a binary clause
+        budget = PROBING_BUDGET
+
+        literals = [
+            literal
+            for literal, found in self.occurrences.items()
+            if any(len(self.clauses[index]) == 2 for index in found)
+        ]
+
+        for negation in sorted(literals, key=abs):
+            literal = -negation
+
+            if literal in self.assigned or -literal in self.assigned:
+                continue
+
+            conflict, budget = self.has_conflict(literal, budget)
+
+            if conflict:
+                self.assign(-literal)
+                self.propagate()
+
+                if self.unsatisfiable:
+                    return
+
+            if budget <= 0:
+                return
+
+    def has_conflict(self, literal: int, budget: int) -> tuple[bool, int]:
+        # whether setting the literal and propagating units gives a clause with every literal false
+        # returns the budget that is left
+        true = {literal}
+        queue = [literal]
+
+        while len(queue) > 0:
+            current = queue.pop()
+
+            for index in self.occurrences.get(-current, ()):
+                clause = self.clauses[index]
+                budget -= len(clause)
+
+                unassigned = None
+                number_unassigned = 0
+                satisfied = False
+
+                for other in clause:
+                    if other in true:
+                        satisfied = True
+                        break
+
+                    if -other not in true:
+                        unassigned = other
+                        number_unassigned += 1
+
+                if satisfied or number_unassigned > 1:
+                    continue
+
+                if number_unassigned == 0:
+                    return True, budget
+
+                true.add(unassigned)
+                queue.append(unassigned)
+
+            if budget <= 0:
+                break
+
+        return False, budget
+
+    def eliminate_variables(self):
+        # symbols in the fewest clauses are tried first because they are the most likely to be eliminated
+        symbols = {abs(literal) for literal, found in self.occurrences.items() if found}
+
+        for symbol in sorted(
+            symbols,
+            key=lambda symbol: len(self.occurrences.get(symbol, ()))
+            * len(self.occurrences.get(-symbol, ())),
+        ):
+            if self.unsatisfiable:
+                return
+
+            self.eliminate_variable(symbol)
+            self.propagate()
+
+    def eliminate_variable(self, symbol: int) -> bool:
+        positive = list(self.occurrences.get(symbol, ()))
+        negative = list(self.occurrences.get(-symbol, ()))
+
+        # pure symbols are left to pure literal elimination
+        if len(positive) == 0 or len(negative) == 0:
+            return False
+
+        if len(positive) + len(negative) > MAX_ELIMINATION_OCCURRENCES:
+            return False
+
+        resolvents = []
+
+        for positive_index in positive:
+            for negative_index in negative:
+                resolvent = self.resolve(
+                    self.clauses[positive_index], self.clauses[negative_index], symbol
+                )
+
+                if resolvent is None:
+                    continue
+
+                if len(resolvent) > MAX_RESOLVENT_LENGTH:
+                    return False
+
+                resolvents.append(resolvent)
+
+                if len(resolvents) > len(positive) + len(negative):
+                    return False
+
+        for index in positive + negative:
+            self.remove_clause(index)
+
+        for resolvent in resolvents:
+            self.add_clause(resolvent)
+
+        return True
+
+    @staticmethod
+    def resolve(positive: list[int], negative: list[int], symbol: int) -> list[int]:
+        # the clause with every literal of both except the symbol, None if it is a tautology
+        resolvent = [literal for literal in positive if literal != symbol]
+        literals = set(resolvent)
+
+        for literal in negative:
+            if literal == -symbol or literal in literals:
+                continue
+
+            if -literal in literals:
+                return None
+
+            resolvent.append(literal)
+
+        return resolvent
@@ -0,0 +1,280 @@
+import gzip
+import re
+from array import array
+
+from src.clause_database import ClauseDatabase
+from src.cnf_knowledge_base import CNFKnowledgeBase
+from src.file_parser import FileParser
+
+# characters of the file that are read at once, the rest of the last line is read with them
+CHUNK_SIZE = 2**20
+
+NEWLINE = "\n"
+
+# lines after the problem line that aren't clauses, they start with a word that isn't a literal
+COMMENT_LINE = re.compile(r"^[ \t]*c(?:[ \t\r].*)?$", re.MULTILINE)
+PROBLEM_LINE = re.compile(r"^[ \t]*p(?:[ \t\r].*)?$", re.MULTILINE)
+END_LINE = re.compile(r"^[ \t]*%(?:[ \t\r].*)?$", re.MULTILINE)
+
+# comment the writer adds for each symbol so the names come back when the file is read again
+# eg. "c symbol 3 p1", symbols without one are named by their number
+SYMBOL_COMMENT = "symbol"
+
+
+# Reads and writes CNF knowledge bases in the DIMACS format used by SAT solvers, plain or gzipped
+#   c a comment
+#   p cnf 3 2
+#   1 -3 0
+#   2 3 -1 0
+# each variable is the symbol with that id in the ClauseDatabase, so the clauses go straight into it
+# the clauses are read in chunks of about a megabyte and there is no Sentence for any clause
+# so the size of the file is only limited by the size of the clause database
+# FileParser finds out if a file is DIMACS without importing this module, see FileParser.is_dimacs
+class DIMACSFile:
+
+    @staticmethod
+    def open_file(file_path: str, mode: str = "r"):
+        # text file that is gzipped when reading a gzip file or writing to a .gz path
+        if mode == "r" and FileParser.is_gzip(file_path):
+            return gzip.open(file_path, "rt")
+
+        if mode == "w" and file_path.endswith(".gz"):
+            return gzip.open(file_path, "wt")
+
+        return open(file_path, mode)
+
+    @staticmethod
+    def read(file_path: str) -> CNFKnowledgeBase:
+        database = ClauseDatabase()
+        names = {}
+
+        number_of_variables = None
+        number_of_clauses = None
+
+        with DIMACSFile.open_file(file_path) as file:
+            # the comments and the problem line are read a line at a time
+            for line_number, line in enumerate(iter(file.readline, ""), 1):
+                words = line.split()
+
+                if len(words) == 0:
+                    continue
+
+                if words[0] == "c":
+                    DIMACSFile.add_name(names, words)
+                    continue
+
+                # the end of some older benchmark files
+                if words[0] == "%":
+                    break
+
+                if words[0] != "p":
+                    raise ValueError(
+                        f"Line {line_number}: clauses must come after the problem line"
+                    )
+
+                if (
+                    len(words) != 4
+                    or words[1] != "cnf"
+                    or not words[2].isdigit()
+                    or not words[3].isdigit()
+                ):
+                    raise ValueError(
+                        f'Line {line_number}: the problem line must be "p cnf <variables> <clauses>"'
+                    )
+
+                number_of_variables, number_of_clauses = int(words[2]), int(words[3])
+
+                # every variable is a symbol even if it isn't in a clause, it still doubles the models
+                database.symbol_names.extend(
+                    str(symbol_id) for symbol_id in range(1, number_of_variables + 1)
+                )
+                database.symbol_ids = {
+                    name: symbol_id
+                    for symbol_id, name in enumerate(database.symbol_names)
+                    if symbol_id > 0
+                }
+
+                clauses_read = DIMACSFile.read_clauses(
+                    file, database, names, line_number
+                )
+
+                if clauses_read != number_of_clauses:
+                    raise ValueError(
+                        f"DIMACS file has {clauses_read} clauses but the problem line says {number_of_clauses}"
+                    )
+
+                break
+
+        if number_of_variables is None:
+            raise ValueError("DIMACS file must have a problem line")
+
+        DIMACSFile.set_names(database, names)
+
+        return CNFKnowledgeBase(database)
+
+    @staticmethod
+    def read_clauses(
+        file, database: ClauseDatabase, names: dict[int, str], line_number: int
+    ) -> int:
+        # reads the rest of the file after the problem line and returns the number of clauses
+        # the literals of a whole chunk are converted at once and each clause is copied straight into the
+        # flat arrays of the database, in the order of the file
+        # clauses that are in the file more than once are all kept, they don't change any result
+        number_of_variables = database.get_number_of_symbols()
+        literals = database.literals
+        offsets = database.offsets
+
+        clauses_read = 0
+
+        # literals of a clause that goes on into the next chunk
+        rest = array("i")
+
+        while True:
+            # whole lines so a literal is never split
+            text = file.read(CHUNK_SIZE)
+
+            if text == "":
+                break
+
+            text += file.readline()
+
+            last = END_LINE.search(text)
+
+            if last is not None:
+                text = text[: last.start()]
+
+            problem = PROBLEM_LINE.search(text)
+
+            if problem is not None:
+                raise ValueError(
+                    f"Line {line_number + text.count(NEWLINE, 0, problem.start()) + 1}: there can only be 1 problem line"
+                )
+
+            # comments are removed but not their newline so the line numbers stay the same
+            if COMMENT_LINE.search(text) is not None:
+                for words in map(str.split, COMMENT_LINE.findall(text)):
+                    DIMACSFile.add_name(names, words)
+
+                text = COMMENT_LINE.sub("", text)
+
+            try:
+                values = array("i", map(int, text.split()))
+            except (ValueError, OverflowError):
+                values = None
+
+            if values is None or (
+                len(values) > 0
+                and (
+                    max(values) > number_of_variables
+                    or -min(values) > number_of_variables
+                )
+            ):
+                raise ValueError(
+                    DIMACSFile.get_error(text, line_number, number_of_variables)
+                )
+
+            start = 0
+
+            for _ in range(values.count(0)):
+                end = values.index(0, start)
+                clause = values[start:end]
+                start = end + 1
+
+                if len(rest) > 0:
+                    clause = rest + clause
+                    rest = array("i")
+
+                clauses_read += 1
+
+                if len(set(map(abs, clause))) != len(clause):
+                    clause = DIMACSFile.remove_repeats(clause)
+
+                    if clause is None:
+                        continue
+
+                literals.extend(clause)
+                offsets.append(len(literals))
+
+            rest.extend(values[start:])
+
+            line_number += text.count(NEWLINE)
+
+            if last is not None:
+                break
+
+        # the last clause doesn't need a 0
+        if len(rest) > 0:
+            clauses_read += 1
+
+            if len(set(map(abs, rest))) != len(rest):
+                rest = DIMACSFile.remove_repeats(rest)
+
+            if rest is not None:
+                literals.extend(rest)
+                offsets.append(len(literals))
+
+        return clauses_read
+
+    @staticmethod
+    def remove_repeats(clause: array) -> array:
+        # the clause without repeated literals, or None if it has a literal and its negation eg. 1 -1
+        clause = array("i", dict.fromkeys(clause))
+
+        if len(set(map(abs, clause))) != len(clause):
+            return None
+
+        return clause
+
+    @staticmethod
+    def add_name(names: dict[int, str], words: list[str]):
+        # names written by DIMACSFile.write
+        if len(words) == 4 and words[1] == SYMBOL_COMMENT and words[2].isdigit():
+            names[int(words[2])] = words[3]
+
+    @staticmethod
+    def get_error(text: str, line_number: int, number_of_variables: int) -> str:
+        # the first line of a chunk that can't be read, the chunk is only gone through again if it failed
+        for line_number, line in enumerate(text.split(NEWLINE), line_number + 1):
+            try:
+                values = list(map(int, line.split()))
+            except ValueError:
+                return f"Line {line_number}: literals must be integers"
+
+            if len(values) > 0 and (
+                max(values) > number_of_variables or -min(values) > number_of_variables
+            ):
+                return f"Line {line_number}: the problem line only has {number_of_variables} variables"
+
+        return f"Line {line_number}: the problem line only has {number_of_variables} variables"
+
+    @staticmethod
+    def set_names(database: ClauseDatabase, names: dict[int, str]):
+        for symbol_id, name in names.items():
+            if symbol_id < 1 or symbol_id > database.get_number_of_symbols():
+                continue
+
+            del database.symbol_ids[database.symbol_names[symbol_id]]
+
+            database.symbol_names[symbol_id] = name
+            database.symbol_ids[name] = symbol_id
+
+            # auxiliary symbols of the tseitin conversion
+            if name.startswith("$"):
+                database.auxiliary_ids.add(symbol_id)
+
+    @staticmethod
+    def write(knowledge_base: CNFKnowledgeBase, file_path: str):
+        # gzipped if the path ends with .gz, each clause is written as soon as it is read from the database
+        database = knowledge_base.database
+
+        with DIMACSFile.open_file(file_path, "w") as file:
+            for symbol_id in range(1, database.get_number_of_symbols() + 1):
+                file.write(
+                    f"c {SYMBOL_COMMENT} {symbol_id} {database.symbol_names[symbol_id]}\n"
+                )
+
+            file.write(f"p cnf {database.get_number_of_symbols()} {len(database)}\n")
+
+            for clause in database:
+                file.write(" ".join(map(str, clause)))
+                file.write(" 0\n" if len(clause) > 0 else "0\n")
@@ -0,0 +1,16 @@
+from enum import Enum
+
+
+# how an algorithm that enumerates models should report them
+class EnumerationMode(Enum):
+    # keep every valid model (the default)
+    ALL = "all"
+
+    # only count the valid models, none are kept
+    COUNT = "count"
+
+    # stop at the first valid model
+    FIRST = "first"
+
+    # pass each valid model to a consumer as soon as it is found, none are kept
+    STREAM = "stream"
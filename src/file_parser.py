@@ -8,28 +8,69 @@ from src.result.dpll_result import DPLLResult
 from src.result.truth_table_checking_result import TruthTableCheckingResult
 from src.syntax.literal import Literal
 
+# first bytes of every gzip file
+GZIP_MAGIC = b"\x1f\x8b"
+
 
 class FileType(Enum):
     STANDARD = 1
     CHAINING_TEST = 2
     TRUTH_TABLE_CHECKING_TEST = 3
+    BATCH = 4
+    DIMACS = 5
 
 
 class FileParser:
 
     @staticmethod
     def parse_kb_and_query(file_path: str) -> tuple[KnowledgeBase, Query]:
+        knowledge_base_string, query_string = FileParser.read_kb_and_query(file_path)
+
+        # second line is the knowledge base
+        knowledge_base = KnowledgeBase.from_string(knowledge_base_string)
+
+        # fourth line is the query
+        query = Query.from_string(
+            query_string,
+            knowledge_base.propositional_symbols,
+            knowledge_base.symbol_table,
+        )
+
+        # return the knowledge base and query
+        return knowledge_base, query
+
+    @staticmethod
+    def read_kb_and_query(file_path: str) -> tuple[str, str]:
+        # the knowledge base and query lines without any whitespace, they aren't parsed
         with open(file_path, "r") as file:
             # get the lines from the file
             lines = file.readlines()
 
-            def remove_whitespace(s: str) -> str:
-                return (
-                    s.replace(" ", "")
-                    .replace("\t", "")
-                    .replace("\n", "")
-                    .replace("\r", "")
-                )
+            # needs at least 4 lines
+            if len(lines) < 4:
+                raise ValueError("File must have at least 4 lines")
+
+            # first line must be "TELL"
+            if lines[0].strip() != "TELL":
+                raise ValueError('First line must be "TELL"')
+
+            # third line must be "ASK"
+            if lines[2].strip() != "ASK":
+                raise ValueError('Third line must be "ASK"')
+
+            # second line is the knowledge base and fourth line is the query
+            knowledge_base = FileParser.remove_whitespace(lines[1])
+            query = FileParser.remove_whitespace(lines[3])
+
+            return knowledge_base, query
+
+    @staticmethod
+    def parse_batch(file_path: str) -> tuple[str, list[str]]:
+        # a batch file is a standard file with a query on every line after ASK
+        # the knowledge base and queries are returned as strings so they can be sent to other processes
+        with open(file_path, "r") as file:
+            # get the lines from the file
+            lines = file.readlines()
 
             # needs at least 4 lines
             if len(lines) < 4:
@@ -44,18 +85,45 @@ class FileParser:
                 raise ValueError('Third line must be "ASK"')
 
             # second line is the knowledge base
-            knowledge_base = KnowledgeBase.from_string(remove_whitespace(lines[1]))
+            knowledge_base = FileParser.remove_whitespace(lines[1])
 
-            # fourth line is the query
-            query = Query.from_string(
-                remove_whitespace(lines[3]), knowledge_base.propositional_symbols
-            )
+            # every line after ASK is a query, empty lines are skipped
+            queries = [FileParser.remove_whitespace(line) for line in lines[3:]]
+            queries = [query for query in queries if query != ""]
 
-            # return the knowledge base and query
-            return knowledge_base, query
+            if len(queries) == 0:
+                raise ValueError("File must have at least 1 query")
+
+            return knowledge_base, queries
+
+    @staticmethod
+    def remove_whitespace(s: str) -> str:
+        return s.replace(" ", "").replace("\t", "").replace("\n", "").replace("\r", "")
+
+    @staticmethod
+    def is_gzip(file_path: str) -> bool:
+        with open(file_path, "rb") as file:
+            return file.read(2) == GZIP_MAGIC
+
+    @staticmethod
+    def is_dimacs(file_path: str) -> bool:
+        # only the first line is read, a DIMACS file starts with a comment or the problem line
+        # gzip files are always DIMACS because the other files are plain text
+        # it is here instead of in DIMACSFile so other files don't have to import the DIMACS reader
+        if FileParser.is_gzip(file_path):
+            return True
+
+        with open(file_path, "r") as file:
+            words = file.readline().split()
+
+        return len(words) > 0 and (words[0] == "c" or words[:2] == ["p", "cnf"])
 
     @staticmethod
     def get_file_type(file_path: str) -> FileType:
+        # DIMACS files can be huge and gzipped so only the start of them is read
+        if FileParser.is_dimacs(file_path):
+            return FileType.DIMACS
+
         # number of lines
         number_of_lines = 0
 
@@ -70,6 +138,10 @@ class FileParser:
         if number_of_lines < 3:
             raise ValueError("File must have at least 3 lines")
 
+        # batch file, test files always have an empty line after the query
+        if number_of_lines > 4 and lines[4].strip() != "":
+            return FileType.BATCH
+
         # standard file
         if number_of_lines == 4:
             return FileType.STANDARD
@@ -93,12 +165,22 @@ class FileParser:
         ):
             raise ValueError("Chaining test file can only be used with FC or BC")
 
-        # can't use general kb for anything other than TT and DPLL
+        # can't use general kb for anything other than truth table checking, DPLL, CDCL, model counting and BDD
         if (
-            algorithm_name != "TT" and algorithm_name != "DPLL"
-        ) and file_type == FileType.TRUTH_TABLE_CHECKING_TEST:
+            algorithm_name
+            not in [
+                "TT",
+                "TT-VEC",
+                "TT-PAR",
+                "DPLL",
+                "CDCL",
+                "SHARPSAT",
+                "BDD",
+            ]
+            and file_type == FileType.TRUTH_TABLE_CHECKING_TEST
+        ):
             raise ValueError(
-                "Truth table checking test file can only be used with TT and DPLL"
+                "Truth table checking test file can only be used with TT, TT-VEC, TT-PAR, DPLL, CDCL, SHARPSAT and BDD"
             )
 
         with open(file_path, "r") as file:
@@ -151,9 +233,9 @@ class FileParser:
 
             # get expected result for general kb
             if file_type == FileType.TRUTH_TABLE_CHECKING_TEST:
-                # dppl doesn't care about models
-                if algorithm_name == "DPLL":
-                    return DPLLResult(found, None), name, description
+                # dppl and cdcl don't care about models
+                if algorithm_name == "DPLL" or algorithm_name == "CDCL":
+                    return DPLLResult(found, None, algorithm_name), name, description
 
                 # number of models
                 number_of_models = int(split[1])
@@ -168,6 +250,16 @@ class FileParser:
 
                     return TruthTableCheckingResult([], found), name, description
 
+                # model counting only gives the number of models
+                if algorithm_name == "SHARPSAT":
+                    return (
+                        TruthTableCheckingResult(
+                            [], found, number_of_models, algorithm_name=algorithm_name
+                        ),
+                        name,
+                        description,
+                    )
+
                 # get models from table
                 models = []
 
@@ -0,0 +1,17 @@
+import gc
+from contextlib import contextmanager
+
+
+# the garbage collector keeps rescanning every object when millions of new ones are created at once
+# eg. the sentences of a big knowledge base, so it can be paused while they are built
+# only use this for code that doesn't create reference cycles, it also works as a decorator
+@contextmanager
+def garbage_collection_paused():
+    enabled = gc.isenabled()
+    gc.disable()
+
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
@@ -1,6 +1,9 @@
+from src.garbage_collection import garbage_collection_paused
+from src.horn_rule_index import HornRuleIndex
 from src.knowledge_base import KnowledgeBase
 from src.syntax.literal import PositiveLiteral, Literal
 from src.syntax.sentence import AtomicSentence, Expression, HornClause, Sentence
+from src.syntax.symbol_table import SymbolTable
 
 
 class HornKnowledgeBase(KnowledgeBase):
@@ -11,51 +14,102 @@ class HornKnowledgeBase(KnowledgeBase):
         rules: list[HornClause],
         propositional_symbols: set[Literal],
         sentences: list[Sentence],
+        symbol_table: SymbolTable = None,
     ):
         self.facts: list[PositiveLiteral] = facts
         self.rules = rules
-        super().__init__(sentences, propositional_symbols)
+        super().__init__(sentences, propositional_symbols, symbol_table)
+
+        # built the first time it is needed, see get_rule_index
+        self.rule_index: HornRuleIndex = None
+
+        # number of the facts and rules above that are in the index, the rest are added to it when it is needed
+        self.indexed_facts = 0
+        self.indexed_rules = 0
+
+        # goals that backward chaining has already proven or failed, by symbol id of the rule index
+        # see BackwardChaining for what is stored
+        self.backward_chaining_memo: dict[int, tuple] = {}
 
     @classmethod
+    @garbage_collection_paused()
     def from_generic_knowledge_base(cls, knowledge_base: KnowledgeBase):
-        facts = []
-        rules = []
+        horn_knowledge_base = cls(
+            [],
+            [],
+            knowledge_base.propositional_symbols,
+            knowledge_base.sentences,
+            knowledge_base.symbol_table,
+        )
 
         for sentence in knowledge_base.sentences:
-            # facts
-            # convert atomic sentences to positive literals
-            if isinstance(sentence, AtomicSentence):
-                # get literal from kb set
-                literal = sentence.atom
-
-                if literal is None:
-                    raise ValueError(
-                        f"Symbol {sentence.atom.name} not found in propositional symbols",
-                        str(sentence),
-                    )
-
-                # must be a positive literal
-                if literal.negated:
-                    raise ValueError(
-                        f"Symbol {sentence.atom.name} must be a positive literal",
-                        str(sentence),
-                    )
-
-                facts.append(literal)
-
-            # rules
-            # convert expressions to horn clauses
-            if isinstance(sentence, Expression):
-                # get the rule from the expression
-                rule = HornClause.from_expression(
-                    sentence, knowledge_base.propositional_symbols
+            horn_knowledge_base.add_fact_or_rule(sentence)
+
+        return horn_knowledge_base
+
+    @classmethod
+    def from_rule_index(
+        cls, index: HornRuleIndex, symbol_table: SymbolTable = None
+    ) -> "HornKnowledgeBase":
+        # a knowledge base that was loaded from a cache (see KnowledgeBaseCache)
+        # its facts and rules are only in the index, facts and rules added later are kept as usual
+        horn_knowledge_base = cls([], [], set(index.symbols), [], symbol_table)
+        horn_knowledge_base.rule_index = index
+
+        return horn_knowledge_base
+
+    def add_fact_or_rule(self, sentence: Sentence):
+        # facts
+        # convert atomic sentences to positive literals
+        if isinstance(sentence, AtomicSentence):
+            # get literal from kb set
+            literal = sentence.atom
+
+            if literal is None:
+                raise ValueError(
+                    f"Symbol {sentence.atom.name} not found in propositional symbols",
+                    str(sentence),
                 )
 
-                rules.append(rule)
+            # must be a positive literal
+            if literal.negated:
+                raise ValueError(
+                    f"Symbol {sentence.atom.name} must be a positive literal",
+                    str(sentence),
+                )
 
-        return cls(
-            facts, rules, knowledge_base.propositional_symbols, knowledge_base.sentences
-        )
+            self.facts.append(literal)
+
+        # rules
+        # convert expressions to horn clauses
+        if isinstance(sentence, Expression):
+            # get the rule from the expression
+            rule = HornClause.from_expression(sentence, self.propositional_symbols)
+
+            self.rules.append(rule)
+
+    def get_rule_index(self) -> HornRuleIndex:
+        # facts and rules are only ever added so the new ones are the ones after the end of the index
+        index = self.rule_index
+
+        if index is None:
+            index = HornRuleIndex(self.facts, self.rules)
+            self.rule_index = index
+
+        elif self.indexed_facts != len(self.facts) or self.indexed_rules != len(
+            self.rules
+        ):
+            index.extend(
+                self.facts[self.indexed_facts :], self.rules[self.indexed_rules :]
+            )
+
+            # new facts or rules can change the results
+            self.backward_chaining_memo = {}
+
+        self.indexed_facts = len(self.facts)
+        self.indexed_rules = len(self.rules)
+
+        return index
 
     def __str__(self):
         facts = ", ".join([str(fact) for fact in self.facts])
@@ -0,0 +1,197 @@
+from array import array
+
+from src.syntax.literal import PositiveLiteral
+from src.syntax.sentence import HornClause
+
+
+# Integer index of the facts and rules of a horn knowledge base
+# each symbol gets an integer id (starting from 0) and each rule is its position in the list of rules
+# lists of lists are stored in compressed sparse row form as two flat arrays
+# eg. the rules with symbol s in their body are body_rules[body_offsets[s] : body_offsets[s + 1]]
+# flat arrays of integers also aren't tracked by the garbage collector, which matters with millions of rules
+# facts and rules can be added later with extend, see get_body_rules for how the new rules are found
+class HornRuleIndex:
+    def __init__(self, facts: list[PositiveLiteral], rules: list[HornClause]):
+        # literal of each id and the id of each symbol name
+        self.symbols: list[PositiveLiteral] = []
+        self.symbol_ids: dict[str, int] = {}
+
+        # whether each symbol is a fact
+        self.is_fact = bytearray()
+
+        # ids of the facts in order, including any duplicates
+        self.fact_ids = array("i")
+
+        for fact in facts:
+            self.add_fact(fact)
+
+        # head symbol and number of body symbols of each rule
+        # the size includes any duplicates eg. a & a => b has a size of 2
+        self.heads = array("i")
+        self.body_sizes = array("i")
+
+        # distinct body symbols of each rule in order
+        self.rule_body_offsets = array("q", [0])
+        self.rule_bodies = array("i")
+
+        for rule in rules:
+            self.add_rule(rule)
+
+        self.build_symbol_rules()
+
+    @classmethod
+    def from_arrays(
+        cls, symbols: list[PositiveLiteral], arrays: dict[str, array]
+    ) -> "HornRuleIndex":
+        # an index that was saved with all of its arrays (see KnowledgeBaseCache) so nothing is built again
+        index = cls([], [])
+
+        index.symbols = symbols
+        index.symbol_ids = {literal.name: i for i, literal in enumerate(symbols)}
+
+        for name, values in arrays.items():
+            setattr(index, name, values)
+
+        index.indexed_rules = len(index.heads)
+        index.indexed_symbols = len(symbols)
+
+        return index
+
+    def build_symbol_rules(self):
+        # rules with each symbol in their body
+        self.body_offsets, self.body_rules = self.transpose(
+            self.rule_body_offsets, self.rule_bodies
+        )
+
+        # rules with each symbol as their head, each rule has exactly one head
+        self.head_offsets, self.head_rules = self.transpose(
+            array("q", range(len(self.heads) + 1)), self.heads
+        )
+
+        # number of rules and symbols in the arrays above
+        self.indexed_rules = len(self.heads)
+        self.indexed_symbols = self.get_number_of_symbols()
+
+        # rules added since then by each symbol, the arrays can't be added to without moving everything after
+        self.extra_body_rules: dict[int, list[int]] = {}
+        self.extra_head_rules: dict[int, list[int]] = {}
+
+    def extend(self, facts: list[PositiveLiteral], rules: list[HornClause]):
+        # adds facts and rules after the index was built, the cost only depends on how many are added
+        for fact in facts:
+            self.add_fact(fact)
+
+        for rule in rules:
+            self.add_rule(rule)
+
+            rule_id = len(self.heads) - 1
+
+            for symbol_id in self.get_rule_body(rule_id):
+                self.extra_body_rules.setdefault(symbol_id, []).append(rule_id)
+
+            self.extra_head_rules.setdefault(self.heads[rule_id], []).append(rule_id)
+
+        # the arrays are rebuilt once there are more new rules than old ones
+        # so each rule is only rebuilt a constant number of times on average
+        if len(self.heads) - self.indexed_rules > self.indexed_rules:
+            self.build_symbol_rules()
+
+    def get_number_of_symbols(self) -> int:
+        return len(self.symbols)
+
+    def get_symbol_id(self, literal: PositiveLiteral) -> int:
+        # adds the symbol if it isn't known yet
+        symbol_id = self.symbol_ids.get(literal.name)
+
+        if symbol_id is None:
+            symbol_id = len(self.symbols)
+            self.symbol_ids[literal.name] = symbol_id
+            self.symbols.append(literal)
+            self.is_fact.append(0)
+
+        return symbol_id
+
+    def add_fact(self, fact: PositiveLiteral):
+        symbol_id = self.get_symbol_id(fact)
+
+        self.fact_ids.append(symbol_id)
+        self.is_fact[symbol_id] = 1
+
+    def add_rule(self, rule: HornClause):
+        self.heads.append(self.get_symbol_id(rule.head))
+        self.body_sizes.append(len(rule.body))
+
+        body = [self.get_symbol_id(literal) for literal in rule.body]
+
+        # only keep the first of any duplicates
+        if len(set(body)) != len(body):
+            body = list(dict.fromkeys(body))
+
+        self.rule_bodies.extend(body)
+        self.rule_body_offsets.append(len(self.rule_bodies))
+
+    def get_rule_body(self, rule: int) -> array:
+        # distinct symbols in the body of the rule
+        return self.rule_bodies[
+            self.rule_body_offsets[rule] : self.rule_body_offsets[rule + 1]
+        ]
+
+    def get_body_rules(self, symbol_id: int) -> array:
+        # rules with the symbol in their body in the order of the kb
+        return self.get_symbol_rules(
+            symbol_id, self.body_offsets, self.body_rules, self.extra_body_rules
+        )
+
+    def get_head_rules(self, symbol_id: int) -> array:
+        # rules with the symbol as their head in the order of the kb
+        return self.get_symbol_rules(
+            symbol_id, self.head_offsets, self.head_rules, self.extra_head_rules
+        )
+
+    def get_symbol_rules(
+        self,
+        symbol_id: int,
+        offsets: array,
+        values: array,
+        extra: dict[int, list[int]],
+    ) -> array:
+        # symbols that were added after the arrays were built only have extra rules
+        if symbol_id < self.indexed_symbols:
+            rules = values[offsets[symbol_id] : offsets[symbol_id + 1]]
+        else:
+            rules = array("i")
+
+        # the extra rules always come after the others in the kb
+        extra_rules = extra.get(symbol_id)
+
+        if extra_rules is not None:
+            rules.extend(extra_rules)
+
+        return rules
+
+    def transpose(self, offsets: array, values: array) -> tuple[array, array]:
+        # turns the symbols of each rule into the rules of each symbol, keeping the rules in order
+        # the symbols of rule r are values[offsets[r] : offsets[r + 1]]
+        n = self.get_number_of_symbols()
+
+        # count the rules of each symbol then turn the counts into offsets
+        symbol_offsets = array("q", bytes(8 * (n + 1)))
+
+        for symbol_id in values:
+            symbol_offsets[symbol_id + 1] += 1
+
+        for symbol_id in range(n):
+            symbol_offsets[symbol_id + 1] += symbol_offsets[symbol_id]
+
+        # fill in the rules, the next free slot of each symbol starts at its offset
+        symbol_rules = array("i", bytes(4 * len(values)))
+        next_slot = array("q", symbol_offsets)
+
+        for rule in range(len(offsets) - 1):
+            for i in range(offsets[rule], offsets[rule + 1]):
+                symbol_id = values[i]
+
+                symbol_rules[next_slot[symbol_id]] = rule
+                next_slot[symbol_id] += 1
+
+        return symbol_offsets, symbol_rules
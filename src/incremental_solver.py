@@ -0,0 +1,213 @@
+import time
+
+from src.cdcl_solver import CDCLSolver
+from src.cnf_knowledge_base import CNFKnowledgeBase
+from src.cnf_preprocessor import FAILED_LITERALS, SUBSUMPTION, CNFPreprocessor
+from src.syntax.sentence import Sentence
+from src.tseitin_converter import TseitinConverter
+
+# preprocessing passes that keep the same models, the others only keep whether there is a model
+# which would make the answers to later queries wrong
+MODEL_PRESERVING_PASSES = (SUBSUMPTION, FAILED_LITERALS)
+
+
+# A CDCL solver that keeps the clauses of a cnf knowledge base, and the clauses it learns, between queries
+# each query is decided under assumptions instead of being added to the clauses, so everything learnt only
+# follows from the knowledge base and speeds up the next queries
+# - a query whose clauses are all units is assumed directly eg. a & ~b assumes a and ~b
+# - otherwise each clause C of the query is added as ~s || C with a new selector symbol s, and s is assumed
+# - the knowledge base entails a query when there is no model of the knowledge base and the negated query
+# once a query is answered its selector is set false, which satisfies its clauses for good, and so are its
+# auxiliary symbols and symbols that aren't in the knowledge base so the solver never branches on them again
+# sentences told to the knowledge base are added to the solver before the next query
+# eg.
+#   solver = IncrementalSolver(knowledge_base)
+#   solver.is_satisfiable(query.sentence)
+#   solver.entails(query.sentence)
+class IncrementalSolver:
+    def __init__(
+        self,
+        knowledge_base: CNFKnowledgeBase,
+        passes: list[str] = MODEL_PRESERVING_PASSES,
+    ):
+        self.database = knowledge_base.database
+        self.tseitin_threshold = knowledge_base.tseitin_threshold
+
+        # the passes it was asked for, only the ones that keep the same models are run
+        self.passes = list(passes)
+        self.preprocessor = CNFPreprocessor(
+            [name for name in passes if name in MODEL_PRESERVING_PASSES]
+        )
+
+        self.solver = CDCLSolver()
+
+        # solver variable of each symbol id of the database, id 0 isn't used
+        self.variables: list[int] = [-1]
+
+        # variables of the query being answered that are set false after it
+        self.temporary_variables: list[int] = []
+
+        # the knowledge base is simplified once, when it is loaded
+        start = time.perf_counter()
+        simplified = self.preprocessor.preprocess(self.database)
+        self.preprocessing_seconds = time.perf_counter() - start
+
+        # the clauses the solver has, shown by --debug
+        self.knowledge_base = CNFKnowledgeBase(
+            simplified, knowledge_base.symbols, knowledge_base.tseitin_threshold
+        )
+
+        self.add_symbols()
+
+        self.solver.add_clauses(simplified.literals, simplified.offsets, self.variables)
+
+        # clauses of the database the solver has
+        self.number_of_clauses = len(self.database)
+
+    def add_symbols(self):
+        for _ in range(len(self.variables), self.database.get_number_of_symbols() + 1):
+            self.variables.append(self.solver.new_variable())
+
+    def update(self):
+        # adds the symbols and clauses that were added to the knowledge base since the last query
+        if self.number_of_clauses == len(self.database) and len(self.variables) == len(
+            self.database.symbol_names
+        ):
+            return
+
+        simplified = self.knowledge_base.database
+
+        # without any passes the solver has the clauses of the database itself
+        if simplified is not self.database:
+            for symbol_id in range(
+                len(self.variables), len(self.database.symbol_names)
+            ):
+                simplified.get_symbol_id(self.database.symbol_names[symbol_id])
+
+                if symbol_id in self.database.auxiliary_ids:
+                    simplified.auxiliary_ids.add(symbol_id)
+
+            for i in range(self.number_of_clauses, len(self.database)):
+                simplified.add_clause(self.database.get_clause(i))
+
+        self.add_symbols()
+
+        self.solver.add_clauses(
+            self.database.literals,
+            self.database.offsets,
+            self.variables,
+            self.number_of_clauses,
+        )
+
+        self.number_of_clauses = len(self.database)
+
+    def new_temporary_variable(self) -> int:
+        variable = self.solver.new_variable()
+        self.temporary_variables.append(variable)
+
+        return variable
+
+    def is_satisfiable(self, sentence: Sentence) -> bool:
+        # whether the knowledge base and the sentence have a model
+        return self.solve(sentence, True)
+
+    def entails(self, sentence: Sentence) -> bool:
+        # whether the sentence is true in every model of the knowledge base
+        return not self.solve(sentence, False)
+
+    def solve(self, sentence: Sentence, positive: bool) -> bool:
+        # whether the knowledge base and the sentence (or its negation) have a model
+        self.update()
+
+        try:
+            clauses = self.get_clauses(sentence, positive)
+
+            # eg. False
+            if any(len(clause) == 0 for clause in clauses):
+                return False
+
+            assumptions = [clause[0] for clause in clauses if len(clause) == 1]
+            clauses = [clause for clause in clauses if len(clause) > 1]
+
+            if len(clauses) > 0:
+                selector = CDCLSolver.to_literal(self.new_temporary_variable(), False)
+
+                for clause in clauses:
+                    self.solver.add_clause([selector ^ 1] + clause)
+
+                assumptions.append(selector)
+
+            return self.solver.solve(assumptions)
+        finally:
+            for variable in self.temporary_variables:
+                self.solver.add_clause([CDCLSolver.to_literal(variable, True)])
+
+            self.temporary_variables = []
+
+    def get_clauses(self, sentence: Sentence, positive: bool) -> list[list[int]]:
+        # clauses of the sentence or its negation as solver literals
+        # symbols that aren't in the knowledge base get temporary variables
+        counts = TseitinConverter.estimate_clause_counts(
+            sentence, self.tseitin_threshold + 1
+        )
+
+        if counts[0 if positive else 1] <= self.tseitin_threshold:
+            symbol_ids = self.database.symbol_ids
+            unknown: dict[str, int] = {}
+
+            clauses = []
+
+            for literals in sentence.get_clauses(positive):
+                clause = []
+
+                for literal in literals:
+                    symbol_id = symbol_ids.get(literal.name)
+
+                    if symbol_id is not None:
+                        variable = self.variables[symbol_id]
+                    else:
+                        variable = unknown.get(literal.name)
+
+                        if variable is None:
+                            variable = self.new_temporary_variable()
+                            unknown[literal.name] = variable
+
+                    clause.append(CDCLSolver.to_literal(variable, literal.negated))
+
+                clauses.append(clause)
+
+            return clauses
+
+        # a sentence that would blow up with the distributive law is converted in a database with the same
+        # symbols, the symbols it adds are auxiliary or not in the knowledge base
+        database = self.database.copy(False)
+        first_new_symbol_id = database.get_number_of_symbols() + 1
+
+        converter = TseitinConverter(database)
+
+        if positive:
+            converter.add_sentence(sentence)
+        else:
+            database.add_clause([-converter.encode(sentence)])
+
+        variables = self.variables + [
+            self.new_temporary_variable()
+            for _ in range(first_new_symbol_id, database.get_number_of_symbols() + 1)
+        ]
+
+        return [
+            [
+                CDCLSolver.to_literal(variables[abs(literal)], literal < 0)
+                for literal in clause
+            ]
+            for clause in database
+        ]
+
+    def get_counters(self) -> dict[str, int]:
+        # totals over all the queries
+        return {
+            "decisions": self.solver.decisions,
+            "propagations": self.solver.propagations,
+            "conflicts": self.solver.conflicts,
+            "restarts": self.solver.restarts,
+        }
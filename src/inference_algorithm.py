@@ -1,3 +1,5 @@
+from src.branching_heuristic import BranchingHeuristic
+from src.enumeration_mode import EnumerationMode
 from src.knowledge_base import KnowledgeBase
 from src.query import Query
 from src.algorithm_result import AlgorithmResult
@@ -9,3 +11,27 @@ class InferenceAlgorithm:
 
     def run(self, knowledge_base: KnowledgeBase, query: Query) -> "AlgorithmResult":
         raise NotImplementedError()
+
+    def set_enumeration_mode(self, mode: EnumerationMode, consumer=None):
+        # only algorithms that enumerate models can change how they are reported
+        raise ValueError(f"Algorithm {self.name} does not support enumeration modes")
+
+    def set_parallelism(self, workers: int = None, chunk_size: int = None):
+        # only algorithms that split their work between processes can change this
+        raise ValueError(f"Algorithm {self.name} does not support parallelism")
+
+    def set_heuristic(self, heuristic: BranchingHeuristic):
+        # only algorithms that branch on literals can choose how
+        raise ValueError(f"Algorithm {self.name} does not support branching heuristics")
+
+    def set_preprocessing(self, passes: list[str]):
+        # only algorithms that search cnf clauses for a model preprocess them
+        raise ValueError(f"Algorithm {self.name} does not support preprocessing")
+
+    def get_counters(self) -> dict[str, int]:
+        # how much work the last run did eg. decisions and conflicts, see Instrumentation
+        return {}
+
+    def get_phases(self) -> dict[str, float]:
+        # seconds of the parts of the last run that aren't the search eg. preprocessing, see Instrumentation
+        return {}
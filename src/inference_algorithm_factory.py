@@ -1,45 +1,122 @@
-from src.algorithm.backward_chaining import BackwardChaining
-from src.algorithm.dpll import DPLL
-from src.algorithm.forward_chaining import ForwardChaining
-from src.algorithm.test_algorithm import TestAlgorithm
-from src.algorithm.truth_table_checking import TruthTableChecking
+import importlib
+
 from src.file_parser import FileType
 from src.inference_algorithm import InferenceAlgorithm
 
+# module and class of each algorithm by name, a module is only imported the first time its algorithm is used
+# so eg. FC doesn't wait for numpy to be imported for TT-VEC
+ALGORITHMS = {
+    "TT": "src.algorithm.truth_table_checking:TruthTableChecking",
+    "TT-VEC": "src.algorithm.vectorised_truth_table_checking:VectorisedTruthTableChecking",
+    "TT-PAR": "src.algorithm.parallel_truth_table_checking:ParallelTruthTableChecking",
+    "FC": "src.algorithm.forward_chaining:ForwardChaining",
+    "BC": "src.algorithm.backward_chaining:BackwardChaining",
+    "DPLL": "src.algorithm.dpll:DPLL",
+    "CDCL": "src.algorithm.cdcl:CDCL",
+    "SHARPSAT": "src.algorithm.sharp_sat:SharpSAT",
+    "BDD": "src.algorithm.bdd_checking:BDDChecking",
+    "TEST": "src.algorithm.test_algorithm:TestAlgorithm",
+}
+
+# entry point group other packages add algorithms with, the name of the entry point is the algorithm name
+# eg. in their pyproject.toml
+#   [project.entry-points."iengine.algorithms"]
+#   WALKSAT = "my_package.walksat:WalkSAT"
+ENTRY_POINT_GROUP = "iengine.algorithms"
+
 
 class InferenceAlgorithmFactory:
+    # algorithms from entry points and register_inference_algorithm, found the first time they are needed
+    plugins: dict[str, str] = None
+
+    # classes of the algorithms that have been imported, by name
+    classes: dict[str, type] = {}
+
+    @staticmethod
+    def get_plugins() -> dict[str, str]:
+        if InferenceAlgorithmFactory.plugins is None:
+            # only imported when an algorithm isn't built in because it is slow to import
+            from importlib.metadata import entry_points
+
+            InferenceAlgorithmFactory.plugins = {
+                entry_point.name.upper(): entry_point.value
+                for entry_point in entry_points(group=ENTRY_POINT_GROUP)
+            }
+
+        return InferenceAlgorithmFactory.plugins
+
+    @staticmethod
+    def register_inference_algorithm(name: str, path: str):
+        # adds an algorithm without an entry point, path is "module:class"
+        # built in algorithms can't be replaced
+        if name in ALGORITHMS:
+            raise ValueError(f"Algorithm with name {name} already exists")
+
+        InferenceAlgorithmFactory.get_plugins()[name] = path
+        InferenceAlgorithmFactory.classes.pop(name, None)
+
+    @staticmethod
+    def get_inference_algorithm_names() -> list[str]:
+        # without importing any of the algorithms
+        plugins = InferenceAlgorithmFactory.get_plugins()
+
+        return list(ALGORITHMS) + [name for name in plugins if name not in ALGORITHMS]
 
     # gets the list of all implemented inference algorithms
     @staticmethod
     def get_inference_algorithms():
         algorithms: list[InferenceAlgorithm] = [
-            TruthTableChecking(),
-            ForwardChaining(),
-            BackwardChaining(),
-            DPLL(),
-            TestAlgorithm(),
+            InferenceAlgorithmFactory.get_inference_algorithm_from_name(name)
+            for name in InferenceAlgorithmFactory.get_inference_algorithm_names()
         ]
         return algorithms
 
     @staticmethod
-    def get_inference_algorithm_from_name(name: str):
-        # get known algorithms
-        algorithms = InferenceAlgorithmFactory.get_inference_algorithms()
+    def get_inference_algorithm_class(name: str) -> type:
+        algorithm_class = InferenceAlgorithmFactory.classes.get(name)
+
+        if algorithm_class is not None:
+            return algorithm_class
+
+        # entry points are only looked at for names that aren't built in
+        path = ALGORITHMS.get(name)
+
+        if path is None:
+            path = InferenceAlgorithmFactory.get_plugins().get(name)
 
-        # check all algorithms to see if we can find the one with the given name
-        for algorithm in algorithms:
-            if algorithm.name == name:
-                return algorithm
+        if path is None:
+            # get list of names of all valid algorithms to show in error message
+            names = InferenceAlgorithmFactory.get_inference_algorithm_names()
 
-        # we couldn't find the algorithm
+            # throw the error
+            raise ValueError(
+                f"Algorithm with name {name} not found, Valid algorithms are: {names}"
+            )
 
-        # get list of names of all valid algorithms to show in error message
-        names = [algorithm.name for algorithm in algorithms]
+        module_name, _, class_name = path.partition(":")
 
-        # throw the error
-        raise ValueError(
-            f"Algorithm with name {name} not found, Valid algorithms are: {names}"
-        )
+        try:
+            algorithm_class = getattr(importlib.import_module(module_name), class_name)
+        except (ImportError, AttributeError) as error:
+            raise ValueError(
+                f"Algorithm {name} couldn't be loaded from {path}: {error}"
+            )
+
+        if not isinstance(algorithm_class, type) or not issubclass(
+            algorithm_class, InferenceAlgorithm
+        ):
+            raise ValueError(
+                f"Algorithm {name} from {path} isn't an InferenceAlgorithm"
+            )
+
+        InferenceAlgorithmFactory.classes[name] = algorithm_class
+
+        return algorithm_class
+
+    @staticmethod
+    def get_inference_algorithm_from_name(name: str):
+        # a new algorithm each time because algorithms keep settings and counters of their last run
+        return InferenceAlgorithmFactory.get_inference_algorithm_class(name)()
 
     @staticmethod
     def get_inference_algorithms_from_file_type(
@@ -49,7 +126,12 @@ class InferenceAlgorithmFactory:
         if file_type == FileType.TRUTH_TABLE_CHECKING_TEST:
             return [
                 InferenceAlgorithmFactory.get_inference_algorithm_from_name("TT"),
+                InferenceAlgorithmFactory.get_inference_algorithm_from_name("TT-VEC"),
+                InferenceAlgorithmFactory.get_inference_algorithm_from_name("TT-PAR"),
                 InferenceAlgorithmFactory.get_inference_algorithm_from_name("DPLL"),
+                InferenceAlgorithmFactory.get_inference_algorithm_from_name("CDCL"),
+                InferenceAlgorithmFactory.get_inference_algorithm_from_name("SHARPSAT"),
+                InferenceAlgorithmFactory.get_inference_algorithm_from_name("BDD"),
             ]
         elif file_type == FileType.CHAINING_TEST:
             return [
@@ -0,0 +1,113 @@
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+# order the phases are shown in, any other phase is shown after them
+PHASES = ["parse", "load", "convert", "store", "normalize", "solve"]
+
+
+# Where the time of a query went, attached to the AlgorithmResult by the Runner when it is asked for
+#   parse: reading the file into the generic knowledge base
+#   load: reading the compiled knowledge base from the KnowledgeBaseCache (only with a cache)
+#   convert: building the horn, cnf or bdd knowledge base the algorithm works on (only the first query of a session)
+#   store: writing the compiled knowledge base to the cache when it wasn't there
+#   normalize: simplifying the clauses before the search, see CNFPreprocessor (DPLL and CDCL)
+#   solve: running the algorithm, not counting normalize
+# counters are from the algorithm eg. decisions and conflicts, see InferenceAlgorithm.get_counters
+# peak memory is only measured with trace_memory because tracemalloc makes everything a few times slower
+# nothing is measured when there isn't an instrumentation so it costs nothing
+class Instrumentation:
+    def __init__(self, trace_memory: bool = False):
+        self.trace_memory = trace_memory
+
+        self.phases: dict[str, float] = {}
+        self.counters: dict[str, int] = {}
+
+        # most bytes allocated at once during each phase, not counting what was allocated before it
+        self.peak_memory: dict[str, int] = {}
+
+    @contextmanager
+    def phase(self, name: str):
+        # times the code in the with block, a phase that runs more than once is added up
+        tracing = self.trace_memory and not tracemalloc.is_tracing()
+
+        if tracing:
+            tracemalloc.start()
+
+        # memory that was already allocated isn't counted
+        if self.trace_memory:
+            allocated = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+
+        start = time.perf_counter()
+
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + (
+                time.perf_counter() - start
+            )
+
+            if self.trace_memory:
+                peak = tracemalloc.get_traced_memory()[1] - allocated
+                self.peak_memory[name] = max(self.peak_memory.get(name, 0), peak)
+
+            if tracing:
+                tracemalloc.stop()
+
+    def add_algorithm(self, algorithm):
+        # counters of the last run and the parts of it that aren't the search
+        # the phases of the algorithm were part of solve so they are taken out of it
+        self.counters.update(algorithm.get_counters())
+
+        for name, seconds in algorithm.get_phases().items():
+            self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+            if "solve" in self.phases:
+                self.phases["solve"] -= seconds
+
+    def get_total_seconds(self) -> float:
+        return sum(self.phases.values())
+
+    def get_ordered_phases(self) -> list[tuple[str, float]]:
+        return sorted(
+            self.phases.items(),
+            key=lambda phase: (
+                PHASES.index(phase[0]) if phase[0] in PHASES else len(PHASES)
+            ),
+        )
+
+    def to_dict(self) -> dict:
+        values = {
+            "phases": dict(self.get_ordered_phases()),
+            "total_seconds": self.get_total_seconds(),
+            "counters": self.counters,
+        }
+
+        if self.trace_memory:
+            values["peak_memory"] = self.peak_memory
+
+        return values
+
+    def __str__(self):
+        phases = ", ".join(
+            f"{name} {seconds:.6f}s" for name, seconds in self.get_ordered_phases()
+        )
+
+        string = f"time: {self.get_total_seconds():.6f}s ({phases})"
+
+        if len(self.counters) > 0:
+            counters = ", ".join(
+                f"{name} {value}" for name, value in self.counters.items()
+            )
+            string += f"\ncounters: {counters}"
+
+        if self.trace_memory:
+            memory = ", ".join(
+                f"{name} {self.peak_memory[name] / 1024 / 1024:.2f}MB"
+                for name, _ in self.get_ordered_phases()
+                if name in self.peak_memory
+            )
+            string += f"\npeak memory: {memory}"
+
+        return string
@@ -1,5 +1,7 @@
+from src.syntax.parser import Parser
 from src.syntax.sentence import AtomicSentence, Sentence
 from src.syntax.literal import Literal
+from src.syntax.symbol_table import SymbolTable
 
 
 class KnowledgeBase:
@@ -7,6 +9,7 @@ class KnowledgeBase:
         self,
         sentences: list[Sentence] = None,
         propositional_symbols: set[Literal] = None,
+        symbol_table: SymbolTable = None,
     ):
         self.propositional_symbols = (
             propositional_symbols if propositional_symbols is not None else set()
@@ -16,6 +19,9 @@ class KnowledgeBase:
         # make a copy of the symbols set without the query because it is mutable
         self.propositional_symbols_excluding_query = set(self.propositional_symbols)
 
+        # sentences that are added later and queries are parsed with this so they share their parts
+        self.symbol_table = symbol_table if symbol_table is not None else SymbolTable()
+
     def get_fact_literals(self) -> list[Literal]:
         sentences = self.sentences
 
@@ -29,8 +35,23 @@ class KnowledgeBase:
         # they can be negated or not (eg. A and ~A are both valid)
         return fact_literals
 
+    def add_sentences(self, sentences: list[Sentence], symbols: set[Literal]):
+        # symbols are the ones found when the sentences were parsed
+        self.sentences.extend(sentences)
+        self.propositional_symbols.update(symbols)
+        self.propositional_symbols_excluding_query.update(symbols)
+
     @classmethod
     def from_string(cls, string: str) -> "KnowledgeBase":
+        symbol_table = SymbolTable()
+
+        return cls(*cls.parse_sentences(string, symbol_table), symbol_table)
+
+    @staticmethod
+    def parse_sentences(
+        string: str, symbol_table: SymbolTable = None
+    ) -> tuple[list[Sentence], set[Literal]]:
+        # gets the sentences separated by ";" and the symbols in them
         propositional_symbols = set()
 
         # remove all spaces in the string
@@ -46,12 +67,11 @@ class KnowledgeBase:
         sentences = [sentence for sentence in sentences if sentence != ""]
 
         # get the actual sentences and update the propositional symbols set
-        sentences = [
-            Sentence.from_string(sentence, propositional_symbols)
-            for sentence in sentences
-        ]
+        sentences = Parser(propositional_symbols, symbol_table).parse_sentences(
+            sentences
+        )
 
-        return cls(sentences, propositional_symbols)
+        return sentences, propositional_symbols
 
     def get_symbol_str(self) -> str:
         return "\n".join([str(symbol) for symbol in self.propositional_symbols])
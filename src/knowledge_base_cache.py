@@ -0,0 +1,391 @@
+import hashlib
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from array import array
+
+from src.clause_database import ClauseDatabase
+from src.cnf_knowledge_base import TSEITIN_THRESHOLD, CNFKnowledgeBase
+from src.horn_knowledge_base import HornKnowledgeBase
+from src.horn_rule_index import HornRuleIndex
+from src.syntax.symbol_table import SymbolTable
+
+# changed whenever the layout of an entry changes so old entries are never read
+FORMAT_VERSION = 2
+
+MAGIC = b"IKBC"
+
+# bytes of the checksum of everything after the header
+CHECKSUM_SIZE = 16
+
+# magic, version, byte order (0 little, 1 big), number of sections and checksum
+HEADER = struct.Struct(f"<4sIBI{CHECKSUM_SIZE}s")
+
+# type code, item size, offset and length in bytes of each section
+SECTION = struct.Struct("<cBQQ")
+
+# type code of the section with the symbol names, which are joined by newlines
+NAMES = b"n"
+
+# type code of a bytearray section
+BYTES = b"b"
+
+# compiled forms of a knowledge base
+CNF = "cnf"
+HORN = "horn"
+
+# arrays of each form and their type codes, in the order they are saved
+CNF_ARRAYS = [("literals", "i"), ("offsets", "q"), ("auxiliary_ids", "i")]
+
+HORN_ARRAYS = [
+    ("is_fact", None),
+    ("fact_ids", "i"),
+    ("heads", "i"),
+    ("body_sizes", "i"),
+    ("rule_body_offsets", "q"),
+    ("rule_bodies", "i"),
+    ("body_offsets", "q"),
+    ("body_rules", "i"),
+    ("head_offsets", "q"),
+    ("head_rules", "i"),
+]
+
+# form that each algorithm works on, algorithms that work on the generic knowledge base can't use the cache
+FORMS = {"FC": HORN, "BC": HORN, "DPLL": CNF, "CDCL": CNF, "SHARPSAT": CNF}
+
+# entries are evicted once they take up more than this many bytes
+MAX_BYTES = 256 * 1024 * 1024
+
+
+# Directory of compiled knowledge bases so the same knowledge base doesn't need to be parsed and converted again
+# each entry is the symbol names and integer arrays of the cnf clause database or the horn rule index
+# in one binary file, named by a hash of the knowledge base without whitespace and the form
+# the arrays are copied straight out of a memory map of the file, nothing is parsed
+# an entry that doesn't match its checksum, the format version or the byte order is deleted and treated as a miss
+# entries are written to a temporary file and renamed so other processes only ever see whole entries
+# and the least recently used entries are deleted once the directory is bigger than max_bytes
+# eg.
+#   cache = KnowledgeBaseCache(".iengine_cache")
+#   key = cache.get_key("a; a => b;")
+#   knowledge_base = cache.load_cnf(key)
+class KnowledgeBaseCache:
+    def __init__(self, directory: str, max_bytes: int = MAX_BYTES):
+        if max_bytes < 0:
+            raise ValueError("The cache size can't be negative")
+
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def get_key(knowledge_base: str) -> str:
+        # the same knowledge base written with different whitespace or extra ";" has the same key
+        sentences = "".join(knowledge_base.split()).split(";")
+        normalised = ";".join(sentence for sentence in sentences if sentence != "")
+
+        # a different threshold gives different clauses
+        digest = hashlib.sha256(
+            f"{FORMAT_VERSION};{TSEITIN_THRESHOLD};{normalised}".encode()
+        )
+
+        return digest.hexdigest()
+
+    def get_path(self, key: str, form: str) -> str:
+        return os.path.join(self.directory, f"{key}.{form}")
+
+    def load(self, key: str, form: str) -> CNFKnowledgeBase | HornKnowledgeBase:
+        return self.load_cnf(key) if form == CNF else self.load_horn(key)
+
+    def store(
+        self,
+        key: str,
+        form: str,
+        knowledge_base: CNFKnowledgeBase | HornKnowledgeBase,
+    ):
+        if form == CNF:
+            self.store_cnf(key, knowledge_base)
+        else:
+            self.store_horn(key, knowledge_base)
+
+    def load_cnf(self, key: str) -> CNFKnowledgeBase:
+        # returns None if the knowledge base isn't in the cache
+        entry = self.read_entry(key, CNF)
+
+        if entry is None:
+            return None
+
+        names, arrays = entry
+
+        database = ClauseDatabase()
+        database.symbol_names = [None] + names
+        database.symbol_ids = {name: i for i, name in enumerate(names, 1)}
+        database.literals = arrays["literals"]
+        database.offsets = arrays["offsets"]
+        database.auxiliary_ids = set(arrays["auxiliary_ids"])
+
+        return CNFKnowledgeBase(database)
+
+    def store_cnf(self, key: str, knowledge_base: CNFKnowledgeBase):
+        database = knowledge_base.database
+
+        arrays = {
+            "literals": database.literals,
+            "offsets": database.offsets,
+            "auxiliary_ids": array("i", sorted(database.auxiliary_ids)),
+        }
+
+        self.write_entry(key, CNF, database.symbol_names[1:], CNF_ARRAYS, arrays)
+
+    def load_horn(self, key: str) -> HornKnowledgeBase:
+        # returns None if the knowledge base isn't in the cache
+        entry = self.read_entry(key, HORN)
+
+        if entry is None:
+            return None
+
+        names, arrays = entry
+
+        # the symbols are shared with the query like a parsed knowledge base
+        symbol_table = SymbolTable()
+        symbols = [symbol_table.get_literal(name) for name in names]
+
+        return HornKnowledgeBase.from_rule_index(
+            HornRuleIndex.from_arrays(symbols, arrays), symbol_table
+        )
+
+    def store_horn(self, key: str, knowledge_base: HornKnowledgeBase):
+        index = knowledge_base.get_rule_index()
+
+        # rules added since the index was built aren't in its arrays yet
+        if len(index.heads) != index.indexed_rules:
+            index.build_symbol_rules()
+
+        arrays = {name: getattr(index, name) for name, _ in HORN_ARRAYS}
+        names = [literal.name for literal in index.symbols]
+
+        self.write_entry(key, HORN, names, HORN_ARRAYS, arrays)
+
+    def read_entry(
+        self, key: str, form: str
+    ) -> tuple[list[str], dict[str, array | bytearray]]:
+        # returns None if there isn't a valid entry
+        path = self.get_path(key, form)
+        layout = CNF_ARRAYS if form == CNF else HORN_ARRAYS
+
+        try:
+            with open(path, "rb") as file:
+                with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    # caught before the map is closed, the traceback would keep views of it open
+                    # eg. a section that isn't a whole number of items or names that aren't utf-8
+                    try:
+                        entry = self.read_sections(mapped, layout)
+                    except ValueError:
+                        entry = None
+        except (OSError, ValueError):
+            # another process deleted it or it is empty
+            return None
+
+        if entry is None:
+            # written by another version or on another machine
+            self.remove(path)
+            return None
+
+        # it was just used so it is evicted last
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+        return entry
+
+    @staticmethod
+    def read_sections(
+        mapped: mmap.mmap, layout: list[tuple[str, str]]
+    ) -> tuple[list[str], dict[str, array | bytearray]]:
+        # returns None if the entry doesn't match the layout
+        if len(mapped) < HEADER.size:
+            return None
+
+        magic, version, byte_order, number_of_sections, checksum = HEADER.unpack_from(
+            mapped, 0
+        )
+
+        if (
+            magic != MAGIC
+            or version != FORMAT_VERSION
+            or byte_order != (sys.byteorder == "big")
+            or number_of_sections != len(layout) + 1
+            or len(mapped) < HEADER.size + number_of_sections * SECTION.size
+        ):
+            return None
+
+        view = memoryview(mapped)
+
+        # a corrupt entry could still have the right layout, eg. a symbol name or a literal that changed
+        with view[HEADER.size :] as data:
+            if KnowledgeBaseCache.get_checksum([data]) != checksum:
+                return None
+
+        sections = []
+
+        for i in range(number_of_sections):
+            type_code, item_size, offset, length = SECTION.unpack_from(
+                mapped, HEADER.size + i * SECTION.size
+            )
+
+            if offset + length > len(mapped):
+                return None
+
+            sections.append((type_code, item_size, view[offset : offset + length]))
+
+        type_code, _, data = sections[0]
+
+        if type_code != NAMES:
+            return None
+
+        names = bytes(data).decode().split("\n") if len(data) > 0 else []
+        arrays = {}
+
+        for (name, expected), (type_code, item_size, data) in zip(layout, sections[1:]):
+            if expected is None:
+                if type_code != BYTES:
+                    return None
+
+                arrays[name] = bytearray(data)
+                continue
+
+            values = array(expected)
+
+            if type_code.decode() != expected or item_size != values.itemsize:
+                return None
+
+            # a copy of the bytes, the arrays are changed when sentences are added
+            values.frombytes(data)
+            arrays[name] = values
+
+        return names, arrays
+
+    def write_entry(
+        self,
+        key: str,
+        form: str,
+        names: list[str],
+        layout: list[tuple[str, str]],
+        arrays: dict[str, array | bytearray],
+    ):
+        # writes to a temporary file first and renames it so readers never see half an entry
+        sections = [(NAMES, 1, "\n".join(names).encode())]
+
+        for name, type_code in layout:
+            values = arrays[name]
+
+            if type_code is None:
+                sections.append((BYTES, 1, bytes(values)))
+            else:
+                sections.append((type_code.encode(), values.itemsize, values))
+
+        header_size = HEADER.size + SECTION.size * len(sections)
+
+        table = []
+        offset = header_size
+
+        for type_code, item_size, values in sections:
+            length = len(values) * item_size if item_size > 1 else len(values)
+            table.append(SECTION.pack(type_code, item_size, offset, length))
+            offset += length
+
+        checksum = self.get_checksum(table + [values for _, _, values in sections])
+
+        descriptor, temporary_path = tempfile.mkstemp(
+            dir=self.directory, prefix=".", suffix=".tmp"
+        )
+
+        try:
+            with os.fdopen(descriptor, "wb") as file:
+                file.write(
+                    HEADER.pack(
+                        MAGIC,
+                        FORMAT_VERSION,
+                        sys.byteorder == "big",
+                        len(sections),
+                        checksum,
+                    )
+                )
+                file.writelines(table)
+
+                for _, _, values in sections:
+                    file.write(values)
+
+            os.replace(temporary_path, self.get_path(key, form))
+        except OSError:
+            # eg. the entry is open in another process on windows, it will be stored next time
+            self.remove(temporary_path)
+            return
+
+        self.evict()
+
+    @staticmethod
+    def get_checksum(parts: list) -> bytes:
+        # of anything with the buffer protocol eg. bytes, arrays and views of the memory map
+        checksum = hashlib.blake2b(digest_size=CHECKSUM_SIZE)
+
+        for part in parts:
+            checksum.update(part)
+
+        return checksum.digest()
+
+    def get_entries(self) -> list[os.DirEntry]:
+        # temporary files that are being written are skipped
+        with os.scandir(self.directory) as entries:
+            return [
+                entry
+                for entry in entries
+                if entry.is_file() and not entry.name.startswith(".")
+            ]
+
+    def get_size(self) -> int:
+        size = 0
+
+        for entry in self.get_entries():
+            try:
+                size += entry.stat().st_size
+            except OSError:
+                pass
+
+        return size
+
+    def evict(self):
+        # deletes the least recently used entries until the cache fits
+        entries = []
+
+        for entry in self.get_entries():
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+        size = sum(entry[1] for entry in entries)
+
+        for _, entry_size, path in sorted(entries):
+            if size <= self.max_bytes:
+                break
+
+            self.remove(path)
+            size -= entry_size
+
+    def clear(self):
+        for entry in self.get_entries():
+            self.remove(entry.path)
+
+    @staticmethod
+    def remove(path: str):
+        # another process may have removed it already
+        try:
+            os.remove(path)
+        except OSError:
+            pass
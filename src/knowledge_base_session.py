@@ -0,0 +1,144 @@
+from src.algorithm_result import AlgorithmResult
+from src.enumeration_mode import EnumerationMode
+from src.inference_algorithm import InferenceAlgorithm
+from src.knowledge_base import KnowledgeBase
+from src.query import HornKnowledgeBaseQuery, Query
+
+# algorithms that work on the cnf knowledge base
+CNF_ALGORITHMS = ("DPLL", "CDCL", "SHARPSAT")
+
+
+# A knowledge base that is kept between queries
+# the horn and cnf versions of the knowledge base are only built the first time an algorithm needs them
+# and then kept up to date by tell, so the cost of a tell only depends on the sentences that are added
+# eg.
+#   session = KnowledgeBaseSession.from_string("a; a => b;")
+#   session.tell("b => c;")
+#   session.ask("c", ForwardChaining())
+class KnowledgeBaseSession:
+    def __init__(self, knowledge_base: KnowledgeBase = None):
+        self.knowledge_base = (
+            knowledge_base if knowledge_base is not None else KnowledgeBase()
+        )
+
+        # used by FC and BC, the rule index and the backward chaining memo are kept with it
+        self.horn_knowledge_base: "HornKnowledgeBase" = None
+
+        # used by DPLL, CDCL and SHARPSAT
+        self.cnf_knowledge_base: "CNFKnowledgeBase" = None
+
+        # used by BDD
+        self.bdd_knowledge_base: "BDDKnowledgeBase" = None
+
+    @classmethod
+    def from_string(cls, string: str) -> "KnowledgeBaseSession":
+        return cls(KnowledgeBase.from_string(string))
+
+    def tell(self, string: str):
+        # sentences separated by ";", the same as the line after TELL
+        sentences, symbols = KnowledgeBase.parse_sentences(
+            string, self.knowledge_base.symbol_table
+        )
+
+        self.knowledge_base.add_sentences(sentences, symbols)
+
+        if self.horn_knowledge_base is not None:
+            try:
+                for sentence in sentences:
+                    self.horn_knowledge_base.add_fact_or_rule(sentence)
+            except ValueError:
+                # the knowledge base isn't horn anymore, FC and BC will raise the error when it is built again
+                self.horn_knowledge_base = None
+
+        if self.cnf_knowledge_base is not None:
+            self.cnf_knowledge_base.add_sentences(sentences, symbols)
+
+        if self.bdd_knowledge_base is not None:
+            self.bdd_knowledge_base.compile_sentences(sentences)
+
+    def ask(
+        self,
+        query: str | Query,
+        algorithm: InferenceAlgorithm,
+        mode: EnumerationMode = None,
+        consumer=None,
+    ) -> AlgorithmResult:
+        if isinstance(query, str):
+            query = self.parse_query(query)
+
+        # change how models are reported eg. only count them
+        if mode is not None:
+            algorithm.set_enumeration_mode(mode, consumer)
+
+        knowledge_base = self.get_knowledge_base(algorithm)
+
+        # run the algorithm
+        return algorithm.run(knowledge_base, self.convert_query(query, algorithm))
+
+    def entails(self, query: str | Query) -> bool:
+        # whether the query is true in every model of the knowledge base, answered by the incremental
+        # CDCL solver of the cnf knowledge base so it learns from every query, see IncrementalSolver
+        if isinstance(query, str):
+            query = self.parse_query(query)
+
+        # imported here so sessions that never use CDCL don't import it
+        from src.algorithm.cdcl import CDCL
+
+        return CDCL().entails(self.get_cnf_knowledge_base(), query)
+
+    @staticmethod
+    def convert_query(query: Query, algorithm: InferenceAlgorithm) -> Query:
+        # convert to horn query if algorithm is FC or BC
+        if algorithm.name == "FC" or algorithm.name == "BC":
+            positive_literal = query.sentence.atom
+
+            return HornKnowledgeBaseQuery(positive_literal)
+
+        return query
+
+    def parse_query(self, string: str) -> Query:
+        # query symbols aren't added to the knowledge base
+        return Query.from_string(string, set(), self.knowledge_base.symbol_table)
+
+    def get_knowledge_base(self, algorithm: InferenceAlgorithm) -> KnowledgeBase:
+        # the version of the knowledge base the algorithm works on, converted the first time it is needed
+        # FC and BC only work on horn kb so we make some conversions
+        if algorithm.name == "FC" or algorithm.name == "BC":
+            return self.get_horn_knowledge_base()
+        elif algorithm.name in CNF_ALGORITHMS:
+            return self.get_cnf_knowledge_base()
+        elif algorithm.name == "BDD":
+            return self.get_bdd_knowledge_base()
+
+        return self.knowledge_base
+
+    # each knowledge base is imported here so sessions only import the ones their algorithms use
+    def get_horn_knowledge_base(self) -> "HornKnowledgeBase":
+        from src.horn_knowledge_base import HornKnowledgeBase
+
+        if self.horn_knowledge_base is None:
+            self.horn_knowledge_base = HornKnowledgeBase.from_generic_knowledge_base(
+                self.knowledge_base
+            )
+
+        return self.horn_knowledge_base
+
+    def get_cnf_knowledge_base(self) -> "CNFKnowledgeBase":
+        from src.cnf_knowledge_base import CNFKnowledgeBase
+
+        if self.cnf_knowledge_base is None:
+            self.cnf_knowledge_base = CNFKnowledgeBase.from_generic_knowledge_base(
+                self.knowledge_base
+            )
+
+        return self.cnf_knowledge_base
+
+    def get_bdd_knowledge_base(self) -> "BDDKnowledgeBase":
+        from src.bdd_knowledge_base import BDDKnowledgeBase
+
+        if self.bdd_knowledge_base is None:
+            self.bdd_knowledge_base = BDDKnowledgeBase.from_generic_knowledge_base(
+                self.knowledge_base
+            )
+
+        return self.bdd_knowledge_base
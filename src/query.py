@@ -1,5 +1,6 @@
 from src.syntax.literal import Literal, PositiveLiteral
 from src.syntax.sentence import AtomicSentence, Sentence
+from src.syntax.symbol_table import SymbolTable
 
 
 class Query:
@@ -7,8 +8,10 @@ class Query:
         self.sentence = sentence
 
     @classmethod
-    def from_string(cls, string: str, known_symbols: set[Literal]) -> "Query":
-        return cls(Sentence.from_string(string, known_symbols))
+    def from_string(
+        cls, string: str, known_symbols: set[Literal], symbol_table: SymbolTable = None
+    ) -> "Query":
+        return cls(Sentence.from_string(string, known_symbols, symbol_table))
 
     def __str__(self) -> str:
         return str(self.sentence)
@@ -1,19 +1,32 @@
 from src.algorithm_result import AlgorithmResult
-from src.cnf_knowledge_base import CNFKnowledgeBase
+
 
 class DPLLResult(AlgorithmResult):
-    def __init__(self, satisfiable: bool, knowledge_base: CNFKnowledgeBase):
-        super().__init__("DPLL")
+    def __init__(
+        self,
+        satisfiable: bool,
+        knowledge_base: "CNFKnowledgeBase",
+        algorithm_name: str = "DPLL",
+        preprocessing_statistics: list[str] = None,
+        search_statistics: str = None,
+    ):
+        super().__init__(algorithm_name)
         self.satisfiable = satisfiable
         self.knowledge_base = knowledge_base
 
+        # a line for each preprocessing pass, see CNFPreprocessor
+        self.preprocessing_statistics = preprocessing_statistics
+
+        # size of the search tree, see DPLL
+        self.search_statistics = search_statistics
+
     def __str__(self) -> str:
         yes_no_str = "YES" if self.satisfiable else "NO"
         return f"{yes_no_str}"
-    
-    def __eq__(self, other: 'DPLLResult') -> bool:
+
+    def __eq__(self, other: "DPLLResult") -> bool:
         return self.satisfiable == other.satisfiable
-    
+
     def debug(self) -> str:
         string = self.__str__()
 
@@ -24,10 +37,23 @@ class DPLLResult(AlgorithmResult):
         string += "\n"
         string += "\n"
 
-        string += "DPLL Knowledge Base:\n"
+        string += f"{self.algorithm_name} Knowledge Base:\n"
 
-        for clause in self.knowledge_base.clauses:
+        for clause in self.knowledge_base.get_clause_strings():
             string += f"{clause}\n"
 
-        return string
+        # clauses with auxiliary symbols from the tseitin conversion aren't shown
+        hidden = self.knowledge_base.get_number_of_hidden_clauses()
+
+        if hidden > 0:
+            string += f"({hidden} clauses with auxiliary symbols are not shown)\n"
+
+        if self.preprocessing_statistics is not None:
+            string += "\n"
+            string += "\n".join(self.preprocessing_statistics)
+            string += "\n"
 
+        if self.search_statistics is not None:
+            string += f"{self.search_statistics}\n"
+
+        return string
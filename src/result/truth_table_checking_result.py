@@ -3,8 +3,15 @@ from src.model import Model
 from src.syntax.literal import Literal
 
 class TruthTableCheckingResult(AlgorithmResult):
-    def __init__(self, models: list[Model], found: bool,):
-        super().__init__("TT")
+    def __init__(
+        self,
+        models: list[Model],
+        found: bool,
+        number_of_models: int = None,
+        is_complete: bool = True,
+        algorithm_name: str = "TT",
+    ):
+        super().__init__(algorithm_name)
         self.found = found
 
         # sort
@@ -12,18 +19,36 @@ class TruthTableCheckingResult(AlgorithmResult):
 
         self.models = models
 
+        # if the models were counted without keeping them then the count is given separately
+        self.number_of_models = (
+            len(models) if number_of_models is None else number_of_models
+        )
+
+        # the search can stop early (eg. at the first model) so the count isn't known
+        self.is_complete = is_complete
+
+        # whether the models list has every valid model in it
+        self.models_kept = number_of_models is None and is_complete
+
 
     def __str__(self) -> str:
         # yes or no
         found = "YES" if self.found else "NO"
 
-        number_of_models = len(self.models)
+        # we don't know how many models there are
+        if not self.is_complete:
+            return found
 
-        return f"{found}: {number_of_models}"
+        return f"{found}: {self.number_of_models}"
 
     def get_truth_table_str(self):
         string = ""
 
+        # the models were only counted
+        if len(self.models) == 0 and not self.models_kept:
+            string += "The models were not kept so there is no table to print"
+            return string
+
         # get all the symbols
         if len(self.models) == 0:
             string += "There were no suitable models found to print the table"
@@ -58,7 +83,19 @@ class TruthTableCheckingResult(AlgorithmResult):
         return string
 
     def __eq__(self, other: 'TruthTableCheckingResult') -> bool: 
-        return self.found == other.found and self.models == other.models
+        if self.found != other.found:
+            return False
+
+        # counts can only be compared if both searches checked every row
+        if self.is_complete and other.is_complete:
+            if self.number_of_models != other.number_of_models:
+                return False
+
+        # models can only be compared if both kept them
+        if self.models_kept and other.models_kept:
+            return self.models == other.models
+
+        return True
     
     def debug(self):
         str = super().debug()
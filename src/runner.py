@@ -1,53 +1,345 @@
+from contextlib import nullcontext
+
 from src.algorithm_result import AlgorithmResult
-from src.cnf_knowledge_base import CNFKnowledgeBase
+from src.enumeration_mode import EnumerationMode
 from src.file_parser import FileParser, FileType
-from src.horn_knowledge_base import HornKnowledgeBase
 from src.inference_algorithm import InferenceAlgorithm
+from src.instrumentation import Instrumentation
 from src.knowledge_base import KnowledgeBase
-from src.query import HornKnowledgeBaseQuery, Query
-from src.test.unit_test_result import UnitTestResult
+from src.knowledge_base_session import CNF_ALGORITHMS, KnowledgeBaseSession
+from src.query import Query
+from src.syntax.symbol_table import SymbolTable
+
+# the DIMACS reader, the cache, the process pool and the test results are only imported by the runs
+# that use them, so answering a query doesn't wait for them (see StartupBenchmark)
+
+# state of each worker process answering batch queries, set once by the pool initializer
+worker_state = {}
+
+
+def init_batch_worker(
+    knowledge_base: str,
+    algorithm: InferenceAlgorithm,
+    mode: EnumerationMode,
+    instrumented: bool = False,
+    trace_memory: bool = False,
+):
+    # each worker parses and compiles the knowledge base once for all of its queries
+    # the parse is timed in the instrumentation of the first query the worker answers
+    instrumentation = Instrumentation(trace_memory) if instrumented else None
+
+    worker_state["session"] = Runner.start_session(knowledge_base, instrumentation)
+    worker_state["algorithm"] = algorithm
+    worker_state["mode"] = mode
+    worker_state["instrumented"] = instrumented
+    worker_state["trace_memory"] = trace_memory
+    worker_state["instrumentation"] = instrumentation
+
+
+def answer_batch_query(query: str) -> str | tuple[str, Instrumentation]:
+    if not worker_state["instrumented"]:
+        result = worker_state["session"].ask(
+            query, worker_state["algorithm"], worker_state["mode"]
+        )
+
+        # results are sent back as their output line because the knowledge base in some results is big
+        return str(result)
+
+    instrumentation = worker_state["instrumentation"] or Instrumentation(
+        worker_state["trace_memory"]
+    )
+    worker_state["instrumentation"] = None
+
+    result = Runner.ask(
+        worker_state["session"],
+        query,
+        worker_state["algorithm"],
+        worker_state["mode"],
+        instrumentation=instrumentation,
+    )
+
+    return str(result), instrumentation
 
 
 class Runner:
 
     @staticmethod
     def run_from_file_path(
-        algorithm: InferenceAlgorithm, file_path: str
+        algorithm: InferenceAlgorithm,
+        file_path: str,
+        mode: EnumerationMode = None,
+        consumer=None,
+        instrumentation: Instrumentation = None,
+        cache: "KnowledgeBaseCache" = None,
     ) -> AlgorithmResult:
+        # a DIMACS file is already cnf so it doesn't need the cache
+        if FileParser.is_dimacs(file_path):
+            return Runner.run_dimacs(
+                algorithm, file_path, mode, consumer, instrumentation
+            )
+
+        # the compiled knowledge base is loaded from the cache instead when the algorithm can use it
+        if cache is not None:
+            from src.knowledge_base_cache import FORMS
+
+            if algorithm.name in FORMS:
+                return Runner.run_cached(
+                    algorithm, file_path, cache, mode, consumer, instrumentation
+                )
+
         # get the knowledge base and query from the file
-        knowledge_base, query = FileParser.parse_kb_and_query(file_path)
+        if instrumentation is None:
+            knowledge_base, query = FileParser.parse_kb_and_query(file_path)
+        else:
+            with instrumentation.phase("parse"):
+                knowledge_base, query = FileParser.parse_kb_and_query(file_path)
 
-        return Runner.run_algorithm_from_default(algorithm, knowledge_base, query)
+        return Runner.run_algorithm_from_default(
+            algorithm, knowledge_base, query, mode, consumer, instrumentation
+        )
 
     @staticmethod
-    def run_algorithm_from_default(
-        algorithm: InferenceAlgorithm, knowledge_base: KnowledgeBase, query: Query
+    def run_cached(
+        algorithm: InferenceAlgorithm,
+        file_path: str,
+        cache: "KnowledgeBaseCache",
+        mode: EnumerationMode = None,
+        consumer=None,
+        instrumentation: Instrumentation = None,
     ) -> AlgorithmResult:
-        # only works on horn kb so we make some conversions
-        if algorithm.name == "FC" or algorithm.name == "BC":
+        # only the query is parsed when the knowledge base is in the cache
+        # otherwise it is parsed and converted as usual and stored for next time
+        from src.knowledge_base_cache import FORMS, HORN
 
-            # convert to horn kb if algorithm is FC or BC
-            knowledge_base = HornKnowledgeBase.from_generic_knowledge_base(
-                knowledge_base
+        form = FORMS[algorithm.name]
+
+        with Runner.measure(instrumentation, "parse"):
+            knowledge_base_string, query_string = FileParser.read_kb_and_query(
+                file_path
             )
+            key = cache.get_key(knowledge_base_string)
+
+        with Runner.measure(instrumentation, "load"):
+            knowledge_base = cache.load(key, form)
+
+        if knowledge_base is not None:
+            # cnf knowledge bases don't keep the symbols so the query gets its own
+            symbol_table = (
+                knowledge_base.symbol_table if form == HORN else SymbolTable()
+            )
+        else:
+            with Runner.measure(instrumentation, "parse"):
+                session = KnowledgeBaseSession.from_string(knowledge_base_string)
+
+            with Runner.measure(instrumentation, "convert"):
+                knowledge_base = session.get_knowledge_base(algorithm)
 
-            # convert to horn query if algorithm is FC or BC
-            positive_literal = query.sentence.atom
+            with Runner.measure(instrumentation, "store"):
+                cache.store(key, form, knowledge_base)
+
+            symbol_table = session.knowledge_base.symbol_table
+
+        with Runner.measure(instrumentation, "parse"):
+            query = Query.from_string(query_string, set(), symbol_table)
+
+        return Runner.solve(
+            algorithm,
+            knowledge_base,
+            KnowledgeBaseSession.convert_query(query, algorithm),
+            mode,
+            consumer,
+            instrumentation,
+        )
 
-            query = HornKnowledgeBaseQuery(positive_literal)
-        elif algorithm.name == "DPLL":
-            # convert to cnf kb
-            knowledge_base = CNFKnowledgeBase.from_generic_knowledge_base(
-                knowledge_base
+    @staticmethod
+    def run_dimacs(
+        algorithm: InferenceAlgorithm,
+        file_path: str,
+        mode: EnumerationMode = None,
+        consumer=None,
+        instrumentation: Instrumentation = None,
+    ) -> AlgorithmResult:
+        # there is no query so DPLL and CDCL check if the clauses are satisfiable and SHARPSAT counts their models
+        if algorithm.name not in CNF_ALGORITHMS:
+            raise ValueError(
+                f"DIMACS files can only be used with {', '.join(CNF_ALGORITHMS)}"
             )
 
-        # run the algorithm
-        return algorithm.run(knowledge_base, query)
+        from src.dimacs_file import DIMACSFile
+
+        with Runner.measure(instrumentation, "parse"):
+            knowledge_base = DIMACSFile.read(file_path)
+
+        return Runner.solve(
+            algorithm, knowledge_base, None, mode, consumer, instrumentation
+        )
+
+    @staticmethod
+    def solve(
+        algorithm: InferenceAlgorithm,
+        knowledge_base,
+        query: Query,
+        mode: EnumerationMode = None,
+        consumer=None,
+        instrumentation: Instrumentation = None,
+    ) -> AlgorithmResult:
+        # runs the algorithm on a knowledge base that is already in the form it works on
+        if mode is not None:
+            algorithm.set_enumeration_mode(mode, consumer)
+
+        with Runner.measure(instrumentation, "solve"):
+            result = algorithm.run(knowledge_base, query)
+
+        if instrumentation is not None:
+            instrumentation.add_algorithm(algorithm)
+            result.instrumentation = instrumentation
+
+        return result
+
+    @staticmethod
+    def measure(instrumentation: Instrumentation, name: str):
+        # the phase of the instrumentation, or nothing without one
+        if instrumentation is None:
+            return nullcontext()
+
+        return instrumentation.phase(name)
+
+    @staticmethod
+    def run_batch(
+        algorithm: InferenceAlgorithm,
+        file_path: str,
+        mode: EnumerationMode = None,
+        consumer=None,
+        workers: int = None,
+        instrumentation_consumer=None,
+        trace_memory: bool = False,
+    ):
+        # yields the output line of each query of a batch file in order
+        # the knowledge base is only parsed and compiled once (once for each worker with more than 1 worker)
+        # instrumentation_consumer is called with the output line and instrumentation of each query in order
+        knowledge_base, queries = FileParser.parse_batch(file_path)
+
+        if workers is not None and workers < 1:
+            raise ValueError("There must be at least 1 worker")
+
+        instrumented = instrumentation_consumer is not None
+
+        if workers is None or workers == 1:
+            # the parse of the knowledge base is part of the first query
+            instrumentation = Instrumentation(trace_memory) if instrumented else None
+            session = Runner.start_session(knowledge_base, instrumentation)
+
+            for query in queries:
+                if not instrumented:
+                    yield str(session.ask(query, algorithm, mode, consumer))
+                    continue
+
+                # the first query already has one with the parse in it
+                if instrumentation is None:
+                    instrumentation = Instrumentation(trace_memory)
+
+                result = Runner.ask(
+                    session, query, algorithm, mode, consumer, instrumentation
+                )
+                instrumentation = None
+
+                yield str(result)
+
+                # after the line so it is shown under it
+                instrumentation_consumer(str(result), result.instrumentation)
+
+            return
+
+        # the consumer would be called in the worker processes
+        if consumer is not None:
+            raise ValueError("Models can't be streamed with more than 1 worker")
+
+        # multiprocessing is only imported when there is more than 1 worker
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(
+            workers,
+            initializer=init_batch_worker,
+            initargs=(knowledge_base, algorithm, mode, instrumented, trace_memory),
+        ) as executor:
+            # a few tasks for each worker so the work is shared out evenly without too many messages
+            chunk_size = max(1, len(queries) // (workers * 4))
+
+            answers = executor.map(answer_batch_query, queries, chunksize=chunk_size)
+
+            if not instrumented:
+                yield from answers
+                return
+
+            for line, instrumentation in answers:
+                yield line
+
+                instrumentation_consumer(line, instrumentation)
+
+    @staticmethod
+    def run_algorithm_from_default(
+        algorithm: InferenceAlgorithm,
+        knowledge_base: KnowledgeBase,
+        query: Query,
+        mode: EnumerationMode = None,
+        consumer=None,
+        instrumentation: Instrumentation = None,
+    ) -> AlgorithmResult:
+        # the session converts the knowledge base for the algorithm
+        return Runner.ask(
+            KnowledgeBaseSession(knowledge_base),
+            query,
+            algorithm,
+            mode,
+            consumer,
+            instrumentation,
+        )
+
+    @staticmethod
+    def start_session(
+        knowledge_base: str, instrumentation: Instrumentation = None
+    ) -> KnowledgeBaseSession:
+        if instrumentation is None:
+            return KnowledgeBaseSession.from_string(knowledge_base)
+
+        with instrumentation.phase("parse"):
+            return KnowledgeBaseSession.from_string(knowledge_base)
+
+    @staticmethod
+    def ask(
+        session: KnowledgeBaseSession,
+        query: str | Query,
+        algorithm: InferenceAlgorithm,
+        mode: EnumerationMode = None,
+        consumer=None,
+        instrumentation: Instrumentation = None,
+    ) -> AlgorithmResult:
+        # without an instrumentation nothing is measured
+        if instrumentation is None:
+            return session.ask(query, algorithm, mode, consumer)
+
+        if isinstance(query, str):
+            with instrumentation.phase("parse"):
+                query = session.parse_query(query)
+
+        # the conversion is cached by the session so ask doesn't do it again
+        with instrumentation.phase("convert"):
+            session.get_knowledge_base(algorithm)
+
+        with instrumentation.phase("solve"):
+            result = session.ask(query, algorithm, mode, consumer)
+
+        instrumentation.add_algorithm(algorithm)
+        result.instrumentation = instrumentation
+
+        return result
 
     @staticmethod
     def run_test_from_file_path(
         algorithm: InferenceAlgorithm, file_path: str
-    ) -> UnitTestResult:
+    ) -> "UnitTestResult":
+        from src.test.unit_test_result import UnitTestResult
+
         # validate the file is correct
         file_type = FileParser.get_file_type(file_path)
 
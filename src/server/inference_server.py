@@ -0,0 +1,462 @@
+import asyncio
+import itertools
+import json
+import os
+import time
+from urllib.parse import urlsplit
+
+from src.enumeration_mode import EnumerationMode
+from src.inference_algorithm_factory import InferenceAlgorithmFactory
+from src.knowledge_base_cache import KnowledgeBaseCache
+from src.server.worker_pool import WorkerPool
+
+# seconds a request gets when it doesn't ask for a timeout
+TIMEOUT_SECONDS = 60.0
+
+# requests with a bigger body are refused
+MAX_BODY_BYTES = 64 * 1024 * 1024
+
+REASONS = {
+    200: "OK",
+    201: "Created",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    409: "Conflict",
+    413: "Content Too Large",
+    500: "Internal Server Error",
+    504: "Gateway Timeout",
+}
+
+# status of an ask request, the http status is in brackets
+OK = "ok"  # (200)
+ERROR = "error"  # eg. the query isn't a valid sentence or FC on a knowledge base that isn't horn (400)
+TIMEOUT = "timeout"  # it ran past its deadline and its worker was stopped (504)
+CANCELLED = "cancelled"  # it was cancelled with DELETE /ask/<id> and its worker was stopped (409)
+
+
+class HTTPError(ValueError):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+
+        self.status = status
+
+
+# A knowledge base that clients can ask queries about, by name
+# the workers compile it the first time they need it and keep it, see WorkerSessions
+# key is different for every registration so a knowledge base that is registered again is compiled again
+class RegisteredKnowledgeBase:
+    def __init__(self, key: int, name: str, sentences: str, symbols: int):
+        self.key = key
+        self.name = name
+        self.sentences = sentences
+        self.symbols = symbols
+
+        # sentences told after it was registered, in order
+        self.tells: list[str] = []
+
+        # tells are checked by a worker one at a time so none are lost
+        self.lock = asyncio.Lock()
+
+    def to_dict(self) -> dict:
+        return {"name": self.name, "symbols": self.symbols, "tells": len(self.tells)}
+
+
+# Long running server that answers queries about knowledge bases that are kept compiled between requests
+# it speaks HTTP/1.1 with JSON bodies over a unix socket or a localhost port:
+#   POST /kb {"kb": "a; a => b;", "name": "example"}   register a knowledge base (the name is optional)
+#   POST /kb/<name>/tell {"sentences": "b => c;"}      add sentences to it
+#   GET /kb, GET /kb/<name>, DELETE /kb/<name>
+#   POST /ask {"kb": "example", "query": "c", "algorithm": "FC", "mode": "count", "timeout": 5, "id": "q1"}
+#   DELETE /ask/<id>                                     cancel a query
+#   GET /ask                                             ids of the queries that are running
+#   GET /metrics, GET /health
+# parsing, compiling and solving all happen in the WorkerPool so the event loop is never blocked
+class InferenceServer:
+    def __init__(self, workers: int = None, timeout: float = TIMEOUT_SECONDS):
+        self.pool = WorkerPool(workers or os.cpu_count() or 1)
+        self.timeout = timeout
+
+        self.knowledge_bases: dict[str, RegisteredKnowledgeBase] = {}
+
+        # ask requests that haven't finished, by id
+        self.requests: dict[str, asyncio.Task] = {}
+
+        self.keys = itertools.count(1)
+        self.request_ids = itertools.count(1)
+
+        self.algorithm_names = InferenceAlgorithmFactory.get_inference_algorithm_names()
+
+        # for the metrics
+        self.start_time = time.time()
+        self.statuses = {status: 0 for status in (OK, ERROR, TIMEOUT, CANCELLED)}
+        self.algorithm_metrics: dict[str, dict] = {}
+
+    async def serve_unix(self, path: str):
+        # a socket file that was left behind by a server that didn't stop cleanly is replaced
+        if os.path.exists(path):
+            os.remove(path)
+
+        self.pool.start()
+
+        try:
+            server = await asyncio.start_unix_server(self.handle_connection, path)
+
+            async with server:
+                await server.serve_forever()
+        finally:
+            self.pool.stop()
+
+            if os.path.exists(path):
+                os.remove(path)
+
+    async def serve_tcp(self, host: str, port: int):
+        self.pool.start()
+
+        try:
+            server = await asyncio.start_server(self.handle_connection, host, port)
+
+            async with server:
+                await server.serve_forever()
+        finally:
+            self.pool.stop()
+
+    async def handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ):
+        # requests on the same connection are answered in order until the client closes it
+        try:
+            while True:
+                try:
+                    request = await self.read_request(reader)
+                except HTTPError as error:
+                    await self.write_response(
+                        writer, error.status, {"error": str(error)}, False
+                    )
+                    return
+
+                if request is None:
+                    return
+
+                method, path, body, keep_alive = request
+
+                try:
+                    status, response = await self.route(method, path, body)
+                except HTTPError as error:
+                    status, response = error.status, {"error": str(error)}
+
+                await self.write_response(writer, status, response, keep_alive)
+
+                if not keep_alive:
+                    return
+        except (ConnectionError, asyncio.IncompleteReadError):
+            # the client went away
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def read_request(
+        reader: asyncio.StreamReader,
+    ) -> tuple[str, str, dict, bool]:
+        # method, path, json body and whether the connection is kept open, None at the end of the connection
+        line = await reader.readline()
+
+        if line == b"":
+            return None
+
+        words = line.decode("latin-1").split()
+
+        if len(words) != 3:
+            raise HTTPError(400, "Invalid request line")
+
+        method, target, version = words
+        headers = {}
+
+        while True:
+            line = await reader.readline()
+
+            if line in (b"\r\n", b"\n", b""):
+                break
+
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        try:
+            length = int(headers.get("content-length", "0"))
+        except ValueError:
+            raise HTTPError(400, "Invalid Content-Length") from None
+
+        if length > MAX_BODY_BYTES:
+            raise HTTPError(413, f"Bodies can't be bigger than {MAX_BODY_BYTES} bytes")
+
+        body = {}
+
+        if length > 0:
+            try:
+                body = json.loads(await reader.readexactly(length))
+            except ValueError:
+                raise HTTPError(400, "The body must be JSON") from None
+
+            if not isinstance(body, dict):
+                raise HTTPError(400, "The body must be a JSON object")
+
+        # http/1.1 keeps the connection open unless it is asked not to, http/1.0 is the other way around
+        connection = headers.get("connection", "").lower()
+        keep_alive = (
+            connection != "close"
+            if version == "HTTP/1.1"
+            else connection == "keep-alive"
+        )
+
+        return method, urlsplit(target).path, body, keep_alive
+
+    @staticmethod
+    async def write_response(
+        writer: asyncio.StreamWriter, status: int, response: dict, keep_alive: bool
+    ):
+        body = json.dumps(response).encode()
+
+        writer.write(
+            (
+                f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+                "Content-Type: application/json\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+                "\r\n"
+            ).encode()
+            + body
+        )
+
+        await writer.drain()
+
+    async def route(self, method: str, path: str, body: dict) -> tuple[int, dict]:
+        parts = [part for part in path.split("/") if part != ""]
+
+        if parts == ["health"] and method == "GET":
+            return 200, {"status": "ok"}
+
+        if parts == ["metrics"] and method == "GET":
+            return 200, self.get_metrics()
+
+        if parts == ["kb"]:
+            if method == "GET":
+                return 200, {
+                    "knowledge_bases": [
+                        knowledge_base.to_dict()
+                        for knowledge_base in self.knowledge_bases.values()
+                    ]
+                }
+
+            if method == "POST":
+                return await self.register(body)
+
+        if len(parts) == 2 and parts[0] == "kb":
+            knowledge_base = self.get_knowledge_base(parts[1])
+
+            if method == "GET":
+                return 200, knowledge_base.to_dict()
+
+            if method == "DELETE":
+                del self.knowledge_bases[knowledge_base.name]
+                return 200, knowledge_base.to_dict()
+
+        if len(parts) == 3 and parts[0] == "kb" and parts[2] == "tell":
+            if method == "POST":
+                return await self.tell(self.get_knowledge_base(parts[1]), body)
+
+        if parts == ["ask"]:
+            if method == "GET":
+                return 200, {"requests": list(self.requests)}
+
+            if method == "POST":
+                return await self.ask(body)
+
+        if len(parts) == 2 and parts[0] == "ask" and method == "DELETE":
+            request = self.requests.get(parts[1])
+
+            if request is None:
+                raise HTTPError(404, f"There is no request running with id {parts[1]}")
+
+            request.cancel()
+
+            return 200, {"id": parts[1], "status": CANCELLED}
+
+        raise HTTPError(404, f"{method} {path} not found")
+
+    def get_knowledge_base(self, name: str) -> RegisteredKnowledgeBase:
+        knowledge_base = self.knowledge_bases.get(name)
+
+        if knowledge_base is None:
+            raise HTTPError(404, f"Knowledge base with name {name} not found")
+
+        return knowledge_base
+
+    @staticmethod
+    def get_string(body: dict, name: str, required: bool = True) -> str:
+        value = body.get(name)
+
+        if value is None and not required:
+            return None
+
+        if not isinstance(value, str) or value.strip() == "":
+            raise HTTPError(400, f'"{name}" must be a string')
+
+        return value
+
+    def get_timeout(self, body: dict) -> float:
+        timeout = body.get("timeout", self.timeout)
+
+        if not isinstance(timeout, (int, float)) or timeout <= 0:
+            raise HTTPError(400, '"timeout" must be a number of seconds more than 0')
+
+        return float(timeout)
+
+    async def register(self, body: dict) -> tuple[int, dict]:
+        # the knowledge base is parsed by a worker first so a client finds out about errors straight away
+        sentences = self.get_string(body, "kb")
+
+        # the same knowledge base without a name always gets the same name
+        name = (
+            self.get_string(body, "name", False)
+            or KnowledgeBaseCache.get_key(sentences)[:16]
+        )
+
+        key = next(self.keys)
+
+        try:
+            response = await asyncio.wait_for(
+                self.pool.run(key, sentences, []), self.get_timeout(body)
+            )
+        except ValueError as error:
+            raise HTTPError(400, str(error)) from None
+        except asyncio.TimeoutError:
+            raise HTTPError(504, "The knowledge base took too long to parse") from None
+
+        # one that is registered again with the same name is replaced
+        knowledge_base = RegisteredKnowledgeBase(
+            key, name, sentences, response["symbols"]
+        )
+        self.knowledge_bases[name] = knowledge_base
+
+        return 201, knowledge_base.to_dict()
+
+    async def tell(
+        self, knowledge_base: RegisteredKnowledgeBase, body: dict
+    ) -> tuple[int, dict]:
+        sentences = self.get_string(body, "sentences")
+
+        async with knowledge_base.lock:
+            tells = knowledge_base.tells + [sentences]
+
+            try:
+                response = await asyncio.wait_for(
+                    self.pool.run(knowledge_base.key, knowledge_base.sentences, tells),
+                    self.get_timeout(body),
+                )
+            except ValueError as error:
+                raise HTTPError(400, str(error)) from None
+            except asyncio.TimeoutError:
+                raise HTTPError(504, "The sentences took too long to parse") from None
+
+            knowledge_base.tells = tells
+            knowledge_base.symbols = response["symbols"]
+
+        return 200, knowledge_base.to_dict()
+
+    async def ask(self, body: dict) -> tuple[int, dict]:
+        knowledge_base = self.get_knowledge_base(self.get_string(body, "kb"))
+        query = self.get_string(body, "query")
+        algorithm = self.get_string(body, "algorithm").upper()
+        mode = self.get_string(body, "mode", False)
+        timeout = self.get_timeout(body)
+
+        if algorithm not in self.algorithm_names:
+            raise HTTPError(
+                400,
+                f"Algorithm with name {algorithm} not found, valid names are: {self.algorithm_names}",
+            )
+
+        # models can't be streamed back
+        if mode is not None and mode not in (
+            EnumerationMode.ALL.value,
+            EnumerationMode.COUNT.value,
+            EnumerationMode.FIRST.value,
+        ):
+            raise HTTPError(400, '"mode" must be all, count or first')
+
+        request_id = body.get("id", str(next(self.request_ids)))
+
+        if not isinstance(request_id, str):
+            raise HTTPError(400, '"id" must be a string')
+
+        if request_id in self.requests:
+            raise HTTPError(409, f"A request with id {request_id} is already running")
+
+        # the tells up to now, tells while it is running are for later queries
+        request = asyncio.ensure_future(
+            asyncio.wait_for(
+                self.pool.run(
+                    knowledge_base.key,
+                    knowledge_base.sentences,
+                    list(knowledge_base.tells),
+                    query,
+                    algorithm,
+                    mode,
+                ),
+                timeout,
+            )
+        )
+        self.requests[request_id] = request
+
+        start = time.perf_counter()
+
+        try:
+            # waits without raising so a cancelled request can be told apart from the server stopping
+            await asyncio.wait({request})
+        finally:
+            del self.requests[request_id]
+            request.cancel()
+
+        seconds = time.perf_counter() - start
+        response = {"id": request_id, "seconds": seconds}
+
+        if request.cancelled():
+            status, http_status = CANCELLED, 409
+        elif isinstance(request.exception(), asyncio.TimeoutError):
+            status, http_status = TIMEOUT, 504
+            response["error"] = f"The query took longer than {timeout}s"
+        elif request.exception() is not None:
+            status, http_status = ERROR, 400
+            response["error"] = str(request.exception())
+        else:
+            status, http_status = OK, 200
+            response.update(request.result())
+
+        self.add_metrics(algorithm, status, seconds)
+        response["status"] = status
+
+        return http_status, response
+
+    def add_metrics(self, algorithm: str, status: str, seconds: float):
+        self.statuses[status] += 1
+
+        metrics = self.algorithm_metrics.setdefault(
+            algorithm, {"requests": 0, "seconds": 0.0, "max_seconds": 0.0}
+        )
+        metrics["requests"] += 1
+        metrics["seconds"] += seconds
+        metrics["max_seconds"] = max(metrics["max_seconds"], seconds)
+
+    def get_metrics(self) -> dict:
+        return {
+            "uptime_seconds": time.time() - self.start_time,
+            "workers": self.pool.size,
+            "busy_workers": self.pool.get_busy(),
+            "waiting_requests": self.pool.waiting,
+            "running_requests": len(self.requests),
+            "worker_restarts": self.pool.restarts,
+            "knowledge_bases": len(self.knowledge_bases),
+            "requests": self.statuses,
+            "algorithms": self.algorithm_metrics,
+        }
@@ -0,0 +1,278 @@
+import asyncio
+import multiprocessing
+import os
+import signal
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+
+from src.enumeration_mode import EnumerationMode
+from src.inference_algorithm_factory import InferenceAlgorithmFactory
+from src.knowledge_base_session import KnowledgeBaseSession
+
+# knowledge bases each worker keeps compiled, the least recently used one is dropped after this
+MAX_SESSIONS = 32
+
+
+def run_server_worker(connection):
+    # answers tasks until it is sent None, in its own process group so the processes of TT-PAR are stopped with it
+    if hasattr(os, "setsid"):
+        os.setsid()
+
+    # the main process can stop the worker at any time, a ctrl-c in the terminal is for the server
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    sessions = WorkerSessions()
+
+    try:
+        while True:
+            task = connection.recv()
+
+            if task is None:
+                return
+
+            try:
+                connection.send((True, sessions.run(task)))
+            except Exception as error:
+                # the first argument is the message, the second can be a huge sentence
+                message = str(error.args[0]) if error.args else ""
+
+                connection.send((False, f"{type(error).__name__}: {message}"))
+    except EOFError:
+        # the server stopped
+        pass
+    finally:
+        connection.close()
+
+
+# The knowledge bases a worker has compiled, by the key of their registration
+# a task only has the sentences and tells that the worker doesn't have yet, the server works out which
+# ones from ServerWorker.sessions, which is changed in exactly the same way as this so they always match
+class WorkerSessions:
+    def __init__(self):
+        # session and the number of tells it has had
+        self.sessions: OrderedDict[int, tuple[KnowledgeBaseSession, int]] = (
+            OrderedDict()
+        )
+
+    def run(self, task: dict) -> dict:
+        # the server drops the session after any error so it is dropped here as well
+        try:
+            return self.answer(task)
+        except Exception:
+            self.sessions.pop(task["key"], None)
+            raise
+
+    def answer(self, task: dict) -> dict:
+        session = self.get_session(task)
+
+        if task["query"] is None:
+            return {"symbols": len(session.knowledge_base.propositional_symbols)}
+
+        algorithm = InferenceAlgorithmFactory.get_inference_algorithm_from_name(
+            task["algorithm"]
+        )
+
+        mode = EnumerationMode(task["mode"]) if task["mode"] is not None else None
+
+        start = time.perf_counter()
+        result = session.ask(task["query"], algorithm, mode)
+        seconds = time.perf_counter() - start
+
+        return {
+            "result": str(result),
+            "solve_seconds": seconds,
+            "counters": algorithm.get_counters(),
+        }
+
+    def get_session(self, task: dict) -> KnowledgeBaseSession:
+        key = task["key"]
+
+        if task["sentences"] is not None:
+            self.sessions[key] = (
+                KnowledgeBaseSession.from_string(task["sentences"]),
+                0,
+            )
+
+        session, number_of_tells = self.sessions[key]
+
+        # the tells start from the first one the session hasn't had
+        for sentences in task["tells"]:
+            session.tell(sentences)
+            number_of_tells += 1
+
+        self.sessions[key] = (session, number_of_tells)
+        self.sessions.move_to_end(key)
+
+        while len(self.sessions) > MAX_SESSIONS:
+            self.sessions.popitem(last=False)
+
+        return session
+
+
+# A worker process and what the server knows about it
+class ServerWorker:
+    def __init__(self):
+        self.connection, worker_connection = multiprocessing.Pipe()
+
+        self.process = multiprocessing.Process(
+            target=run_server_worker, args=(worker_connection,)
+        )
+        self.process.start()
+        worker_connection.close()
+
+        # number of tells of each knowledge base the worker has, kept the same as its WorkerSessions
+        self.sessions: OrderedDict[int, int] = OrderedDict()
+
+    def get_task(
+        self,
+        key: int,
+        sentences: str,
+        tells: list[str],
+        query: str = None,
+        algorithm: str = None,
+        mode: str = None,
+    ) -> dict:
+        # only what the worker doesn't have yet
+        number_of_tells = self.sessions.get(key)
+
+        return {
+            "key": key,
+            "sentences": sentences if number_of_tells is None else None,
+            "tells": tells[number_of_tells or 0 :],
+            "query": query,
+            "algorithm": algorithm,
+            "mode": mode,
+        }
+
+    def update_sessions(self, key: int, number_of_tells: int, succeeded: bool):
+        # the same as WorkerSessions.run
+        if not succeeded:
+            self.sessions.pop(key, None)
+            return
+
+        self.sessions[key] = number_of_tells
+        self.sessions.move_to_end(key)
+
+        while len(self.sessions) > MAX_SESSIONS:
+            self.sessions.popitem(last=False)
+
+    def stop(self, reader: Future = None):
+        # the whole process group so worker processes of TT-PAR are stopped as well
+        # the connection is only closed once the thread reading from it has seen the end of it
+        if hasattr(os, "killpg"):
+            try:
+                os.killpg(self.process.pid, signal.SIGKILL)
+            except OSError:
+                self.process.kill()
+        else:
+            self.process.kill()
+
+        self.process.join()
+
+        if reader is not None:
+            wait([reader], 1)
+
+        self.connection.close()
+
+
+# A fixed number of worker processes that answer tasks for the server, so solves never block the event loop
+# a task waits for an idle worker, and a task that is cancelled (or runs past its deadline) while a worker
+# is answering it stops that worker, which is replaced by a new one
+# the result of each worker is waited for in a thread so it works with any event loop
+class WorkerPool:
+    def __init__(self, size: int):
+        if size < 1:
+            raise ValueError("There must be at least 1 worker")
+
+        self.size = size
+
+        self.idle: asyncio.Queue[ServerWorker] = None
+        self.workers: list[ServerWorker] = []
+        self.threads = ThreadPoolExecutor(size, thread_name_prefix="worker-pool")
+
+        # tasks waiting for a worker, and workers that were stopped and replaced
+        self.waiting = 0
+        self.restarts = 0
+
+    def start(self):
+        # called in the event loop
+        self.idle = asyncio.Queue()
+
+        for _ in range(self.size):
+            self.add_worker()
+
+    def add_worker(self):
+        worker = ServerWorker()
+
+        self.workers.append(worker)
+        self.idle.put_nowait(worker)
+
+    def replace_worker(self, worker: ServerWorker, reader: Future = None):
+        self.workers.remove(worker)
+        worker.stop(reader)
+
+        self.restarts += 1
+        self.add_worker()
+
+    def get_busy(self) -> int:
+        return len(self.workers) - self.idle.qsize()
+
+    async def run(
+        self,
+        key: int,
+        sentences: str,
+        tells: list[str],
+        query: str = None,
+        algorithm: str = None,
+        mode: str = None,
+    ) -> dict:
+        # loads the knowledge base in a worker and answers the query if there is one
+        # raises ValueError with the message of an error in the worker
+        self.waiting += 1
+
+        try:
+            worker = await self.idle.get()
+        finally:
+            self.waiting -= 1
+
+        task = worker.get_task(key, sentences, tells, query, algorithm, mode)
+
+        worker.connection.send(task)
+        reader = self.threads.submit(worker.connection.recv)
+
+        try:
+            succeeded, value = await asyncio.wrap_future(reader)
+        except asyncio.CancelledError:
+            # the only way to stop a solve is to stop its worker
+            self.replace_worker(worker, reader)
+            raise
+        except (EOFError, OSError):
+            # eg. it ran out of memory
+            self.replace_worker(worker, reader)
+
+            raise ValueError(f"Worker exited with code {worker.process.exitcode}")
+
+        worker.update_sessions(key, len(tells), succeeded)
+        self.idle.put_nowait(worker)
+
+        if not succeeded:
+            raise ValueError(value)
+
+        return value
+
+    def stop(self):
+        for worker in self.workers:
+            try:
+                worker.connection.send(None)
+            except OSError:
+                pass
+
+        for worker in self.workers:
+            worker.process.join(1)
+
+            if worker.process.is_alive():
+                worker.stop()
+
+        self.workers = []
+        self.threads.shutdown(wait=False)
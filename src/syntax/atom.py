@@ -6,11 +6,22 @@ class Atom:
         self.name = name
         self.negated = negated
 
+        # atoms are never changed so the hash only needs to be worked out once
+        self.hash = hash((name, negated))
+
     def __eq__(self, other: "Atom"):
-        return self.name == other.name and self.negated == other.negated
+        # atoms from a symbol table are shared so most checks stop at the first test
+        return self is other or (
+            self.name == other.name and self.negated == other.negated
+        )
 
     def __hash__(self):
-        return hash((self.name, self.negated))
+        return self.hash
+
+    def __setstate__(self, state: dict):
+        # strings hash differently in other processes so the hash is worked out again after unpickling
+        self.__dict__.update(state)
+        self.hash = hash((self.name, self.negated))
 
     def __str__(self):
         return f"{Operator.NEGATION.value if self.negated else ''}{self.name}"
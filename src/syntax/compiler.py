@@ -0,0 +1,239 @@
+from src.syntax.atom import BoolAtom
+from src.syntax.operator import Operator
+from src.syntax.sentence import AtomicSentence, Expression, Sentence
+
+# python can only nest expressions so deep before the parser gives up
+# so deeper sub expressions are stored in temporary variables instead eg. t1 = ...; t2 = ...
+MAX_EXPRESSION_DEPTH = 50
+
+
+# Compiles sentences into a single python function over a tuple of booleans
+# eg. the sentences "a => b; c" with indexes {"a": 0, "b": 1, "c": 2} become
+# def evaluate(v):
+#     if not ((not v[0]) or v[1]):
+#         return False
+#     if not v[2]:
+#         return False
+#     return True
+# in vectorised mode the same is done with bitwise operators so each value can be a column of packed rows
+class SentenceCompiler:
+    def __init__(
+        self,
+        symbol_indexes: dict[str, int],
+        constants: dict[str, bool] = None,
+        vectorised: bool = False,
+    ):
+        # index of each symbol in the tuple passed to the compiled function
+        self.symbol_indexes = symbol_indexes
+
+        # symbols that always have the same value are inlined
+        self.constants = constants if constants is not None else {}
+
+        self.vectorised = vectorised
+
+        # lines for any temporary variables of the sentence being compiled
+        self.temporary_lines: list[str] = []
+        self.temporary_count = 0
+
+    @staticmethod
+    def compile_sentences(
+        sentences: list[Sentence],
+        symbol_indexes: dict[str, int],
+        constants: dict[str, bool] = None,
+        vectorised: bool = False,
+        namespace: dict = None,
+    ):
+        # scalar functions return whether all the sentences are true for the values
+        # vectorised functions take the valid rows as a column and return the rows where all the sentences are true
+        # vectorised functions need ONES and ZEROS (all rows true and all rows false) in the namespace
+        compiler = SentenceCompiler(symbol_indexes, constants, vectorised)
+
+        source = compiler.get_source(sentences)
+
+        namespace = dict(namespace) if namespace is not None else {}
+
+        exec(compile(source, "<compiled sentences>", "exec"), namespace)
+
+        return namespace["evaluate"]
+
+    @staticmethod
+    def compile_sentence(sentence: Sentence, symbol_indexes: dict[str, int]):
+        return SentenceCompiler.compile_sentences([sentence], symbol_indexes)
+
+    def get_source(self, sentences: list[Sentence]) -> str:
+        lines = ["def evaluate(v, valid=None):"]
+
+        for sentence in sentences:
+            self.temporary_lines = []
+
+            expression = self.get_expression(sentence)
+
+            lines.extend(self.temporary_lines)
+
+            if self.vectorised:
+                # remove the rows where the sentence is false
+                lines.append(f"    valid = valid & {expression}")
+
+                # stop early if no rows are left
+                lines.append("    if not valid.any():")
+                lines.append("        return valid")
+            else:
+                # stop at the first false sentence
+                lines.append(f"    if not {expression}:")
+                lines.append("        return False")
+
+        lines.append("    return valid" if self.vectorised else "    return True")
+
+        return "\n".join(lines) + "\n"
+
+    def get_expression(self, sentence: Sentence) -> str:
+        # the tree is walked with an explicit stack because sentences can be very deep, the operands
+        # are compiled before the sentence and any part that nests too deep is stored in a temporary variable
+        # expressions of the parts that are done, each with how deep it nests
+        expressions: list[tuple[str, int]] = []
+
+        # each entry is a sentence and its operands once they have been pushed
+        stack: list[tuple[Sentence, list[Sentence]]] = [(sentence, None)]
+
+        while len(stack) > 0:
+            current, operands = stack.pop()
+
+            if operands is None:
+                if isinstance(current, AtomicSentence):
+                    expressions.append((self.get_atom_expression(current), 1))
+                    continue
+
+                current: Expression
+                operator = current.operator
+
+                # chains of the same conjunction or disjunction are flattened so they don't nest
+                if operator == Operator.NEGATION:
+                    operands = [current.rhs]
+                elif (
+                    operator == Operator.CONJUNCTION or operator == Operator.DISJUNCTION
+                ):
+                    operands = self.get_chain(current)
+                else:
+                    operands = [current.lhs, current.rhs]
+
+                stack.append((current, operands))
+                stack.extend((operand, None) for operand in reversed(operands))
+
+                continue
+
+            # the expressions of the operands are the last ones
+            first = len(expressions) - len(operands)
+            operand_expressions = expressions[first:]
+            del expressions[first:]
+
+            expression, depth = self.combine(current.operator, operand_expressions)
+
+            # too deep so this part goes in a temporary variable
+            if depth > MAX_EXPRESSION_DEPTH:
+                expression, depth = self.store(expression), 1
+
+            expressions.append((expression, depth))
+
+        return expressions[0][0]
+
+    def combine(
+        self, operator: Operator, operands: list[tuple[str, int]]
+    ) -> tuple[str, int]:
+        # expression of the operator applied to the expressions of its operands, and how deep it nests
+        if operator == Operator.NEGATION:
+            expression, depth = operands[0]
+            return self.negate(expression), depth + 1
+
+        if operator == Operator.CONJUNCTION or operator == Operator.DISJUNCTION:
+            if self.vectorised:
+                joiner = " & " if operator == Operator.CONJUNCTION else " | "
+            else:
+                joiner = " and " if operator == Operator.CONJUNCTION else " or "
+
+            # "and" and "or" take any number of operands, but each "&" or "|" nests the ones before it
+            # so a long vectorised chain is stored in temporary variables a part at a time
+            expression, depth = operands[0]
+
+            for operand, operand_depth in operands[1:]:
+                if self.vectorised:
+                    if depth >= MAX_EXPRESSION_DEPTH:
+                        expression, depth = self.store(f"({expression})"), 1
+
+                    depth += 1
+
+                expression = f"{expression}{joiner}{operand}"
+                depth = max(depth, operand_depth + 1)
+
+            return f"({expression})", depth + 1
+
+        (lhs, lhs_depth), (rhs, rhs_depth) = operands
+        depth = max(lhs_depth, rhs_depth) + 2
+
+        # A=>B is equivalent to -A or B according to material implication
+        if operator == Operator.IMPLICATION:
+            if self.vectorised:
+                return f"(~{lhs} | {rhs})", depth
+            return f"(not {lhs} or {rhs})", depth
+
+        # A<=>B is true when both sides have the same value, each side is only evaluated once
+        if operator == Operator.BICONDITIONAL:
+            if self.vectorised:
+                return f"(~({lhs} ^ {rhs}))", depth
+            return f"({lhs} == {rhs})", depth
+
+        raise ValueError(f"Operator {operator} not supported.")
+
+    def store(self, expression: str) -> str:
+        # assigns the expression to a new temporary variable and returns its name
+        self.temporary_count += 1
+        name = f"t{self.temporary_count}"
+
+        self.temporary_lines.append(f"    {name} = {expression}")
+
+        return name
+
+    def get_atom_expression(self, sentence: AtomicSentence) -> str:
+        atom = sentence.atom
+
+        # True and False
+        if isinstance(atom, BoolAtom):
+            return self.get_constant(atom.name == "True")
+
+        if atom.name in self.symbol_indexes:
+            expression = f"v[{self.symbol_indexes[atom.name]}]"
+        elif atom.name in self.constants:
+            expression = self.get_constant(self.constants[atom.name])
+        else:
+            raise ValueError(f"Symbol {atom.name} has no value to compile with.")
+
+        return self.negate(expression) if atom.negated else expression
+
+    def get_constant(self, value: bool) -> str:
+        if self.vectorised:
+            return "ONES" if value else "ZEROS"
+        return "True" if value else "False"
+
+    def negate(self, expression: str) -> str:
+        if self.vectorised:
+            return f"(~{expression})"
+        return f"(not {expression})"
+
+    @staticmethod
+    def get_chain(sentence: Expression) -> list[Sentence]:
+        # get all the operands of a chain of the same operator in order eg. (a & b) & (c & d) -> a, b, c, d
+        operands = []
+        stack = [sentence]
+
+        while len(stack) > 0:
+            current = stack.pop()
+
+            if (
+                isinstance(current, Expression)
+                and current.operator == sentence.operator
+            ):
+                stack.append(current.rhs)
+                stack.append(current.lhs)
+            else:
+                operands.append(current)
+
+        return operands
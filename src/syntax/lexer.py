@@ -0,0 +1,71 @@
+import re
+
+from src.syntax.operator import Operator
+
+# longest operators first so <=> isn't read as < followed by =>
+OPERATOR_PATTERN = "|".join(
+    re.escape(operator.value)
+    for operator in sorted(Operator, key=lambda operator: -len(operator.value))
+)
+
+# one pass over the string with a single regular expression, spaces before a token are skipped
+# words are read as a whole and checked by the parser so eg. "ab" is an error instead of two symbols
+# anything else is read as a single character token that the parser will reject
+TOKEN_PATTERN = re.compile(rf"\s*({OPERATOR_PATTERN}|\w+|.)", re.DOTALL)
+
+WORD_PATTERN = re.compile(r"\w+")
+
+OPERATORS = {operator.value: operator for operator in Operator}
+
+
+class ParseError(ValueError):
+    def __init__(self, message: str, string: str, position: int):
+        # position is the index of the character in the string that caused the error
+        self.position = position
+
+        super().__init__(
+            f"{message} at position {position}: {ParseError.get_excerpt(string, position)}"
+        )
+
+    @staticmethod
+    def get_excerpt(string: str, position: int, width: int = 20) -> str:
+        # only show the part of the string around the error because it can be huge
+        start = max(0, position - width)
+        end = min(len(string), position + width)
+
+        prefix = "..." if start > 0 else ""
+        suffix = "..." if end < len(string) else ""
+
+        return f"{prefix}{string[start:position]} >>> {string[position:end]}{suffix}"
+
+
+# Splits a sentence string into tokens (operators and words)
+# eg. "~a & (b1=>c)" -> ~, a, &, (, b1, =>, c, )
+# tokens are kept as plain strings because there can be millions of them
+# their positions are only needed for errors so they are found again when something goes wrong
+class Lexer:
+    def __init__(self, string: str):
+        self.string = string
+
+    def get_tokens(self) -> list[str]:
+        # trailing spaces aren't a token
+        return TOKEN_PATTERN.findall(self.string.rstrip())
+
+    def get_position(self, index: int) -> int:
+        # index of the first character of the token, or the length of the string after the last token
+        for i, match in enumerate(TOKEN_PATTERN.finditer(self.string.rstrip())):
+            if i == index:
+                return match.start(1)
+
+        return len(self.string)
+
+    @staticmethod
+    def is_word(token: str) -> bool:
+        return WORD_PATTERN.fullmatch(token) is not None
+
+    @staticmethod
+    def describe(token: str) -> str:
+        if token is None:
+            return "end of sentence"
+
+        return f"'{token}'"
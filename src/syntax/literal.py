@@ -11,6 +11,9 @@ class Literal(Atom):
 
         super().__init__(symbol, negated)
 
+        # the literal with the opposite sign, symbol tables link their literals when they make them
+        self.negation: Literal = None
+
     def __lt__(self, other: "Literal"):
         return self.name < other.name
 
@@ -26,6 +29,13 @@ class Literal(Atom):
         # no negation
         return cls(string, False)
 
+    def get_negation(self) -> "Literal":
+        if self.negation is None:
+            self.negation = Literal(self.name, not self.negated)
+            self.negation.negation = self
+
+        return self.negation
+
     def satifies(self, model: Model) -> bool:
         model_value = model.get(self.name)
 
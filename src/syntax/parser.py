@@ -0,0 +1,237 @@
+from src.garbage_collection import garbage_collection_paused
+from src.syntax.atom import BoolAtom
+from src.syntax.lexer import Lexer, ParseError
+from src.syntax.literal import Literal
+from src.syntax.operator import Operator
+from src.syntax.sentence import AtomicSentence, Sentence
+from src.syntax.symbol_table import SymbolTable
+from src.syntax.utils import Utils
+
+# precedence of each binary operator, higher binds tighter
+# all the operators have the same precedence and group to the right so a & b => c is a & (b => c)
+# this is how sentences have always been read so changing it would change the meaning of existing files
+PRECEDENCE = {
+    Operator.BICONDITIONAL: 1,
+    Operator.IMPLICATION: 1,
+    Operator.CONJUNCTION: 1,
+    Operator.DISJUNCTION: 1,
+}
+
+RIGHT_ASSOCIATIVE = {
+    Operator.BICONDITIONAL,
+    Operator.IMPLICATION,
+    Operator.CONJUNCTION,
+    Operator.DISJUNCTION,
+}
+
+# binary operators by their token
+BINARY_OPERATORS = {operator.value: operator for operator in PRECEDENCE}
+
+# whether the operator on top of the stack has to be reduced before the next operator is pushed
+# it does if it binds tighter, or the same and the next operator groups to the left
+# the operator stack holds tokens instead of operators because hashing an enum is slow
+REDUCE_FIRST = {
+    (top.value, operator.value): PRECEDENCE[top] > PRECEDENCE[operator]
+    or (PRECEDENCE[top] == PRECEDENCE[operator] and operator not in RIGHT_ASSOCIATIVE)
+    for top in PRECEDENCE
+    for operator in PRECEDENCE
+}
+
+# opening brackets are also kept on the operator stack
+OPENING_BRACKET = Operator.OPENING_BRACKET.value
+NEGATED_OPENING_BRACKET = Operator.NEGATION.value + Operator.OPENING_BRACKET.value
+
+
+# Precedence climbing parser for sentences
+# the lexer splits the string into tokens first, then each token is only looked at once
+# negation only applies to the symbol or bracket right after it eg. ~a & b is (~a) & b
+# the operator and operand stacks are explicit (shunting yard) so deeply nested or very long sentences
+# don't hit the recursion limit
+class Parser:
+    def __init__(self, known_symbols: set[Literal], symbol_table: SymbolTable = None):
+        # every symbol in the parsed sentences is added to this set
+        self.known_symbols = known_symbols
+
+        # the literals and sentences are made by the symbol table so they are shared with every other
+        # sentence made by it, a parser on its own still shares them between its own sentences
+        self.symbol_table = symbol_table if symbol_table is not None else SymbolTable()
+
+        # the same symbols come up again and again in big knowledge bases so each word is only checked once
+        # the atomic sentence of each word is kept because known_symbols only needs to be updated the first time
+        self.atomic_sentences: dict[str, AtomicSentence] = {}
+        self.negated_atomic_sentences: dict[str, AtomicSentence] = {}
+
+        # sentence being parsed, for errors
+        self.string = ""
+        self.lexer: Lexer = None
+
+    @staticmethod
+    def parse_sentence(
+        string: str, known_symbols: set[Literal], symbol_table: SymbolTable = None
+    ) -> Sentence:
+        return Parser(known_symbols, symbol_table).parse(string)
+
+    def parse(self, string: str) -> Sentence:
+        return self.parse_sentences([string])[0]
+
+    def parse_sentences(self, strings: list[str]) -> list[Sentence]:
+        # nothing here creates reference cycles
+        with garbage_collection_paused():
+            sentences = []
+
+            for string in strings:
+                self.string = string
+                self.lexer = Lexer(string)
+
+                sentences.append(self.parse_tokens(self.lexer.get_tokens()))
+
+            return sentences
+
+    def parse_tokens(self, tokens: list[str]) -> Sentence:
+        operands: list[Sentence] = []
+        operators: list[str] = []
+
+        # index of the token of each opening bracket on the operator stack, for errors
+        bracket_indexes: list[int] = []
+
+        # the end of the string is None
+        tokens.append(None)
+
+        i = 0
+
+        while True:
+            # expecting an operand: a symbol, ~ or an opening bracket
+            token = tokens[i]
+            i += 1
+
+            # ~ must be followed by a symbol or a bracket
+            negated = token == "~"
+
+            if negated:
+                token = tokens[i]
+                i += 1
+
+            if token == "(":
+                if negated:
+                    operators.append(NEGATED_OPENING_BRACKET)
+                    bracket_indexes.append(i - 2)
+                else:
+                    operators.append(OPENING_BRACKET)
+                    bracket_indexes.append(i - 1)
+                continue
+
+            atomic_sentences = (
+                self.negated_atomic_sentences if negated else self.atomic_sentences
+            )
+            atomic_sentence = atomic_sentences.get(token)
+
+            if atomic_sentence is None:
+                atomic_sentence = self.get_atomic_sentence(token, negated, i - 1)
+
+            operands.append(atomic_sentence)
+
+            # expecting an operator, closing brackets can come before it
+            token = tokens[i]
+            i += 1
+
+            while token == ")":
+                # reduce everything back to the opening bracket
+                while (
+                    len(operators) > 0
+                    and operators[-1] != OPENING_BRACKET
+                    and operators[-1] != NEGATED_OPENING_BRACKET
+                ):
+                    self.reduce(operands, operators)
+
+                if len(operators) == 0:
+                    raise self.error("No corresponding opening bracket found", i - 1)
+
+                bracket_indexes.pop()
+
+                # brackets don't add anything to the tree unless they are negated
+                if operators.pop() == NEGATED_OPENING_BRACKET:
+                    operands.append(
+                        self.symbol_table.get_expression(
+                            None, Operator.NEGATION, operands.pop()
+                        )
+                    )
+
+                token = tokens[i]
+                i += 1
+
+            if token is None:
+                break
+
+            if token not in BINARY_OPERATORS:
+                raise self.error(
+                    f"Expected an operator but found {Lexer.describe(token)}", i - 1
+                )
+
+            # reduce the operators on the stack that bind tighter than this one
+            while len(operators) > 0 and REDUCE_FIRST.get((operators[-1], token)):
+                self.reduce(operands, operators)
+
+            operators.append(token)
+
+        # reduce everything left, there shouldn't be any brackets
+        while len(operators) > 0:
+            if (
+                operators[-1] == OPENING_BRACKET
+                or operators[-1] == NEGATED_OPENING_BRACKET
+            ):
+                raise self.error(
+                    "No corresponding closing bracket found", bracket_indexes[-1]
+                )
+
+            self.reduce(operands, operators)
+
+        return operands[0]
+
+    def reduce(self, operands: list[Sentence], operators: list[str]):
+        # combine the top two operands with the top operator
+        rhs = operands.pop()
+        lhs = operands.pop()
+
+        operands.append(
+            self.symbol_table.get_expression(
+                lhs, BINARY_OPERATORS[operators.pop()], rhs
+            )
+        )
+
+    def get_atomic_sentence(
+        self, token: str, negated: bool, index: int
+    ) -> AtomicSentence:
+        if token is None or not Lexer.is_word(token):
+            expected = (
+                "a symbol or '(' after '~'" if negated else "a symbol, '~' or '('"
+            )
+
+            raise self.error(
+                f"Expected {expected} but found {Lexer.describe(token)}", index
+            )
+
+        if Utils.is_propositional_symbol(token):
+            # atomic sentence needs to know if its negated or not
+            atom = self.symbol_table.get_literal(token, negated)
+
+            self.known_symbols.add(atom)
+
+        # True and False can't be negated
+        elif Utils.is_true_false(token) and not negated:
+            atom = BoolAtom.from_string(token)
+
+        else:
+            raise self.error(f"{token} is not a valid propositional symbol", index)
+
+        atomic_sentence = self.symbol_table.get_atomic_sentence(atom)
+
+        if negated:
+            self.negated_atomic_sentences[token] = atomic_sentence
+        else:
+            self.atomic_sentences[token] = atomic_sentence
+
+        return atomic_sentence
+
+    def error(self, message: str, index: int) -> ParseError:
+        # the position is only worked out now because it needs another pass over the string
+        return ParseError(message, self.string, self.lexer.get_position(index))
@@ -3,28 +3,27 @@ from src.model import Model
 from src.syntax.atom import Atom, BoolAtom
 from src.syntax.operator import Operator
 from src.syntax.literal import Literal, PositiveLiteral
-from src.syntax.utils import Utils
+
+# looking up an enum member is slow so the operators are kept here for the cnf conversion
+NEGATION = Operator.NEGATION
+CONJUNCTION = Operator.CONJUNCTION
+DISJUNCTION = Operator.DISJUNCTION
+IMPLICATION = Operator.IMPLICATION
+BICONDITIONAL = Operator.BICONDITIONAL
 
 
 class Sentence:
 
     @classmethod
-    def from_string(cls, string: str, known_symbols: set[Literal]) -> "Sentence":
-        # is the string a proposition symbol?
-        if Utils.is_propositional_symbol(
-            string
-        ) or Utils.is_negated_propositional_symbol(string):
-            known_symbols.add(Literal.from_string(string))
-
-            # atomic sentence needs to know if its negated or not
-            return AtomicSentence(Literal.from_string(string))
+    def from_string(
+        cls, string: str, known_symbols: set[Literal], symbol_table=None
+    ) -> "Sentence":
+        # imported here because the parser needs the sentence classes
+        from src.syntax.parser import Parser
 
-        # is the string a boolean value?
-        if Utils.is_true_false(string):
-            return AtomicSentence(BoolAtom.from_string(string))
-
-        # otherwise this is a complex sentence
-        return Expression.from_string(string, known_symbols)
+        # every symbol in the string is added to known_symbols
+        # the sentence shares its parts with the other sentences of the symbol table if there is one
+        return Parser.parse_sentence(string, known_symbols, symbol_table)
 
     def get_symbols(self) -> set[Literal]:
         raise NotImplementedError("Get symbols should be implemented in subclasses.")
@@ -37,40 +36,50 @@ class Sentence:
             "Converting to CNF should be implemented in subclasses."
         )
 
-    def convert_biconditionals(self) -> "Sentence":
-        raise NotImplementedError(
-            "Converting biconditionals should be implemented in subclasses."
-        )
+    def get_clauses(self, positive: bool = True) -> list[tuple[Literal, ...]]:
+        # clauses of the sentence, or of its negation, made with the distributive law
+        # the clauses of each part are worked out from the clauses of its children instead of rewriting the
+        # sentence, so sentences are never changed and can be shared (see SymbolTable)
+        # - A & B has the clauses of A and the clauses of B
+        # - A || B has a clause for each pair of clauses of A and B, joined together
+        # - ~A has the clauses of A with the opposite sign, which is how de morgan's laws are applied
+        # - A => B is ~A || B and A <=> B is (~A || B) & (~B || A)
+        # the tree is walked with an explicit stack because sentences can be very deep, and each sub sentence
+        # is only converted once for each sign even if it is shared
+        clauses: dict[tuple[int, bool], list[tuple[Literal, ...]]] = {}
 
-    def convert_implications(self) -> "Sentence":
-        raise NotImplementedError(
-            "Converting implications should be implemented in subclasses."
-        )
+        # each entry is a sentence, its sign and its children once they have been pushed
+        stack: list[tuple[Sentence, bool, list]] = [(self, positive, None)]
 
-    def remove_double_negations(self) -> "Sentence":
-        raise NotImplementedError(
-            "Removing double negations should be implemented in subclasses."
-        )
+        while len(stack) > 0:
+            current, positive, children = stack.pop()
 
-    def apply_de_morgans_laws(self) -> "Sentence":
-        raise NotImplementedError(
-            "Applying De Morgan's laws should be implemented in subclasses."
-        )
+            key = (id(current), positive)
 
-    def distribute_conjuctions_over_disjunctions(self) -> "Sentence":
-        raise NotImplementedError(
-            "Distributing conjunctions over disjunctions should be implemented in subclasses."
-        )
+            if children is None:
+                if key in clauses:
+                    continue
 
-    def convert_negated_sentence_to_negated_literal(self) -> "Sentence":
-        raise NotImplementedError(
-            "Converted negated sentences should be implemented in subclasses."
-        )
+                if isinstance(current, AtomicSentence):
+                    clauses[key] = current.get_atom_clauses(positive)
+                    continue
 
-    def get_cnf_subsentences(self) -> list["CNFClause"]:
-        raise NotImplementedError(
-            "Getting CNF sub sentences should be implemented in subclasses."
-        )
+                current: Expression
+                children = current.get_children(positive)
+
+                stack.append((current, positive, children))
+
+                for child, child_positive in children:
+                    if (id(child), child_positive) not in clauses:
+                        stack.append((child, child_positive, None))
+
+                continue
+
+            operands = [clauses[(id(child), sign)] for child, sign in children]
+
+            clauses[key] = current.combine_clauses(positive, operands)
+
+        return clauses[(id(self), positive)]
 
 
 class AtomicSentence(Sentence):
@@ -84,7 +93,14 @@ class AtomicSentence(Sentence):
     def __eq__(self, other: "AtomicSentence"):
         return self.atom == other.atom
 
+    def __hash__(self):
+        return hash(self.atom)
+
     def evaluate(self, model: Model) -> bool:
+        # True and False aren't in the model
+        if isinstance(self.atom, BoolAtom):
+            return self.atom.name == "True"
+
         # handle negation of the atom
         value_according_model = model.get(self.atom.name)
 
@@ -98,28 +114,16 @@ class AtomicSentence(Sentence):
         return set([self.atom])
 
     def get_cnfs(self) -> list[CNFClause]:
-        return [CNFClause(set([self.atom]))]
+        return [CNFClause(list(clause)) for clause in self.get_atom_clauses(True)]
 
-    def convert_biconditionals(self) -> Sentence:
-        return self
+    def get_atom_clauses(self, positive: bool) -> list[tuple[Literal, ...]]:
+        atom = self.atom
 
-    def convert_implications(self) -> Sentence:
-        return self
+        # True has no clauses and False is the empty clause
+        if isinstance(atom, BoolAtom):
+            return [] if (atom.name == "True") == positive else [()]
 
-    def remove_double_negations(self) -> Sentence:
-        return self
-
-    def apply_de_morgans_laws(self) -> Sentence:
-        return self
-
-    def distribute_conjuctions_over_disjunctions(self) -> Sentence:
-        return self
-
-    def convert_negated_sentence_to_negated_literal(self) -> Sentence:
-        return self
-
-    def get_cnf_subsentences(self) -> list["CNFClause"]:
-        return [CNFClause(set([self.atom]))]
+        return [(atom,)] if positive else [(atom.get_negation(),)]
 
 
 class Expression(Sentence):
@@ -129,427 +133,194 @@ class Expression(Sentence):
         self.rhs = rhs
 
     def __str__(self):
-        # if operator is negation then only show the rhs
-        if self.operator == Operator.NEGATION:
-            return f"{self.operator}{self.rhs}"
+        # the tree is walked with an explicit stack because sentences can be very deep
+        # each entry is a sub sentence or a piece of text that is already done
+        parts = []
+        stack: list[Sentence | str] = [self]
 
-        return f"({self.lhs} {self.operator} {self.rhs})"
+        while len(stack) > 0:
+            current = stack.pop()
 
-    @staticmethod
-    def get_operator(string: str):
-        # find the operator can be multiple chars long
-        operator = None
-
-        # we need to find the left most operator
-        # so we need to find the index of the current operator and choose the one with the smallest index
-        index = len(string)
+            # other sentences, including horn clauses, are shown the way they show themselves
+            if type(current) is not Expression:
+                parts.append(str(current))
+                continue
 
-        for op in Operator:
-            # take the left most operator
-            if op.value in string and string.index(op.value) < index:
-                operator = op
-                index = string.index(op.value)
+            # if operator is negation then only show the rhs
+            if current.operator == Operator.NEGATION:
+                stack.append(current.rhs)
+                stack.append(str(current.operator))
+                continue
 
-        if operator is None:
-            raise ValueError(f"Could not find an operator in {string}")
+            stack.extend([")", current.rhs, f" {current.operator} ", current.lhs, "("])
 
-        return operator
+        return "".join(parts)
 
     @classmethod
-    def from_string(cls, string: str, known_symbols: set[Literal]) -> "Expression":
-        # get operator
-        operator = cls.get_operator(string)
-
-        # if its a negation check if the next character is a bracket because it could be a negated sentence
-        if operator == Operator.NEGATION:
-            negation_index = string.find(Operator.NEGATION.value)
-
-            negation_length = len(Operator.NEGATION.value)
-
-            next_char_is_bracket = (
-                string[negation_index + negation_length]
-                == Operator.OPENING_BRACKET.value
-            )
-
-            # negated literal
-            if not next_char_is_bracket:
-                # if its not a bracket then we need to find the next operator because the negation is only for the next literal
-                operator = cls.get_operator(
-                    string[(negation_index + negation_length) :]
-                )
+    def from_string(
+        cls, string: str, known_symbols: set[Literal], symbol_table=None
+    ) -> "Expression":
+        sentence = Sentence.from_string(string, known_symbols, symbol_table)
 
-            # negated sentence
-            else:
-                # we need to negate this sentence
-                opening_bracket_index = string.find(Operator.OPENING_BRACKET.value)
-                closing_bracket_index = Utils.find_matching_bracket(
-                    string, opening_bracket_index
-                )
-
-                operator_substring = string[closing_bracket_index:]
-
-                # if there is no rhs, then the expression could be e.g. ~(A&B)
-                if len(operator_substring) == 0:
-                    # so we just take the lhs
-                    # index is 2 because we need to skip over negation and opening bracket
-                    negated_sentence = Sentence.from_string(string[2:-1], known_symbols)
-
-                    return Expression(None, Operator.NEGATION, negated_sentence)
-
-                # get the next operator after the closing bracket
-                second_operator = cls.get_operator(operator_substring)
+        if not isinstance(sentence, Expression):
+            raise ValueError(f"Could not find an operator in {string}")
 
-                # first part: get the local index of the second operator in the operator substring
-                # second part: add the index of where it is in the actual string
-                second_operator_index = operator_substring.find(
-                    second_operator.value
-                ) + (len(string) - len(operator_substring))
+        return sentence
 
-                # lhs_string is everything before the second operator index
-                # rhs_string is everything after the second operator index plus the operator's length
-                lhs_string = string[opening_bracket_index:second_operator_index]
-                rhs_string = string[
-                    second_operator_index + len(second_operator.value) :
-                ]
+    def evaluate(self, model: Model) -> bool:
+        # the tree is walked with an explicit stack because sentences can be very deep
+        values: list[bool] = []
 
-                lhs = Sentence.from_string(lhs_string, known_symbols)
-                rhs = Sentence.from_string(rhs_string, known_symbols)
+        # each entry is a sentence and whether its children are done
+        stack: list[tuple[Sentence, bool]] = [(self, False)]
 
-                negated_sentence = Expression(None, Operator.NEGATION, lhs)
+        while len(stack) > 0:
+            current, children_done = stack.pop()
 
-                return Expression(negated_sentence, second_operator, rhs)
+            if isinstance(current, AtomicSentence):
+                values.append(current.evaluate(model))
+                continue
 
-        # There are 3 bracket cases:
-        # 1. (A&B)&C
-        # 2. A&(B&C)
-        # 3. A&(B&C)&D
+            current: Expression
+            operator = current.operator
 
-        # Case 1 we want to group (A&B) as LHS and C as RHS
-        # Case 2 we want to group A as LHS and (B&C) as RHS
-        # Case 3 we want to group A as LHS and (B&C)&D as RHS
+            if not children_done:
+                stack.append((current, True))
 
-        # Case 2 is done by default because it already groups at operator left to right
-        # Case 3 is done by default because it already groups at operator left to right
+                # the rhs is pushed first so the lhs is done first
+                stack.append((current.rhs, False))
 
-        # Therefore, we only need to handle Case 1
+                if operator != Operator.NEGATION:
+                    stack.append((current.lhs, False))
 
-        # Case 1 is when the first operator is a bracket
+                continue
 
-        # if the first operator is a bracket then we need to group that as LHS
-        if operator == Operator.OPENING_BRACKET:
-            # get the first bracketed sentence
-            opening_bracket_index = string.find(Operator.OPENING_BRACKET.value)
+            rhs = values.pop()
 
-            # only if we find brackets
-            closing_bracket_index = Utils.find_matching_bracket(
-                string, opening_bracket_index
-            )
+            if operator == Operator.NEGATION:
+                values.append(not rhs)
+                continue
 
-            # between lhs and rhs there is an operator
-            # but the operator could be 1 length, 2 length of 3 length
-            # so we need the substring to find the operator
-            # find the operator
-            operator_substring = string[closing_bracket_index:]
+            lhs = values.pop()
 
-            # if there is no rhs, then the expression could be e.g. (A&B)
-            if len(operator_substring) == 0:
-                # so we just take the lhs
-                return Sentence.from_string(string[1:-1], known_symbols)
+            if operator == Operator.CONJUNCTION:
+                values.append(lhs and rhs)
 
-            # get the next operator after the closing bracket
-            second_operator = cls.get_operator(operator_substring)
+            elif operator == Operator.DISJUNCTION:
+                values.append(lhs or rhs)
 
-            # first part: get the local index of the second operator in the operator substring
-            # second part: add the index of where it is in the actual string
-            second_operator_index = operator_substring.find(second_operator.value) + (
-                len(string) - len(operator_substring)
-            )
+            # A=>B is equivalent to -A or B according to material implication
+            elif operator == Operator.IMPLICATION:
+                values.append(not lhs or rhs)
 
-            # lhs is everything before the second operator index
-            # rhs is everything after the second operator index plus the operator's length
-            lhs = string[:second_operator_index]
-            rhs = string[second_operator_index + len(second_operator.value) :]
+            # A<=>B is equivalent to (A=>B) and (B=>A) according to material equivalence
+            # which is true when both sides have the same value
+            elif operator == Operator.BICONDITIONAL:
+                values.append(lhs == rhs)
 
-            return cls(
-                Sentence.from_string(lhs, known_symbols),
-                second_operator,
-                Sentence.from_string(rhs, known_symbols),
-            )
+            else:
+                raise ValueError(f"Operator {operator} not supported.")
 
-        # split the string into lhs and rhs at the first operator only
-        lhs, rhs = string.split(operator.value, 1)
+        return values[0]
 
-        return cls(
-            Sentence.from_string(lhs, known_symbols),
-            operator,
-            Sentence.from_string(rhs, known_symbols),
-        )
+    def get_symbols(self) -> set[Literal]:
+        # the tree is walked with an explicit stack because sentences can be very deep
+        # and a part that is shared by other parts (see SymbolTable) is only looked at once
+        symbols = set()
+        visited = set()
+        stack: list[Sentence] = [self]
 
-    def evaluate(self, model: Model) -> bool:
-        if self.operator == Operator.NEGATION:
-            return not self.rhs.evaluate(model)
+        while len(stack) > 0:
+            current = stack.pop()
 
-        if self.operator == Operator.CONJUNCTION:
-            return self.lhs.evaluate(model) and self.rhs.evaluate(model)
+            if id(current) in visited:
+                continue
 
-        if self.operator == Operator.DISJUNCTION:
-            return self.lhs.evaluate(model) or self.rhs.evaluate(model)
+            visited.add(id(current))
 
-        # A=>B is equivalent to -A or B according to material implication
-        if self.operator == Operator.IMPLICATION:
-            return not self.lhs.evaluate(model) or self.rhs.evaluate(model)
+            if isinstance(current, AtomicSentence):
+                symbols.add(current.atom)
+                continue
 
-        # A<=>B is equivalent to (A=>B) and (B=>A) according to material equivalence
-        # which is equivalent to (-A or B) and (-B or A) according to material implication
-        if self.operator == Operator.BICONDITIONAL:
-            return (not self.lhs.evaluate(model) or self.rhs.evaluate(model)) and (
-                not self.rhs.evaluate(model) or self.lhs.evaluate(model)
-            )
+            # a negation only has a right hand side
+            stack.append(current.rhs)
 
-        raise ValueError(f"Operator {self.operator} not supported.")
+            if current.operator != Operator.NEGATION:
+                stack.append(current.lhs)
 
-    def get_symbols(self) -> set[Literal]:
-        return self.lhs.get_symbols().union(self.rhs.get_symbols())
+        return symbols
 
     # CNF is where the sentence is a conjunction of disjunctions
     def get_cnfs(self) -> list["CNFClause"]:
-        # so we have to remove biconditionals and implications
-        sentence = self.convert_biconditionals()
-        sentence = sentence.convert_implications()
-
-        # now we remove double negations and apply de morgan's laws
-        # this is done until the string doesn't change anymore
-        # once this occurs the sentence is now in negation normal form (flattened)
-        previous_string = str(sentence)
-        while True:
-            sentence = sentence.remove_double_negations()
-            sentence = sentence.apply_de_morgans_laws()
-
-            if previous_string == str(sentence):
-                break
-            previous_string = str(sentence)
-
-        # we have both negated sentences and negated literals
-        # to simplify the next step we know that each negated sentence must only have one literal in it
-        # so we convert them to negated literals
-        sentence = sentence.convert_negated_sentence_to_negated_literal()
-
-        # now we distribute the conjunctions over the disjunctions
-        # this is done until the string doesn't change anymore
-        # this gives us the CNF
-        previous_string = str(sentence)
-        while True:
-            sentence = sentence.distribute_conjuctions_over_disjunctions()
-            if previous_string == str(sentence):
-                break
-            previous_string = str(sentence)
-
-        cnfs = sentence.get_cnf_subsentences()
-        return cnfs
-
-    def convert_biconditionals(self) -> Sentence:
-        # negation expression doesn't have a lhs
-        if self.operator != Operator.NEGATION:
-            self.lhs = self.lhs.convert_biconditionals()
-        self.rhs = self.rhs.convert_biconditionals()
-
-        # this isn't an infinite loop, the atomic sentence has the base case
-        if self.operator == Operator.BICONDITIONAL:
-            # split the biconditional using the following rule:
-            # A <=> B === (A => B) & (B => A)
-            implication_lhs = Expression(self.lhs, Operator.IMPLICATION, self.rhs)
-            implication_rhs = Expression(self.rhs, Operator.IMPLICATION, self.lhs)
-            return Expression(implication_lhs, Operator.CONJUNCTION, implication_rhs)
-
-        return self
-
-    def convert_implications(self) -> Sentence:
-        # negation expression doesn't have a lhs
-        if self.operator != Operator.NEGATION:
-            self.lhs = self.lhs.convert_implications()
-        self.rhs = self.rhs.convert_implications()
-
-        # this isn't an infinite loop, the atomic sentence has the base case
-        if self.operator == Operator.IMPLICATION:
-            # split the implication using the following rule:
-            # A => B === ~A || B
-            not_lhs = Expression(None, Operator.NEGATION, self.lhs)
-            return Expression(not_lhs, Operator.DISJUNCTION, self.rhs)
-
-        return self
-
-    def apply_de_morgans_laws(self) -> Sentence:
-        # check if we are negated
-        if self.operator == Operator.NEGATION:
-            # if we are negated then we want to apply de morgan's laws to the rhs
-
-            # if the rhs is an expression then we need to apply de morgan's laws to it
-            if isinstance(self.rhs, Expression) and self.rhs.lhs is not None:
-                # apply de morgan's laws to the rhs
-                # NOTE: the rhs cannot be a negation because we are already removed double negations
-
-                # get the inner expression of the negated sentence
-                inner_expression = self.rhs
-                inner_operator = inner_expression.operator
-
-                # make sure that we only allow ands and ors
-                if (
-                    inner_operator != Operator.DISJUNCTION
-                    and inner_operator != Operator.CONJUNCTION
-                ):
-                    raise ValueError(
-                        "The operator is "
-                        + inner_operator.value
-                        + " and is not a disjunction or a conjunction"
-                    )
-
-                # get the lhs and rhs
-                inner_lhs = inner_expression.lhs
-                inner_rhs = inner_expression.rhs
+        # a literal can come up more than once in a clause, only the first is kept
+        return [CNFClause(list(dict.fromkeys(clause))) for clause in self.get_clauses()]
 
-                # flip the operator depending on the inner operator
-                other_operator = (
-                    Operator.CONJUNCTION
-                    if inner_operator == Operator.DISJUNCTION
-                    else Operator.DISJUNCTION
-                )
-
-                # apply de morgans law
-                negated_inner_lhs = Expression(None, Operator.NEGATION, inner_lhs)
-                negated_inner_rhs = Expression(None, Operator.NEGATION, inner_rhs)
-                return Expression(
-                    negated_inner_lhs.apply_de_morgans_laws(),
-                    other_operator,
-                    negated_inner_rhs.apply_de_morgans_laws(),
-                )
+    def get_children(self, positive: bool) -> list[tuple[Sentence, bool]]:
+        # the children whose clauses are needed for the clauses of the sentence with the sign
+        # and the sign of each one
+        operator = self.operator
 
-            # if its an atom it can't be affected by de morgan's laws so we don't even need to recurse
-            return self
+        if operator is NEGATION:
+            return [(self.rhs, not positive)]
 
-        # apply de morgan's laws to the lhs and rhs
-        self.lhs = self.lhs.apply_de_morgans_laws()
-        self.rhs = self.rhs.apply_de_morgans_laws()
+        if operator is CONJUNCTION or operator is DISJUNCTION:
+            return [(self.lhs, positive), (self.rhs, positive)]
 
-        return self
+        if operator is IMPLICATION:
+            return [(self.lhs, not positive), (self.rhs, positive)]
 
-    def remove_double_negations(self) -> Sentence:
-        # not negated so we can just recurse
-        if not self.operator == Operator.NEGATION:
-            self.lhs = self.lhs.remove_double_negations()
-            self.rhs = self.rhs.remove_double_negations()
-            return self
-
-        # if we are negated then we need to check if the rhs is negated
-        if isinstance(self.rhs, Expression):
-
-            # rhs is negated, so its a double negation
-            if self.rhs.operator == Operator.NEGATION:
-                # recurse rhs
-                return self.rhs.rhs.remove_double_negations()
-
-            # child is not negated so we can just recurse as there is no double negation
-            self.rhs = self.rhs.remove_double_negations()
-            return self
+        if operator is BICONDITIONAL:
+            return [
+                (self.lhs, True),
+                (self.lhs, False),
+                (self.rhs, True),
+                (self.rhs, False),
+            ]
 
-        # othercase is that the rhs is an atomic sentence
-        self.rhs: AtomicSentence
+        raise ValueError(f"Operator {operator} not supported.")
 
-        # if atom is negated there is a double negation
-        if self.rhs.atom.negated:
-            return AtomicSentence(Literal(self.rhs.atom.name, False))
+    def combine_clauses(
+        self, positive: bool, operands: list[list[tuple[Literal, ...]]]
+    ) -> list[tuple[Literal, ...]]:
+        # clauses of the sentence with the sign from the clauses of the children from get_children
+        operator = self.operator
 
-        # not double negation
-        return self
+        if operator is NEGATION:
+            return operands[0]
 
-    def distribute_conjuctions_over_disjunctions(self) -> Sentence:
-        # we want to distribute the disjunction over the conjunction where the conjunction is the inner expression
-        if self.operator == Operator.DISJUNCTION:
-            # grab the lhs and rhs
-            lhs = self.lhs
-            rhs = self.rhs
+        if operator is BICONDITIONAL:
+            lhs_positive, lhs_negative, rhs_positive, rhs_negative = operands
 
-            # we need to distribute over the inner and outer side
-            # we can't distribute over atomic sentences
-            if not (
-                isinstance(lhs, AtomicSentence) and isinstance(rhs, AtomicSentence)
-            ):
+            # A <=> B === (~A || B) & (~B || A)
+            if positive:
+                return self.distribute(lhs_negative, rhs_positive) + self.distribute(
+                    rhs_negative, lhs_positive
+                )
 
-                # there are 3 other cases:
-                # A || (B & C)
-                # (A & B) || C
-                # (A & B) || (C & D)
-
-                # in case 3 we can choose to distribute over the lhs or rhs
-                # so we just choose rhs as inner
-
-                # so case 2 and 3 we make inner lhs
-                # case 1 we make inner rhs
-
-                if isinstance(rhs, AtomicSentence) or (
-                    isinstance(lhs, Expression)
-                    and isinstance(rhs, Expression)
-                    and rhs.operator == Operator.DISJUNCTION
-                ):
-                    inner = lhs
-                    outer = rhs
-                else:
-                    outer = lhs
-                    inner = rhs
-                inner: Expression
-                outer: Expression
-                if inner.operator == Operator.CONJUNCTION:
-                    return Expression.apply_distributive_law(outer, inner)
-
-        # recurse the distribution function to both sides of the expression
-        self.lhs = self.lhs.distribute_conjuctions_over_disjunctions()
-        self.rhs = self.rhs.distribute_conjuctions_over_disjunctions()
-
-        return self
+            # ~(A <=> B) === (A || B) & (~A || ~B)
+            return self.distribute(lhs_positive, rhs_positive) + self.distribute(
+                lhs_negative, rhs_negative
+            )
 
-    @staticmethod
-    def apply_distributive_law(outer: "Sentence", inner: "Expression") -> "Expression":
-        distributed_lhs = Expression(outer, Operator.DISJUNCTION, inner.lhs)
-        distributed_rhs = Expression(outer, Operator.DISJUNCTION, inner.rhs)
-        return Expression(
-            distributed_lhs.distribute_conjuctions_over_disjunctions(),
-            Operator.CONJUNCTION,
-            distributed_rhs.distribute_conjuctions_over_disjunctions(),
-        )
+        lhs, rhs = operands
 
-    def convert_negated_sentence_to_negated_literal(self) -> Sentence:
-        # convert to a negated atomic sentence
-        if self.operator == Operator.NEGATION:
-            return AtomicSentence(Literal(self.rhs.atom.name, True))
-
-        # recurse
-        self.lhs = self.lhs.convert_negated_sentence_to_negated_literal()
-        self.rhs = self.rhs.convert_negated_sentence_to_negated_literal()
-        return self
-
-    def get_cnf_subsentences(self) -> list["CNFClause"]:
-        # (~a || ~b) || ((d || c) & (d || f))
-        # (~a || ~b) || ((d || c) & (d || f))
-        # (~a || ~b || d || c) & (d || f)
-        sentence_string = (
-            str(self)
-            .replace(" ", "")
-            .replace(Operator.OPENING_BRACKET.value, "")
-            .replace(Operator.CLOSING_BRACKET.value, "")
+        # ~(A & B) === ~A || ~B and ~(A || B) === ~A & ~B
+        # A => B === ~A || B and ~(A => B) === A & ~B
+        is_conjunction = (
+            operator is CONJUNCTION if positive else operator is not CONJUNCTION
         )
-        disjunction_sentences = sentence_string.split(Operator.CONJUNCTION.value)
 
-        cnfs = []
-        for disjunction_sentence in disjunction_sentences:
-            literals_as_strings = disjunction_sentence.split(Operator.DISJUNCTION.value)
+        if is_conjunction:
+            return lhs + rhs
 
-            literals = [
-                Literal.from_string(literal_string)
-                for literal_string in literals_as_strings
-            ]
-
-            cnfs.append(CNFClause(set(literals)))
+        return self.distribute(lhs, rhs)
 
-        return cnfs
+    @staticmethod
+    def distribute(
+        lhs: list[tuple[Literal, ...]], rhs: list[tuple[Literal, ...]]
+    ) -> list[tuple[Literal, ...]]:
+        # (A & B) || (C & D) === (A || C) & (A || D) & (B || C) & (B || D)
+        return [lhs_clause + rhs_clause for lhs_clause in lhs for rhs_clause in rhs]
 
 
 # Horn Clause implication form is always A & B & C => D with all positive literals, there cannot be any negative literals
@@ -566,10 +337,15 @@ class HornClause(Expression):
         self.body = body
         self.head = head
 
-        lhs = Sentence.from_string(
-            Operator.CONJUNCTION.value.join([str(literal) for literal in self.body]),
-            known_symbols,
-        )
+        # the body is a conjunction of the literals grouped to the right, the same as parsing a & b & c
+        # it is built directly because parsing it again is slow with a lot of rules
+        lhs = AtomicSentence(self.body[-1])
+
+        for literal in reversed(self.body[:-1]):
+            lhs = Expression(AtomicSentence(literal), Operator.CONJUNCTION, lhs)
+
+        known_symbols.update(self.body)
+
         rhs = AtomicSentence(self.head)
 
         super().__init__(lhs, Operator.IMPLICATION, rhs)
@@ -578,48 +354,69 @@ class HornClause(Expression):
     def get_symbols(
         sentence: Sentence, body: list[PositiveLiteral]
     ) -> list[PositiveLiteral]:
-        # if sentence is expression make sure operator is conjunction or implication
-        if isinstance(sentence, Expression):
-            # if it is the last sentence
-            last_sentence = isinstance(sentence.rhs, AtomicSentence)
-
-            # then the last sentence needs to be implication
-            if not last_sentence and sentence.operator != Operator.CONJUNCTION:
-                raise ValueError(
-                    f"Body of Horn clause must be conjunctions only.", str(sentence)
-                )
+        # a & b & c => d is parsed as a & (b & (c => d)) so the symbols are found by going down the rhs
+        # a loop instead of recursion because a rule can have a lot of symbols
+        while True:
+            # if sentence is expression make sure operator is conjunction or implication
+            if isinstance(sentence, Expression):
+                # if it is the last sentence
+                last_sentence = isinstance(sentence.rhs, AtomicSentence)
 
-            # else it has to be a conjunction
-            if last_sentence and sentence.operator != Operator.IMPLICATION:
-                raise ValueError(
-                    f"Head of Horn clause must be implication only.", str(sentence)
-                )
+                # then the last sentence needs to be implication
+                if not last_sentence and sentence.operator != Operator.CONJUNCTION:
+                    raise ValueError(
+                        f"Body of Horn clause must be conjunctions only.", str(sentence)
+                    )
 
-        # add lhs
-        if isinstance(sentence.lhs, AtomicSentence):
-            # check if its a positive literal
-            if sentence.lhs.atom.negated:
-                raise ValueError(
-                    f"Body of Horn clause must be positive literals only.",
-                    str(sentence),
-                )
+                # else it has to be a conjunction
+                if last_sentence and sentence.operator != Operator.IMPLICATION:
+                    raise ValueError(
+                        f"Head of Horn clause must be implication only.", str(sentence)
+                    )
 
-            body.append(sentence.lhs.atom)
+            # add lhs, brackets around part of the body eg. (a & b) & c => d are the same as none
+            if (
+                isinstance(sentence.lhs, Expression)
+                and sentence.lhs.operator == Operator.CONJUNCTION
+            ):
+                operands = HornClause.get_body_chain(sentence.lhs)
+            else:
+                operands = [sentence.lhs]
 
-        # add rhs
-        if isinstance(sentence.rhs, AtomicSentence):
-            # check if its a positive literal
-            if sentence.lhs.atom.negated:
-                raise ValueError(
-                    f"Body of Horn clause must be positive literals only.",
-                    str(sentence),
-                )
+            for operand in operands:
+                # check if its a positive literal
+                if not isinstance(operand, AtomicSentence) or operand.atom.negated:
+                    raise ValueError(
+                        f"Body of Horn clause must be positive literals only.",
+                        str(sentence),
+                    )
+
+                body.append(operand.atom)
+
+            # add rhs
+            if isinstance(sentence.rhs, AtomicSentence):
+                body.append(sentence.rhs.atom)
 
-            body.append(sentence.rhs.atom)
-        else:
-            HornClause.get_symbols(sentence.rhs, body)
+                return body
+
+            sentence = sentence.rhs
+
+    @staticmethod
+    def get_body_chain(sentence: Expression) -> list[Sentence]:
+        # operands of a chain of conjunctions in order eg. (a & b) & (c & d) -> a, b, c, d
+        operands = []
+        stack: list[Sentence] = [sentence]
+
+        while len(stack) > 0:
+            current = stack.pop()
+
+            if isinstance(current, Expression) and current.operator == CONJUNCTION:
+                stack.append(current.rhs)
+                stack.append(current.lhs)
+            else:
+                operands.append(current)
 
-        return body
+        return operands
 
     @classmethod
     def from_expression(
@@ -0,0 +1,73 @@
+from src.syntax.atom import Atom
+from src.syntax.literal import Literal
+from src.syntax.operator import Operator
+from src.syntax.sentence import AtomicSentence, Expression, Sentence
+
+
+# Interned symbols and sentences of a knowledge base
+# each symbol gets an integer id and its two literals the first time its name is seen, after that
+# the same literal instances are handed out so the name is only checked once
+# sentences are hash consed, there is only one instance of each structure eg. every (a & b) in the
+# knowledge base is the same object, so sub sentences that come up again don't use any more memory
+# and two sentences made by the same table are equal exactly when they are the same object
+# sentences are never changed after they are made because they can be shared
+class SymbolTable:
+    def __init__(self):
+        # name of each id and the id of each name
+        self.names: list[str] = []
+        self.symbol_ids: dict[str, int] = {}
+
+        # positive and negated literal of each id
+        self.literals: list[tuple[Literal, Literal]] = []
+
+        self.atomic_sentences: dict[Atom, AtomicSentence] = {}
+
+        # the key is the ids of the lhs, operator and rhs, which are all kept alive by the expression
+        # so the ids can't be reused, comparing them is much faster than comparing the sentences
+        self.expressions: dict[tuple[int, int, int], Expression] = {}
+
+    def get_number_of_symbols(self) -> int:
+        return len(self.names)
+
+    def get_symbol_id(self, name: str) -> int:
+        # adds the symbol if it isn't known yet, raises a ValueError if it isn't a valid symbol
+        symbol_id = self.symbol_ids.get(name)
+
+        if symbol_id is None:
+            positive = Literal(name, False)
+            negated = Literal(name, True)
+
+            positive.negation = negated
+            negated.negation = positive
+
+            symbol_id = len(self.names)
+            self.symbol_ids[name] = symbol_id
+            self.names.append(name)
+            self.literals.append((positive, negated))
+
+        return symbol_id
+
+    def get_literal(self, name: str, negated: bool = False) -> Literal:
+        return self.literals[self.get_symbol_id(name)][negated]
+
+    def get_atomic_sentence(self, atom: Atom) -> AtomicSentence:
+        sentence = self.atomic_sentences.get(atom)
+
+        if sentence is None:
+            sentence = AtomicSentence(atom)
+            self.atomic_sentences[atom] = sentence
+
+        return sentence
+
+    def get_expression(
+        self, lhs: Sentence, operator: Operator, rhs: Sentence
+    ) -> Expression:
+        # lhs is None for a negation
+        key = (id(lhs), id(operator), id(rhs))
+        expression = self.expressions.get(key)
+
+        if expression is None:
+            expression = Expression(lhs, operator, rhs)
+            self.expressions[key] = expression
+
+        return expression
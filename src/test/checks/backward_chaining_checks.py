@@ -0,0 +1,54 @@
+import random
+
+from src.algorithm.backward_chaining import BackwardChaining
+from src.knowledge_base_session import KnowledgeBaseSession
+from src.test.unit_test_check import expect
+
+SYMBOLS = ["a", "b", "c", "d", "e", "f", "g", "h"]
+
+# random knowledge bases are told this many sentences, each followed by queries
+NUMBER_OF_SESSIONS = 40
+SENTENCES = 10
+
+
+def get_random_rule(rng: random.Random) -> str:
+    # a fact or a rule, more rules than facts so there are long chains
+    head = rng.choice(SYMBOLS)
+
+    if rng.random() < 0.25:
+        return f"{head};"
+
+    body = rng.sample(SYMBOLS, rng.randint(1, 3))
+
+    return f"{' & '.join(body)} => {head};"
+
+
+def check_backward_chaining_memo():
+    # the memo is kept between queries and emptied by a tell, answers are the same as a session without one
+    rng = random.Random(1)
+
+    for _ in range(NUMBER_OF_SESSIONS):
+        session = KnowledgeBaseSession()
+        told = ""
+
+        for _ in range(SENTENCES):
+            rule = get_random_rule(rng)
+            session.tell(rule)
+            told += rule
+
+            for symbol in SYMBOLS:
+                algorithm = BackwardChaining()
+                result = str(session.ask(symbol, algorithm))
+
+                fresh = KnowledgeBaseSession.from_string(told)
+                expected = str(fresh.ask(symbol, BackwardChaining()))
+
+                expect(result, expected, f"{told} BC {symbol}")
+
+                # asked again it is replayed from the memo
+                algorithm = BackwardChaining()
+                expect(str(session.ask(symbol, algorithm)), expected, f"{told} again")
+                expect(algorithm.goals_expanded, 0, f"{told} {symbol} goals expanded")
+
+            memo = session.get_horn_knowledge_base().backward_chaining_memo
+            expect(len(memo) > 0, True, f"{told} memo")
@@ -0,0 +1,115 @@
+from tempfile import TemporaryDirectory
+
+from src.file_parser import FileParser, FileType
+from src.inference_algorithm_factory import InferenceAlgorithmFactory
+from src.knowledge_base_session import KnowledgeBaseSession
+from src.runner import Runner
+from src.test.checks.dimacs_checks import write_file
+from src.test.unit_test_check import expect, expect_error
+
+# a horn knowledge base so every algorithm can answer the queries, h isn't in it
+KNOWLEDGE_BASE = (
+    "p2 => p3; p3 => p1; c => e; b & e => f; p2 & p1 & p3 => d; p1 & p3 => c; a; b; p2;"
+)
+QUERIES = ["d", "f", "a", "h", "p1", "e"]
+
+ALGORITHMS = ["TT", "FC", "BC", "DPLL", "CDCL", "SHARPSAT", "BDD"]
+
+
+def get_algorithm(name: str):
+    return InferenceAlgorithmFactory.get_inference_algorithm_from_name(name)
+
+
+def write_batch_file(directory: str) -> str:
+    return write_file(
+        directory,
+        "batch.txt",
+        f"TELL\n{KNOWLEDGE_BASE}\nASK\n" + "\n".join(QUERIES) + "\n\n",
+    )
+
+
+def get_answers(name: str) -> list[str]:
+    # each query asked in a session of its own
+    return [
+        str(
+            KnowledgeBaseSession.from_string(KNOWLEDGE_BASE).ask(
+                query, get_algorithm(name)
+            )
+        )
+        for query in QUERIES
+    ]
+
+
+def check_answers():
+    # a line for each query in order, the same as asking it on its own, with any number of workers
+    with TemporaryDirectory() as directory:
+        file_path = write_batch_file(directory)
+
+        expect(FileParser.get_file_type(file_path), FileType.BATCH, "file type")
+
+        for name in ALGORITHMS:
+            answers = get_answers(name)
+
+            for workers in (None, 1, 2):
+                lines = list(
+                    Runner.run_batch(get_algorithm(name), file_path, workers=workers)
+                )
+
+                expect(lines, answers, f"{name} with {workers} workers")
+
+
+def check_instrumentation():
+    # each query is measured and reported after its line, in the order of the queries
+    with TemporaryDirectory() as directory:
+        file_path = write_batch_file(directory)
+
+        for workers in (None, 2):
+            reports = []
+
+            lines = list(
+                Runner.run_batch(
+                    get_algorithm("CDCL"),
+                    file_path,
+                    workers=workers,
+                    instrumentation_consumer=lambda line, instrumentation: reports.append(
+                        (line, instrumentation)
+                    ),
+                )
+            )
+
+            expect([line for line, _ in reports], lines, f"{workers} workers lines")
+
+            for i, (_, instrumentation) in enumerate(reports):
+                expect(
+                    "solve" in instrumentation.phases,
+                    True,
+                    f"query {i + 1} with {workers} workers solved",
+                )
+
+
+def check_errors():
+    with TemporaryDirectory() as directory:
+        file_path = write_batch_file(directory)
+
+        expect_error(
+            lambda: list(Runner.run_batch(get_algorithm("DPLL"), file_path, workers=0)),
+            "There must be at least 1 worker",
+            "no workers",
+        )
+        expect_error(
+            lambda: list(
+                Runner.run_batch(
+                    get_algorithm("TT"), file_path, consumer=print, workers=2
+                )
+            ),
+            "Models can't be streamed with more than 1 worker",
+            "streaming with 2 workers",
+        )
+
+        file_path = write_file(directory, "no_queries.txt", "TELL\na;\nASK\n\n")
+
+        expect_error(
+            lambda: list(Runner.run_batch(get_algorithm("DPLL"), file_path)),
+            "File must have at least 1 query",
+            "no queries",
+        )
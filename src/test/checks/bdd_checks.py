@@ -0,0 +1,117 @@
+import random
+
+from src.algorithm.bdd_checking import BDDChecking
+from src.algorithm.truth_table_checking import TruthTableChecking
+from src.bdd_knowledge_base import BDDKnowledgeBase
+from src.enumeration_mode import EnumerationMode
+from src.knowledge_base_session import KnowledgeBaseSession
+from src.test.checks.truth_table_checks import (
+    get_random_knowledge_base,
+    get_random_sentence,
+    get_results,
+)
+from src.test.unit_test_check import expect
+
+NUMBER_OF_KNOWLEDGE_BASES = 200
+
+# sentences told to a session one at a time so the diagram is added to after it is compiled
+NUMBER_OF_SESSIONS = 30
+SENTENCES = 5
+
+# a budget so small that every diagram goes over it
+MAX_NODES = 3
+
+
+def compare_results(results: list, expected: list, description: str):
+    for result, expected_result in zip(results, expected):
+        expect(str(result), str(expected_result), description)
+        expect(
+            [str(model) for model in result.models],
+            [str(model) for model in expected_result.models],
+            f"{description} models",
+        )
+
+
+def check_bdd():
+    # BDD finds the same models as TT, and counts the same number of them
+    rng = random.Random(14)
+
+    for _ in range(NUMBER_OF_KNOWLEDGE_BASES):
+        knowledge_base, queries = get_random_knowledge_base(rng)
+        expected = get_results(knowledge_base, queries, TruthTableChecking())
+
+        algorithm = BDDChecking()
+
+        compare_results(
+            get_results(knowledge_base, queries, algorithm),
+            expected,
+            f"{knowledge_base} ASK {queries}",
+        )
+
+        algorithm.set_enumeration_mode(EnumerationMode.COUNT)
+
+        expect(
+            [str(result) for result in get_results(knowledge_base, queries, algorithm)],
+            [str(result) for result in expected],
+            f"{knowledge_base} ASK {queries} count",
+        )
+
+
+def check_bdd_tell():
+    # the diagram of a session is the same as compiling everything that was told to it
+    rng = random.Random(15)
+
+    for _ in range(NUMBER_OF_SESSIONS):
+        session = KnowledgeBaseSession()
+        told = ""
+
+        for _ in range(SENTENCES):
+            sentence = get_random_sentence(rng)
+            session.tell(f"{sentence};")
+            told += f"{sentence};"
+
+            queries = [get_random_sentence(rng, 2) for _ in range(3)]
+
+            compare_results(
+                [session.ask(query, BDDChecking()) for query in queries],
+                [session.ask(query, TruthTableChecking()) for query in queries],
+                f"{told} ASK {queries}",
+            )
+
+
+def check_bdd_over_budget():
+    # a diagram over budget falls back to TT, or to SHARPSAT when only counting
+    rng = random.Random(16)
+
+    for _ in range(20):
+        knowledge_base, queries = get_random_knowledge_base(rng)
+        session = KnowledgeBaseSession.from_string(knowledge_base)
+
+        bdd_knowledge_base = BDDKnowledgeBase.from_generic_knowledge_base(
+            session.knowledge_base, MAX_NODES
+        )
+
+        expect(bdd_knowledge_base.is_compiled(), False, f"{knowledge_base} compiled")
+
+        expected = get_results(knowledge_base, queries, TruthTableChecking())
+        algorithm = BDDChecking()
+
+        compare_results(
+            [
+                algorithm.run(bdd_knowledge_base, session.parse_query(query))
+                for query in queries
+            ],
+            expected,
+            f"{knowledge_base} ASK {queries} over budget",
+        )
+
+        algorithm.set_enumeration_mode(EnumerationMode.COUNT)
+
+        expect(
+            [
+                str(algorithm.run(bdd_knowledge_base, session.parse_query(query)))
+                for query in queries
+            ],
+            [str(result) for result in expected],
+            f"{knowledge_base} ASK {queries} count over budget",
+        )
@@ -0,0 +1,184 @@
+import os
+from tempfile import TemporaryDirectory
+
+from src.inference_algorithm_factory import InferenceAlgorithmFactory
+from src.instrumentation import Instrumentation
+from src.knowledge_base_cache import (
+    CNF,
+    FORMAT_VERSION,
+    FORMS,
+    HEADER,
+    HORN,
+    SECTION,
+    KnowledgeBaseCache,
+)
+from src.knowledge_base_session import KnowledgeBaseSession
+from src.runner import Runner
+from src.test.checks.dimacs_checks import write_file
+from src.test.unit_test_check import CheckError, expect, expect_error
+
+# a horn knowledge base so every algorithm that can use the cache can answer it
+KNOWLEDGE_BASE = (
+    "p2 => p3; p3 => p1; c => e; b & e => f; p2 & p1 & p3 => d; p1 & p3 => c; a; b; p2;"
+)
+
+
+def store_entry(cache: KnowledgeBaseCache, key: str, form: str) -> str:
+    session = KnowledgeBaseSession.from_string(KNOWLEDGE_BASE)
+
+    if form == CNF:
+        cache.store(key, form, session.get_cnf_knowledge_base())
+    else:
+        cache.store(key, form, session.get_horn_knowledge_base())
+
+    return cache.get_path(key, form)
+
+
+def check_entries_are_used():
+    # only the first run of each form converts the knowledge base, the others load it with the same result
+    # eg. BC loads the entry that FC stored
+    with TemporaryDirectory() as directory:
+        cache = KnowledgeBaseCache(os.path.join(directory, "cache"))
+        file_path = write_file(
+            directory, "standard.txt", f"TELL\n{KNOWLEDGE_BASE}\nASK\nd\n"
+        )
+
+        stored = set()
+
+        for name, form in FORMS.items():
+            results = []
+
+            for run in range(2):
+                instrumentation = Instrumentation()
+                result = Runner.run_from_file_path(
+                    InferenceAlgorithmFactory.get_inference_algorithm_from_name(name),
+                    file_path,
+                    instrumentation=instrumentation,
+                    cache=cache,
+                )
+
+                results.append(str(result))
+
+                expect(
+                    "convert" in instrumentation.phases,
+                    form not in stored,
+                    f"{name} converted on run {run + 1}",
+                )
+
+                stored.add(form)
+
+            expect(results[1], results[0], f"{name} result from the cache")
+
+            key = cache.get_key(KNOWLEDGE_BASE)
+            expect(os.path.exists(cache.get_path(key, form)), True, f"{name} entry")
+
+
+def check_corrupt_entries():
+    # an entry that can't be read is a miss, and it is deleted unless it is empty
+    with TemporaryDirectory() as directory:
+        cache = KnowledgeBaseCache(directory)
+
+        for form in (CNF, HORN):
+            path = store_entry(cache, "key", form)
+
+            with open(path, "rb") as file:
+                contents = file.read()
+
+            corruptions = [
+                ("garbage", b"not a cache entry" * 4, False),
+                ("header only", contents[: HEADER.size], False),
+                ("truncated", contents[: len(contents) // 2], False),
+                ("empty", b"", True),
+            ]
+
+            for name, corrupted, kept in corruptions:
+                with open(path, "wb") as file:
+                    file.write(corrupted)
+
+                expect(cache.load("key", form), None, f"{form} {name} entry")
+                expect(os.path.exists(path), kept, f"{form} {name} entry kept")
+
+            # it is stored again like any other miss
+            store_entry(cache, "key", form)
+
+            if cache.load("key", form) is None:
+                raise CheckError(f"{form} entry wasn't stored again")
+
+
+def check_foreign_entries():
+    # entries of another format version or byte order, or that don't match their checksum, are deleted
+    with TemporaryDirectory() as directory:
+        cache = KnowledgeBaseCache(directory)
+
+        for form in (CNF, HORN):
+            path = store_entry(cache, "key", form)
+
+            with open(path, "rb") as file:
+                contents = file.read()
+
+            magic, version, byte_order, sections, checksum = HEADER.unpack_from(
+                contents
+            )
+
+            # the checksum is only of what comes after the header so it still matches
+            headers = [
+                ("version", (magic, FORMAT_VERSION + 1, byte_order, sections)),
+                ("byte order", (magic, version, 1 - byte_order, sections)),
+                ("magic", (b"XXXX", version, byte_order, sections)),
+                ("sections", (magic, version, byte_order, sections + 1)),
+            ]
+
+            for name, header in headers:
+                with open(path, "wb") as file:
+                    file.write(HEADER.pack(*header, checksum) + contents[HEADER.size :])
+
+                expect(cache.load("key", form), None, f"{form} {name}")
+                expect(os.path.exists(path), False, f"{form} {name} entry kept")
+
+            # a changed byte that still has the right layout is found by the checksum
+            for position in (HEADER.size + SECTION.size, len(contents) - 1):
+                store_entry(cache, "key", form)
+
+                with open(path, "r+b") as file:
+                    file.seek(position)
+                    changed = file.read(1)[0] ^ 1
+                    file.seek(position)
+                    file.write(bytes([changed]))
+
+                expect(cache.load("key", form), None, f"{form} byte {position}")
+                expect(os.path.exists(path), False, f"{form} byte {position} kept")
+
+
+def check_eviction():
+    # the least recently used entries are deleted once the cache is too big, loading an entry uses it
+    with TemporaryDirectory() as directory:
+        size = os.path.getsize(store_entry(KnowledgeBaseCache(directory), "size", CNF))
+        os.remove(os.path.join(directory, f"size.{CNF}"))
+
+        cache = KnowledgeBaseCache(directory, size * 2 + size // 2)
+
+        os.utime(store_entry(cache, "first", CNF), (1000, 1000))
+        os.utime(store_entry(cache, "second", CNF), (2000, 2000))
+
+        expect(cache.get_size(), size * 2, "size of 2 entries")
+
+        # first is used again so second is now the least recently used
+        if cache.load("first", CNF) is None:
+            raise CheckError("first entry was evicted too early")
+
+        store_entry(cache, "third", CNF)
+
+        for key, kept in (("first", True), ("second", False), ("third", True)):
+            expect(os.path.exists(cache.get_path(key, CNF)), kept, f"{key} entry kept")
+
+        # nothing fits in an empty cache, not even the entry that was just stored
+        empty = KnowledgeBaseCache(os.path.join(directory, "empty"), 0)
+        store_entry(empty, "first", CNF)
+
+        expect(empty.get_size(), 0, "size of an empty cache")
+
+        expect_error(
+            lambda: KnowledgeBaseCache(directory, -1),
+            "The cache size can't be negative",
+            "negative size",
+        )
@@ -0,0 +1,81 @@
+import random
+
+from src.algorithm.cdcl import CDCL
+from src.algorithm.dpll import DPLL
+from src.clause_database import ClauseDatabase
+from src.cnf_knowledge_base import CNFKnowledgeBase
+from src.test.checks.preprocessor_checks import count_models, get_random_database
+from src.test.unit_test_check import expect
+
+NUMBER_OF_CNFS = 300
+
+# random 3 cnfs with about as many clauses as can be satisfied, too big to check every assignment
+# but hard enough that CDCL learns clauses and restarts
+NUMBER_OF_HARD_CNFS = 30
+HARD_SYMBOLS = (40, 80)
+
+
+def get_results(database: ClauseDatabase, passes: list[str] = None) -> list[str]:
+    # CDCL and DPLL without a query, with the default preprocessing if there are no passes
+    results = []
+
+    for algorithm in (CDCL(), DPLL()):
+        if passes is not None:
+            algorithm.set_preprocessing(passes)
+
+        results.append(str(algorithm.run(CNFKnowledgeBase(database))))
+
+    return results
+
+
+def check_cdcl():
+    # CDCL finds a model exactly when there is one, with and without preprocessing
+    rng = random.Random(9)
+
+    for i in range(NUMBER_OF_CNFS):
+        database = get_random_database(rng)
+        expected = "YES" if count_models(database) > 0 else "NO"
+
+        for passes in (None, []):
+            expect(
+                get_results(database, passes),
+                [expected, expected],
+                f"cnf {i} with passes {passes}",
+            )
+
+
+def check_hard_cdcl():
+    # CDCL gives the same answer as DPLL after learning clauses and restarting
+    rng = random.Random(10)
+    conflicts = 0
+    restarts = 0
+
+    for i in range(NUMBER_OF_HARD_CNFS):
+        database = ClauseDatabase()
+        number_of_symbols = rng.randint(*HARD_SYMBOLS)
+
+        for symbol_id in range(1, number_of_symbols + 1):
+            database.get_symbol_id(f"x{symbol_id}")
+
+        for _ in range(int(4.26 * number_of_symbols)):
+            database.add_clause(
+                [
+                    rng.choice((1, -1)) * symbol_id
+                    for symbol_id in rng.sample(range(1, number_of_symbols + 1), 3)
+                ]
+            )
+
+        algorithm = CDCL()
+        algorithm.set_preprocessing([])
+        result = str(algorithm.run(CNFKnowledgeBase(database)))
+
+        conflicts += algorithm.get_counters()["conflicts"]
+        restarts += algorithm.get_counters()["restarts"]
+
+        dpll = DPLL()
+        dpll.set_preprocessing([])
+
+        expect(result, str(dpll.run(CNFKnowledgeBase(database))), f"hard cnf {i}")
+
+    expect(conflicts > 0, True, "hard cnfs have conflicts")
+    expect(restarts > 0, True, "hard cnfs restart")
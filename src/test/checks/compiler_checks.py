@@ -0,0 +1,111 @@
+import random
+from itertools import product
+
+from src.algorithm.vectorised_truth_table_checking import np
+from src.knowledge_base import KnowledgeBase
+from src.model import Model
+from src.syntax.compiler import MAX_EXPRESSION_DEPTH, SentenceCompiler
+from src.test.checks.truth_table_checks import (
+    OPERATORS,
+    SYMBOLS,
+    get_random_sentence,
+)
+from src.test.unit_test_check import expect
+
+NUMBER_OF_SENTENCES = 300
+
+# operators added to a sentence one at a time, far deeper than python can nest an expression
+DEEP_SENTENCE_LENGTH = 500
+
+
+def get_deep_sentence(rng: random.Random) -> str:
+    # each operator is on the side of a different operator so nothing is flattened into a chain
+    sentence = rng.choice(SYMBOLS)
+
+    for _ in range(DEEP_SENTENCE_LENGTH):
+        symbol = rng.choice(SYMBOLS)
+
+        if rng.random() < 0.1:
+            sentence = f"~({sentence})"
+        elif rng.random() < 0.5:
+            sentence = f"({sentence} {rng.choice(OPERATORS)} {symbol})"
+        else:
+            sentence = f"({symbol} {rng.choice(OPERATORS)} {sentence})"
+
+    return sentence
+
+
+def get_chain(rng: random.Random, operator: str) -> str:
+    # a long chain of the same operator, each operand is a small sentence
+    return f" {operator} ".join(
+        get_random_sentence(rng, 1) for _ in range(DEEP_SENTENCE_LENGTH)
+    )
+
+
+def compare_compiled_sentence(sentence_string: str, description: str):
+    # the compiled function gives the same value as evaluating the sentence for every row of its truth table
+    sentence = KnowledgeBase.from_string(sentence_string + ";").sentences[0]
+
+    names = sorted({symbol.name for symbol in sentence.get_symbols()})
+    indexes = {name: i for i, name in enumerate(names)}
+
+    rows = list(product((False, True), repeat=len(names)))
+    expected = [sentence.evaluate(Model(dict(zip(names, row)))) for row in rows]
+
+    evaluate = SentenceCompiler.compile_sentence(sentence, indexes)
+
+    expect([evaluate(row) for row in rows], expected, f"{description} scalar")
+
+    # numpy is optional, only the vectorised functions need it
+    if np is None:
+        return
+
+    # each column is the value of a symbol in every row
+    columns = [np.array([row[i] for row in rows]) for i in range(len(names))]
+
+    evaluate = SentenceCompiler.compile_sentences(
+        [sentence],
+        indexes,
+        vectorised=True,
+        namespace={
+            "ONES": np.ones(len(rows), bool),
+            "ZEROS": np.zeros(len(rows), bool),
+        },
+    )
+
+    expect(
+        evaluate(columns, np.ones(len(rows), bool)).tolist(),
+        expected,
+        f"{description} vectorised",
+    )
+
+
+def check_random_sentences():
+    rng = random.Random(5)
+
+    for i in range(NUMBER_OF_SENTENCES):
+        sentence = get_random_sentence(rng, 4)
+
+        compare_compiled_sentence(sentence, f"sentence {i} {sentence}")
+
+
+def check_deep_sentences():
+    # sentences and chains too deep for one python expression are split into temporary variables
+    rng = random.Random(6)
+
+    for i in range(10):
+        for sentence in (
+            get_deep_sentence(rng),
+            get_chain(rng, "&"),
+            get_chain(rng, "||"),
+        ):
+            compare_compiled_sentence(sentence, f"deep sentence {i} {sentence[:40]}")
+
+    sentence = KnowledgeBase.from_string(get_deep_sentence(rng) + ";").sentences[0]
+    source = SentenceCompiler({name: 0 for name in SYMBOLS}).get_source([sentence])
+
+    expect(
+        "t1 = " in source,
+        True,
+        f"temporary variables of a sentence deeper than {MAX_EXPRESSION_DEPTH}",
+    )
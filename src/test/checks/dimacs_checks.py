@@ -0,0 +1,212 @@
+import gzip
+import os
+import subprocess
+import sys
+from tempfile import TemporaryDirectory
+
+from src import dimacs_file
+from src.algorithm.sharp_sat import SharpSAT
+from src.cnf_knowledge_base import CNFKnowledgeBase
+from src.dimacs_file import DIMACSFile
+from src.file_parser import FileParser, FileType
+from src.inference_algorithm_factory import InferenceAlgorithmFactory
+from src.instrumentation import Instrumentation
+from src.knowledge_base import KnowledgeBase
+from src.knowledge_base_session import CNF_ALGORITHMS
+from src.runner import Runner
+from src.test.unit_test_check import expect, expect_error
+
+# a DIMACS file without symbol comments so the symbols are named by their numbers
+UNNAMED_FILE = "c no names\np cnf 3 2\n1 -3 0\n2 3 -1 0\n"
+
+# with a tseitin threshold of 0 the second sentence gets auxiliary symbols
+KNOWLEDGE_BASE = "a => b; (c & d) || (~a & e) || (b & ~c); p1 <=> ~d; d;"
+
+ENGINE = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))),
+    "iengine.py",
+)
+
+
+def write_file(directory: str, name: str, contents: str) -> str:
+    file_path = os.path.join(directory, name)
+
+    with open(file_path, "w") as file:
+        file.write(contents)
+
+    return file_path
+
+
+def check_debug_without_names():
+    # what iengine.py prints with --debug
+    with TemporaryDirectory() as directory:
+        file_path = write_file(directory, "unnamed.cnf", UNNAMED_FILE)
+
+        for name in CNF_ALGORITHMS:
+            algorithm = InferenceAlgorithmFactory.get_inference_algorithm_from_name(
+                name
+            )
+
+            # without preprocessing DPLL and CDCL print the clauses as they are in the file
+            if name != "SHARPSAT":
+                algorithm.set_preprocessing([])
+
+            result = Runner.run_from_file_path(
+                algorithm, file_path, instrumentation=Instrumentation()
+            )
+
+            debug = result.debug()
+            str(result.instrumentation)
+
+            expect(str(result), "YES: 5" if name == "SHARPSAT" else "YES", name)
+
+            if name != "SHARPSAT":
+                expect(
+                    debug.split("\n")[3:5],
+                    ["1 || ~3", "2 || 3 || ~1"],
+                    f"{name} --debug clauses",
+                )
+
+
+def get_clauses(knowledge_base: CNFKnowledgeBase) -> list[list[int]]:
+    return [clause.tolist() for clause in knowledge_base.database]
+
+
+def check_round_trip():
+    # the clauses, names and auxiliary symbols come back the same, plain and gzipped
+    knowledge_base = CNFKnowledgeBase.from_generic_knowledge_base(
+        KnowledgeBase.from_string(KNOWLEDGE_BASE), tseitin_threshold=0
+    )
+
+    models = str(SharpSAT().run(knowledge_base))
+
+    with TemporaryDirectory() as directory:
+        for name in ("round_trip.cnf", "round_trip.cnf.gz"):
+            file_path = os.path.join(directory, name)
+            DIMACSFile.write(knowledge_base, file_path)
+
+            expect(FileParser.is_gzip(file_path), name.endswith(".gz"), name)
+            expect(FileParser.get_file_type(file_path), FileType.DIMACS, name)
+
+            read = DIMACSFile.read(file_path)
+            database = read.database
+
+            expect(get_clauses(read), get_clauses(knowledge_base), f"{name} clauses")
+            expect(
+                database.symbol_names,
+                knowledge_base.database.symbol_names,
+                f"{name} names",
+            )
+            expect(
+                database.auxiliary_ids,
+                knowledge_base.database.auxiliary_ids,
+                f"{name} auxiliary symbols",
+            )
+            expect(read.symbols, knowledge_base.symbols, f"{name} symbols")
+            expect(str(SharpSAT().run(read)), models, f"{name} models")
+
+
+def check_gzip_input():
+    with TemporaryDirectory() as directory:
+        file_path = os.path.join(directory, "unnamed.cnf.gz")
+
+        with gzip.open(file_path, "wt") as file:
+            file.write(UNNAMED_FILE)
+
+        for name in CNF_ALGORITHMS:
+            result = Runner.run_from_file_path(
+                InferenceAlgorithmFactory.get_inference_algorithm_from_name(name),
+                file_path,
+            )
+
+            expect(str(result), "YES: 5" if name == "SHARPSAT" else "YES", name)
+
+
+def check_write_dimacs_option():
+    # iengine.py --write-dimacs writes the knowledge base of a TELL/ASK file without the query
+    with TemporaryDirectory() as directory:
+        file_path = write_file(
+            directory, "standard.txt", f"TELL\n{KNOWLEDGE_BASE}\nASK\nd\n"
+        )
+
+        for name in ("written.cnf", "written.cnf.gz"):
+            dimacs_path = os.path.join(directory, name)
+
+            output = subprocess.run(
+                [
+                    sys.executable,
+                    ENGINE,
+                    file_path,
+                    "CDCL",
+                    f"--write-dimacs={dimacs_path}",
+                ],
+                capture_output=True,
+                text=True,
+                check=True,
+            ).stdout
+
+            expect(output, f"Knowledge base written to {dimacs_path}\n", name)
+
+            knowledge_base = CNFKnowledgeBase.from_generic_knowledge_base(
+                KnowledgeBase.from_string(KNOWLEDGE_BASE)
+            )
+
+            expect(
+                get_clauses(DIMACSFile.read(dimacs_path)),
+                get_clauses(knowledge_base),
+                f"{name} clauses",
+            )
+
+
+def check_chunks():
+    # clauses over more than 1 line and comments between them are read the same whatever the chunk size
+    contents = (
+        "c symbol 1 a\np cnf 4 6\n1 -3\n 0 2 3 -1 0\nc between\n4 4 -2 0 1 -1 0\n"
+        "c symbol 4 d\n\n-4\n0\n2 3 1"
+    )
+
+    with TemporaryDirectory() as directory:
+        file_path = write_file(directory, "chunks.cnf", contents)
+        expected = DIMACSFile.read(file_path)
+
+        expect(
+            get_clauses(expected),
+            [[1, -3], [2, 3, -1], [4, -2], [-4], [2, 3, 1]],
+            "clauses",
+        )
+        expect(expected.database.symbol_names, [None, "a", "2", "3", "d"], "names")
+
+        chunk_size = dimacs_file.CHUNK_SIZE
+
+        try:
+            for size in range(1, len(contents) + 1):
+                dimacs_file.CHUNK_SIZE = size
+                read = DIMACSFile.read(file_path)
+
+                expect(get_clauses(read), get_clauses(expected), f"chunk size {size}")
+                expect(
+                    read.database.symbol_names,
+                    expected.database.symbol_names,
+                    f"names with chunk size {size}",
+                )
+        finally:
+            dimacs_file.CHUNK_SIZE = chunk_size
+
+
+def check_errors():
+    # the line of the error is found even after the clauses have been read in chunks
+    files = [
+        ("1 2 0\np cnf 2 1\n", "Line 1: clauses must come after the problem line"),
+        ("p cnf 2\n", 'Line 1: the problem line must be "p cnf <variables> <clauses>"'),
+        ("p cnf 2 2\n1 0\nc x\n2 x 0\n", "Line 4: literals must be integers"),
+        ("p cnf 2 2\n1 0\n\n2 3 0\n", "Line 4: the problem line only has 2 variables"),
+        ("p cnf 2 1\n1 0\np cnf 2 1\n", "Line 3: there can only be 1 problem line"),
+        ("p cnf 2 2\n1 0\n", "DIMACS file has 1 clauses but the problem line says 2"),
+        ("c only a comment\n", "DIMACS file must have a problem line"),
+    ]
+
+    with TemporaryDirectory() as directory:
+        for contents, message in files:
+            file_path = write_file(directory, "error.cnf", contents)
+
+            expect_error(lambda: DIMACSFile.read(file_path), message, repr(contents))
@@ -0,0 +1,97 @@
+import random
+
+from src.algorithm.parallel_truth_table_checking import ParallelTruthTableChecking
+from src.algorithm.truth_table_checking import TruthTableChecking
+from src.algorithm.vectorised_truth_table_checking import (
+    VectorisedTruthTableChecking,
+    np,
+)
+from src.enumeration_mode import EnumerationMode
+from src.test.checks.truth_table_checks import get_random_knowledge_base, get_results
+from src.test.unit_test_check import expect, expect_error
+
+NUMBER_OF_KNOWLEDGE_BASES = 100
+
+# TT-PAR starts a process pool for each query so it only gets a few knowledge bases
+NUMBER_OF_PARALLEL_KNOWLEDGE_BASES = 5
+
+
+def get_algorithms(parallel: bool) -> list:
+    # small chunks so the tables of the random knowledge bases are split up
+    algorithms = [TruthTableChecking()]
+
+    # numpy is optional, only TT-VEC needs it
+    if np is not None:
+        algorithms.append(VectorisedTruthTableChecking(2))
+
+    if parallel:
+        algorithms.append(ParallelTruthTableChecking(2, 4))
+
+    return algorithms
+
+
+def compare_modes(knowledge_base: str, queries: list[str], algorithm):
+    # each mode gives the same answer as keeping every model
+    description = f"{algorithm.name} {knowledge_base}"
+
+    algorithm.set_enumeration_mode(EnumerationMode.ALL)
+    expected = get_results(knowledge_base, queries, algorithm)
+
+    algorithm.set_enumeration_mode(EnumerationMode.COUNT)
+
+    for query, result, expected_result in zip(
+        queries, get_results(knowledge_base, queries, algorithm), expected
+    ):
+        expect(str(result), str(expected_result), f"{description} ASK {query} count")
+        expect(result.models, [], f"{description} ASK {query} count keeps no models")
+
+    algorithm.set_enumeration_mode(EnumerationMode.FIRST)
+
+    for query, result, expected_result in zip(
+        queries, get_results(knowledge_base, queries, algorithm), expected
+    ):
+        # the first model can be any of the models
+        expect(result.found, expected_result.found, f"{description} ASK {query} first")
+        expect(
+            all(model in expected_result.models for model in result.models),
+            True,
+            f"{description} ASK {query} first model is a model",
+        )
+        expect(
+            len(result.models),
+            1 if expected_result.found else 0,
+            f"{description} ASK {query} first number of models",
+        )
+
+    # each query is asked on its own so the streamed models are only the models of that query
+    for query, expected_result in zip(queries, expected):
+        models = []
+        algorithm.set_enumeration_mode(EnumerationMode.STREAM, models.append)
+
+        result = get_results(knowledge_base, [query], algorithm)[0]
+
+        expect(str(result), str(expected_result), f"{description} ASK {query} stream")
+        expect(
+            sorted(str(model) for model in models),
+            sorted(str(model) for model in expected_result.models),
+            f"{description} ASK {query} streamed models",
+        )
+
+
+def check_enumeration_modes():
+    rng = random.Random(7)
+
+    for i in range(NUMBER_OF_KNOWLEDGE_BASES):
+        knowledge_base, queries = get_random_knowledge_base(rng)
+
+        for algorithm in get_algorithms(i < NUMBER_OF_PARALLEL_KNOWLEDGE_BASES):
+            compare_modes(knowledge_base, queries, algorithm)
+
+
+def check_stream_without_consumer():
+    for algorithm in get_algorithms(True):
+        expect_error(
+            lambda: algorithm.set_enumeration_mode(EnumerationMode.STREAM),
+            "Streaming models requires a consumer",
+            f"{algorithm.name} stream without a consumer",
+        )
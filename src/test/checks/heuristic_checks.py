@@ -0,0 +1,176 @@
+import random
+from itertools import chain
+
+from src.algorithm.dpll import DPLL
+from src.branching_heuristic import BranchingHeuristic
+from src.clause_database import ClauseDatabase
+from src.cnf_knowledge_base import CNFKnowledgeBase
+from src.cnf_preprocessor import PASSES
+from src.test.checks.preprocessor_checks import (
+    NUMBER_OF_CNFS,
+    count_models,
+    get_random_database,
+)
+from src.test.unit_test_check import expect, expect_error
+
+# cnfs searched with the scores checked at every choice, which is slow so there are fewer of them
+CHECKED_CNFS = 50
+
+
+def check_branching_heuristics():
+    # every heuristic finds a model if there is one, with and without preprocessing
+    rng = random.Random(2)
+
+    for i in range(NUMBER_OF_CNFS):
+        knowledge_base = CNFKnowledgeBase(get_random_database(rng))
+        satisfiable = count_models(knowledge_base.database) > 0
+
+        for heuristic in BranchingHeuristic.get_branching_heuristics(i):
+            for passes in ([], list(PASSES)):
+                algorithm = DPLL()
+                algorithm.set_heuristic(heuristic)
+                algorithm.set_preprocessing(passes)
+
+                expect(
+                    algorithm.run(knowledge_base).satisfiable,
+                    satisfiable,
+                    f"cnf {i} {heuristic.name} heuristic with {passes}",
+                )
+
+    names = [
+        heuristic.name for heuristic in BranchingHeuristic.get_branching_heuristics()
+    ]
+
+    expect_error(
+        lambda: BranchingHeuristic.from_name("vsids"),
+        f"Heuristic with name vsids not found, valid heuristics are: {names}",
+        "unknown heuristic",
+    )
+
+
+def check_heuristic_choices():
+    # the choice of each heuristic on clauses where it is clear, ties go to the first symbol
+    clauses = [[1, 2], [-2, 3], [-2, -3, 4], [-2, 4], [2, -4, 1]]
+    ranks = {1: 0, 2: 1, 3: 2, 4: 3}
+
+    choices = {"order": 1, "moms": -2, "jw": -2, "dlis": -2}
+
+    for heuristic in BranchingHeuristic.get_branching_heuristics():
+        if heuristic.name not in choices:
+            continue
+
+        heuristic.reset(ranks)
+        heuristic.add_clauses(clauses)
+
+        expect(
+            heuristic.choose_literal(),
+            choices[heuristic.name],
+            f"{heuristic.name} heuristic",
+        )
+
+        # the clauses that are left after setting 1 to true
+        heuristic.remove_literals([1, 2], 2)
+        heuristic.remove_literals([2, -4, 1], 3)
+
+        expect(
+            heuristic.choose_literal(),
+            2 if heuristic.name == "order" else -2,
+            f"{heuristic.name} heuristic after 1 is set",
+        )
+
+    # the same seed makes the same choices after each reset
+    random_heuristic = BranchingHeuristic.from_name("random", 7)
+    random_heuristic.reset(ranks)
+    random_heuristic.add_clauses(clauses)
+    first = [random_heuristic.choose_literal() for _ in range(10)]
+
+    random_heuristic.reset(ranks)
+    random_heuristic.add_clauses(clauses)
+
+    expect(
+        [random_heuristic.choose_literal() for _ in range(10)],
+        first,
+        "random heuristic after reset",
+    )
+
+
+# Checks the scores a heuristic keeps up to date during a search against a new heuristic of the same kind
+# given the clauses that are left at each choice, and the literal counts DPLL keeps for the pure literals
+class CheckedHeuristic(BranchingHeuristic):
+    def __init__(self, name: str, algorithm: DPLL, description: str):
+        super().__init__(name)
+
+        self.heuristic = BranchingHeuristic.from_name(name)
+        self.algorithm = algorithm
+        self.description = description
+
+    def reset(self, ranks: dict[int, int]):
+        super().reset(ranks)
+        self.heuristic.reset(ranks)
+
+    def add_literals(self, literals: list[int], length: int):
+        self.heuristic.add_literals(literals, length)
+
+    def remove_literals(self, literals: list[int], length: int):
+        self.heuristic.remove_literals(literals, length)
+
+    def choose_literal(self) -> int:
+        values = self.algorithm.values
+
+        clauses = [
+            [literal for literal in clause if values[literal] == 0]
+            for clause in self.algorithm.clauses
+            if all(values[literal] != 1 for literal in clause)
+        ]
+
+        description = f"{self.description} decision {self.algorithm.decisions + 1}"
+
+        totals = [0] * len(values)
+
+        for literal in chain.from_iterable(clauses):
+            totals[literal] += 1
+
+        expect(self.algorithm.totals, totals, f"{description} totals")
+
+        heuristic = BranchingHeuristic.from_name(self.name)
+        heuristic.reset(self.ranks)
+        heuristic.add_clauses(clauses)
+
+        literal = self.heuristic.choose_literal()
+
+        expect(literal, heuristic.choose_literal(), f"{description} choice")
+
+        return literal
+
+
+def check_heuristic_scores():
+    # the scores are the same as scoring the clauses that are left again after every decision and backtrack
+    # the cnfs are random 3 cnfs with about as many clauses as can be satisfied so the search backtracks a lot
+    # and a few longer clauses so the clauses have different lengths
+    rng = random.Random(3)
+
+    for i in range(CHECKED_CNFS):
+        database = ClauseDatabase()
+        number_of_symbols = rng.randint(10, 20)
+
+        for symbol_id in range(1, number_of_symbols + 1):
+            database.get_symbol_id(f"x{symbol_id}")
+
+        for _ in range(int(4.3 * number_of_symbols)):
+            database.add_clause(
+                [
+                    rng.choice((1, -1)) * symbol_id
+                    for symbol_id in rng.sample(
+                        range(1, number_of_symbols + 1), rng.choice((3, 3, 3, 5, 8))
+                    )
+                ]
+            )
+
+        for name in ("order", "moms", "jw", "dlis"):
+            algorithm = DPLL()
+            algorithm.set_heuristic(
+                CheckedHeuristic(name, algorithm, f"cnf {i} {name} heuristic")
+            )
+            algorithm.set_preprocessing([])
+
+            algorithm.run(CNFKnowledgeBase(database))
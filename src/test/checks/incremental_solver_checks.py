@@ -0,0 +1,69 @@
+import random
+
+from src.algorithm.cdcl import CDCL
+from src.cnf_knowledge_base import CNFKnowledgeBase
+from src.knowledge_base_session import KnowledgeBaseSession
+from src.test.checks.preprocessor_checks import count_models
+from src.test.unit_test_check import expect
+
+SYMBOLS = ["a", "b", "c", "d", "e", "f", "g", "h"]
+
+# random knowledge bases are told this many sentences, each followed by queries
+NUMBER_OF_SESSIONS = 40
+SENTENCES = 10
+
+
+def get_random_sentence(rng: random.Random, depth: int = 2) -> str:
+    if depth == 0 or rng.random() < 0.3:
+        return rng.choice(["", "~"]) + rng.choice(SYMBOLS[:6])
+
+    operator = rng.choice(["&", "||", "=>", "<=>"])
+    left = get_random_sentence(rng, depth - 1)
+    right = get_random_sentence(rng, depth - 1)
+
+    return f"({left} {operator} {right})"
+
+
+def check_incremental_solver():
+    # queries answered under assumptions by the solver that is kept between tells, checked with every model
+    rng = random.Random(2)
+
+    for _ in range(NUMBER_OF_SESSIONS):
+        session = KnowledgeBaseSession()
+        told = ""
+
+        for _ in range(SENTENCES):
+            sentence = get_random_sentence(rng)
+            session.tell(f"{sentence};")
+            told += f"{sentence};"
+
+            knowledge_base = CNFKnowledgeBase.from_generic_knowledge_base(
+                session.knowledge_base
+            )
+
+            for _ in range(3):
+                query = get_random_sentence(rng)
+                parsed = session.parse_query(query)
+
+                # the knowledge base and the query, or its negation
+                satisfiable = knowledge_base.copy()
+                satisfiable.add_sentence(parsed.sentence)
+                refuting = knowledge_base.copy()
+                refuting.add_sentence(session.parse_query(f"~({query})").sentence)
+
+                expect(
+                    session.entails(parsed),
+                    count_models(refuting.database) == 0,
+                    f"{told} entails {query}",
+                )
+
+                # CDCL answers false if the query has a symbol that isn't in the knowledge base
+                if all(
+                    literal.name in knowledge_base.symbols
+                    for literal in parsed.sentence.get_symbols()
+                ):
+                    expect(
+                        str(session.ask(parsed, CDCL())),
+                        "YES" if count_models(satisfiable.database) > 0 else "NO",
+                        f"{told} CDCL {query}",
+                    )
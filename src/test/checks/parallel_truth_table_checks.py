@@ -0,0 +1,62 @@
+import random
+
+from src.algorithm.parallel_truth_table_checking import ParallelTruthTableChecking
+from src.algorithm.truth_table_checking import TruthTableChecking
+from src.test.checks.truth_table_checks import get_random_knowledge_base, get_results
+from src.test.unit_test_check import expect, expect_error
+
+# each query starts a process pool so only a few knowledge bases are checked
+NUMBER_OF_KNOWLEDGE_BASES = 4
+
+WORKERS = (1, 2)
+
+# chunks smaller than a truth table so it is split into partitions, and bigger so the pool isn't started
+CHUNK_SIZES = (1, 2, 4, 2**16)
+
+
+def check_parallel_truth_table():
+    # TT-PAR finds the same models as TT however the table is split up
+    rng = random.Random(8)
+
+    for _ in range(NUMBER_OF_KNOWLEDGE_BASES):
+        knowledge_base, queries = get_random_knowledge_base(rng)
+        expected = get_results(knowledge_base, queries, TruthTableChecking())
+
+        for workers in WORKERS:
+            for chunk_size in CHUNK_SIZES:
+                results = get_results(
+                    knowledge_base,
+                    queries,
+                    ParallelTruthTableChecking(workers, chunk_size),
+                )
+
+                for query, result, expected_result in zip(queries, results, expected):
+                    description = f"{knowledge_base} ASK {query} with {workers} workers and chunks of {chunk_size}"
+
+                    expect(str(result), str(expected_result), description)
+                    expect(
+                        [str(model) for model in result.models],
+                        [str(model) for model in expected_result.models],
+                        f"{description} models",
+                    )
+
+
+def check_parallelism_errors():
+    expect_error(
+        lambda: ParallelTruthTableChecking(0),
+        "There must be at least 1 worker",
+        "TT-PAR with no workers",
+    )
+
+    for chunk_size in (0, 3, 6):
+        expect_error(
+            lambda: ParallelTruthTableChecking(1, chunk_size),
+            "Chunk size must be a power of 2",
+            f"TT-PAR with chunks of {chunk_size}",
+        )
+
+    expect_error(
+        lambda: ParallelTruthTableChecking().set_parallelism(chunk_size=12),
+        "Chunk size must be a power of 2",
+        "TT-PAR set to chunks of 12",
+    )
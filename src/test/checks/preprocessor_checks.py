@@ -0,0 +1,126 @@
+import random
+from itertools import product
+
+from src.clause_database import ClauseDatabase
+from src.cnf_preprocessor import (
+    DEFAULT_PASSES,
+    MAX_DEFAULT_CLAUSES,
+    PASSES,
+    CNFPreprocessor,
+)
+from src.incremental_solver import MODEL_PRESERVING_PASSES
+from src.test.unit_test_check import expect, expect_error
+
+# random cnfs are small enough to check every assignment
+NUMBER_OF_CNFS = 300
+MAX_SYMBOLS = 8
+
+
+def get_random_database(rng: random.Random) -> ClauseDatabase:
+    database = ClauseDatabase()
+    number_of_symbols = rng.randint(1, MAX_SYMBOLS)
+
+    for symbol_id in range(1, number_of_symbols + 1):
+        database.get_symbol_id(f"x{symbol_id}")
+
+    for _ in range(rng.randint(0, 5 * number_of_symbols)):
+        database.add_clause(
+            [
+                rng.choice((1, -1)) * rng.randint(1, number_of_symbols)
+                for _ in range(rng.choice((1, 2, 3, 3, 4)))
+            ]
+        )
+
+    return database
+
+
+def count_models(database: ClauseDatabase) -> int:
+    # every assignment of the symbols of the database, the value of symbol i is values[i - 1]
+    clauses = [clause.tolist() for clause in database]
+
+    return sum(
+        all(
+            any(values[abs(literal) - 1] == (literal > 0) for literal in clause)
+            for clause in clauses
+        )
+        for values in product((False, True), repeat=database.get_number_of_symbols())
+    )
+
+
+def get_clauses(database: ClauseDatabase) -> list[list[int]]:
+    return [clause.tolist() for clause in database]
+
+
+def check_preprocessing_passes():
+    # every pass keeps whether there is a model, the passes the incremental solver uses keep every model
+    rng = random.Random(1)
+    choices = [[], *([name] for name in PASSES), list(PASSES)]
+
+    for i in range(NUMBER_OF_CNFS):
+        database = get_random_database(rng)
+        clauses = get_clauses(database)
+        models = count_models(database)
+
+        for passes in choices:
+            simplified = CNFPreprocessor(passes).preprocess(database)
+
+            # the database it was given is left the same
+            expect(get_clauses(database), clauses, f"cnf {i} {passes} original")
+            expect(
+                simplified.symbol_names,
+                database.symbol_names,
+                f"cnf {i} {passes} symbols",
+            )
+
+            if all(name in MODEL_PRESERVING_PASSES for name in passes):
+                expect(count_models(simplified), models, f"cnf {i} {passes} models")
+            else:
+                expect(
+                    count_models(simplified) > 0,
+                    models > 0,
+                    f"cnf {i} {passes} satisfiable",
+                )
+
+    expect_error(
+        lambda: CNFPreprocessor(["units"]),
+        f"Preprocessing pass units not found, valid passes are: {list(PASSES)}",
+        "unknown pass",
+    )
+
+
+def check_default_passes():
+    # the default passes only run on knowledge bases with at most MAX_DEFAULT_CLAUSES clauses
+    # and passes that are chosen run on any knowledge base
+    preprocessor = CNFPreprocessor()
+
+    expect(preprocessor.passes, list(DEFAULT_PASSES), "default passes")
+
+    # a || b subsumes a || b || c
+    database = ClauseDatabase()
+    database.add_clause([1, 2])
+    database.add_clause([1, 2, 3])
+
+    expect(
+        get_clauses(preprocessor.preprocess(database)), [[1, 2]], "small knowledge base"
+    )
+
+    database = ClauseDatabase()
+
+    for symbol_id in range(1, MAX_DEFAULT_CLAUSES + 2):
+        database.add_clause([symbol_id, -(symbol_id % MAX_DEFAULT_CLAUSES + 1)])
+
+    database.add_clause([1, 2, 3])
+    database.add_clause([1, 2, 3, 4])
+
+    expect(
+        preprocessor.preprocess(database) is database,
+        True,
+        "default passes on a big knowledge base",
+    )
+    expect(preprocessor.get_statistics(), None, "statistics on a big knowledge base")
+
+    expect(
+        len(CNFPreprocessor([*DEFAULT_PASSES]).preprocess(database)),
+        len(database) - 1,
+        "chosen passes on a big knowledge base",
+    )
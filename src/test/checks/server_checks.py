@@ -0,0 +1,191 @@
+import asyncio
+import json
+import os
+import random
+import socket
+import tempfile
+
+from src.algorithm.vectorised_truth_table_checking import np
+from src.enumeration_mode import EnumerationMode
+from src.inference_algorithm_factory import InferenceAlgorithmFactory
+from src.knowledge_base_session import KnowledgeBaseSession
+from src.server.inference_server import InferenceServer
+from src.test.checks.truth_table_checks import (
+    get_random_knowledge_base,
+    get_random_sentence,
+)
+from src.test.unit_test_check import expect
+
+NUMBER_OF_KNOWLEDGE_BASES = 5
+WORKERS = 2
+
+# TT-PAR would start a process pool in each worker and TEST isn't an algorithm that can be asked
+ALGORITHMS = ["TT", "FC", "BC", "DPLL", "CDCL", "SHARPSAT", "BDD"]
+
+# numpy is optional, only TT-VEC needs it
+if np is not None:
+    ALGORITHMS.append("TT-VEC")
+
+MODES = (None, EnumerationMode.COUNT, EnumerationMode.FIRST)
+
+
+async def send_request(
+    reader: asyncio.StreamReader,
+    writer: asyncio.StreamWriter,
+    method: str,
+    path: str,
+    body: dict = None,
+) -> tuple[int, dict]:
+    # a request on a connection that is kept open, returns the status and the json body of the response
+    data = json.dumps(body).encode() if body is not None else b""
+
+    writer.write(
+        (
+            f"{method} {path} HTTP/1.1\r\n"
+            "Host: localhost\r\n"
+            f"Content-Length: {len(data)}\r\n"
+            "\r\n"
+        ).encode()
+        + data
+    )
+    await writer.drain()
+
+    status = int((await reader.readline()).split()[1])
+    headers = {}
+
+    while True:
+        line = await reader.readline()
+
+        if line in (b"\r\n", b""):
+            break
+
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    return status, json.loads(await reader.readexactly(int(headers["content-length"])))
+
+
+def get_answer(
+    session: KnowledgeBaseSession, query: str, algorithm: str, mode
+) -> tuple[int, str, str]:
+    # the status, the result of asking the session directly or the error the server would give
+    # the workers send back any error with its type and first argument eg. FC with a query that isn't a symbol
+    try:
+        result = session.ask(
+            query,
+            InferenceAlgorithmFactory.get_inference_algorithm_from_name(algorithm),
+            mode,
+        )
+    except Exception as error:
+        message = str(error.args[0]) if error.args else ""
+
+        return 400, "error", f"{type(error).__name__}: {message}"
+
+    return 200, "ok", str(result)
+
+
+async def compare_answers(reader, writer, name: str, session, queries: list[str]):
+    for query in queries:
+        for algorithm in ALGORITHMS:
+            for mode in MODES:
+                body = {"kb": name, "query": query, "algorithm": algorithm}
+
+                if mode is not None:
+                    body["mode"] = mode.value
+
+                status, response = await send_request(
+                    reader, writer, "POST", "/ask", body
+                )
+
+                expect(
+                    (
+                        status,
+                        response["status"],
+                        response.get("result", response.get("error")),
+                    ),
+                    get_answer(session, query, algorithm, mode),
+                    f"{name} ASK {query} with {algorithm} {mode}",
+                )
+
+
+async def run_server_checks(path: str):
+    server = InferenceServer(WORKERS)
+    serving = asyncio.ensure_future(server.serve_unix(path))
+
+    try:
+        while not os.path.exists(path):
+            await asyncio.sleep(0.01)
+
+        reader, writer = await asyncio.open_unix_connection(path)
+        rng = random.Random(18)
+
+        for i in range(NUMBER_OF_KNOWLEDGE_BASES):
+            knowledge_base, queries = get_random_knowledge_base(rng)
+            name = f"kb{i}"
+
+            # every other knowledge base is horn so FC and BC answer instead of giving an error
+            if i % 2 == 1:
+                knowledge_base = "a => b; b & c => d; a; c;"
+
+            session = KnowledgeBaseSession.from_string(knowledge_base)
+
+            status, _ = await send_request(
+                reader, writer, "POST", "/kb", {"kb": knowledge_base, "name": name}
+            )
+            expect(status, 201, f"register {knowledge_base}")
+
+            await compare_answers(reader, writer, name, session, queries)
+
+            # the workers answer with the sentences told since it was registered
+            told = f"{get_random_sentence(rng)};" if i % 2 == 0 else "d => e;"
+            session.tell(told)
+
+            status, response = await send_request(
+                reader, writer, "POST", f"/kb/{name}/tell", {"sentences": told}
+            )
+            expect(
+                (status, response["tells"]), (200, 1), f"{knowledge_base} TELL {told}"
+            )
+
+            await compare_answers(reader, writer, name, session, queries + ["e"])
+
+        status, response = await send_request(
+            reader,
+            writer,
+            "POST",
+            "/ask",
+            {"kb": "kb0", "query": "a &", "algorithm": "TT"},
+        )
+        expect((status, response["status"]), (400, "error"), "invalid query")
+
+        status, _ = await send_request(
+            reader,
+            writer,
+            "POST",
+            "/ask",
+            {"kb": "none", "query": "a", "algorithm": "TT"},
+        )
+        expect(status, 404, "unknown knowledge base")
+
+        status, response = await send_request(reader, writer, "GET", "/metrics")
+        expect(status, 200, "metrics")
+        expect(response["worker_restarts"], 0, "worker restarts")
+
+        writer.close()
+    finally:
+        serving.cancel()
+
+        try:
+            await serving
+        except asyncio.CancelledError:
+            pass
+
+
+def check_server_round_trip():
+    # the server gives the same answers as asking a session directly
+    # eg. windows
+    if not hasattr(socket, "AF_UNIX"):
+        return
+
+    with tempfile.TemporaryDirectory() as directory:
+        asyncio.run(run_server_checks(os.path.join(directory, "server.sock")))
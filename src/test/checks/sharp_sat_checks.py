@@ -0,0 +1,79 @@
+import random
+
+from src.algorithm.sharp_sat import SharpSAT
+from src.algorithm.truth_table_checking import TruthTableChecking
+from src.clause_database import ClauseDatabase
+from src.cnf_knowledge_base import CNFKnowledgeBase
+from src.test.checks.preprocessor_checks import count_models, get_random_database
+from src.test.checks.truth_table_checks import get_random_knowledge_base, get_results
+from src.test.unit_test_check import expect
+
+NUMBER_OF_CNFS = 300
+NUMBER_OF_KNOWLEDGE_BASES = 200
+
+# copies of a small cnf on different symbols, too many symbols to check every assignment
+# but the copies are components so the count is the product of their counts
+NUMBER_OF_COPIES = 12
+
+
+def check_sharp_sat_counts():
+    # SHARPSAT counts the same models as checking every assignment
+    rng = random.Random(11)
+
+    for i in range(NUMBER_OF_CNFS):
+        database = get_random_database(rng)
+
+        expect(
+            SharpSAT().run(CNFKnowledgeBase(database)).number_of_models,
+            count_models(database),
+            f"cnf {i}",
+        )
+
+
+def check_sharp_sat_queries():
+    # SHARPSAT gives the same answers as TT, including queries with a symbol that isn't in the knowledge base
+    rng = random.Random(12)
+
+    for _ in range(NUMBER_OF_KNOWLEDGE_BASES):
+        knowledge_base, queries = get_random_knowledge_base(rng)
+
+        expect(
+            [
+                str(result)
+                for result in get_results(knowledge_base, queries, SharpSAT())
+            ],
+            [
+                str(result)
+                for result in get_results(knowledge_base, queries, TruthTableChecking())
+            ],
+            f"{knowledge_base} ASK {queries}",
+        )
+
+
+def check_sharp_sat_components():
+    # each copy is a component with the same clauses once the symbols are renumbered
+    rng = random.Random(13)
+
+    for i in range(20):
+        copy = get_random_database(rng)
+        size = copy.get_number_of_symbols()
+
+        database = ClauseDatabase()
+
+        for symbol_id in range(1, NUMBER_OF_COPIES * size + 1):
+            database.get_symbol_id(f"x{symbol_id}")
+
+        for n in range(NUMBER_OF_COPIES):
+            for clause in copy:
+                database.add_clause(
+                    [
+                        literal + n * size if literal > 0 else literal - n * size
+                        for literal in clause.tolist()
+                    ]
+                )
+
+        expect(
+            SharpSAT().run(CNFKnowledgeBase(database)).number_of_models,
+            count_models(copy) ** NUMBER_OF_COPIES,
+            f"{NUMBER_OF_COPIES} copies of cnf {i}",
+        )
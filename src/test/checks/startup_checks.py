@@ -0,0 +1,31 @@
+import os
+import tempfile
+
+from src.benchmark.startup_benchmark import STARTUP_FILE, StartupBenchmark
+from src.test.unit_test_check import expect
+
+
+def check_startup_modules():
+    # iengine.py only imports the modules of STARTUP_MODULES that the algorithm it runs uses
+    with tempfile.TemporaryDirectory() as directory:
+        file_path = os.path.join(directory, "startup.txt")
+
+        with open(file_path, "w") as file:
+            file.write(STARTUP_FILE)
+
+        for name in StartupBenchmark().algorithms:
+            modules = StartupBenchmark.get_modules(
+                [StartupBenchmark.get_iengine_path(), file_path, name]
+            )
+
+            # a run that failed before it got to the algorithm wouldn't import anything it shouldn't either
+            expect(
+                "src.inference_algorithm_factory" in modules,
+                True,
+                f"{name} imported the algorithms",
+            )
+            expect(
+                StartupBenchmark.get_unexpected_modules(name, modules),
+                [],
+                f"{name} unexpected modules",
+            )
@@ -0,0 +1,113 @@
+import random
+
+from src.knowledge_base_session import KnowledgeBaseSession
+from src.syntax.atom import BoolAtom
+from src.syntax.sentence import AtomicSentence, Expression, Sentence
+from src.syntax.symbol_table import SymbolTable
+from src.test.checks.truth_table_checks import (
+    get_random_knowledge_base,
+    get_random_sentence,
+)
+from src.test.unit_test_check import expect, expect_error
+
+NUMBER_OF_KNOWLEDGE_BASES = 200
+
+
+def get_sub_sentences(sentences: list[Sentence]) -> list[Sentence]:
+    # every sub sentence including the sentences, with an explicit stack because sentences can be very deep
+    sub_sentences = []
+    stack = list(sentences)
+
+    while len(stack) > 0:
+        sentence = stack.pop()
+        sub_sentences.append(sentence)
+
+        if isinstance(sentence, Expression):
+            stack.append(sentence.rhs)
+
+            # lhs is None for a negation
+            if sentence.lhs is not None:
+                stack.append(sentence.lhs)
+
+    return sub_sentences
+
+
+def check_hash_consing():
+    # sub sentences that are written the same are the same object, including in queries and told sentences
+    rng = random.Random(17)
+
+    for _ in range(NUMBER_OF_KNOWLEDGE_BASES):
+        knowledge_base, queries = get_random_knowledge_base(rng)
+
+        # sentences made of the sentences of the knowledge base so there are sub sentences that come up again
+        sentences = knowledge_base.rstrip(";").split("; ")
+        knowledge_base += f" ({sentences[0]} & {sentences[-1]});"
+
+        session = KnowledgeBaseSession.from_string(knowledge_base)
+        session.tell(f"{get_random_sentence(rng)}; ~({sentences[0]});")
+
+        table = session.knowledge_base.symbol_table
+        sub_sentences = get_sub_sentences(
+            session.knowledge_base.sentences
+            + [session.parse_query(query).sentence for query in queries]
+        )
+
+        # the same structure can only be the same object, the structure of a sub sentence is worked out
+        # from its children so it isn't the text, a negated literal eg. ~d is written the same as the negation
+        # of a bracketed symbol eg. ~(d)
+        # the children of each sub sentence come after it so they are done first in reverse
+        structures = {}
+        instances = {}
+
+        for sentence in reversed(sub_sentences):
+            if isinstance(sentence, Expression):
+                structure = (
+                    sentence.operator.value,
+                    structures.get(id(sentence.lhs)),
+                    structures[id(sentence.rhs)],
+                )
+            else:
+                structure = str(sentence)
+
+            structures[id(sentence)] = structure
+            instances.setdefault(structure, set()).add(id(sentence))
+
+        for structure, ids in instances.items():
+            expect(len(ids), 1, f"{knowledge_base} instances of {structure}")
+
+        # every atom is the literal of the table, and its negation is the other literal of the symbol
+        for sentence in sub_sentences:
+            if not isinstance(sentence, AtomicSentence) or isinstance(
+                sentence.atom, BoolAtom
+            ):
+                continue
+
+            atom = sentence.atom
+            literal = table.get_literal(atom.name, atom.negated)
+
+            expect(atom is literal, True, f"{knowledge_base} literal {atom}")
+            expect(
+                atom.negation is table.get_literal(atom.name, not atom.negated),
+                True,
+                f"{knowledge_base} negation of {atom}",
+            )
+
+
+def check_symbol_ids():
+    # ids are given out in the order the names are first seen and never change
+    table = SymbolTable()
+
+    expect(
+        [table.get_symbol_id(name) for name in ("b", "a", "b", "p1", "a")],
+        [0, 1, 0, 2, 1],
+        "symbol ids",
+    )
+    expect(table.names, ["b", "a", "p1"], "symbol names")
+    expect(table.get_number_of_symbols(), 3, "number of symbols")
+
+    expect_error(
+        lambda: table.get_symbol_id("ab cde"),
+        "ab cde is not a valid propositional symbol.",
+        "invalid symbol",
+    )
+    expect(table.get_number_of_symbols(), 3, "invalid symbols aren't added")
@@ -0,0 +1,70 @@
+import random
+
+from src.algorithm.truth_table_checking import TruthTableChecking
+from src.algorithm.vectorised_truth_table_checking import VectorisedTruthTableChecking
+from src.knowledge_base_session import KnowledgeBaseSession
+from src.test.unit_test_check import expect
+
+# random knowledge bases have few enough symbols that every row of the truth table is checked
+SYMBOLS = ("a", "b", "c", "d", "p1", "p2")
+OPERATORS = ("&", "||", "=>", "<=>")
+NUMBER_OF_KNOWLEDGE_BASES = 200
+
+# sizes of the chunks of TT-VEC, smaller than a truth table so there are many chunks and bigger than one
+CHUNK_BITS = (1, 3, 16)
+
+
+def get_random_sentence(rng: random.Random, depth: int = 3) -> str:
+    # every binary operator is in brackets so the sentence doesn't depend on the precedence of the parser
+    if depth == 0 or rng.random() < 0.3:
+        symbol = rng.choice(SYMBOLS)
+
+        return f"~{symbol}" if rng.random() < 0.3 else symbol
+
+    if rng.random() < 0.15:
+        return f"~({get_random_sentence(rng, depth - 1)})"
+
+    lhs = get_random_sentence(rng, depth - 1)
+    rhs = get_random_sentence(rng, depth - 1)
+
+    return f"({lhs} {rng.choice(OPERATORS)} {rhs})"
+
+
+def get_random_knowledge_base(rng: random.Random) -> tuple[str, list[str]]:
+    # a knowledge base with some facts and the queries to ask it, a query can have a symbol that isn't in it
+    sentences = [get_random_sentence(rng) for _ in range(rng.randint(1, 4))]
+    sentences += [rng.choice(SYMBOLS) for _ in range(rng.randint(0, 2))]
+
+    queries = [get_random_sentence(rng, 2) for _ in range(3)] + ["z"]
+
+    return "; ".join(sentences) + ";", queries
+
+
+def get_results(knowledge_base: str, queries: list[str], algorithm) -> list:
+    session = KnowledgeBaseSession.from_string(knowledge_base)
+
+    return [session.ask(query, algorithm) for query in queries]
+
+
+def check_vectorised_truth_table():
+    # TT-VEC finds the same models as TT with chunks smaller and bigger than the truth table
+    rng = random.Random(4)
+
+    for i in range(NUMBER_OF_KNOWLEDGE_BASES):
+        knowledge_base, queries = get_random_knowledge_base(rng)
+        expected = get_results(knowledge_base, queries, TruthTableChecking())
+
+        for chunk_bits in CHUNK_BITS:
+            results = get_results(
+                knowledge_base, queries, VectorisedTruthTableChecking(chunk_bits)
+            )
+
+            for query, result, expected_result in zip(queries, results, expected):
+                description = f"{knowledge_base} ASK {query} with {chunk_bits} bits"
+
+                expect(str(result), str(expected_result), description)
+                expect(
+                    [str(model) for model in result.models],
+                    [str(model) for model in expected_result.models],
+                    f"{description} models",
+                )
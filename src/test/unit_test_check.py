@@ -0,0 +1,91 @@
+import importlib
+import inspect
+
+# checks are run by test.py as tests of this algorithm name, after the test files
+CHECK = "CHECK"
+
+# modules with the checks, every function in them that starts with check_ is a check
+CHECK_MODULES = [
+    "src.test.checks.dimacs_checks",
+    "src.test.checks.batch_checks",
+    "src.test.checks.cache_checks",
+    "src.test.checks.preprocessor_checks",
+    "src.test.checks.heuristic_checks",
+    "src.test.checks.backward_chaining_checks",
+    "src.test.checks.incremental_solver_checks",
+    "src.test.checks.truth_table_checks",
+    "src.test.checks.compiler_checks",
+    "src.test.checks.enumeration_checks",
+    "src.test.checks.parallel_truth_table_checks",
+    "src.test.checks.cdcl_checks",
+    "src.test.checks.sharp_sat_checks",
+    "src.test.checks.bdd_checks",
+    "src.test.checks.symbol_table_checks",
+    "src.test.checks.server_checks",
+    "src.test.checks.startup_checks",
+]
+
+
+class CheckError(ValueError):
+    def __init__(self, message: str, expected=None, actual=None):
+        super().__init__(message)
+
+        self.expected = expected
+        self.actual = actual
+
+
+def expect(actual, expected, message: str):
+    if actual != expected:
+        raise CheckError(
+            f"{message}: expected {expected!r}, got {actual!r}", expected, actual
+        )
+
+
+def expect_error(function, message: str, description: str):
+    # function is called without arguments and must raise a ValueError with the message
+    try:
+        function()
+        error = None
+    except ValueError as exception:
+        error = str(exception)
+
+    expect(error, message, description)
+
+
+# A test of something a test file can't show on its own eg. that a cache entry is used again or that
+# a DIMACS file can be printed with --debug, each check is a function that raises CheckError if it fails
+# checks are found by their path "module:function" so they can be sent to the test workers like test files
+class UnitTestCheck:
+
+    @staticmethod
+    def get_check_paths() -> list[str]:
+        # in the order they are written in each module
+        paths = []
+
+        for module_name in CHECK_MODULES:
+            module = importlib.import_module(module_name)
+
+            functions = [
+                function
+                for name, function in vars(module).items()
+                if name.startswith("check_") and inspect.isfunction(function)
+            ]
+
+            functions.sort(key=lambda function: function.__code__.co_firstlineno)
+
+            paths.extend(f"{module_name}:{function.__name__}" for function in functions)
+
+        return paths
+
+    @staticmethod
+    def get_name(path: str) -> str:
+        # eg. src.test.checks.dimacs_checks:check_round_trip is dimacs_checks round_trip
+        module_name, _, function_name = path.partition(":")
+
+        return f"{module_name.rpartition('.')[2]} {function_name[len('check_'):]}"
+
+    @staticmethod
+    def run(path: str):
+        module_name, _, function_name = path.partition(":")
+
+        getattr(importlib.import_module(module_name), function_name)()
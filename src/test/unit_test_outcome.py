@@ -0,0 +1,69 @@
+# status of a test
+PASSED = "passed"
+FAILED = "failed"
+# the test took longer than the timeout and its worker was stopped
+TIMEOUT = "timeout"
+# the test raised an exception
+ERROR = "error"
+
+# keys of each json line, in the same order as the fields
+FIELDS = [
+    "number",
+    "file",
+    "name",
+    "algorithm",
+    "status",
+    "seconds",
+    "expected",
+    "actual",
+    "message",
+]
+
+
+# The result of one test that is sent back by the workers and reported
+# only the output lines of the expected and actual results are kept, not the results themselves
+# because their debug strings (eg. full truth tables) are big and slow to build
+# details is the full UnitTestResult string, which is only built when it is asked for
+class UnitTestOutcome:
+    def __init__(
+        self,
+        number: int,
+        file: str,
+        algorithm: str,
+        status: str,
+        seconds: float,
+        name: str = "",
+        expected: str = "",
+        actual: str = "",
+        message: str = "",
+        details: str = None,
+    ):
+        self.number = number
+        self.file = file
+        self.name = name
+        self.algorithm = algorithm
+        self.status = status
+        self.seconds = seconds
+        self.expected = expected
+        self.actual = actual
+        self.message = message
+        self.details = details
+
+    @property
+    def passed(self) -> bool:
+        return self.status == PASSED
+
+    def to_dict(self) -> dict:
+        return {field: getattr(self, field) for field in FIELDS}
+
+    def get_summary(self) -> str:
+        # one line, the same for every status
+        name = self.name or self.file
+        string = f"Test #{self.number} {name} ({self.algorithm}) - {self.status.upper()} ({self.seconds:.3f}s)"
+
+        if self.status == FAILED:
+            string += f"\n  expected {self.expected!r}, got {self.actual!r}"
+        elif self.message != "":
+            string += f"\n  {self.message}"
+
+        return string
@@ -0,0 +1,136 @@
+import json
+from xml.sax.saxutils import escape, quoteattr
+
+from src.test.unit_test_outcome import ERROR, FAILED, TIMEOUT, UnitTestOutcome
+
+# formats of the reports
+TEXT = "text"
+JSONL = "jsonl"
+JUNIT = "junit"
+
+
+# Writes the outcome of each test to a stream as soon as it is added
+# start is called before the first test and finish after the last one
+class UnitTestReport:
+    def __init__(self, stream):
+        self.stream = stream
+
+    @staticmethod
+    def from_format(format_name: str, stream, verbose: bool = False):
+        if format_name == TEXT:
+            return TextReport(stream, verbose)
+        elif format_name == JSONL:
+            return JSONLinesReport(stream)
+        elif format_name == JUNIT:
+            return JUnitReport(stream)
+
+        raise ValueError(
+            f"Report format {format_name} not found, valid formats are: {[TEXT, JSONL, JUNIT]}"
+        )
+
+    def start(self, number_of_tests: int):
+        pass
+
+    def add(self, outcome: UnitTestOutcome):
+        pass
+
+    def finish(self):
+        pass
+
+
+# A line for each test in green if it passed and red if it didn't, then the overall results
+# with verbose the full UnitTestResult of each test is shown instead, eg. the knowledge base and truth tables
+class TextReport(UnitTestReport):
+    def __init__(self, stream, verbose: bool = False):
+        super().__init__(stream)
+
+        self.verbose = verbose
+
+        self.number_of_tests = 0
+        self.number_passed = 0
+
+        # numbers of the tests that didn't pass
+        self.failed_tests: list[int] = []
+
+    def add(self, outcome: UnitTestOutcome):
+        self.number_of_tests += 1
+
+        if outcome.passed:
+            self.number_passed += 1
+        else:
+            self.failed_tests.append(outcome.number)
+
+        string = outcome.get_summary()
+
+        if self.verbose and outcome.details is not None:
+            string = f"Test #{outcome.number} " + "-" * 50 + f"\n\n{outcome.details}"
+
+        colour = "\033[92m" if outcome.passed else "\033[91m"
+
+        print(f"{colour}{string}\033[0m", file=self.stream, flush=True)
+
+    def finish(self):
+        print("Overall Results:", file=self.stream)
+
+        if len(self.failed_tests) == 0:
+            print(
+                f"\033[92mAll tests passed ({self.number_passed}/{self.number_of_tests})\033[0m",
+                file=self.stream,
+            )
+            return
+
+        print(
+            f"\033[91m{self.number_passed}/{self.number_of_tests} tests passed\033[0m",
+            file=self.stream,
+        )
+
+        # in order even though they finished in a different order
+        failed_tests_str = ", ".join(
+            f"#{number}" for number in sorted(self.failed_tests)
+        )
+        print(f"Failed Tests: {failed_tests_str}", file=self.stream)
+
+
+# One json object for each test, see FIELDS of UnitTestOutcome
+class JSONLinesReport(UnitTestReport):
+    def add(self, outcome: UnitTestOutcome):
+        self.stream.write(json.dumps(outcome.to_dict()) + "\n")
+        self.stream.flush()
+
+
+# JUnit XML that CI servers can show, each test case is written as soon as it finishes
+# so the number of failures isn't known when the test suite element is written, the servers count them anyway
+class JUnitReport(UnitTestReport):
+    def start(self, number_of_tests: int):
+        self.stream.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+        self.stream.write("<testsuites>\n")
+        self.stream.write(f'  <testsuite name="iengine" tests="{number_of_tests}">\n')
+        self.stream.flush()
+
+    def add(self, outcome: UnitTestOutcome):
+        name = quoteattr(f"#{outcome.number} {outcome.name or outcome.file}")
+
+        self.stream.write(
+            f"    <testcase classname={quoteattr(outcome.algorithm)} name={name} "
+            f'file={quoteattr(outcome.file)} time="{outcome.seconds:.6f}"'
+        )
+
+        if outcome.status == FAILED:
+            message = f"expected {outcome.expected!r}, got {outcome.actual!r}"
+
+            self.stream.write(
+                f">\n      <failure message={quoteattr(message)}/>\n    </testcase>\n"
+            )
+        elif outcome.status in (ERROR, TIMEOUT):
+            self.stream.write(
+                f">\n      <error type={quoteattr(outcome.status)} message={quoteattr(outcome.message)}>"
+                f"{escape(outcome.message)}</error>\n    </testcase>\n"
+            )
+        else:
+            self.stream.write("/>\n")
+
+        self.stream.flush()
+
+    def finish(self):
+        self.stream.write("  </testsuite>\n</testsuites>\n")
+        self.stream.flush()
@@ -0,0 +1,313 @@
+import multiprocessing
+import os
+import signal
+import time
+from multiprocessing.connection import wait
+
+from src.file_parser import FileParser, FileType
+from src.inference_algorithm_factory import InferenceAlgorithmFactory
+from src.runner import Runner
+from src.test.unit_test_check import CHECK, CheckError, UnitTestCheck
+from src.test.unit_test_outcome import ERROR, FAILED, PASSED, TIMEOUT, UnitTestOutcome
+
+# file types that are tests
+TEST_FILE_TYPES = [FileType.CHAINING_TEST, FileType.TRUTH_TABLE_CHECKING_TEST]
+
+
+def run_test(
+    number: int, file_path: str, algorithm_name: str, details: bool = False
+) -> UnitTestOutcome:
+    # a new algorithm for each test so nothing is left over from the last one
+    start = time.perf_counter()
+
+    if algorithm_name == CHECK:
+        return run_check(number, file_path, details)
+
+    try:
+        algorithm = InferenceAlgorithmFactory.get_inference_algorithm_from_name(
+            algorithm_name
+        )
+        result = Runner.run_test_from_file_path(algorithm, file_path)
+    except Exception as error:
+        # the first argument is the message, the second can be a huge sentence
+        message = str(error.args[0]) if error.args else ""
+
+        return UnitTestOutcome(
+            number,
+            file_path,
+            algorithm_name,
+            ERROR,
+            time.perf_counter() - start,
+            message=f"{type(error).__name__}: {message}",
+        )
+
+    return UnitTestOutcome(
+        number,
+        file_path,
+        algorithm_name,
+        PASSED if result.passed else FAILED,
+        time.perf_counter() - start,
+        result.name,
+        str(result.expect),
+        str(result.actual),
+        details=str(result) if details else None,
+    )
+
+
+def run_check(number: int, path: str, details: bool = False) -> UnitTestOutcome:
+    # a check is a function instead of a test file, see UnitTestCheck
+    start = time.perf_counter()
+    name = UnitTestCheck.get_name(path)
+
+    try:
+        UnitTestCheck.run(path)
+    except CheckError as error:
+        return UnitTestOutcome(
+            number,
+            path,
+            CHECK,
+            FAILED,
+            time.perf_counter() - start,
+            name,
+            repr(error.expected),
+            repr(error.actual),
+            str(error),
+            f"{name} ({CHECK}) - FAILED\n{error}\n" if details else None,
+        )
+    except Exception as error:
+        message = str(error.args[0]) if error.args else ""
+
+        return UnitTestOutcome(
+            number,
+            path,
+            CHECK,
+            ERROR,
+            time.perf_counter() - start,
+            name,
+            message=f"{type(error).__name__}: {message}",
+        )
+
+    return UnitTestOutcome(
+        number,
+        path,
+        CHECK,
+        PASSED,
+        time.perf_counter() - start,
+        name,
+        details=f"{name} ({CHECK}) - PASSED\n" if details else None,
+    )
+
+
+def run_test_worker(connection, details: bool):
+    # runs tests until it is sent None, in its own process group so the processes of TT-PAR are stopped with it
+    if hasattr(os, "setsid"):
+        os.setsid()
+
+    try:
+        while True:
+            test = connection.recv()
+
+            if test is None:
+                return
+
+            connection.send(run_test(*test, details))
+    except (EOFError, KeyboardInterrupt):
+        # the runner stopped
+        pass
+    finally:
+        connection.close()
+
+
+# Runs the tests of a folder, each test is a test file with one of its algorithms
+# with more than 1 job (or a timeout) the tests run in a pool of worker processes and are yielded as they finish
+# a worker that takes longer than the timeout on a test is stopped and replaced by a new one
+# eg.
+#   runner = UnitTestRunner(jobs=4, timeout=60)
+#   for outcome in runner.run(UnitTestRunner.get_tests("test_files")):
+#       print(outcome.get_summary())
+class UnitTestRunner:
+    def __init__(self, jobs: int = 1, timeout: float = None, details: bool = False):
+        if jobs < 1:
+            raise ValueError("There must be at least 1 job")
+
+        if timeout is not None and timeout <= 0:
+            raise ValueError("The timeout must be more than 0 seconds")
+
+        self.jobs = jobs
+        self.timeout = timeout
+
+        # build the full UnitTestResult string of each test as well
+        self.details = details
+
+    @staticmethod
+    def get_tests(
+        folder_path: str, algorithm_name: str = None
+    ) -> list[tuple[int, str, str]]:
+        # number, file path and algorithm name of each test, sorted by file so the numbers are always the same
+        tests = []
+
+        for file in sorted(os.listdir(folder_path)):
+            file_path = os.path.join(folder_path, file)
+
+            file_type = FileParser.get_file_type(file_path)
+
+            if file_type not in TEST_FILE_TYPES:
+                raise ValueError(
+                    f"All files should be test files. {file} is not a test file"
+                )
+
+            names = [
+                algorithm.name
+                for algorithm in InferenceAlgorithmFactory.get_inference_algorithms_from_file_type(
+                    file_type
+                )
+            ]
+
+            # if we have specified a specific algorithm only files that work with it are tested
+            if algorithm_name is not None:
+                if algorithm_name not in names:
+                    continue
+
+                names = [algorithm_name]
+
+            for name in names:
+                tests.append((len(tests) + 1, file_path, name))
+
+        # the checks don't depend on the folder, they run with the test files or on their own with CHECK
+        if algorithm_name is None or algorithm_name == CHECK:
+            for path in UnitTestCheck.get_check_paths():
+                tests.append((len(tests) + 1, path, CHECK))
+
+        return tests
+
+    def run(self, tests: list[tuple[int, str, str]]):
+        # yields the outcome of each test, in the order they finish
+        if self.jobs == 1 and self.timeout is None:
+            for test in tests:
+                yield run_test(*test, self.details)
+
+            return
+
+        yield from self.run_pool(tests)
+
+    def run_pool(self, tests: list[tuple[int, str, str]]):
+        pending = list(reversed(tests))
+
+        # connection of each idle worker and the worker, test and start time of each busy worker
+        idle = []
+        busy = {}
+
+        for _ in range(min(self.jobs, len(tests))):
+            idle.append(self.start_worker())
+
+        try:
+            while len(pending) > 0 or len(busy) > 0:
+                while len(pending) > 0 and len(idle) > 0:
+                    worker = idle.pop()
+                    test = pending.pop()
+
+                    worker[1].send(test)
+                    busy[worker[1]] = (worker, test, time.perf_counter())
+
+                for connection in wait(list(busy), self.get_wait_seconds(busy)):
+                    worker, test, start = busy.pop(connection)
+
+                    # the worker is idle again before the outcome is yielded so it is stopped if the runner is closed
+                    try:
+                        outcome = connection.recv()
+                        idle.append(worker)
+                    except EOFError:
+                        # eg. the worker ran out of memory
+                        self.stop_worker(worker)
+                        idle.append(self.start_worker())
+
+                        yield UnitTestOutcome(
+                            test[0],
+                            test[1],
+                            test[2],
+                            ERROR,
+                            time.perf_counter() - start,
+                            message=f"worker exited with code {worker[0].exitcode}",
+                        )
+                        continue
+
+                    yield outcome
+
+                if self.timeout is None:
+                    continue
+
+                now = time.perf_counter()
+
+                for connection, (worker, test, start) in list(busy.items()):
+                    if now - start < self.timeout:
+                        continue
+
+                    del busy[connection]
+
+                    self.stop_worker(worker)
+                    idle.append(self.start_worker())
+
+                    yield UnitTestOutcome(
+                        test[0],
+                        test[1],
+                        test[2],
+                        TIMEOUT,
+                        now - start,
+                        message=f"stopped after {self.timeout}s",
+                    )
+        finally:
+            for worker in idle:
+                try:
+                    worker[1].send(None)
+                except OSError:
+                    pass
+
+            for worker in idle:
+                worker[0].join(1)
+
+            # stopped early eg. with ctrl-c
+            for worker, _, _ in busy.values():
+                self.stop_worker(worker)
+
+            for worker in idle:
+                if worker[0].is_alive():
+                    self.stop_worker(worker)
+
+    def get_wait_seconds(self, busy: dict) -> float:
+        # until the first busy worker runs out of time
+        if self.timeout is None:
+            return None
+
+        now = time.perf_counter()
+
+        return max(
+            0.0, min(start + self.timeout - now for _, _, start in busy.values())
+        )
+
+    def start_worker(self) -> tuple[multiprocessing.Process, object]:
+        connection, worker_connection = multiprocessing.Pipe()
+
+        process = multiprocessing.Process(
+            target=run_test_worker, args=(worker_connection, self.details)
+        )
+        process.start()
+        worker_connection.close()
+
+        return process, connection
+
+    @staticmethod
+    def stop_worker(worker: tuple[multiprocessing.Process, object]):
+        # the whole process group so worker processes of TT-PAR are stopped as well
+        process, connection = worker
+
+        connection.close()
+
+        if hasattr(os, "killpg") and process.pid is not None:
+            try:
+                os.killpg(process.pid, signal.SIGKILL)
+            except OSError:
+                process.kill()
+        else:
+            process.kill()
+
+        process.join()
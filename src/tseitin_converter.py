@@ -0,0 +1,208 @@
+from src.clause_database import ClauseDatabase
+from src.syntax.atom import BoolAtom
+from src.syntax.compiler import SentenceCompiler
+from src.syntax.operator import Operator
+from src.syntax.sentence import AtomicSentence, Expression, Sentence
+
+
+# Tseitin (definitional) CNF conversion
+# every sub sentence that isn't a literal gets an auxiliary symbol x and clauses for x <=> sub sentence
+# eg. a || (b & c) becomes (a || x) & (~x || b) & (~x || c) & (x || ~b || ~c)
+# the number of clauses grows linearly with the sentence instead of exponentially like the distributive law
+# the auxiliary symbols are always defined in both directions so each model of the knowledge base
+# has exactly one model of the clauses, which keeps model counts the same
+class TseitinConverter:
+    def __init__(self, database: ClauseDatabase):
+        self.database = database
+
+    @staticmethod
+    def estimate_clause_count(sentence: Sentence, limit: int) -> int:
+        # number of clauses that the distributive law would create for the sentence
+        # counting stops at the limit because the numbers can get huge
+        return TseitinConverter.estimate_clause_counts(sentence, limit)[0]
+
+    @staticmethod
+    def estimate_clause_counts(sentence: Sentence, limit: int) -> tuple[int, int]:
+        # number of clauses for the sentence and for its negation, up to the limit
+        # the tree is walked with an explicit stack because sentences can be very deep
+        # and each sub sentence is only counted once even if it is shared
+        counts: dict[int, tuple[int, int]] = {}
+
+        # each entry is a sentence and whether its children are done
+        stack: list[tuple[Sentence, bool]] = [(sentence, False)]
+
+        while len(stack) > 0:
+            current, children_done = stack.pop()
+
+            if isinstance(current, AtomicSentence):
+                counts[id(current)] = (1, 1)
+                continue
+
+            current: Expression
+            operator = current.operator
+
+            if not children_done:
+                if id(current) in counts:
+                    continue
+
+                stack.append((current, True))
+                stack.append((current.rhs, False))
+
+                if operator != Operator.NEGATION:
+                    stack.append((current.lhs, False))
+
+                continue
+
+            rhs_positive, rhs_negative = counts[id(current.rhs)]
+
+            if operator == Operator.NEGATION:
+                counts[id(current)] = (rhs_negative, rhs_positive)
+                continue
+
+            lhs_positive, lhs_negative = counts[id(current.lhs)]
+
+            # clauses are added together for a conjunction and multiplied for a disjunction
+            if operator == Operator.CONJUNCTION:
+                positive = lhs_positive + rhs_positive
+                negative = lhs_negative * rhs_negative
+
+            elif operator == Operator.DISJUNCTION:
+                positive = lhs_positive * rhs_positive
+                negative = lhs_negative + rhs_negative
+
+            # A=>B is equivalent to ~A || B
+            elif operator == Operator.IMPLICATION:
+                positive = lhs_negative * rhs_positive
+                negative = lhs_positive + rhs_negative
+
+            # A<=>B is equivalent to (~A || B) & (~B || A)
+            # and ~(A<=>B) is equivalent to (A || B) & (~A || ~B), the same as Expression.combine_clauses
+            elif operator == Operator.BICONDITIONAL:
+                positive = lhs_negative * rhs_positive + rhs_negative * lhs_positive
+                negative = lhs_positive * rhs_positive + lhs_negative * rhs_negative
+
+            else:
+                raise ValueError(f"Operator {operator} not supported.")
+
+            counts[id(current)] = (min(positive, limit), min(negative, limit))
+
+        return counts[id(sentence)]
+
+    def add_sentence(self, sentence: Sentence):
+        # each part of a top level conjunction must be true so it doesn't need an auxiliary symbol
+        for conjunct in self.get_chain(sentence, Operator.CONJUNCTION):
+            # a top level disjunction is already a clause
+            disjuncts = self.get_chain(conjunct, Operator.DISJUNCTION)
+
+            self.database.add_clause([self.encode(disjunct) for disjunct in disjuncts])
+
+    def encode(self, sentence: Sentence) -> int:
+        # returns the literal that is true exactly when the sentence is true
+        # the tree is walked with an explicit stack because sentences can be very deep, the operands
+        # are encoded from left to right before the sentence so the symbols are numbered in that order
+        literals: list[int] = []
+
+        # each entry is a sentence and its operands once they have been pushed
+        stack: list[tuple[Sentence, list[Sentence]]] = [(sentence, None)]
+
+        while len(stack) > 0:
+            current, operands = stack.pop()
+
+            if operands is None:
+                if isinstance(current, AtomicSentence):
+                    literals.append(self.encode_atom(current))
+                    continue
+
+                current: Expression
+                operator = current.operator
+
+                if operator == Operator.NEGATION:
+                    operands = [current.rhs]
+                elif (
+                    operator == Operator.CONJUNCTION or operator == Operator.DISJUNCTION
+                ):
+                    operands = self.get_chain(current, operator)
+                else:
+                    operands = [current.lhs, current.rhs]
+
+                stack.append((current, operands))
+                stack.extend((operand, None) for operand in reversed(operands))
+
+                continue
+
+            # the literals of the operands are the last ones
+            first = len(literals) - len(operands)
+            operand_literals = literals[first:]
+            del literals[first:]
+
+            literals.append(self.define(current.operator, operand_literals))
+
+        return literals[0]
+
+    def encode_atom(self, sentence: AtomicSentence) -> int:
+        atom = sentence.atom
+
+        # True and False are an auxiliary symbol with a fixed value
+        if isinstance(atom, BoolAtom):
+            symbol = self.database.new_auxiliary_symbol()
+            self.database.add_clause([symbol if atom.name == "True" else -symbol])
+            return symbol
+
+        return self.database.encode_literal(atom.name, atom.negated)
+
+    def define(self, operator: Operator, literals: list[int]) -> int:
+        # returns the literal that is true exactly when the operator applied to the literals is true
+        add_clause = self.database.add_clause
+
+        # negations don't need an auxiliary symbol
+        if operator == Operator.NEGATION:
+            return -literals[0]
+
+        symbol = self.database.new_auxiliary_symbol()
+
+        # x <=> a & b is (~x || a) & (~x || b) & (x || ~a || ~b)
+        if operator == Operator.CONJUNCTION:
+            for literal in literals:
+                add_clause([-symbol, literal])
+
+            add_clause([symbol] + [-literal for literal in literals])
+
+            return symbol
+
+        # x <=> a || b is (~x || a || b) & (x || ~a) & (x || ~b)
+        if operator == Operator.DISJUNCTION:
+            add_clause([-symbol] + literals)
+
+            for literal in literals:
+                add_clause([symbol, -literal])
+
+            return symbol
+
+        lhs, rhs = literals
+
+        # x <=> (a => b) is (~x || ~a || b) & (x || a) & (x || ~b)
+        if operator == Operator.IMPLICATION:
+            add_clause([-symbol, -lhs, rhs])
+            add_clause([symbol, lhs])
+            add_clause([symbol, -rhs])
+
+            return symbol
+
+        # x <=> (a <=> b) is (~x || ~a || b) & (~x || a || ~b) & (x || a || b) & (x || ~a || ~b)
+        if operator == Operator.BICONDITIONAL:
+            add_clause([-symbol, -lhs, rhs])
+            add_clause([-symbol, lhs, -rhs])
+            add_clause([symbol, lhs, rhs])
+            add_clause([symbol, -lhs, -rhs])
+
+            return symbol
+
+        raise ValueError(f"Operator {operator} not supported.")
+
+    @staticmethod
+    def get_chain(sentence: Sentence, operator: Operator) -> list[Sentence]:
+        # operands of a chain of the operator, or just the sentence if it isn't one
+        if isinstance(sentence, Expression) and sentence.operator == operator:
+            return SentenceCompiler.get_chain(sentence)
+
+        return [sentence]
@@ -1,102 +1,84 @@
 import os
 import sys
+from contextlib import closing
 
-from src.file_parser import FileParser, FileType
-from src.inference_algorithm_factory import InferenceAlgorithmFactory
-from src.runner import Runner
-from src.test.unit_test_result import UnitTestResult
+from src.test.unit_test_report import TEXT, UnitTestReport
+from src.test.unit_test_runner import UnitTestRunner
+
+
+def get_option(name: str) -> str:
+    # gets the value of an option given as --name=value
+    for argument in sys.argv[1:]:
+        if argument.startswith(f"{name}="):
+            return argument[len(name) + 1 :]
+
+    return None
 
 
 def main():
+    # arguments that aren't options
+    arguments = [argument for argument in sys.argv[1:] if not argument.startswith("--")]
+
     # not enough arguments
-    if len(sys.argv) < 2:
-        print("Usage: python test.py <test_folder_path> [<algorithm type?>]")
+    if len(arguments) < 1:
+        print(
+            "Usage: python test.py <test_folder_path> [<algorithm type?>] [--jobs=<n>] [--timeout=<seconds>] [--format=text/jsonl/junit] [--output=<path>] [--verbose]"
+        )
         return
 
     # get the folder name
-    test_folder_path = sys.argv[1]
-
-    overall_results: list[UnitTestResult] = []
-
-    # failed tests
-    failed_tests: list[str] = []
+    test_folder_path = arguments[0]
 
     # get algorithm type if it exists
-    algorithm_type = sys.argv[2] if len(sys.argv) > 2 else None
+    algorithm_type = arguments[1].upper() if len(arguments) > 1 else None
 
-    test_number = 1
+    # number of tests that run at once (all the cpus with --jobs=0) and seconds each test gets
+    jobs = int(get_option("--jobs") or 1)
+    timeout = get_option("--timeout")
 
-    # for each file in the folder
-    for file in os.listdir(test_folder_path):
-        # get the file path
-        file_path = os.path.join(test_folder_path, file)
+    runner = UnitTestRunner(
+        jobs if jobs > 0 else os.cpu_count(),
+        float(timeout) if timeout is not None else None,
+        "--verbose" in sys.argv,
+    )
 
-        # get file type
-        file_type = FileParser.get_file_type(file_path)
+    tests = UnitTestRunner.get_tests(test_folder_path, algorithm_type)
 
-        if file_type == FileType.STANDARD:
-            raise ValueError(
-                f"All files should be test files. {file} is not a test file"
-            )
+    # the report is written to the output file, or printed instead of the text report
+    format_name = get_option("--format") or TEXT
+    output_path = get_option("--output")
 
-        # get the inference algorithms
-        inference_algorithms = (
-            InferenceAlgorithmFactory.get_inference_algorithms_from_file_type(file_type)
-        )
-
-        # if we have specified a specifc algorithm and it's not in the list we can't do it for this file
-        if algorithm_type and algorithm_type not in [
-            algorithm.name for algorithm in inference_algorithms
-        ]:
-            continue
-
-        # otherwise set the inference algorithms to the one specified
-        if algorithm_type:
-            inference_algorithms = [
-                InferenceAlgorithmFactory.get_inference_algorithm_from_name(
-                    algorithm_type
-                )
-            ]
-
-        # for each algorithm
-        for algorithm in inference_algorithms:
-            # print the test number
-            print(f"Test #{test_number} " + "-" * 50 + "\n")
+    output = open(output_path, "w") if output_path is not None else sys.stdout
 
-            # run the test
-            result = Runner.run_test_from_file_path(algorithm, file_path)
+    reports = [UnitTestReport.from_format(format_name, output, runner.details)]
 
-            # print the result in green if passed, red if failed
-            if result.passed:
-                print(f"\033[92m{result}\033[0m")
-            else:
-                print(f"\033[91m{result}\033[0m")
-                failed_tests.append(f"#{test_number}")
+    # the text report is still printed when the report goes to a file
+    if format_name != TEXT and output_path is not None:
+        reports.append(UnitTestReport.from_format(TEXT, sys.stdout, runner.details))
 
-            overall_results.append(result)
+    passed = True
 
-            test_number += 1
+    try:
+        for report in reports:
+            report.start(len(tests))
 
-    # print the overall results
-    print("Overall Results:")
+        # closed straight away if a report fails so the workers are stopped
+        with closing(runner.run(tests)) as outcomes:
+            for outcome in outcomes:
+                passed = passed and outcome.passed
 
-    # number passed
-    number_passed = len([result for result in overall_results if result.passed])
-
-    # all passed
-    if all(result.passed for result in overall_results):
-        # as fraction
-        print(
-            f"\033[92mAll tests passed ({number_passed}/{len(overall_results)})\033[0m"
-        )
+                for report in reports:
+                    report.add(outcome)
 
-    else:
-        # as fraction
-        print(f"\033[91m{number_passed}/{len(overall_results)} tests passed\033[0m")
+        for report in reports:
+            report.finish()
+    finally:
+        if output is not sys.stdout:
+            output.close()
 
-        # print failed test numbers
-        failed_tests_str = ", ".join([str(test) for test in failed_tests])
-        print(f"Failed Tests: {failed_tests_str}")
+    # so a script running the tests can tell some failed
+    if not passed:
+        sys.exit(1)
 
 
 # runs the program if the file is run directly